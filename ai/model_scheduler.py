@@ -0,0 +1,265 @@
+"""
+Model Scheduler - Model-affinity request scheduling for the local Ollama server
+
+Every OllamaClient in the process shares one scheduler. Requests wait in a
+per-model queue and are granted so that as much work as possible runs on models
+that are already resident in VRAM:
+
+1. Higher priority first (interactive chat > artifact generation > background
+   judging / synthetic data)
+2. Within a priority, requests for resident models go first, so queued work for
+   the loaded model is drained as a batch before a swap
+3. A swap (a model that is not resident when the resident set is full) waits
+   until the least recently used resident model has no requests in flight, then
+   evicts it
+4. After `max_batch` consecutive resident grants while another model is waiting,
+   affinity is ignored until the next swap so no model starves
+
+The scheduler does not talk to Ollama itself; it only orders requests. Ollama
+evicts models on its own when a request arrives for a model that does not fit.
+Explicit loads (OllamaClient.ensure_model_available) take a normal slot, and
+explicit unloads run inside `evicting()`, which refuses models with requests in
+flight and holds back new grants for the model until the unload is sent.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional: report to the backend metrics collector when running inside the API
+try:
+    from backend.core.metrics import get_metrics_collector
+    metrics = get_metrics_collector()
+except ImportError:
+    metrics = None
+
+
+class RequestPriority(IntEnum):
+    """Scheduling priority (lower value is served first)"""
+    INTERACTIVE = 0   # Chat, agentic chat - a user is waiting on tokens
+    NORMAL = 1        # Artifact generation
+    BACKGROUND = 2    # LLM judge, synthetic data, dataset building
+
+
+@dataclass(order=True)
+class _Waiter:
+    """A queued request (heap-ordered by priority, then arrival)"""
+    priority: int
+    seq: int
+    model: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class ModelScheduler:
+    """
+    Per-model request queues with batch draining and priorities.
+
+    Usage:
+        async with scheduler.slot("llama3", RequestPriority.INTERACTIVE):
+            ...  # call Ollama
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_resident: int = 2, max_batch: int = 8):
+        """
+        Args:
+            max_concurrent: Requests allowed on the Ollama server at once
+            max_resident: Models assumed to fit in VRAM together
+            max_batch: Resident grants in a row before a waiting model gets its turn
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_resident = max(1, max_resident)
+        self.max_batch = max(1, max_batch)
+
+        self.queues: Dict[str, List[_Waiter]] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.resident: "OrderedDict[str, None]" = OrderedDict()  # LRU order, most recent last
+        self.evicting_models: Dict[str, int] = {}  # Models being unloaded; not granted meanwhile
+        self._seq = itertools.count()
+        self._batch = 0
+
+        self.grants = 0
+        self.loads = 0
+        self.swaps = 0
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: int = RequestPriority.NORMAL) -> AsyncIterator[None]:
+        """Wait for this model's turn, hold the slot for the body, then release it."""
+        waiter = _Waiter(
+            priority=int(priority),
+            seq=next(self._seq),
+            model=model,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.perf_counter(),
+        )
+        heapq.heappush(self.queues.setdefault(model, []), waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except BaseException:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted at the same moment the caller gave up
+                self._release(model)
+            else:
+                self._remove(waiter)
+            raise
+
+        if metrics:
+            metrics.record(
+                "model_scheduler_wait_seconds",
+                time.perf_counter() - waiter.enqueued_at,
+                tags={"priority": RequestPriority(waiter.priority).name.lower()},
+            )
+
+        try:
+            yield
+        finally:
+            self._release(model)
+
+    @asynccontextmanager
+    async def evicting(self, model: str) -> AsyncIterator[bool]:
+        """
+        Hold a model out of scheduling while it is unloaded.
+        
+        Yields False (and changes nothing) when the model has requests in
+        flight; otherwise drops it from the resident set and yields True, and
+        queued requests for it wait until the block exits.
+        """
+        if self.in_flight.get(model):
+            yield False
+            return
+        self.evicting_models[model] = self.evicting_models.get(model, 0) + 1
+        self.resident.pop(model, None)
+        try:
+            yield True
+        finally:
+            remaining = self.evicting_models[model] - 1
+            if remaining:
+                self.evicting_models[model] = remaining
+            else:
+                del self.evicting_models[model]
+            self._dispatch()
+
+    def _dispatch(self):
+        """Grant as many queued requests as capacity and policy allow."""
+        while sum(self.in_flight.values()) < self.max_concurrent:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            queue = self.queues[waiter.model]
+            heapq.heappop(queue)
+            if not queue:
+                del self.queues[waiter.model]
+
+            self.in_flight[waiter.model] = self.in_flight.get(waiter.model, 0) + 1
+            self.resident.move_to_end(waiter.model)
+            self.grants += 1
+            waiter.future.set_result(None)
+        self._publish()
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        heads = [queue[0] for model, queue in self.queues.items() if model not in self.evicting_models]
+        if not heads:
+            return None
+
+        others_waiting = any(head.model not in self.resident for head in heads)
+        if not others_waiting:
+            self._batch = 0
+        affinity = self._batch < self.max_batch
+
+        best = min(heads, key=lambda head: (
+            head.priority,
+            0 if affinity and head.model in self.resident else 1,
+            head.seq,
+        ))
+
+        if best.model in self.resident:
+            if others_waiting:
+                self._batch += 1
+            return best
+
+        if len(self.resident) >= self.max_resident:
+            victim = next((m for m in self.resident if not self.in_flight.get(m)), None)
+            if victim is None:
+                # Every resident model is busy: stop granting so they drain, then swap
+                return None
+            del self.resident[victim]
+            self.swaps += 1
+            if metrics:
+                metrics.increment("model_scheduler_swaps_total", tags={"model": best.model})
+            logger.info(f"[SCHEDULER] Swapping {victim} -> {best.model} (swap #{self.swaps})")
+
+        self.resident[best.model] = None
+        self.loads += 1
+        self._batch = 0
+        return best
+
+    def _release(self, model: str):
+        remaining = self.in_flight.get(model, 0) - 1
+        if remaining > 0:
+            self.in_flight[model] = remaining
+        else:
+            self.in_flight.pop(model, None)
+        self._dispatch()
+
+    def _remove(self, waiter: _Waiter):
+        queue = self.queues.get(waiter.model)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            heapq.heapify(queue)
+            if not queue:
+                del self.queues[waiter.model]
+        self._dispatch()
+
+    def _publish(self):
+        if not metrics:
+            return
+        for model in set(self.queues) | set(self.in_flight) | set(self.resident):
+            metrics.gauge("model_scheduler_queue_depth", len(self.queues.get(model, ())), tags={"model": model})
+            metrics.gauge("model_scheduler_in_flight", self.in_flight.get(model, 0), tags={"model": model})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current queue depths, in-flight counts and swap totals."""
+        return {
+            "queue_depth": {model: len(queue) for model, queue in self.queues.items()},
+            "in_flight": dict(self.in_flight),
+            "resident_models": list(self.resident),
+            "evicting_models": list(self.evicting_models),
+            "grants": self.grants,
+            "loads": self.loads,
+            "swaps": self.swaps,
+            "max_concurrent": self.max_concurrent,
+            "max_resident": self.max_resident,
+        }
+
+
+# Global instance
+_scheduler: Optional[ModelScheduler] = None
+
+
+def get_model_scheduler() -> Optional[ModelScheduler]:
+    """Get the process-wide scheduler (None when disabled in settings)."""
+    global _scheduler
+    if _scheduler is None:
+        try:
+            from backend.core.config import settings
+            if not settings.ollama_scheduler_enabled:
+                return None
+            _scheduler = ModelScheduler(
+                max_concurrent=settings.ollama_max_concurrent_requests,
+                max_resident=settings.ollama_max_resident_models,
+                max_batch=settings.ollama_scheduler_max_batch,
+            )
+        except ImportError:
+            _scheduler = ModelScheduler()
+    return _scheduler
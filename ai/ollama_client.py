@@ -5,12 +5,29 @@ Provides on-demand loading and persistent caching of local AI models
 
 import asyncio
 import httpx
+from contextlib import nullcontext
 from typing import Dict, List, Optional, Any
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
 import time
 
+from ai.model_scheduler import ModelScheduler, RequestPriority, get_model_scheduler
+from ai.response_cache import get_response_cache
+
+# How long model digests from /api/tags are trusted (a re-pull changes the digest)
+DIGEST_TTL_SECONDS = 60.0
+
+# How long Ollama keeps a model (and the KV cache of its last prompt) loaded after a request
+DEFAULT_KEEP_ALIVE = "30m"
+
+# Optional: report to the backend metrics collector when running inside the API
+try:
+    from backend.core.metrics import get_metrics_collector
+    metrics = get_metrics_collector()
+except ImportError:
+    metrics = None
+
 
 class ModelStatus(Enum):
     """Status of a model in Ollama"""
@@ -43,6 +60,9 @@ class GenerationResponse:
     tokens_generated: int = 0
     success: bool = True
     error_message: str = ""
+    prompt_eval_count: int = 0        # Prompt tokens evaluated (tokens reused from the prompt cache are not counted)
+    prompt_eval_duration: float = 0.0  # Seconds spent evaluating the prompt
+    eval_duration: float = 0.0         # Seconds spent generating the response
 
 
 class OllamaClient:
@@ -55,9 +75,18 @@ class OllamaClient:
     - Model status tracking (not loaded / loading / ready / in use / error)
     - Async API for non-blocking operations
     - Automatic retry and error handling
+    - Model-affinity scheduling shared across all clients (see ai/model_scheduler.py)
     """
     
-    def __init__(self, base_url: str = "http://localhost:11434", timeout: int = 120, vram_limit_gb: float = 12.0):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        timeout: int = 120,
+        vram_limit_gb: float = 12.0,
+        default_priority: int = RequestPriority.NORMAL,
+        scheduler: Optional[ModelScheduler] = None,
+        keep_alive: Optional[str] = None
+    ):
         """
         Initialize Ollama client with VRAM management.
         
@@ -65,18 +94,56 @@ class OllamaClient:
             base_url: Ollama server URL (default: http://localhost:11434)
             timeout: Request timeout in seconds (default: 120)
             vram_limit_gb: VRAM limit in GB (default: 12.0 for RTX 3500 Ada)
+            default_priority: Scheduling priority for requests that don't pass one
+            scheduler: Scheduler to queue requests on (default: the shared one)
+            keep_alive: Ollama keep_alive sent with every request (default: settings.ollama_keep_alive)
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.vram_limit_gb = vram_limit_gb
         self.models: Dict[str, ModelInfo] = {}
         self._http_client = None
+        self.default_priority = default_priority
+        self.scheduler = scheduler if scheduler is not None else get_model_scheduler()
+        self.model_digests: Dict[str, str] = {}
+        self._digests_fetched_at = 0.0
+        self.keep_alive = keep_alive if keep_alive is not None else self._default_keep_alive()
+        self.eval_stats: Dict[str, Dict[str, float]] = {}  # Last prompt-eval/eval timings per model (for stats only)
         
         # VRAM management (Dynamic)
         self.persistent_models: set = set()  # Models that should stay loaded
         self.active_models: set = set()      # Currently loaded models
         self.model_sizes: Dict[str, float] = {} # Populated dynamically
         
+    @staticmethod
+    def _default_keep_alive() -> str:
+        try:
+            from backend.core.config import settings
+            return settings.ollama_keep_alive
+        except ImportError:
+            return DEFAULT_KEEP_ALIVE
+    
+    def _record_eval_timings(self, model_name: str, data: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Extract prompt-eval vs eval timings from a final Ollama response.
+        
+        Ollama reports durations in nanoseconds. A warm prompt cache shows up as
+        a small prompt_eval_count/prompt_eval_duration for a long prompt.
+        """
+        timings = {
+            "prompt_eval_count": int(data.get("prompt_eval_count") or 0),
+            "prompt_eval_duration": (data.get("prompt_eval_duration") or 0) / 1e9,
+            "eval_count": int(data.get("eval_count") or 0),
+            "eval_duration": (data.get("eval_duration") or 0) / 1e9,
+        }
+        self.eval_stats[model_name] = timings
+        if metrics:
+            tags = {"model": model_name}
+            metrics.record("ollama_prompt_eval_seconds", timings["prompt_eval_duration"], tags=tags)
+            metrics.record("ollama_prompt_eval_tokens", timings["prompt_eval_count"], tags=tags)
+            metrics.record("ollama_eval_seconds", timings["eval_duration"], tags=tags)
+        return timings
+    
     def _get_http_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client"""
         if self._http_client is None:
@@ -122,16 +189,19 @@ class OllamaClient:
                 data = response.json()
                 models = data.get("models", [])
                 
-                # Update model sizes map dynamically
+                # Update model sizes and digests dynamically
                 for model in models:
                     name = model.get("name")
                     size_bytes = model.get("size", 0)
+                    if name and model.get("digest"):
+                        self.model_digests[name] = model["digest"]
                     if name and size_bytes:
                         # Convert to GB (10^9 bytes usually for disk, but VRAM is 2^30? using 10^9 for safety/conservative)
                         # Ollama reports bytes on disk. VRAM usage is roughly similar for GGUF + context.
                         # Let's use binary GB (GiB) as standard VRAM is measured in GiB.
                         self.model_sizes[name] = size_bytes / (1024 ** 3)
-                        
+                
+                self._digests_fetched_at = time.time()
                 return [model.get("name", "") for model in models]
             else:
                 print(f"[ERROR] Failed to list models: {response.status_code}")
@@ -246,7 +316,8 @@ class OllamaClient:
             request_data = {
                 "model": model_name,
                 "prompt": test_prompt,
-                "stream": False
+                "stream": False,
+                "keep_alive": self.keep_alive
             }
             
             response = await client.post(
@@ -276,7 +347,83 @@ class OllamaClient:
             self.models[model_name].error_message = error_msg
             return False
     
+    async def get_model_digest(self, model_name: str) -> Optional[str]:
+        """
+        Content digest of a local model (e.g. "sha256:..."), used as a cache key.
+        
+        Returns:
+            The digest, or None if the model is unknown to the server
+        """
+        if time.time() - self._digests_fetched_at > DIGEST_TTL_SECONDS:
+            # Stamped before the fetch so a failed listing is also cached for the TTL
+            self._digests_fetched_at = time.time()
+            await self.list_models()
+        for name in (model_name, f"{model_name}:latest"):
+            if name in self.model_digests:
+                return self.model_digests[name]
+        return None
+    
+    def _slot(self, model_name: str, priority: Optional[int]):
+        """Scheduler slot for one request (no-op when scheduling is disabled)."""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(model_name, self.default_priority if priority is None else priority)
+    
     async def generate(
+        self,
+        model_name: str,
+        prompt: str,
+        system: Optional[str] = None,
+        system_message: Optional[str] = None,  # Alias for system (compatibility)
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        num_ctx: int = 16384,  # CRITICAL: Context window size (default 16K tokens for ~64K chars)
+        priority: Optional[int] = None,
+        **kwargs
+    ) -> GenerationResponse:
+        """
+        Generate text using a model.
+        
+        Temperature-0 requests are served from the response cache when it is
+        enabled (see ai/response_cache.py). Otherwise waits for the model's turn
+        in the shared scheduler; `priority` is a RequestPriority (defaults to
+        the client's default_priority). Other arguments are described in
+        _generate.
+        """
+        cache = get_response_cache()
+        cache_key = None
+        if cache is not None:
+            params = {"temperature": temperature, "max_tokens": max_tokens, "num_ctx": num_ctx, **kwargs}
+            digest = await self.get_model_digest(model_name) if cache.is_cacheable(params) else None
+            cache_key, cached = await asyncio.to_thread(
+                cache.lookup, "ollama", digest, prompt, system or system_message, params
+            )
+            if cached is not None:
+                return GenerationResponse(
+                    content=cached,
+                    model_used=model_name,
+                    generation_time=0.0,
+                    tokens_generated=len(cached.split()),
+                    success=True
+                )
+        
+        async with self._slot(model_name, priority):
+            response = await self._generate(
+                model_name=model_name,
+                prompt=prompt,
+                system=system,
+                system_message=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                num_ctx=num_ctx,
+                **kwargs
+            )
+        
+        if cache_key and response.success and response.content:
+            await asyncio.to_thread(cache.store, cache_key, "ollama", model_name, response.content)
+        return response
+    
+    async def _generate(
         self,
         model_name: str,
         prompt: str,
@@ -340,6 +487,7 @@ class OllamaClient:
                 "model": model_name,
                 "prompt": prompt,
                 "stream": False,
+                "keep_alive": self.keep_alive,
                 "options": {
                     "temperature": temperature,
                     "num_ctx": num_ctx  # CRITICAL: Expand context window for full context retention
@@ -368,6 +516,7 @@ class OllamaClient:
             if response.status_code == 200:
                 data = response.json()
                 content = data.get("response", "")
+                timings = self._record_eval_timings(model_name, data)
                 
                 # Update model info
                 self.models[model_name].status = ModelStatus.READY
@@ -377,8 +526,11 @@ class OllamaClient:
                     content=content,
                     model_used=model_name,
                     generation_time=generation_time,
-                    tokens_generated=len(content.split()),  # Approximate
-                    success=True
+                    tokens_generated=timings["eval_count"] or len(content.split()),  # Approximate if not reported
+                    success=True,
+                    prompt_eval_count=timings["prompt_eval_count"],
+                    prompt_eval_duration=timings["prompt_eval_duration"],
+                    eval_duration=timings["eval_duration"]
                 )
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
@@ -413,6 +565,51 @@ class OllamaClient:
         temperature: float = 0.0,
         max_tokens: Optional[int] = None,
         num_ctx: int = 16384,
+        priority: Optional[int] = None,
+        eval_stats: Optional[Dict[str, float]] = None,
+        **kwargs
+    ):
+        """
+        Generate text using a model with streaming.
+        
+        The scheduler slot is held until the stream finishes or is closed.
+        
+        Args:
+            eval_stats: Filled with this stream's prompt-eval/eval timings when it
+                        completes (a generator can't return them, and the per-model
+                        `self.eval_stats` is shared by concurrent requests)
+        
+        Yields:
+            Chunks of generated text
+        """
+        async with self._slot(model_name, priority):
+            stream = self._generate_stream(
+                model_name=model_name,
+                prompt=prompt,
+                system=system,
+                system_message=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                num_ctx=num_ctx,
+                eval_stats=eval_stats,
+                **kwargs
+            )
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+    
+    async def _generate_stream(
+        self,
+        model_name: str,
+        prompt: str,
+        system: Optional[str] = None,
+        system_message: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        num_ctx: int = 16384,
+        eval_stats: Optional[Dict[str, float]] = None,
         **kwargs
     ):
         """
@@ -445,6 +642,7 @@ class OllamaClient:
                 "model": model_name,
                 "prompt": prompt,
                 "stream": True,  # Enable streaming
+                "keep_alive": self.keep_alive,
                 "options": {
                     "temperature": temperature,
                     "num_ctx": num_ctx
@@ -480,6 +678,9 @@ class OllamaClient:
                             yield chunk_data["response"]
                             
                         if chunk_data.get("done", False):
+                            timings = self._record_eval_timings(model_name, chunk_data)
+                            if eval_stats is not None:
+                                eval_stats.update(timings)
                             break
                     except Exception:
                         continue
@@ -491,6 +692,11 @@ class OllamaClient:
             print(f"[ERROR] Stream generation failed: {e}")
             self.models[model_name].status = ModelStatus.READY
             yield f"Error: {str(e)}"
+        finally:
+            # Consumer stopped early (client disconnect, timeout): closing the
+            # stream above aborts the request so Ollama stops generating
+            if self.models[model_name].status == ModelStatus.IN_USE:
+                self.models[model_name].status = ModelStatus.READY
     
     def get_model_status(self, model_name: str) -> ModelStatus:
         """
@@ -546,7 +752,8 @@ class OllamaClient:
         
         all_success = True
         for model in persistent:
-            success = await self.load_model(model, show_progress=True)
+            async with self._slot(model, None):
+                success = await self.load_model(model, show_progress=True)
             if success:
                 self.persistent_models.add(model)
                 self.active_models.add(model)
@@ -560,11 +767,20 @@ class OllamaClient:
         
         return all_success
     
-    async def ensure_model_available(self, target_model: str, show_progress: bool = True) -> bool:
+    async def ensure_model_available(
+        self,
+        target_model: str,
+        show_progress: bool = True,
+        priority: Optional[int] = None
+    ) -> bool:
         """
         Ensure target model is loaded, swapping if necessary (VRAM-aware).
         
-        Logic:
+        With the scheduler enabled, the load waits for a scheduler slot like any
+        other request: the scheduler decides which model is swapped out (and
+        never one with requests in flight), so nothing is unloaded here.
+        
+        Logic without the scheduler:
         1. If target is already loaded → return immediately ⚡
         2. If target is persistent → should already be loaded
         3. If target requires swap → unload non-persistent, load target ⚠️
@@ -572,10 +788,15 @@ class OllamaClient:
         Args:
             target_model: Model to ensure is loaded
             show_progress: Show progress messages
+            priority: RequestPriority for the scheduler slot (default: the client's)
             
         Returns:
             True if model is now available
         """
+        if self.scheduler is not None:
+            async with self._slot(target_model, priority):
+                return await self.load_model(target_model, show_progress=show_progress)
+        
         # Already loaded?
         if target_model in self.active_models:
             if show_progress:
@@ -639,15 +860,29 @@ class OllamaClient:
         """
         Unload a model from VRAM.
         
-        Uses Ollama API with keep_alive=0 to immediately free VRAM.
+        Uses Ollama API with keep_alive=0 to immediately free VRAM. With the
+        scheduler enabled, a model with requests in flight is left loaded and
+        no request for the model is granted until the unload has been sent.
         
         Args:
             model_name: Model to unload
             show_progress: Show progress messages
         """
-        if model_name not in self.active_models:
+        if self.scheduler is not None:
+            async with self.scheduler.evicting(model_name) as evictable:
+                if not evictable:
+                    if show_progress:
+                        print(f"[INFO] Not unloading {model_name}: requests in flight")
+                    return
+                await self._unload(model_name, show_progress)
             return
         
+        if model_name not in self.active_models:
+            return
+        await self._unload(model_name, show_progress)
+    
+    async def _unload(self, model_name: str, show_progress: bool):
+        """Send the keep_alive=0 request that frees a model's VRAM."""
         try:
             if show_progress:
                 print(f"[INFO] Unloading {model_name}...")
@@ -687,16 +922,21 @@ class OllamaClient:
         Returns:
             Dict with usage stats
         """
-        used_gb = sum(self.model_sizes.get(m, 0) for m in self.active_models)
+        # With the scheduler enabled it tracks residency; active_models is only used without it
+        active_models = list(self.scheduler.resident) if self.scheduler else list(self.active_models)
+        used_gb = sum(self.model_sizes.get(m, 0) for m in active_models)
         available_gb = self.vram_limit_gb - used_gb
         
         return {
             "used_gb": round(used_gb, 1),
             "available_gb": round(available_gb, 1),
             "total_gb": self.vram_limit_gb,
-            "active_models": list(self.active_models),
+            "active_models": active_models,
             "persistent_models": list(self.persistent_models),
-            "usage_percent": round((used_gb / self.vram_limit_gb) * 100, 1)
+            "usage_percent": round((used_gb / self.vram_limit_gb) * 100, 1),
+            "scheduler": self.scheduler.get_stats() if self.scheduler else None,
+            "keep_alive": self.keep_alive,
+            "eval_timings": dict(self.eval_stats)
         }
     
     async def close(self):
@@ -0,0 +1,229 @@
+"""
+LLM Response Cache - Persistent cache for deterministic (temperature 0) generations
+
+Regenerating an artifact, re-judging it or repairing the same diagram again
+sends byte-identical prompts to the model. At temperature 0 the answer is the
+same, so it can be served from disk instead of spending seconds of GPU time or
+a cloud API call.
+
+- Key: SHA-256 of (provider, model digest, prompt, system prompt, sampling params)
+  The model digest (Ollama's content digest, or the cloud model id) means a
+  re-pulled model never serves stale answers.
+- Requests with a non-zero (or unspecified) temperature always bypass the cache.
+- Stored in SQLite, bounded by total response size with LRU eviction.
+- Opt-in: disabled unless settings.llm_response_cache_enabled is true.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional: report to the backend metrics collector when running inside the API
+try:
+    from backend.core.metrics import get_metrics_collector
+    metrics = get_metrics_collector()
+except ImportError:
+    metrics = None
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "cache" / "llm_responses.db"
+DEFAULT_MAX_MB = 256
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed LRU cache of model responses.
+
+    lookup() and store() do blocking SQLite I/O; async callers run them through
+    asyncio.to_thread so the event loop is never stalled on disk.
+
+    Usage:
+        key, cached = await asyncio.to_thread(
+            cache.lookup, "ollama", digest, prompt, system, {"temperature": 0.0}
+        )
+        if cached is not None:
+            return cached
+        content = await call_model(...)
+        if key:
+            await asyncio.to_thread(cache.store, key, "ollama", model_name, content)
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_mb: float = DEFAULT_MAX_MB):
+        self.path = Path(path)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " provider TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self.entries, self.total_bytes = row[0], row[1]
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def is_cacheable(params: Dict[str, Any]) -> bool:
+        """Only greedy decoding is deterministic; provider defaults are not."""
+        temperature = params.get("temperature")
+        return temperature is not None and float(temperature) == 0.0
+
+    @staticmethod
+    def make_key(provider: str, model_digest: str, prompt: str, system: Optional[str], params: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            [provider, model_digest, prompt, system or "", params],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(
+        self,
+        provider: str,
+        model_digest: Optional[str],
+        prompt: str,
+        system: Optional[str],
+        params: Dict[str, Any],
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a response.
+
+        Returns:
+            (key, cached_response). key is None when the request bypasses the
+            cache (non-zero temperature or unknown model digest); cached_response
+            is None on a miss.
+        """
+        if model_digest is None or not self.is_cacheable(params):
+            self.bypasses += 1
+            self._record(provider, "bypass")
+            return None, None
+
+        key = self.make_key(provider, model_digest, prompt, system, params)
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if row is None:
+            self._record(provider, "miss")
+            return key, None
+
+        self._record(provider, "hit")
+        return key, row[0]
+
+    def store(self, key: str, provider: str, model: str, response: str):
+        """Store a response, evicting least recently used entries over the size bound."""
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, response, size, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, size, now, now),
+            )
+            if old is None:
+                self.entries += 1
+                self.total_bytes += size
+            else:
+                self.total_bytes += size - old[0]
+            self._evict()
+            self._conn.commit()
+        if metrics:
+            metrics.gauge("llm_cache_bytes", self.total_bytes)
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries > 0:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.entries -= 1
+                self.total_bytes -= size
+                self.evictions += 1
+
+    def _record(self, provider: str, result: str):
+        if not metrics:
+            return
+        metrics.increment("llm_cache_requests_total", tags={"provider": provider, "result": result})
+        lookups = self.hits + self.misses
+        if lookups:
+            metrics.gauge("llm_cache_hit_rate", self.hits / lookups)
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.entries = 0
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate (of cacheable lookups), bypasses and storage usage."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": self.entries,
+            "size_mb": round(self.total_bytes / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "evictions": self.evictions,
+        }
+
+
+# Global instance
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Get the shared response cache (None unless enabled in settings)."""
+    global _response_cache
+    if _response_cache is None:
+        try:
+            from backend.core.config import settings
+        except ImportError:
+            return None
+        if not settings.llm_response_cache_enabled:
+            return None
+        try:
+            _response_cache = LLMResponseCache(
+                path=Path(settings.llm_response_cache_path),
+                max_mb=settings.llm_response_cache_max_mb,
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache unavailable: {e}")
+            return None
+    return _response_cache
@@ -1363,7 +1363,7 @@ OUTPUT THE CORRECTED CODE ONLY:"""
         result = await generation_service.generate_with_fallback(
             prompt=prompt,
             model_routing=routing,
-            temperature=0.05,  # Near-zero temperature for pure syntax repair
+            temperature=0.0,  # Greedy decoding for pure syntax repair (also makes repeat repairs cacheable)
             max_local_attempts=3 if not use_cloud else 0,  # Try up to 3 local models before cloud, or 0 if forced cloud
             system_instruction=f"""YOU ARE A CODE-ONLY MERMAID SYNTAX REPAIR TOOL.
 
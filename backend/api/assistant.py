@@ -13,9 +13,11 @@ Production-grade REST API for AI-powered development assistance:
 9. Contextual AI - File-focused AI assistance
 """
 
+import json
 import logging
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -523,6 +525,26 @@ async def index_repository(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/repos/index")
+async def index_all_repositories(
+    current_user: UserPublic = Depends(get_current_user)
+):
+    """Index all registered repositories concurrently (progress via repo_index.progress events)."""
+    try:
+        from backend.services.multi_repo import get_multi_repo_service
+        
+        service = get_multi_repo_service()
+        results = await service.index_repositories()
+        
+        return {"results": results}
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to index repositories: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/repos/context")
 async def get_combined_context(
     current_user: UserPublic = Depends(get_current_user)
@@ -611,6 +633,43 @@ async def design_review(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/review/stream")
+async def design_review_stream(
+    request: DesignReviewRequest,
+    current_user: UserPublic = Depends(get_current_user)
+):
+    """
+    Perform a full design review, streaming each reviewer's findings as it finishes.
+    
+    Server-Sent Events: one "partial" event per reviewer (architecture or
+    code_quality, tests, security, patterns), then a "result" event with the
+    combined review.
+    """
+    from backend.services.design_review import get_design_review_service
+    
+    service = get_design_review_service()
+    
+    async def event_stream():
+        try:
+            async for event in service.full_review_stream(
+                directory=request.directory,
+                architecture_diagram=request.architecture_diagram,
+                meeting_notes=request.meeting_notes
+            ):
+                if event["type"] == "result":
+                    event = {"type": "result", "result": event["result"].to_dict()}
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            logger.error(f"Failed to perform design review: {e}")
+            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ============================================================
 # Contextual Ask AI Endpoint
 # ============================================================
@@ -16,6 +16,7 @@ from backend.core.auth import get_current_user
 from backend.models.dto import UserPublic
 from backend.core.middleware import limiter
 from backend.core.cache import cached
+from backend.core.streaming import StreamCoalescer, stop_on_disconnect
 
 logger = logging.getLogger(__name__)
 
@@ -532,10 +533,14 @@ async def send_message(
 @router.post("/stream")
 async def send_message_stream(
     request: ChatRequest,
+    http_request: Request,
     current_user: UserPublic = Depends(get_current_user)
 ):
     """
     Send a message with streaming response.
+    
+    Tokens are relayed as the model produces them; if the client disconnects the
+    model request is cancelled.
     """
     service = get_chat_service()
     
@@ -546,7 +551,7 @@ async def send_message_stream(
         try:
             logger.info(f"💬 [CHAT_API_STREAM] Step 2: Starting chat stream")
             chunk_count = 0
-            async for chunk in service.chat(
+            chat_stream = StreamCoalescer("chat").coalesce_events(service.chat(
                 message=request.message,
                 conversation_history=request.conversation_history,
                 include_project_context=request.include_project_context,
@@ -554,7 +559,8 @@ async def send_message_stream(
                 session_id=request.session_id,
                 folder_id=request.folder_id,
                 meeting_notes_content=request.meeting_notes_content
-            ):
+            ))
+            async for chunk in stop_on_disconnect(http_request, chat_stream, endpoint="chat"):
                 chunk_count += 1
                 if chunk_count == 1:
                     logger.info(f"💬 [CHAT_API_STREAM] Step 2.1: First chunk received: type={chunk.get('type')}")
@@ -624,14 +630,15 @@ async def stream_agentic_chat(
         try:
             logger.info(f"🤖 [AGENTIC_CHAT_API] Step 2: Starting agentic chat stream")
             chunk_count = 0
-            async for chunk in service.chat(
+            agent_stream = StreamCoalescer("agent_chat").coalesce_events(service.chat(
                 message=body.message,
                 conversation_history=body.conversation_history,
                 session_id=body.session_id,
                 write_mode=write_mode,
                 folder_id=body.folder_id,
                 meeting_notes_content=body.meeting_notes_content
-            ):
+            ))
+            async for chunk in stop_on_disconnect(request, agent_stream, endpoint="agent_chat"):
                 chunk_count += 1
                 if chunk_count == 1:
                     logger.info(f"🤖 [AGENTIC_CHAT_API] Step 2.1: First chunk received: type={chunk.get('type')}")
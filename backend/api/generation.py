@@ -2,7 +2,7 @@
 Generation API endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Request, Query
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Request, Query, Response
 from fastapi.responses import StreamingResponse
 from starlette.requests import Request
 from typing import Optional, List, Dict
@@ -22,6 +22,8 @@ from backend.models.dto import (
     BulkGenerationResult,
 )
 from backend.services.generation_service import get_service
+from backend.services.context_builder import ContextSession
+from backend.services.generation_queue import JobPriority, QueueFullError
 from backend.core.auth import get_current_user
 from backend.models.dto import UserPublic
 from backend.core.middleware import limiter
@@ -32,6 +34,16 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/generation", tags=["generation"])
 
 
+def _queue_full(error: QueueFullError) -> HTTPException:
+    """429 with a Retry-After hint when the generation queue is full."""
+    logger.warning(f"⏸️ [GENERATION] Rejecting request: {error}")
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"{error}. Please retry in about {error.retry_after} seconds.",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
 @router.post("/generate", response_model=GenerationResponse)
 @limiter.limit("5/minute")
 async def generate_artifact(
@@ -97,7 +109,7 @@ async def generate_artifact(
                 detail=f"No notes found in folder: {gen_request.folder_id}"
             )
         # Combine all notes from the folder
-        meeting_notes = "\n\n".join([note.get("content", "") for note in folder_notes])
+        meeting_notes = notes_service.get_folder_context(gen_request.folder_id)
         logger.info(f"📝 [GENERATION] Combined {len(folder_notes)} notes into {len(meeting_notes)} chars of meeting notes")
         if not meeting_notes.strip():
             logger.warning(f"⚠️ [GENERATION] Folder {gen_request.folder_id} contains no content after combining")
@@ -112,13 +124,13 @@ async def generate_artifact(
     # Use a mutable container to share job_id between async task and main coroutine
     job_state = {"job_id": None}
     
-    async def generate_task_async():
+    async def generate_task_async(job_id: str):
         """
         Async background task for artifact generation.
         
         FIX: Previously this was a sync function that created its own event loop,
         which blocked FastAPI's main event loop. Now properly async to allow
-        concurrent request handling.
+        concurrent request handling. Runs on a generation queue worker.
         """
         result = None
         try:
@@ -134,7 +146,8 @@ async def generate_artifact(
                 context_id=gen_request.context_id,
                 options=gen_request.options.dict() if gen_request.options else None,
                 stream=True,  # Enable streaming to capture progress events for WebSocket
-                folder_id=gen_request.folder_id  # Pass folder_id for artifact association
+                folder_id=gen_request.folder_id,  # Pass folder_id for artifact association
+                job_id=job_id
             ):
                 # Capture job_id from first update
                 if not job_state["job_id"] and update.get("job_id"):
@@ -208,9 +221,21 @@ async def generate_artifact(
         except Exception as e:
             logger.error(f"❌ [GENERATION] Background generation task failed: {e}", exc_info=True)
     
-    # Start the async task properly using asyncio.create_task()
-    # This runs concurrently without blocking the event loop
-    asyncio.create_task(generate_task_async())
+    # Queue the task: a bounded number of workers per resource class runs it
+    # (a burst of requests no longer starts dozens of generations on one GPU)
+    try:
+        job_state["job_id"], _ = service.enqueue_job(
+            generate_task_async,
+            artifact_type=gen_request.artifact_type,
+            meeting_notes=meeting_notes,
+            options=gen_request.options.dict() if gen_request.options else None,
+            folder_id=gen_request.folder_id,
+            priority=JobPriority.INTERACTIVE,
+            context_id=gen_request.context_id,
+            stream=True
+        )
+    except QueueFullError as e:
+        raise _queue_full(e)
     
     # Wait up to 60 seconds for the job to complete (most generations finish within this time)
     # Longer wait avoids premature "pending" responses that feel like timeouts in the UI.
@@ -252,15 +277,25 @@ async def generate_artifact(
                     detail=error_detail
                 )
     
-    # If we reach here, generation is still in progress after max_wait seconds
+    # If we reach here, generation is still in progress (or queued) after max_wait seconds
     # Return the job_id so frontend can wait for WebSocket events
     final_job_id = job_state["job_id"]
-    logger.info(f"⏳ [GENERATION] Generation still in progress after {max_wait}s, returning job_id: {final_job_id}")
-    response = GenerationResponse(
-        job_id=final_job_id or "pending",
-        status=GenerationStatus.IN_PROGRESS,
-        message="Generation in progress. The artifact will be delivered via WebSocket when ready."
-    )
+    job_status = service.get_job_status(final_job_id) or {}
+    if job_status.get("status") == GenerationStatus.PENDING.value:
+        logger.info(f"⏳ [GENERATION] Job still queued after {max_wait}s (position {job_status.get('queue_position')}), returning job_id: {final_job_id}")
+        response = GenerationResponse(
+            job_id=final_job_id,
+            status=GenerationStatus.PENDING,
+            message=f"Generation queued (position {job_status.get('queue_position')}). "
+                    f"Poll /api/generation/jobs/{final_job_id} or wait for WebSocket events."
+        )
+    else:
+        logger.info(f"⏳ [GENERATION] Generation still in progress after {max_wait}s, returning job_id: {final_job_id}")
+        response = GenerationResponse(
+            job_id=final_job_id or "pending",
+            status=GenerationStatus.IN_PROGRESS,
+            message="Generation in progress. The artifact will be delivered via WebSocket when ready."
+        )
     logger.info(f"📤 [GENERATION] Returning response: job_id={response.job_id}, status={response.status}")
     return response
 
@@ -316,7 +351,7 @@ async def generate_artifact_stream(
                 detail=f"No notes found in folder: {folder_id}"
             )
         # Combine all notes from the folder
-        meeting_notes = "\n\n".join([note.get("content", "") for note in folder_notes])
+        meeting_notes = notes_service.get_folder_context(folder_id)
     
     if not meeting_notes or len(meeting_notes.strip()) < 10:
         raise HTTPException(
@@ -410,12 +445,21 @@ async def generate_artifact_stream(
 @router.post("/bulk", response_model=list[BulkGenerationResult])
 async def bulk_generate(
     request: BulkGenerationRequest,
+    response: Response,
     current_user: UserPublic = Depends(get_current_user),
 ):
-    """Generate multiple artifacts sequentially."""
+    """
+    Generate multiple artifacts.
+    
+    Items are queued in the bulk priority lane and run concurrently up to the
+    generation workers' limits; results keep the order of the request.
+    The artifact-independent context is built once for the whole batch; the
+    X-Context-Time-Saved header reports the context build time this saved.
+    """
     service = get_service()
-    responses: list[BulkGenerationResult] = []
+    prepared = []
 
+    # Validate and resolve every item before queueing any work
     for item in request.items:
         if not item.meeting_notes and not item.context_id and not item.folder_id:
             raise HTTPException(
@@ -439,20 +483,53 @@ async def bulk_generate(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"No notes found in folder: {item.folder_id}",
                 )
-            meeting_notes = "\n\n".join([note.get("content", "") for note in folder_notes])
+            meeting_notes = notes_service.get_folder_context(item.folder_id)
 
         if not meeting_notes and not item.context_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Each item must include meeting_notes or context_id after folder resolution",
             )
+        prepared.append((item, meeting_notes))
+
+    # Admit the whole batch or none of it
+    if not service.job_queue.has_capacity(len(prepared)):
+        raise _queue_full(QueueFullError(service.job_queue.pending_count, service.job_queue.retry_after()))
+
+    # Universal/KG/pattern/ML context is built once for the batch; items only add targeted RAG
+    context_session = ContextSession()
+
+    def make_run(item, meeting_notes):
+        async def run(job_id: str):
+            return await service.generate_artifact_sync(
+                artifact_type=item.artifact_type,
+                meeting_notes=meeting_notes,
+                context_id=item.context_id,
+                options=item.options.dict() if item.options else None,
+                job_id=job_id,
+                context_session=context_session,
+            )
+        return run
 
-        result = await service.generate_artifact_sync(
+    jobs = []
+    for item, meeting_notes in prepared:
+        jobs.append(service.enqueue_job(
+            make_run(item, meeting_notes),
             artifact_type=item.artifact_type,
             meeting_notes=meeting_notes,
-            context_id=item.context_id,
             options=item.options.dict() if item.options else None,
-        )
+            priority=JobPriority.BULK,
+            context_id=item.context_id,
+        ))
+
+    results = await asyncio.gather(*(future for _, future in jobs), return_exceptions=True)
+
+    responses: list[BulkGenerationResult] = []
+    for (job_id, _), result in zip(jobs, results):
+        if isinstance(result, asyncio.CancelledError):
+            result = {"job_id": job_id, "status": GenerationStatus.CANCELLED.value, "error": "Cancelled before it started"}
+        elif isinstance(result, BaseException) or not isinstance(result, dict):
+            result = {"job_id": job_id, "status": GenerationStatus.FAILED.value, "error": str(result)}
 
         status_value = result.get("status", GenerationStatus.FAILED.value)
         try:
@@ -462,13 +539,16 @@ async def bulk_generate(
 
         responses.append(
             BulkGenerationResult(
-                job_id=result.get("job_id", "unknown"),
+                job_id=result.get("job_id", job_id),
                 status=status_enum,
                 artifact=result.get("artifact"),
                 error=result.get("error"),
             )
         )
 
+    context_stats = context_session.get_stats()
+    response.headers["X-Context-Time-Saved"] = str(context_stats["time_saved_seconds"])
+    logger.info(f"📦 [BULK] {len(responses)} items, shared context: {context_stats}")
     return responses
 
 
@@ -668,254 +748,60 @@ async def update_artifact(
 @limiter.limit("30/minute")
 async def list_artifacts(
     request: Request,
+    response: Response,
     all_versions: bool = Query(False, description="If True, return all versions of all artifacts. If False (default), return only latest version per type."),
     folder_id: Optional[str] = Query(None, description="Filter artifacts by meeting notes folder ID"),
+    artifact_type: Optional[str] = Query(None, description="Filter artifacts by type"),
+    include_content: bool = Query(True, description="Include cleaned content and HTML. Set to False for metadata only and fetch content via /artifacts/{artifact_id}."),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (default: no limit)"),
+    offset: int = Query(0, ge=0, description="Number of artifacts to skip"),
     current_user: UserPublic = Depends(get_current_user)
 ):
     """
     List all generated artifacts.
     
+    Artifacts are read from the indexed artifact store, which VersionService
+    writes every version to (content is cleaned once, when it is saved).
+    
     Args:
         all_versions: If True, return all versions of all artifacts. If False (default), return only latest version per type.
         folder_id: Optional filter to only return artifacts associated with a specific meeting notes folder.
+        artifact_type: Optional filter on the artifact type.
+        include_content: If False, return metadata only (content_length/has_html instead of bodies).
+        limit: Optional page size; the total is returned in the X-Total-Count header.
+        offset: Number of artifacts to skip.
     
     Returns:
         List of artifact objects with id, type, content, validation, folder_id, etc.
     """
-    logger.info(f"📋 [LIST_ARTIFACTS] ========== LIST ARTIFACTS REQUEST ==========")
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 1: Initializing list request")
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 1.1: all_versions={all_versions}, folder_id={folder_id}")
-    
-    service = get_service()
-    artifacts = []
-    artifact_ids_seen = set()  # Track to avoid duplicates
-    
-    # CONSTANT: Default folder for orphan artifacts (with null folder_id)
-    DEFAULT_ORPHAN_FOLDER = "Orphaned Artifacts"
-    
-    # Use centralized ArtifactCleaner service (avoids code duplication)
-    from backend.services.artifact_cleaner import get_cleaner
-    cleaner = get_cleaner()
-    
-    def clean_artifact_content(content: str, artifact_type: str) -> str:
-        """Clean artifact content using the centralized ArtifactCleaner service."""
-        try:
-            return cleaner.clean_artifact(content, artifact_type)
-        except Exception as e:
-            logger.warning(f"⚠️ [LIST_ARTIFACTS] Failed to clean artifact content: {e}")
-            return content
+    logger.info(f"📋 [LIST_ARTIFACTS] all_versions={all_versions}, folder_id={folder_id}, artifact_type={artifact_type}, "
+                f"include_content={include_content}, limit={limit}, offset={offset}")
     
-    # 1. Get all completed artifacts from active_jobs (in-memory, current session)
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 2: Loading artifacts from active_jobs (in-memory)")
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 2.1: Checking {len(service.active_jobs)} active jobs")
-    active_jobs_count = 0
-    for job_id, job in service.active_jobs.items():
-        if job.get("status") == GenerationStatus.COMPLETED.value:
-            artifact = job.get("artifact")
-            if artifact:
-                active_jobs_count += 1
-                # Get artifact's folder_id (from artifact or job)
-                # If null, assign to default orphan folder
-                artifact_folder_id = artifact.get("folder_id") or job.get("folder_id")
-                if not artifact_folder_id:
-                    artifact_folder_id = DEFAULT_ORPHAN_FOLDER
-                
-                # Filter by folder_id if specified
-                if folder_id and artifact_folder_id != folder_id:
-                    logger.debug(f"📋 [LIST_ARTIFACTS] Step 2.{active_jobs_count}: Skipping artifact (folder mismatch): {artifact_folder_id} != {folder_id}")
-                    continue
-                
-                artifact_id = artifact.get("id") or artifact.get("artifact_id") or job_id
-                if artifact_id not in artifact_ids_seen:
-                    artifact_ids_seen.add(artifact_id)
-                    artifact_type = artifact.get("artifact_type") or artifact.get("type") or job.get("artifact_type", "unknown")
-                    raw_content = artifact.get("content") or job.get("artifact_content", "")
-                    # Clean artifact content using centralized cleaner
-                    cleaned_content = clean_artifact_content(raw_content, artifact_type)
-                    
-                    logger.info(f"📋 [LIST_ARTIFACTS] Step 2.{active_jobs_count}: Adding artifact from active_jobs: id={artifact_id}, type={artifact_type}, folder_id={artifact_folder_id}")
-                    
-                    # Convert to frontend format
-                    artifact_dict = {
-                        "id": artifact_id,
-                        "type": artifact_type,
-                        "content": cleaned_content,
-                        "created_at": artifact.get("generated_at") or job.get("created_at") or job.get("completed_at", datetime.now().isoformat()),
-                        "updated_at": job.get("updated_at") or artifact.get("generated_at") or job.get("created_at", datetime.now().isoformat()),
-                        "folder_id": artifact_folder_id,  # Include folder association
-                    }
-                    # Add optional fields
-                    if "validation" in artifact:
-                        validation = artifact["validation"]
-                        if isinstance(validation, dict):
-                            artifact_dict["score"] = validation.get("score", 0.0)
-                    if "html_content" in artifact:
-                        artifact_dict["html_content"] = artifact["html_content"]
-                    if "model_used" in artifact:
-                        artifact_dict["model_used"] = artifact["model_used"]
-                    if "attempts" in artifact:
-                        artifact_dict["attempts"] = artifact["attempts"]
-                    artifacts.append(artifact_dict)
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 2.2: Found {active_jobs_count} completed artifacts in active_jobs, added {len([a for a in artifacts if a.get('id') in artifact_ids_seen])} to list")
-    
-    # 2. Load artifacts from VersionService (persistent storage)
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 3: Loading artifacts from VersionService (persistent storage)")
+    from backend.services.artifact_store import get_artifact_store
+    store = get_artifact_store()
     try:
-        from backend.services.version_service import get_version_service
-        version_service = get_version_service()
-        logger.info(f"📋 [LIST_ARTIFACTS] Step 3.1: VersionService has {len(version_service.versions)} artifacts with versions")
-        
-        if all_versions:
-            logger.info(f"📋 [LIST_ARTIFACTS] Step 3.2: Returning ALL versions")
-            # Return ALL versions of ALL artifacts
-            for artifact_id, versions in version_service.versions.items():
-                if not versions:
-                    continue
-                
-                # Add all versions for this artifact
-                for version in versions:
-                    metadata = version.get("metadata", {})
-                    version_folder_id = metadata.get("folder_id")
-                    # Assign default folder if null
-                    if not version_folder_id:
-                        version_folder_id = DEFAULT_ORPHAN_FOLDER
-                    
-                    # Filter by folder_id if specified
-                    if folder_id and version_folder_id != folder_id:
-                        continue
-                    
-                    artifact_type = version.get("artifact_type", "unknown")
-                    raw_content = version.get("content", "")
-                    # Clean artifact content using centralized cleaner
-                    cleaned_content = clean_artifact_content(raw_content, artifact_type)
-                    
-                    # Convert version to frontend format
-                    artifact_dict = {
-                        "id": artifact_id,
-                        "type": artifact_type,
-                        "content": cleaned_content,
-                        "created_at": version.get("created_at", datetime.now().isoformat()),
-                        "updated_at": version.get("created_at", datetime.now().isoformat()),
-                        "version": version.get("version", 1),
-                        "is_current": version.get("is_current", False),
-                        "folder_id": version_folder_id,  # Include folder association (defaulted)
-                    }
-                    # Add optional fields from metadata
-                    if "validation_score" in metadata:
-                        artifact_dict["score"] = metadata["validation_score"]
-                    if "html_content" in metadata:
-                        artifact_dict["html_content"] = metadata["html_content"]
-                    if "model_used" in metadata:
-                        artifact_dict["model_used"] = metadata["model_used"]
-                    if "attempts" in metadata:
-                        artifact_dict["attempts"] = metadata["attempts"]
-                    artifacts.append(artifact_dict)
-        else:
-            # Return only current/latest version per artifact (original behavior)
-            logger.info(f"📋 [LIST_ARTIFACTS] Step 3.2: Returning only latest version per artifact")
-            version_service_count = 0
-            for artifact_id, versions in version_service.versions.items():
-                if not versions:
-                    continue
-                
-                version_service_count += 1
-                # Get the current version (is_current=True) or latest version
-                current_version = None
-                for version in versions:
-                    if version.get("is_current", False):
-                        current_version = version
-                        break
-                
-                if not current_version and versions:
-                    # If no current version, use the latest one
-                    current_version = versions[-1]
-                
-                if current_version and artifact_id not in artifact_ids_seen:
-                    metadata = current_version.get("metadata", {})
-                    version_folder_id = metadata.get("folder_id")
-                    # Assign default folder if null
-                    if not version_folder_id:
-                        version_folder_id = DEFAULT_ORPHAN_FOLDER
-                    
-                    # Filter by folder_id if specified
-                    if folder_id and version_folder_id != folder_id:
-                        logger.debug(f"📋 [LIST_ARTIFACTS] Step 3.2.{version_service_count}: Skipping artifact (folder mismatch): {version_folder_id} != {folder_id}")
-                        continue
-                    
-                    artifact_ids_seen.add(artifact_id)
-                    artifact_type = current_version.get("artifact_type", "unknown")
-                    raw_content = current_version.get("content", "")
-                    # Clean artifact content using centralized cleaner
-                    cleaned_content = clean_artifact_content(raw_content, artifact_type)
-                    
-                    logger.info(f"📋 [LIST_ARTIFACTS] Step 3.2.{version_service_count}: Adding artifact from VersionService: id={artifact_id}, type={artifact_type}, folder_id={version_folder_id}, content_length={len(cleaned_content)}")
-                    
-                    # Convert version to frontend format
-                    artifact_dict = {
-                        "id": artifact_id,
-                        "type": artifact_type,
-                        "content": cleaned_content,
-                        "created_at": current_version.get("created_at", datetime.now().isoformat()),
-                        "updated_at": current_version.get("created_at", datetime.now().isoformat()),
-                        "folder_id": version_folder_id,  # Include folder association (defaulted)
-                    }
-                    # Add optional fields from metadata
-                    if "validation_score" in metadata:
-                        artifact_dict["score"] = metadata["validation_score"]
-                    if "html_content" in metadata:
-                        artifact_dict["html_content"] = metadata["html_content"]
-                    if "model_used" in metadata:
-                        artifact_dict["model_used"] = metadata["model_used"]
-                    if "attempts" in metadata:
-                        artifact_dict["attempts"] = metadata["attempts"]
-                    artifacts.append(artifact_dict)
-            logger.info(f"📋 [LIST_ARTIFACTS] Step 3.3: Processed {version_service_count} artifacts from VersionService, added {len([a for a in artifacts if a.get('id') not in [x.get('id') for x in artifacts[:active_jobs_count]]])} new artifacts")
+        artifacts = await asyncio.to_thread(
+            store.list_artifacts,
+            folder_id=folder_id,
+            artifact_type=artifact_type,
+            all_versions=all_versions,
+            include_content=include_content,
+            limit=limit,
+            offset=offset,
+        )
+        if limit is not None:
+            total = await asyncio.to_thread(store.count, folder_id=folder_id, artifact_type=artifact_type,
+                                            all_versions=all_versions)
+            response.headers["X-Total-Count"] = str(total)
     except Exception as e:
-        logger.error(f"📋 [LIST_ARTIFACTS] Step 3.ERROR: Failed to load artifacts from version service: {e}", exc_info=True)
-    
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 4: Processing results")
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 4.1: Total artifacts collected: {len(artifacts)}")
-    
-    if all_versions:
-        # Return all versions, sorted by created_at descending (newest first)
-        artifacts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        logger.info(f"📋 [LIST_ARTIFACTS] Step 4.2: Returning {len(artifacts)} artifacts (all versions)")
-        logger.info(f"📋 [LIST_ARTIFACTS] ========== LIST ARTIFACTS COMPLETE ==========")
-        return artifacts
-    
-    # Group by (folder_id + artifact_type) and keep only the latest version per type per folder
-    # FIX: Previously only grouped by artifact_type, which meant all folders shared the same artifact
-    # Now each folder gets its own artifact per type
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 4.2: Grouping by folder_id + artifact_type")
-    artifacts_by_key: Dict[str, Dict] = {}
-    for artifact in artifacts:
-        artifact_type = artifact.get("type", "unknown")
-        artifact_folder_id = artifact.get("folder_id") or ""  # Use empty string for null folder
-        created_at = artifact.get("created_at", "")
-        
-        # Create a composite key: folder_id + artifact_type
-        # This ensures each folder can have its own version of each artifact type
-        group_key = f"{artifact_folder_id}::{artifact_type}"
-        
-        # If we haven't seen this key, or this one is newer, keep it
-        if group_key not in artifacts_by_key:
-            artifacts_by_key[group_key] = artifact
-            logger.debug(f"📋 [LIST_ARTIFACTS] Step 4.2.1: Added artifact to group: {group_key}")
-        else:
-            existing = artifacts_by_key[group_key]
-            existing_date = existing.get("created_at", "")
-            if created_at > existing_date:
-                artifacts_by_key[group_key] = artifact
-                logger.debug(f"📋 [LIST_ARTIFACTS] Step 4.2.1: Replaced artifact in group (newer): {group_key}")
-    
-    # Convert back to list and sort by created_at descending (newest first)
-    latest_artifacts = list(artifacts_by_key.values())
-    latest_artifacts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 4.3: Grouped to {len(latest_artifacts)} unique artifacts (from {len(artifacts)} total)")
-    logger.info(f"📋 [LIST_ARTIFACTS] Step 4.4: Artifact IDs: {[a.get('id') for a in latest_artifacts[:10]]}...")  # Show first 10
-    logger.info(f"📋 [LIST_ARTIFACTS] ========== LIST ARTIFACTS COMPLETE ==========")
-    return latest_artifacts
+        logger.error(f"📋 [LIST_ARTIFACTS] Failed to query artifact store: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to list artifacts"
+        )
+    
+    logger.info(f"📋 [LIST_ARTIFACTS] Returning {len(artifacts)} artifacts")
+    return artifacts
 
 
 @router.post("/artifacts/{artifact_id}/regenerate", response_model=GenerationResponse)
@@ -1023,12 +909,13 @@ async def regenerate_artifact(
     # Use a mutable container to share job_id between async task and main coroutine
     regen_job_state = {"job_id": None}
     
-    async def regenerate_task_async():
+    async def regenerate_task_async(job_id: str):
         """
         Async background task for artifact regeneration.
         
         FIX: Previously this was a sync function that created its own event loop,
-        which blocked FastAPI's main event loop. Now properly async.
+        which blocked FastAPI's main event loop. Now properly async. Runs on a
+        generation queue worker.
         """
         result = None
         try:
@@ -1041,7 +928,8 @@ async def regenerate_artifact(
                 meeting_notes=meeting_notes,
                 context_id=None,
                 options=gen_request.options.dict() if gen_request.options else None,
-                stream=False
+                stream=False,
+                job_id=job_id
             ):
                 if not regen_job_state["job_id"] and update.get("job_id"):
                     regen_job_state["job_id"] = update.get("job_id")
@@ -1079,13 +967,23 @@ async def regenerate_artifact(
         except Exception as e:
             logger.error(f"❌ [REGENERATE] Background regeneration task failed: {e}", exc_info=True)
     
-    # Start the async task properly using asyncio.create_task()
-    asyncio.create_task(regenerate_task_async())
+    # Queue the task on the generation workers
+    try:
+        regen_job_state["job_id"], _ = service.enqueue_job(
+            regenerate_task_async,
+            artifact_type=gen_request.artifact_type,
+            meeting_notes=meeting_notes,
+            options=gen_request.options.dict() if gen_request.options else None,
+            priority=JobPriority.INTERACTIVE
+        )
+    except QueueFullError as e:
+        raise _queue_full(e)
     
-    # Return immediately with placeholder job_id (actual ID will be assigned in background)
+    # Return immediately; the job ID can be polled via /jobs/{job_id} (queue position while pending)
+    job_status = service.get_job_status(regen_job_state["job_id"]) or {}
     response = GenerationResponse(
-        job_id=f"regen_{artifact_id}",
-        status=GenerationStatus.IN_PROGRESS
+        job_id=regen_job_state["job_id"],
+        status=GenerationStatus(job_status.get("status", GenerationStatus.PENDING.value))
     )
     logger.info(f"📤 [REGENERATE] Returning response: job_id={response.job_id}, status={response.status}")
     return response
@@ -1147,48 +1045,14 @@ async def get_artifact(
                 artifact_dict["model_used"] = artifact["model_used"]
             return artifact_dict
     
-    # Check VersionService (persistent storage)
+    # Check the artifact store (persistent storage, content cleaned when saved)
     try:
-        from backend.services.version_service import get_version_service
-        version_service = get_version_service()
-        
-        if artifact_id in version_service.versions:
-            versions = version_service.versions[artifact_id]
-            if versions:
-                # Get the current version (is_current=True) or latest version
-                current_version = None
-                for version in versions:
-                    if version.get("is_current", False):
-                        current_version = version
-                        break
-                
-                if not current_version and versions:
-                    current_version = versions[-1]
-                
-                if current_version:
-                    artifact_type = current_version.get("artifact_type", "unknown")
-                    raw_content = current_version.get("content", "")
-                    # Clean artifact content using centralized cleaner
-                    cleaned_content = clean_artifact_content(raw_content, artifact_type)
-                    
-                    metadata = current_version.get("metadata", {})
-                    artifact_dict = {
-                        "id": artifact_id,
-                        "type": artifact_type,
-                        "content": cleaned_content,
-                        "created_at": current_version.get("created_at", datetime.now().isoformat()),
-                        "updated_at": current_version.get("created_at", datetime.now().isoformat()),
-                    }
-                    # Add optional fields from metadata
-                    if "validation_score" in metadata:
-                        artifact_dict["score"] = metadata["validation_score"]
-                    if "html_content" in metadata:
-                        artifact_dict["html_content"] = metadata["html_content"]
-                    if "model_used" in metadata:
-                        artifact_dict["model_used"] = metadata["model_used"]
-                    return artifact_dict
+        from backend.services.artifact_store import get_artifact_store
+        artifact = await asyncio.to_thread(get_artifact_store().get, artifact_id)
+        if artifact:
+            return artifact
     except Exception as e:
-        logger.warning(f"Failed to load artifact from version service: {e}")
+        logger.warning(f"Failed to load artifact from artifact store: {e}")
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -4,6 +4,7 @@ Meeting Notes API endpoints with folder system and AI suggestions.
 
 from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Request
 from typing import List, Optional, Dict, Any
+import asyncio
 import logging
 from pathlib import Path
 import json
@@ -13,6 +14,8 @@ from backend.models.dto import UserPublic
 from backend.core.auth import get_current_user
 from backend.core.middleware import limiter
 from backend.core.config import settings
+from backend.services.folder_classifier import get_folder_classifier
+from backend.services.meeting_notes_index import get_meeting_notes_index
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -125,6 +128,7 @@ async def create_folder(
         )
     
     folder_path.mkdir(parents=True, exist_ok=True)
+    get_meeting_notes_index().invalidate(folder_path)
     return {"success": True, "folder": {"id": name, "name": name}}
 
 
@@ -218,6 +222,8 @@ async def upload_meeting_notes(
     # Save file
     file_path = folder_path / file.filename
     file_path.write_bytes(content)
+    await asyncio.to_thread(get_folder_classifier().add_note, target_folder, file_path, text_content)
+    get_meeting_notes_index().invalidate(folder_path)
     
     return {
         "success": True,
@@ -336,6 +342,9 @@ async def move_note(
     # Move the file
     destination_file = to_folder_path / note_file.name
     note_file.rename(destination_file)
+    get_folder_classifier().move_note(body.from_folder, body.to_folder, note_file.name)
+    get_meeting_notes_index().invalidate(from_folder_path)
+    get_meeting_notes_index().invalidate(to_folder_path)
     
     return {
         "success": True,
@@ -368,6 +377,8 @@ async def delete_folder(
     
     # Delete the folder and all its contents
     shutil.rmtree(folder_path)
+    get_folder_classifier().remove_folder(folder_id)
+    get_meeting_notes_index().invalidate(folder_path)
     
     return {
         "success": True,
@@ -402,6 +413,9 @@ async def rename_folder(
     
     # Rename the folder
     old_folder_path.rename(new_folder_path)
+    get_folder_classifier().rename_folder(folder_id, body.new_name)
+    get_meeting_notes_index().invalidate(old_folder_path)
+    get_meeting_notes_index().invalidate(new_folder_path)
     
     return {
         "success": True,
@@ -435,6 +449,8 @@ async def delete_note(
     
     # Delete the file
     note_file.unlink()
+    get_folder_classifier().remove_note(folder_id, note_file.name)
+    get_meeting_notes_index().invalidate(note_file.parent)
     
     return {
         "success": True,
@@ -470,6 +486,8 @@ async def update_note(
     
     # Update the file content
     note_file.write_text(content, encoding='utf-8')
+    await asyncio.to_thread(get_folder_classifier().add_note, folder_id, note_file, content)
+    get_meeting_notes_index().invalidate(note_file.parent)
     
     return {
         "success": True,
@@ -112,8 +112,8 @@ async def get_all_versions(
         if artifact_type not in by_type:
             by_type[artifact_type] = []
         
-        # Add all versions with artifact_id included
-        for v in versions:
+        # Add all versions with artifact_id included (content rebuilt from the log)
+        for v in service.get_versions(artifact_id):
             by_type[artifact_type].append({
                 **v,
                 "artifact_id": artifact_id
@@ -176,8 +176,8 @@ async def get_versions_by_type(
             is_match = True
             
         if is_match:
-            # Add all versions, ensuring artifact_id is included
-            for v in versions:
+            # Add all versions, ensuring artifact_id is included (content rebuilt from the log)
+            for v in service.get_versions(artifact_id):
                 v_with_id = {**v, "artifact_id": artifact_id}
                 all_versions.append(v_with_id)
     
@@ -65,9 +65,11 @@ class Settings(BaseSettings):
     training_threshold: int = 50  # Examples needed to trigger training
     training_batch_size: int = 4
     training_epochs: int = 3
+    finetuning_near_duplicate_threshold: float = 0.8  # Estimated Jaccard (content and notes) at which a pool example is a near-duplicate
     
     # Data directories (centralized to avoid circular imports)
     meeting_notes_dir: Path = Path(__file__).parent.parent.parent / "data" / "meeting_notes"
+    meeting_notes_watch_enabled: bool = True  # Invalidate the meeting notes index with a filesystem watcher (watchdog)
     
     # Logging
     log_level: str = "INFO"
@@ -77,16 +79,43 @@ class Settings(BaseSettings):
     # Metrics
     metrics_enabled: bool = True
     metrics_port: int = 9090  # Prometheus metrics port
+    metrics_max_series: int = 10000  # Distinct metric/label series kept; least recently used evicted above this
+    metrics_series_ttl_seconds: int = 3600  # Series not recorded for this long are evicted first
     
     # Performance
     enable_lazy_loading: bool = True
     cache_default_ttl: int = 3600  # Default cache TTL in seconds
     
+    # Persistent cache of temperature-0 LLM responses (ai/response_cache.py) - opt-in
+    llm_response_cache_enabled: bool = False
+    llm_response_cache_path: str = str(Path(__file__).parent.parent.parent / "data" / "cache" / "llm_responses.db")
+    llm_response_cache_max_mb: int = 256  # LRU-evicted above this total response size
+    
+    # Model list refresh (ModelService.list_models) - per-provider timeouts in seconds
+    model_refresh_timeouts: dict[str, float] = {"ollama": 3.0, "huggingface": 5.0, "cloud": 2.0}
+    
+    # Design review (DesignReviewService.full_review) - per-reviewer timeouts in seconds
+    design_review_timeouts: dict[str, float] = {
+        "architecture": 180.0, "code_quality": 180.0, "tests": 30.0, "security": 30.0, "patterns": 60.0
+    }
+    
     # Generation Timeouts (in seconds)
     generation_timeout: int = 300  # Total timeout for artifact generation (increased from 120)
     model_attempt_timeout: int = 120  # Timeout per model attempt (increased from 60)
     cloud_fallback_timeout: int = 120  # Timeout for cloud API calls (increased from 90)
     
+    # Generation job queue (backend/services/generation_queue.py)
+    generation_local_workers: int = 1  # Concurrent jobs that use the local GPU
+    generation_cloud_workers: int = 4  # Concurrent jobs pinned to a cloud model
+    generation_queue_max_pending: int = 50  # Waiting jobs before /generate answers 429
+    generation_dedup_enabled: bool = True  # Identical concurrent requests share one pipeline run
+    generation_result_cache_seconds: float = 0  # Reuse a finished identical result this long (0 = off; regenerate repeats inputs on purpose)
+    sprint_package_max_concurrency: int = 3  # Independent sprint package artifacts generated at once
+    version_snapshot_interval: int = 10  # Artifact versions stored as compressed diffs between full snapshots
+    folder_suggestion_min_similarity: float = 0.4  # Below this nearest-folder similarity, ask the LLM instead
+    folder_suggestion_top_k: int = 3  # Folders returned by the meeting notes folder classifier
+    multi_repo_index_workers: int = 4  # Registered repositories scanned and indexed at once
+    
     # ==========================================================================
     # LLM-as-a-Judge Validation Settings
     # ==========================================================================
@@ -108,6 +137,16 @@ class Settings(BaseSettings):
     ollama_warmup_enabled: bool = True  # Pre-load first model into memory on startup
     ollama_base_url: str = "http://localhost:11434"  # Ollama API endpoint
     
+    # Model-affinity scheduler (ai/model_scheduler.py) shared by every OllamaClient
+    ollama_scheduler_enabled: bool = True  # Queue requests per model to avoid VRAM thrashing
+    ollama_max_concurrent_requests: int = 2  # Requests sent to Ollama at once
+    ollama_max_resident_models: int = 2  # Models that fit in VRAM together (2 x ~4-5GB on 12GB)
+    ollama_scheduler_max_batch: int = 8  # Resident-model requests in a row before a waiting model swaps in
+    
+    # Prompt prefix reuse: Ollama only re-evaluates the prompt after the first changed token
+    ollama_keep_alive: str = "30m"  # How long a model (and its prompt cache) stays loaded after a request
+    prompt_layout: str = "prefix_stable"  # "prefix_stable" (static context first) or "legacy" (request first)
+    
     # ==========================================================================
     # Token/Context Window Limits (CENTRALIZED - use these everywhere!)
     # ==========================================================================
@@ -131,6 +170,18 @@ class Settings(BaseSettings):
     chat_max_snippet_length: int = 5000  # Increased from 2500
     chat_max_rag_snippets: int = 20  # Increased from 12
     
+    # ==========================================================================
+    # Streaming (token-chunk coalescing between model streams and SSE/WebSocket)
+    # ==========================================================================
+    # Frames are flushed at max_bytes buffered or max_interval_ms after the first
+    # buffered chunk, whichever comes first. The first chunk is always sent at once.
+    stream_coalesce_profiles: dict[str, dict[str, float]] = {
+        "default": {"max_bytes": 512, "max_interval_ms": 50},
+        "generation": {"max_bytes": 1024, "max_interval_ms": 100},  # Artifacts: throughput over latency
+        "chat": {"max_bytes": 256, "max_interval_ms": 40},  # Chat: keep typing effect smooth
+        "agent_chat": {"max_bytes": 256, "max_interval_ms": 40},
+    }
+    
     class Config:
         env_file = [".env", "../.env", "../../.env"]  # Try multiple locations
         env_file_encoding = "utf-8"
@@ -10,7 +10,7 @@ Features:
 
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple, List
 from functools import wraps
 import logging
 import json
@@ -18,6 +18,7 @@ from datetime import datetime
 from contextvars import ContextVar
 import traceback
 import threading
+from abc import ABC, abstractmethod
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -105,15 +106,24 @@ def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
 # JSONL File Writers
 # =============================================================================
 
-def _write_jsonl(filepath: Path, data: Dict[str, Any]):
-    """Thread-safe write to JSONL file."""
+def _write_jsonl(filepath: Path, data: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """
+    Thread-safe write to JSONL file.
+    
+    Returns:
+        (start, end) byte offsets of the written line, or None if the write failed
+    """
+    line = (json.dumps(data, default=str) + "\n").encode("utf-8")
     with _file_lock:
         try:
-            with open(filepath, "a", encoding="utf-8") as f:
-                f.write(json.dumps(data, default=str) + "\n")
+            with open(filepath, "ab") as f:
+                start = f.tell()
+                f.write(line)
+                return start, start + len(line)
         except Exception as e:
             # Last resort: print to stderr
             print(f"Failed to write to {filepath}: {e}", file=sys.stderr)
+            return None
 
 
 def log_error_to_file(
@@ -145,7 +155,9 @@ def log_error_to_file(
         "context": context or {}
     }
     
-    _write_jsonl(ERRORS_JSONL, error_data)
+    offsets = _write_jsonl(ERRORS_JSONL, error_data)
+    if offsets:
+        _error_aggregate.record(error_data, *offsets)
 
 
 def log_token_usage(
@@ -190,7 +202,9 @@ def log_token_usage(
         "metadata": metadata or {}
     }
     
-    _write_jsonl(TOKENS_JSONL, token_data)
+    offsets = _write_jsonl(TOKENS_JSONL, token_data)
+    if offsets:
+        _token_aggregate.record(token_data, *offsets)
     
     # Also log to standard logger for real-time visibility
     logger = logging.getLogger("ai.tokens")
@@ -595,50 +609,335 @@ def debug_print(msg: str):
 # =============================================================================
 # Token Usage Summary
 # =============================================================================
+#
+# Summaries are served from in-memory aggregates that are updated as records
+# are written. Each aggregate periodically persists a checkpoint containing its
+# state and the byte offset of the JSONL file already folded in, so a restart
+# only has to read the tail of the file instead of the whole history.
 
-def get_token_usage_summary() -> Dict[str, Any]:
+TOKENS_CHECKPOINT = LOGS_DIR / "tokens.summary.json"
+ERRORS_CHECKPOINT = LOGS_DIR / "errors.summary.json"
+
+# Persist a checkpoint after this many newly folded records
+CHECKPOINT_EVERY = 50
+
+# Number of time buckets kept in the rollups
+HOURLY_BUCKETS = 48
+DAILY_BUCKETS = 90
+
+# Bytes at the head of the source file used to detect rotation/replacement
+_HEAD_FINGERPRINT_BYTES = 256
+
+
+class _JsonlAggregate(ABC):
     """
-    Get summary of token usage from logs/tokens.jsonl.
+    Incrementally maintained summary over an append-only JSONL file.
     
-    Returns:
-        Dictionary with usage statistics by model
+    Subclasses implement `_reset`, `_fold`, `_state`, `_load_state` and `summary`.
+    All public methods are thread-safe.
     """
-    if not TOKENS_JSONL.exists():
-        return {"total_tokens": 0, "total_cost_usd": 0, "by_model": {}}
     
-    total_tokens = 0
-    total_cost = 0.0
-    by_model: Dict[str, Dict[str, Any]] = {}
+    CHECKPOINT_VERSION = 1
     
-    try:
-        with open(TOKENS_JSONL, "r", encoding="utf-8") as f:
-            for line in f:
+    def __init__(self, source: Path, checkpoint: Path):
+        self.source = source
+        self.checkpoint = checkpoint
+        self.offset = 0
+        self._head = ""
+        self._loaded = False
+        self._pending = 0
+        self._lock = threading.RLock()
+        self._reset()
+    
+    # --- subclass hooks -------------------------------------------------------
+    
+    @abstractmethod
+    def _reset(self):
+        """Clear the aggregate to its empty state."""
+        pass
+    
+    @abstractmethod
+    def _fold(self, entry: Dict[str, Any]):
+        """Add one JSONL record to the aggregate."""
+        pass
+    
+    @abstractmethod
+    def _state(self) -> Dict[str, Any]:
+        """Return the aggregate as JSON-serializable checkpoint state."""
+        pass
+    
+    @abstractmethod
+    def _load_state(self, state: Dict[str, Any]):
+        """Restore the aggregate from checkpoint state."""
+        pass
+    
+    @abstractmethod
+    def summary(self) -> Dict[str, Any]:
+        """Return the summary served to callers."""
+        pass
+    
+    # --- bookkeeping ----------------------------------------------------------
+    
+    def _read_head(self) -> str:
+        try:
+            with open(self.source, "rb") as f:
+                return f.read(_HEAD_FINGERPRINT_BYTES).hex()
+        except OSError:
+            return ""
+    
+    def _load_checkpoint(self):
+        """Restore state from the checkpoint if it still matches the source file."""
+        try:
+            data = json.loads(self.checkpoint.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        
+        if data.get("version") != self.CHECKPOINT_VERSION:
+            return
+        offset = int(data.get("offset", 0))
+        head = data.get("head", "")
+        try:
+            size = self.source.stat().st_size
+        except OSError:
+            return
+        # The file was truncated, rotated or replaced: rebuild from scratch
+        if offset > size or not self._read_head().startswith(head):
+            return
+        
+        try:
+            self._load_state(data.get("state", {}))
+        except Exception:
+            self._reset()
+            return
+        self.offset = offset
+        self._head = head
+    
+    def _save_checkpoint(self):
+        """Atomically persist state and the folded-in byte offset."""
+        if len(self._head) < _HEAD_FINGERPRINT_BYTES * 2:
+            self._head = self._read_head()[: self.offset * 2]
+        data = {
+            "version": self.CHECKPOINT_VERSION,
+            "offset": self.offset,
+            "head": self._head,
+            "state": self._state(),
+        }
+        tmp = self.checkpoint.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(data, default=str), encoding="utf-8")
+            tmp.replace(self.checkpoint)
+            self._pending = 0
+        except OSError as e:
+            print(f"Failed to write checkpoint {self.checkpoint}: {e}", file=sys.stderr)
+    
+    def _catch_up(self):
+        """Fold in any complete lines written past the current offset."""
+        try:
+            size = self.source.stat().st_size
+        except OSError:
+            if self.offset:
+                self._reset()
+                self.offset = 0
+                self._head = ""
+            return
+        
+        if size < self.offset:
+            # Truncated underneath us
+            self._reset()
+            self.offset = 0
+            self._head = ""
+        if size == self.offset:
+            return
+        
+        with open(self.source, "rb") as f:
+            f.seek(self.offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Partially written line; pick it up next time
+                self.offset += len(raw)
                 try:
-                    entry = json.loads(line.strip())
-                    if entry.get("type") == "token_usage":
-                        model = entry.get("model", "unknown")
-                        tokens = entry.get("total_tokens", 0)
-                        cost = entry.get("cost_usd", 0)
-                        
-                        total_tokens += tokens
-                        total_cost += cost
-                        
-                        if model not in by_model:
-                            by_model[model] = {"tokens": 0, "cost_usd": 0, "calls": 0}
-                        
-                        by_model[model]["tokens"] += tokens
-                        by_model[model]["cost_usd"] += cost
-                        by_model[model]["calls"] += 1
-                except json.JSONDecodeError:
+                    entry = json.loads(raw)
+                except ValueError:
                     continue
-    except Exception:
-        pass
+                if isinstance(entry, dict):
+                    self._fold(entry)
+                    self._pending += 1
+        
+        if self._pending:
+            self._save_checkpoint()
     
-    return {
-        "total_tokens": total_tokens,
-        "total_cost_usd": round(total_cost, 6),
-        "by_model": by_model
-    }
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._load_checkpoint()
+            self._loaded = True
+    
+    # --- public API -----------------------------------------------------------
+    
+    def record(self, entry: Dict[str, Any], start: int, end: int):
+        """
+        Fold a record that was just appended at [start, end) of the source file.
+        
+        If other writers appended in between, the gap is read from disk first.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if start != self.offset:
+                self._catch_up()
+                return
+            self._fold(entry)
+            self.offset = end
+            self._pending += 1
+            if self._pending >= CHECKPOINT_EVERY:
+                self._save_checkpoint()
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Return the summary, reading only bytes appended since the last update."""
+        with self._lock:
+            self._ensure_loaded()
+            self._catch_up()
+            return self.summary()
+    
+    def flush(self):
+        """Persist a checkpoint if there are unsaved records."""
+        with self._lock:
+            if self._loaded and self._pending:
+                self._save_checkpoint()
+
+
+def _bucket_add(buckets: Dict[str, Dict[str, float]], key: str, limit: int, tokens: int, cost: float):
+    bucket = buckets.get(key)
+    if bucket is None:
+        bucket = buckets[key] = {"tokens": 0, "cost_usd": 0.0, "calls": 0}
+        # ISO keys sort chronologically; drop the oldest beyond the limit
+        if len(buckets) > limit:
+            for old_key in sorted(buckets)[: len(buckets) - limit]:
+                del buckets[old_key]
+    bucket["tokens"] += tokens
+    bucket["cost_usd"] += cost
+    bucket["calls"] += 1
+
+
+class TokenUsageAggregate(_JsonlAggregate):
+    """Per-model token, cost and call counters with hourly/daily rollups."""
+    
+    def _reset(self):
+        self.total_tokens = 0
+        self.total_cost = 0.0
+        self.by_model: Dict[str, Dict[str, Any]] = {}
+        self.hourly: Dict[str, Dict[str, float]] = {}
+        self.daily: Dict[str, Dict[str, float]] = {}
+    
+    def _fold(self, entry: Dict[str, Any]):
+        if entry.get("type") != "token_usage":
+            return
+        model = entry.get("model", "unknown")
+        tokens = entry.get("total_tokens", 0) or 0
+        cost = entry.get("cost_usd", 0) or 0
+        
+        self.total_tokens += tokens
+        self.total_cost += cost
+        
+        stats = self.by_model.get(model)
+        if stats is None:
+            stats = self.by_model[model] = {"tokens": 0, "cost_usd": 0, "calls": 0}
+        stats["tokens"] += tokens
+        stats["cost_usd"] += cost
+        stats["calls"] += 1
+        
+        # Timestamps are ISO-8601 ("2026-01-15T10:42:07.123Z"): slice into buckets
+        timestamp = str(entry.get("timestamp") or "")
+        if len(timestamp) >= 13:
+            _bucket_add(self.hourly, timestamp[:13], HOURLY_BUCKETS, tokens, cost)
+            _bucket_add(self.daily, timestamp[:10], DAILY_BUCKETS, tokens, cost)
+    
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "total_tokens": self.total_tokens,
+            "total_cost": self.total_cost,
+            "by_model": self.by_model,
+            "hourly": self.hourly,
+            "daily": self.daily,
+        }
+    
+    def _load_state(self, state: Dict[str, Any]):
+        self.total_tokens = state.get("total_tokens", 0)
+        self.total_cost = state.get("total_cost", 0.0)
+        self.by_model = state.get("by_model", {})
+        self.hourly = state.get("hourly", {})
+        self.daily = state.get("daily", {})
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total_tokens": self.total_tokens,
+            "total_cost_usd": round(self.total_cost, 6),
+            "by_model": {model: dict(stats) for model, stats in self.by_model.items()},
+            "hourly": {key: dict(bucket) for key, bucket in sorted(self.hourly.items())},
+            "daily": {key: dict(bucket) for key, bucket in sorted(self.daily.items())},
+        }
+
+
+class ErrorAggregate(_JsonlAggregate):
+    """Error counts by exception class plus the most recent errors."""
+    
+    RECENT_LIMIT = 10
+    
+    def _reset(self):
+        self.total_errors = 0
+        self.by_type: Dict[str, int] = {}
+        self.recent: List[Dict[str, Any]] = []
+    
+    def _fold(self, entry: Dict[str, Any]):
+        if entry.get("type") != "exception":
+            return
+        self.total_errors += 1
+        error_class = entry.get("error_class", "Unknown")
+        self.by_type[error_class] = self.by_type.get(error_class, 0) + 1
+        
+        self.recent.append({
+            "timestamp": entry.get("timestamp"),
+            "error_class": error_class,
+            "message": (entry.get("error_message") or "")[:200],
+            "module": entry.get("module"),
+            "function": entry.get("function")
+        })
+        if len(self.recent) > self.RECENT_LIMIT:
+            self.recent.pop(0)
+    
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "total_errors": self.total_errors,
+            "by_type": self.by_type,
+            "recent": self.recent,
+        }
+    
+    def _load_state(self, state: Dict[str, Any]):
+        self.total_errors = state.get("total_errors", 0)
+        self.by_type = state.get("by_type", {})
+        self.recent = state.get("recent", [])[-self.RECENT_LIMIT:]
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total_errors": self.total_errors,
+            "by_type": dict(self.by_type),
+            "recent": list(self.recent),
+        }
+
+
+_token_aggregate = TokenUsageAggregate(TOKENS_JSONL, TOKENS_CHECKPOINT)
+_error_aggregate = ErrorAggregate(ERRORS_JSONL, ERRORS_CHECKPOINT)
+
+
+def get_token_usage_summary() -> Dict[str, Any]:
+    """
+    Get summary of token usage from logs/tokens.jsonl.
+    
+    Served from the incremental aggregate; only lines appended since the last
+    call (e.g. by another process) are read from disk.
+    
+    Returns:
+        Dictionary with usage statistics by model and hourly/daily rollups
+    """
+    return _token_aggregate.get_summary()
 
 
 def get_error_summary() -> Dict[str, Any]:
@@ -648,43 +947,13 @@ def get_error_summary() -> Dict[str, Any]:
     Returns:
         Dictionary with error statistics
     """
-    if not ERRORS_JSONL.exists():
-        return {"total_errors": 0, "by_type": {}, "recent": []}
-    
-    total_errors = 0
-    by_type: Dict[str, int] = {}
-    recent = []
-    
-    try:
-        with open(ERRORS_JSONL, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    if entry.get("type") == "exception":
-                        total_errors += 1
-                        error_class = entry.get("error_class", "Unknown")
-                        by_type[error_class] = by_type.get(error_class, 0) + 1
-                        
-                        # Keep last 10 errors
-                        recent.append({
-                            "timestamp": entry.get("timestamp"),
-                            "error_class": error_class,
-                            "message": entry.get("error_message", "")[:200],
-                            "module": entry.get("module"),
-                            "function": entry.get("function")
-                        })
-                        if len(recent) > 10:
-                            recent.pop(0)
-                except json.JSONDecodeError:
-                    continue
-    except Exception:
-        pass
-    
-    return {
-        "total_errors": total_errors,
-        "by_type": by_type,
-        "recent": recent[-10:]  # Last 10
-    }
+    return _error_aggregate.get_summary()
+
+
+def flush_log_summaries():
+    """Persist token/error summary checkpoints (call on shutdown)."""
+    _token_aggregate.flush()
+    _error_aggregate.flush()
 
 
 # Initialize logging on import
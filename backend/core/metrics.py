@@ -4,10 +4,14 @@ Provides counters, histograms, gauges, and timers for performance tracking.
 """
 
 import sys
+import math
+import re
+import itertools
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
+from bisect import bisect_left
 import time
 import threading
 import logging
@@ -22,6 +26,105 @@ from backend.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+# Default Prometheus bucket upper bounds (seconds for durations). Extends the
+# client-library defaults up to 5 minutes because LLM calls routinely take that long.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0
+)
+
+# Relative accuracy of the quantile sketch (1% => p99 is within 1% of the true value)
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Fixed number of write shards; threads are spread over them round-robin
+METRIC_SHARDS = 16
+
+
+class Histogram:
+    """
+    Constant-memory histogram for one series.
+    
+    Keeps count/sum/min/max, cumulative-ready counts for fixed Prometheus
+    buckets and a log-bucketed quantile sketch (DDSketch-style) whose size is
+    bounded by the dynamic range of the values, not by the number of samples.
+    Recording is O(1) apart from a bisect over the fixed bounds.
+    """
+    
+    __slots__ = ("bounds", "bucket_counts", "sketch", "zero_count", "count", "sum", "min", "max")
+    
+    _gamma = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+    _log_gamma = math.log(_gamma)
+    # Values at or below this are counted in the zero bucket
+    _min_indexable = 1e-9
+    
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sketch: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        if value > self._min_indexable:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.sketch[index] = self.sketch.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+    
+    def merge(self, other: "Histogram"):
+        """Fold another histogram (same bounds) into this one."""
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for i, c in enumerate(other.bucket_counts):
+            self.bucket_counts[i] += c
+        for index, c in other.sketch.items():
+            self.sketch[index] = self.sketch.get(index, 0) + c
+        self.zero_count += other.zero_count
+    
+    def copy(self) -> "Histogram":
+        clone = Histogram(self.bounds)
+        clone.merge(self)
+        return clone
+    
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0..1) within the sketch's relative accuracy."""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0) if self.min <= self._min_indexable else self.min
+        for index in sorted(self.sketch):
+            seen += self.sketch[index]
+            if rank < seen:
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+class _Shard:
+    """Metric storage for the threads assigned to it; its lock is rarely contended."""
+    
+    __slots__ = ("lock", "counters", "histograms", "timers")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.histograms: Dict[str, Histogram] = {}
+        self.timers: Dict[str, Histogram] = {}
+
+
 class MetricsCollector:
     """
     Centralized metrics collection system.
@@ -32,28 +135,60 @@ class MetricsCollector:
     - Gauges (current values)
     - Timers (duration tracking)
     - Automatic aggregation and reporting
+    
+    Writes go to one of METRIC_SHARDS shards, assigned per thread round-robin,
+    so concurrent recorders rarely contend; shards are merged on read. The
+    shard set is fixed, so thread churn (to_thread pools, executors) does not
+    grow the cost of reads. Histograms and timers use
+    fixed-size `Histogram` series (O(1) memory per series) and are exported
+    as real Prometheus histograms (`_bucket`/`_sum`/`_count`).
+    
+    The number of series is capped (settings.metrics_max_series): past the
+    cap, series idle for settings.metrics_series_ttl_seconds and then the
+    least recently used ones are dropped, so high-cardinality labels cannot
+    grow memory without bound.
     """
     
     def __init__(self):
         """Initialize metrics collector."""
-        self._counters: Dict[str, int] = defaultdict(int)
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
         self._gauges: Dict[str, float] = {}
-        self._timers: Dict[str, List[float]] = defaultdict(list)
-        self._timer_start: Dict[str, float] = {}
+        self._timer_start: Dict[str, Tuple[str, float]] = {}
         
-        # Thread safety
+        # Fixed shard set; each thread is assigned one on its first record
+        self._local = threading.local()
+        self._shards: List[_Shard] = [_Shard() for _ in range(METRIC_SHARDS)]
+        self._next_shard = itertools.count()
         self._lock = threading.Lock()
         
+        # Series key -> (metric name, tags) for Prometheus label export; inserts
+        # and evictions happen under the registry lock
+        self._series: Dict[str, Tuple[str, Tuple[Tuple[str, str], ...]]] = {}
+        # Series key -> monotonic time it was last recorded
+        self._series_seen: Dict[str, float] = {}
+        # Metric name -> bucket bounds (DEFAULT_BUCKETS when not registered)
+        self._bucket_bounds: Dict[str, Tuple[float, ...]] = {}
+        
         # Aggregation window (default: 1 minute)
         self.aggregation_window = 60
         self._last_aggregation = time.time()
         
-        # Keep last N samples for histograms/timers
-        self.max_samples = 1000
-        
         logger.info("Metrics Collector initialized")
     
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            # itertools.count is atomic under the GIL
+            shard = self._local.shard = self._shards[next(self._next_shard) % METRIC_SHARDS]
+        return shard
+    
+    def register_histogram(self, metric_name: str, buckets: Tuple[float, ...]):
+        """
+        Set custom Prometheus bucket bounds for a histogram/timer metric.
+        
+        Must be called before the first value is recorded for that metric.
+        """
+        self._bucket_bounds[metric_name] = tuple(sorted(buckets))
+    
     def increment(self, metric_name: str, value: int = 1, tags: Optional[Dict[str, str]] = None):
         """
         Increment a counter metric.
@@ -64,8 +199,9 @@ class MetricsCollector:
             tags: Optional tags for filtering
         """
         key = self._make_key(metric_name, tags)
-        with self._lock:
-            self._counters[key] += value
+        shard = self._shard()
+        with shard.lock:
+            shard.counters[key] += value
     
     def decrement(self, metric_name: str, value: int = 1, tags: Optional[Dict[str, str]] = None):
         """
@@ -76,9 +212,7 @@ class MetricsCollector:
             value: Amount to decrement (default: 1)
             tags: Optional tags for filtering
         """
-        key = self._make_key(metric_name, tags)
-        with self._lock:
-            self._counters[key] -= value
+        self.increment(metric_name, -value, tags)
     
     def record(self, metric_name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """
@@ -90,11 +224,16 @@ class MetricsCollector:
             tags: Optional tags for filtering
         """
         key = self._make_key(metric_name, tags)
-        with self._lock:
-            self._histograms[key].append(value)
-            # Limit samples
-            if len(self._histograms[key]) > self.max_samples:
-                self._histograms[key] = self._histograms[key][-self.max_samples:]
+        self._observe(metric_name, key, value)
+    
+    def _observe(self, metric_name: str, key: str, value: float, timer: bool = False):
+        shard = self._shard()
+        series = shard.timers if timer else shard.histograms
+        with shard.lock:
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._bucket_bounds.get(metric_name, DEFAULT_BUCKETS))
+            histogram.observe(value)
     
     def gauge(self, metric_name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """
@@ -105,9 +244,8 @@ class MetricsCollector:
             value: Current value
             tags: Optional tags for filtering
         """
-        key = self._make_key(metric_name, tags)
-        with self._lock:
-            self._gauges[key] = value
+        # Last write wins; a single dict assignment needs no lock
+        self._gauges[self._make_key(metric_name, tags)] = value
     
     def start_timer(self, metric_name: str, tags: Optional[Dict[str, str]] = None) -> str:
         """
@@ -120,10 +258,9 @@ class MetricsCollector:
         Returns:
             Timer ID for stopping the timer
         """
-        timer_id = f"{metric_name}_{time.time()}_{id(self)}"
+        timer_id = f"{metric_name}_{time.time()}_{id(self)}_{threading.get_ident()}"
         key = self._make_key(metric_name, tags)
-        with self._lock:
-            self._timer_start[timer_id] = (key, time.time())
+        self._timer_start[timer_id] = (key, time.perf_counter())
         return timer_id
     
     def stop_timer(self, timer_id: str):
@@ -133,14 +270,13 @@ class MetricsCollector:
         Args:
             timer_id: Timer ID from start_timer
         """
-        with self._lock:
-            if timer_id in self._timer_start:
-                key, start_time = self._timer_start.pop(timer_id)
-                duration = time.time() - start_time
-                self._timers[key].append(duration)
-                # Limit samples
-                if len(self._timers[key]) > self.max_samples:
-                    self._timers[key] = self._timers[key][-self.max_samples:]
+        entry = self._timer_start.pop(timer_id, None)
+        if entry is None:
+            return
+        key, start_time = entry
+        duration = time.perf_counter() - start_time
+        metric_name = self._series.get(key, (key,))[0]
+        self._observe(metric_name, key, duration, timer=True)
     
     def timer(self, metric_name: str, tags: Optional[Dict[str, str]] = None):
         """
@@ -156,117 +292,197 @@ class MetricsCollector:
     def _make_key(self, metric_name: str, tags: Optional[Dict[str, str]]) -> str:
         """Create metric key with tags."""
         if not tags:
-            return metric_name
+            key = metric_name
+            label_items: Tuple[Tuple[str, str], ...] = ()
+        else:
+            label_items = tuple(sorted((k, str(v)) for k, v in tags.items()))
+            tag_str = ",".join(f"{k}={v}" for k, v in label_items)
+            key = f"{metric_name}[{tag_str}]"
+        # A single dict assignment needs no lock
+        self._series_seen[key] = time.monotonic()
+        if key not in self._series:
+            with self._lock:
+                if key not in self._series:
+                    self._series[key] = (metric_name, label_items)
+                    if len(self._series) > settings.metrics_max_series:
+                        self._evict_series()
+        return key
+    
+    def _evict_series(self):
+        """
+        Drop idle series, then the least recently used ones, down to 90% of
+        the cap (so the next few new series don't each trigger an eviction).
+        
+        Caller holds the registry lock.
+        """
+        now = time.monotonic()
+        target = int(settings.metrics_max_series * 0.9)
+        seen = self._series_seen.copy()
+        by_age = sorted(self._series, key=lambda key: seen.get(key, 0.0))
+        stale_before = now - settings.metrics_series_ttl_seconds
+        evicted = [key for key in by_age if seen.get(key, 0.0) < stale_before]
+        if len(self._series) - len(evicted) > target:
+            evicted = by_age[:len(self._series) - target]
+        if not evicted:
+            return
         
-        tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
-        return f"{metric_name}[{tag_str}]"
+        for key in evicted:
+            del self._series[key]
+            self._series_seen.pop(key, None)
+            self._gauges.pop(key, None)
+        for shard in self._shards:
+            with shard.lock:
+                for key in evicted:
+                    shard.counters.pop(key, None)
+                    shard.histograms.pop(key, None)
+                    shard.timers.pop(key, None)
+        logger.info(f"Evicted {len(evicted)} metric series ({len(self._series)} kept)")
+    
+    def _merged(self) -> Tuple[Dict[str, int], Dict[str, Histogram], Dict[str, Histogram]]:
+        """Merge all shards into fresh counters/histograms/timers maps."""
+        counters: Dict[str, int] = defaultdict(int)
+        histograms: Dict[str, Histogram] = {}
+        timers: Dict[str, Histogram] = {}
+        for shard in self._shards:
+            with shard.lock:
+                for key, value in shard.counters.items():
+                    counters[key] += value
+                for source, target in ((shard.histograms, histograms), (shard.timers, timers)):
+                    for key, histogram in source.items():
+                        if key in target:
+                            target[key].merge(histogram)
+                        else:
+                            target[key] = histogram.copy()
+        return dict(counters), histograms, timers
+    
+    @staticmethod
+    def _summarize(histogram: Histogram) -> Dict[str, float]:
+        return {
+            "count": histogram.count,
+            "min": histogram.min,
+            "max": histogram.max,
+            "mean": histogram.sum / histogram.count,
+            "p50": histogram.quantile(0.50),
+            "p95": histogram.quantile(0.95),
+            "p99": histogram.quantile(0.99)
+        }
     
     def get_stats(self) -> Dict[str, Any]:
         """
         Get aggregated statistics for all metrics.
         
+        Percentiles come from the quantile sketch (~1% relative error).
+        
         Returns:
             Dictionary with metric statistics
         """
-        with self._lock:
-            stats = {
-                "counters": dict(self._counters),
-                "gauges": dict(self._gauges),
-                "histograms": {},
-                "timers": {}
-            }
-            
-            # Calculate histogram statistics
-            for key, values in self._histograms.items():
-                if values:
-                    stats["histograms"][key] = {
-                        "count": len(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "mean": sum(values) / len(values),
-                        "p50": self._percentile(values, 50),
-                        "p95": self._percentile(values, 95),
-                        "p99": self._percentile(values, 99)
-                    }
-            
-            # Calculate timer statistics
-            for key, values in self._timers.items():
-                if values:
-                    stats["timers"][key] = {
-                        "count": len(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "mean": sum(values) / len(values),
-                        "p50": self._percentile(values, 50),
-                        "p95": self._percentile(values, 95),
-                        "p99": self._percentile(values, 99),
-                        "total": sum(values)
-                    }
-            
-            return stats
-    
-    def _percentile(self, values: List[float], percentile: int) -> float:
-        """Calculate percentile of a list of values."""
-        if not values:
-            return 0.0
-        sorted_values = sorted(values)
-        index = int(len(sorted_values) * percentile / 100)
-        return sorted_values[min(index, len(sorted_values) - 1)]
+        counters, histograms, timers = self._merged()
+        stats = {
+            "counters": counters,
+            "gauges": dict(self._gauges),
+            "histograms": {},
+            "timers": {}
+        }
+        
+        for key, histogram in histograms.items():
+            if histogram.count:
+                stats["histograms"][key] = self._summarize(histogram)
+        
+        for key, histogram in timers.items():
+            if histogram.count:
+                stats["timers"][key] = {**self._summarize(histogram), "total": histogram.sum}
+        
+        return stats
     
     def reset(self):
         """Reset all metrics (useful for testing)."""
-        with self._lock:
-            self._counters.clear()
-            self._histograms.clear()
-            self._gauges.clear()
-            self._timers.clear()
-            self._timer_start.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.counters.clear()
+                shard.histograms.clear()
+                shard.timers.clear()
+        self._gauges.clear()
+        self._timer_start.clear()
+    
+    # -------------------------------------------------------------------------
+    # Prometheus export
+    # -------------------------------------------------------------------------
+    
+    @staticmethod
+    def _prom_name(name: str) -> str:
+        name = re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+        return name if not name[:1].isdigit() else f"_{name}"
+    
+    @staticmethod
+    def _prom_labels(label_items, extra: Optional[Tuple[str, str]] = None) -> str:
+        items = list(label_items)
+        if extra:
+            items.append(extra)
+        if not items:
+            return ""
+        rendered = []
+        for k, v in items:
+            value = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            rendered.append(f'{MetricsCollector._prom_name(k)}="{value}"')
+        return "{" + ",".join(rendered) + "}"
     
     def export_prometheus(self) -> str:
         """
-        Export metrics in Prometheus format.
+        Export metrics in Prometheus text format.
+        
+        Histograms and timers are exported as cumulative `_bucket{le=...}`
+        series plus `_sum` and `_count`, so quantiles can be computed
+        server-side with `histogram_quantile()`.
         
         Returns:
             Prometheus-formatted metrics string
         """
+        counters, histograms, timers = self._merged()
+        
+        def families(series: Dict[str, Any]) -> Dict[str, List[Tuple[tuple, Any]]]:
+            grouped: Dict[str, List[Tuple[tuple, Any]]] = defaultdict(list)
+            for key, value in series.items():
+                name, label_items = self._series.get(key, (key, ()))
+                grouped[self._prom_name(name)].append((label_items, value))
+            return grouped
+        
         lines = []
-        stats = self.get_stats()
         
         # Export counters
-        for key, value in stats["counters"].items():
-            lines.append(f"# TYPE {key} counter")
-            lines.append(f"{key} {value}")
+        for name, series in families(counters).items():
+            lines.append(f"# TYPE {name} counter")
+            for label_items, value in series:
+                lines.append(f"{name}{self._prom_labels(label_items)} {value}")
         
         # Export gauges
-        for key, value in stats["gauges"].items():
-            lines.append(f"# TYPE {key} gauge")
-            lines.append(f"{key} {value}")
+        for name, series in families(dict(self._gauges)).items():
+            lines.append(f"# TYPE {name} gauge")
+            for label_items, value in series:
+                lines.append(f"{name}{self._prom_labels(label_items)} {value}")
         
-        # Export histogram summaries
-        for key, stats_dict in stats["histograms"].items():
-            lines.append(f"# TYPE {key} histogram")
-            lines.append(f"{key}_count {stats_dict['count']}")
-            lines.append(f"{key}_sum {stats_dict['mean'] * stats_dict['count']}")
-            lines.append(f"{key}_mean {stats_dict['mean']}")
-            lines.append(f"{key}_min {stats_dict['min']}")
-            lines.append(f"{key}_max {stats_dict['max']}")
-            lines.append(f"{key}_p50 {stats_dict['p50']}")
-            lines.append(f"{key}_p95 {stats_dict['p95']}")
-            lines.append(f"{key}_p99 {stats_dict['p99']}")
+        # Export histograms and timers
+        merged_histograms = dict(histograms)
+        for key, histogram in timers.items():
+            if key in merged_histograms:
+                merged_histograms[key] = merged_histograms[key].copy()
+                merged_histograms[key].merge(histogram)
+            else:
+                merged_histograms[key] = histogram
         
-        # Export timer summaries
-        for key, stats_dict in stats["timers"].items():
-            lines.append(f"# TYPE {key} histogram")
-            lines.append(f"{key}_count {stats_dict['count']}")
-            lines.append(f"{key}_sum {stats_dict['total']}")
-            lines.append(f"{key}_mean {stats_dict['mean']}")
-            lines.append(f"{key}_min {stats_dict['min']}")
-            lines.append(f"{key}_max {stats_dict['max']}")
-            lines.append(f"{key}_p50 {stats_dict['p50']}")
-            lines.append(f"{key}_p95 {stats_dict['p95']}")
-            lines.append(f"{key}_p99 {stats_dict['p99']}")
+        for name, series in families(merged_histograms).items():
+            lines.append(f"# TYPE {name} histogram")
+            for label_items, histogram in series:
+                cumulative = 0
+                for bound, count in zip(histogram.bounds, histogram.bucket_counts):
+                    cumulative += count
+                    labels = self._prom_labels(label_items, ("le", repr(float(bound))))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = self._prom_labels(label_items, ("le", "+Inf"))
+                lines.append(f"{name}_bucket{labels} {histogram.count}")
+                lines.append(f"{name}_sum{self._prom_labels(label_items)} {histogram.sum}")
+                lines.append(f"{name}_count{self._prom_labels(label_items)} {histogram.count}")
         
-        return "\n".join(lines)
+        return "\n".join(lines) + "\n"
 
 
 class TimerContext:
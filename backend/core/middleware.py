@@ -1,19 +1,21 @@
 """
 Custom middleware for FastAPI.
 Includes rate limiting, request ID tracking, timing, trusted hosts, and IP banning.
+
+`RequestPipelineMiddleware` combines all of these into a single pure-ASGI layer;
+`setup_request_middleware` installs it.
 """
 
 import time
 import uuid
 import logging
 import re
-from typing import Callable, Dict, Set, List
+from typing import Dict, List, Optional
 from collections import defaultdict
 from datetime import datetime, timedelta
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.middleware.trustedhost import TrustedHostMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -118,140 +120,90 @@ class IPBanManager:
 ip_ban_manager = IPBanManager()
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Add request ID to all requests for tracing."""
+def setup_rate_limiting(app):
+    """
+    Setup rate limiting for FastAPI app.
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add request ID header and log request."""
-        # Only process HTTP requests
-        if request.scope.get("type") != "http":
-            return await call_next(request)
+    Args:
+        app: FastAPI application instance
+    """
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    
+    return limiter
 
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        # Add request ID to response headers
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
 
+# Compiled once at import: ngrok tunnel hostnames are always trusted
+NGROK_HOST_REGEXES = [
+    re.compile(pattern) for pattern in (
+        r".*\.ngrok(-free)?\.(app|io|dev|com)$",
+        r".*\.ngrok\.(app|io)$",
+    )
+]
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    """Track request processing time with metrics."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add timing information to response headers and record metrics."""
-        # Only process HTTP requests
-        if request.scope.get("type") != "http":
-            return await call_next(request)
 
-        from backend.core.metrics import get_metrics_collector
-        from backend.core.config import settings
-        
-        start_time = time.time()
-        metrics = get_metrics_collector() if settings.metrics_enabled else None
-        
-        # Initialize response to default error response in case of failure
-        response = Response("Internal Server Error", status_code=500)
-        
-        try:
-            response = await call_next(request)
-        except Exception as e:
-            # Log error and re-raise
-            process_time = time.time() - start_time
-            logger.error(
-                f"Request failed: {request.method} {request.url.path} after {process_time:.2f}s",
-                extra={
-                    "duration": process_time,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "error": str(e)
-                }
-            )
-            raise
-        finally:
-            # Always add timing header and metrics, even on error
-            process_time = time.time() - start_time
-            response.headers["X-Process-Time"] = str(round(process_time, 4))
-            
-            # Record metrics
-            if metrics:
-                metrics.record(
-                    "http_request_duration",
-                    process_time,
-                    tags={
-                        "method": request.method,
-                        "path": request.url.path,
-                        "status": str(response.status_code)
-                    }
-                )
-                metrics.increment(
-                    "http_requests_total",
-                    tags={
-                        "method": request.method,
-                        "path": request.url.path,
-                        "status": str(response.status_code)
-                    }
-                )
-            
-            # Log slow requests
-            if process_time > 1.0:
-                logger.warning(
-                    f"Slow request: {request.method} {request.url.path} "
-                    f"took {process_time:.2f}s",
-                    extra={
-                        "duration": process_time,
-                        "method": request.method,
-                        "path": request.url.path
-                    }
-                )
-        
-        return response
+def is_host_allowed(host: str, allowed_hosts) -> bool:
+    """Check if host is in allowed list or matches ngrok patterns."""
+    if not host:
+        return False
+    
+    # Remove port if present
+    host_without_port = host.split(':')[0]
+    
+    # Check exact matches
+    if host_without_port in allowed_hosts or host in allowed_hosts:
+        return True
+    
+    # Check ngrok patterns
+    return any(regex.match(host_without_port) for regex in NGROK_HOST_REGEXES)
 
 
-class IPBanMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to block banned IPs from accessing the API.
+def get_default_allowed_hosts() -> List[str]:
+    """Default allowed hosts: localhost, 127.0.0.1 and the configured CORS origins."""
+    from backend.core.config import settings
     
-    Works with IPBanManager to detect and block vulnerability scanners.
-    """
+    allowed_hosts = [
+        "localhost",
+        "127.0.0.1",
+        "::1",
+        "[::1]",
+        "0.0.0.0",
+        # Frontend origins (extracted from CORS settings)
+        "localhost:3000",
+        "127.0.0.1:3000",
+    ]
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Check if IP is banned before processing request."""
-        # Only process HTTP requests
-        if request.scope.get("type") != "http":
-            return await call_next(request)
-
-        client_ip = request.client.host if request.client else "unknown"
-        
-        # Check if IP is banned
-        if ip_ban_manager.is_banned(client_ip):
-            logger.warning(f"🚫 [IP_BAN] Blocked request from banned IP: {client_ip}")
-            return JSONResponse(
-                status_code=403,
-                content={
-                    "error": "Forbidden",
-                    "message": "Your IP has been temporarily blocked due to suspicious activity.",
-                    "type": "ip_banned"
-                }
-            )
-        
-        # Process the request
-        response = await call_next(request)
-        
-        # Track 404s for potential banning
-        if response.status_code == 404:
-            path = request.url.path
-            if ip_ban_manager.record_404(client_ip, path):
-                # IP just got banned, but let this request complete
-                logger.warning(f"🔒 [IP_BAN] IP {client_ip} banned after excessive 404s")
-        
-        return response
+    # Add configured CORS origins
+    if hasattr(settings, 'cors_origins'):
+        for origin in settings.cors_origins:
+            # Extract host from URL
+            if origin.startswith("http://") or origin.startswith("https://"):
+                from urllib.parse import urlparse
+                parsed = urlparse(origin)
+                if parsed.netloc:
+                    allowed_hosts.append(parsed.netloc)
+            else:
+                allowed_hosts.append(origin)
+    
+    return allowed_hosts
 
 
-class StructuredLoggingMiddleware(BaseHTTPMiddleware):
-    """Add structured logging for requests with context propagation."""
+# =============================================================================
+# Pure-ASGI request pipeline
+# =============================================================================
+class RequestPipelineMiddleware:
+    """
+    Single pure-ASGI middleware for every HTTP request.
+    
+    In order: IP ban check, trusted host check, request ID and logging
+    context, timing/metrics and structured request logging, then 404
+    tracking for IP bans. It:
+    - runs in the caller's task (no per-layer task group or body stream wrapping),
+      so streaming responses are passed through untouched
+    - resolves the metrics collector once instead of on every request
+    
+    X-Process-Time and the duration metric are measured up to the response start.
+    """
     
     # Paths to skip logging (health checks, metrics, static assets)
     SKIP_LOGGING_PATHS = {
@@ -264,74 +216,130 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
         "/api/openapi.json",
     }
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Log request and response with structured data and context."""
-        # Only process HTTP requests
-        if request.scope.get("type") != "http":
-            return await call_next(request)
-
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_hosts: Optional[List[str]] = None,
+        ban_manager: Optional[IPBanManager] = None,
+    ):
+        from backend.core.config import settings
+        from backend.core.metrics import get_metrics_collector
         from backend.core.logger import request_id_var, user_id_var, operation_var
         
-        request_id = getattr(request.state, "request_id", "unknown")
-        path = request.url.path
+        self.app = app
+        self.allowed_hosts = set(allowed_hosts if allowed_hosts is not None else get_default_allowed_hosts())
+        self.ban_manager = ban_manager or ip_ban_manager
+        self.metrics = get_metrics_collector() if settings.metrics_enabled else None
+        self._request_id_var = request_id_var
+        self._user_id_var = user_id_var
+        self._operation_var = operation_var
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Only process HTTP requests
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         
-        # Skip logging for health checks and other noisy endpoints
-        skip_logging = path in self.SKIP_LOGGING_PATHS or path.startswith("/api/health")
+        # --- IP ban -----------------------------------------------------------
+        if self.ban_manager.is_banned(client_ip):
+            logger.warning(f"🚫 [IP_BAN] Blocked request from banned IP: {client_ip}")
+            response = JSONResponse(
+                status_code=403,
+                content={
+                    "error": "Forbidden",
+                    "message": "Your IP has been temporarily blocked due to suspicious activity.",
+                    "type": "ip_banned"
+                }
+            )
+            await response(scope, receive, send)
+            return
+        
+        # --- Trusted host -----------------------------------------------------
+        headers = Headers(scope=scope)
+        host = headers.get("host", "")
+        if not is_host_allowed(host, self.allowed_hosts):
+            logger.warning(f"🚫 [TRUSTED_HOST] Rejected request from untrusted host: {host}")
+            response = JSONResponse(
+                status_code=403,
+                content={
+                    "error": "Forbidden",
+                    "message": f"Host '{host}' is not allowed. Please use a trusted host.",
+                    "type": "invalid_host"
+                }
+            )
+            await response(scope, receive, send)
+            return
         
-        # Set context variables
-        request_id_var.set(request_id)
+        # --- Request ID and context -------------------------------------------
+        request_id = str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
         
-        # Try to get user ID from request state (if authenticated)
-        user_id = getattr(request.state, "user_id", None)
-        if user_id:
-            user_id_var.set(str(user_id))
+        method = scope["method"]
+        path = scope["path"]
+        skip_logging = path in self.SKIP_LOGGING_PATHS or path.startswith("/api/health")
+        is_generation_request = path.startswith("/api/generation/")
         
-        # Set operation from path
-        operation = f"{request.method} {path}"
-        operation_var.set(operation)
+        request_id_token = self._request_id_var.set(request_id)
+        user_id = state.get("user_id")
+        user_id_token = self._user_id_var.set(str(user_id)) if user_id else None
+        operation_token = self._operation_var.set(f"{method} {path}")
         
-        # Log request (skip for health checks)
         # CRITICAL: Always log generation requests for debugging
-        is_generation_request = path.startswith("/api/generation/")
         if not skip_logging or is_generation_request:
-            log_level = "info" if not is_generation_request else "warning"  # Make generation requests more visible
             logger.log(
                 logging.WARNING if is_generation_request else logging.INFO,
                 f"🌐 [MIDDLEWARE] {'=' * 20} REQUEST RECEIVED {'=' * 20}",
                 extra={
                     "request_id": request_id,
-                    "method": request.method,
+                    "method": method,
                     "path": path,
-                    "query": str(request.query_params),
-                    "client": request.client.host if request.client else None,
-                    "user_agent": request.headers.get("user-agent"),
+                    "query": scope.get("query_string", b"").decode("latin-1"),
+                    "client": client[0] if client else None,
+                    "user_agent": headers.get("user-agent"),
                     "is_generation": is_generation_request,
                 }
             )
         
+        start_time = time.time()
+        status_code = 500
+        response_started = False
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                process_time = time.time() - start_time
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Process-Time"] = str(round(process_time, 4))
+                response_headers["X-Request-ID"] = request_id
+                self._record(method, path, status_code, process_time)
+            await send(message)
+        
         try:
-            response = await call_next(request)
-            
-            # Log response (skip for health checks, unless there's an error)
-            if not skip_logging or response.status_code >= 400:
-                logger.info(
-                    "Request completed",
-                    extra={
-                        "request_id": request_id,
-                        "status_code": response.status_code,
-                        "method": request.method,
-                        "path": path,
-                    }
-                )
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
+            process_time = time.time() - start_time
+            if not response_started:
+                self._record(method, path, status_code, process_time)
+            logger.error(
+                f"Request failed: {method} {path} after {process_time:.2f}s",
+                extra={
+                    "duration": process_time,
+                    "method": method,
+                    "path": path,
+                    "error": str(e)
+                }
+            )
             logger.error(
                 "Request failed",
                 extra={
                     "request_id": request_id,
-                    "method": request.method,
+                    "method": method,
                     "path": path,
                     "error": str(e),
                     "error_type": type(e).__name__,
@@ -339,134 +347,75 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
                 exc_info=True
             )
             raise
+        else:
+            # Log response (skip for health checks, unless there's an error)
+            if not skip_logging or status_code >= 400:
+                logger.info(
+                    "Request completed",
+                    extra={
+                        "request_id": request_id,
+                        "status_code": status_code,
+                        "method": method,
+                        "path": path,
+                    }
+                )
+            
+            # Track 404s for potential banning
+            if status_code == 404 and self.ban_manager.record_404(client_ip, path):
+                # IP just got banned, but let this request complete
+                logger.warning(f"🔒 [IP_BAN] IP {client_ip} banned after excessive 404s")
         finally:
-            # Clear context variables
-            request_id_var.set(None)
-            user_id_var.set(None)
-            operation_var.set(None)
-
-
-def setup_rate_limiting(app):
-    """
-    Setup rate limiting for FastAPI app.
-    
-    Args:
-        app: FastAPI application instance
-    """
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    
-    return limiter
-
-
-class CustomTrustedHostMiddleware(BaseHTTPMiddleware):
-    """
-    Custom TrustedHostMiddleware that properly handles ngrok wildcards.
-    
-    This replaces Starlette's TrustedHostMiddleware which doesn't support wildcard patterns.
-    """
-    
-    def __init__(self, app, allowed_hosts: List[str]):
-        super().__init__(app)
-        self.allowed_hosts = allowed_hosts
-        # Compile ngrok patterns for faster matching
-        ngrok_patterns = [
-            r".*\.ngrok(-free)?\.(app|io|dev|com)$",
-            r".*\.ngrok\.(app|io)$",
-        ]
-        self.ngrok_regexes = [re.compile(pattern) for pattern in ngrok_patterns]
-    
-    def is_host_allowed(self, host: str) -> bool:
-        """Check if host is in allowed list or matches ngrok patterns."""
-        if not host:
-            return False
-        
-        # Remove port if present
-        host_without_port = host.split(':')[0]
-        
-        # Check exact matches
-        if host_without_port in self.allowed_hosts or host in self.allowed_hosts:
-            return True
-        
-        # Check ngrok patterns
-        return any(regex.match(host_without_port) for regex in self.ngrok_regexes)
+            self._request_id_var.reset(request_id_token)
+            if user_id_token is not None:
+                self._user_id_var.reset(user_id_token)
+            self._operation_var.reset(operation_token)
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Validate Host header before processing request."""
-        # Only process HTTP requests
-        if request.scope.get("type") != "http":
-            return await call_next(request)
-        
-        # Get host from request
-        host = request.headers.get("host", "")
-        
-        # Validate host (includes ngrok pattern checking)
-        if not self.is_host_allowed(host):
-            logger.warning(f"🚫 [TRUSTED_HOST] Rejected request from untrusted host: {host}")
-            return JSONResponse(
-                status_code=403,
-                content={
-                    "error": "Forbidden",
-                    "message": f"Host '{host}' is not allowed. Please use a trusted host.",
-                    "type": "invalid_host"
+    def _record(self, method: str, path: str, status_code: int, process_time: float):
+        """Record request metrics and warn about slow requests."""
+        if self.metrics:
+            tags = {
+                "method": method,
+                "path": path,
+                "status": str(status_code)
+            }
+            self.metrics.record("http_request_duration", process_time, tags=tags)
+            self.metrics.increment("http_requests_total", tags=tags)
+        
+        # Log slow requests
+        if process_time > 1.0:
+            logger.warning(
+                f"Slow request: {method} {path} "
+                f"took {process_time:.2f}s",
+                extra={
+                    "duration": process_time,
+                    "method": method,
+                    "path": path
                 }
             )
-        
-        return await call_next(request)
 
 
-def setup_security_middleware(app, allowed_hosts: list = None):
+def setup_request_middleware(app, allowed_hosts: list = None):
     """
-    Setup comprehensive security middleware for FastAPI app.
-    
-    This includes:
-    - NgrokHostMiddleware: Allow ngrok domains (runs first)
-    - CustomTrustedHostMiddleware: Only accept requests from allowed hosts (replaces TrustedHostMiddleware)
-    - IPBanMiddleware: Block IPs with suspicious behavior (repeated 404s)
+    Install the pure-ASGI request pipeline (IP ban, trusted host, request ID,
+    timing/metrics and structured logging in one layer).
     
     Args:
         app: FastAPI application instance
-        allowed_hosts: List of allowed hostnames (default: localhost + ngrok patterns)
-    """
-    from backend.core.config import settings
+        allowed_hosts: List of allowed hostnames (default: localhost + CORS origins; ngrok always allowed)
     
-    # Default allowed hosts: localhost, 127.0.0.1, and ngrok tunnels
+    Returns:
+        The IPBanManager used by the pipeline
+    """
     if allowed_hosts is None:
-        allowed_hosts = [
-            "localhost",
-            "127.0.0.1",
-            "::1",
-            "[::1]",
-            "0.0.0.0",
-            # Frontend origins (extracted from CORS settings)
-            "localhost:3000",
-            "127.0.0.1:3000",
-        ]
-        
-        # Add configured CORS origins
-        if hasattr(settings, 'cors_origins'):
-            for origin in settings.cors_origins:
-                # Extract host from URL
-                if origin.startswith("http://") or origin.startswith("https://"):
-                    from urllib.parse import urlparse
-                    parsed = urlparse(origin)
-                    if parsed.netloc:
-                        allowed_hosts.append(parsed.netloc)
-                else:
-                    allowed_hosts.append(origin)
+        allowed_hosts = get_default_allowed_hosts()
     
-    # Add CustomTrustedHostMiddleware (validates Host header, supports ngrok wildcards)
-    # This replaces Starlette's TrustedHostMiddleware which doesn't support wildcard patterns
-    # Note: This must be added after CORS middleware in main.py (CORS is added last, so executes first)
     app.add_middleware(
-        CustomTrustedHostMiddleware,
-        allowed_hosts=allowed_hosts
+        RequestPipelineMiddleware,
+        allowed_hosts=allowed_hosts,
+        ban_manager=ip_ban_manager
     )
     
-    # Add IP Ban Middleware (blocks banned IPs)
-    app.add_middleware(IPBanMiddleware)
-    
-    logger.info(f"[SECURITY] Security middleware configured with {len(allowed_hosts)} allowed hosts")
+    logger.info(f"[SECURITY] Request pipeline configured with {len(allowed_hosts)} allowed hosts")
     logger.info(f"[SECURITY] IP ban threshold: {ip_ban_manager.ban_threshold} 404s in {ip_ban_manager.window_seconds}s")
     
     return ip_ban_manager
@@ -0,0 +1,85 @@
+"""
+Prefix-stable prompt assembly.
+
+Ollama keeps the KV cache of the previous prompt for a loaded model and only
+re-evaluates tokens after the first difference. A prompt that starts with the
+request-specific text (meeting notes, the user's question, RAG snippets) and
+puts the large, mostly static project context after it is re-evaluated in full
+on every request.
+
+PromptLayout collects prompt segments tagged with how often they change and
+emits them from most to least stable, so consecutive requests share the longest
+possible prefix:
+
+    PROJECT       universal project summary (changes when the project is re-indexed)
+    INSTRUCTIONS  artifact/chat instructions (fixed per artifact type)
+    SESSION       per-folder notes, conversation history (grows by appending)
+    REQUEST       retrieved snippets, requirements, the current question
+
+The system message is sent separately (Ollama's `system` field), which the
+model template already places ahead of the prompt.
+
+`settings.prompt_layout` selects "prefix_stable" (default) or "legacy" (the
+original request-first ordering) in the services that build prompts.
+
+Usage:
+    layout = PromptLayout()
+    layout.add(Stability.REQUEST, f"## Requirements\\n{notes}")
+    layout.add(Stability.PROJECT, project_summary)
+    prompt = layout.build()   # project summary first, requirements last
+"""
+
+import sys
+from enum import IntEnum
+from pathlib import Path
+from typing import List, Tuple
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.core.config import settings
+
+PREFIX_STABLE = "prefix_stable"
+LEGACY = "legacy"
+
+
+class Stability(IntEnum):
+    """How often a prompt segment changes (lower = more stable, emitted first)"""
+    PROJECT = 0
+    INSTRUCTIONS = 1
+    SESSION = 2
+    REQUEST = 3
+
+
+def is_prefix_stable() -> bool:
+    """Whether prompts should be assembled most-stable-first."""
+    return getattr(settings, "prompt_layout", PREFIX_STABLE) == PREFIX_STABLE
+
+
+class PromptLayout:
+    """
+    Ordered collection of prompt segments.
+
+    Segments are emitted by stability; segments with the same stability keep
+    the order they were added in. Empty segments are dropped.
+    """
+
+    def __init__(self, separator: str = "\n"):
+        self.separator = separator
+        self._segments: List[Tuple[int, int, str]] = []
+
+    def add(self, stability: Stability, text: str) -> "PromptLayout":
+        if text and text.strip():
+            self._segments.append((int(stability), len(self._segments), text))
+        return self
+
+    def _ordered(self) -> List[Tuple[int, int, str]]:
+        return sorted(self._segments)
+
+    def build(self) -> str:
+        return self.separator.join(text for _, _, text in self._ordered())
+
+    def prefix_length(self, up_to: Stability = Stability.INSTRUCTIONS) -> int:
+        """Length in characters of the leading segments up to (and including) `up_to`."""
+        texts = [text for stability, _, text in self._ordered() if stability <= up_to]
+        return len(self.separator.join(texts))
@@ -0,0 +1,256 @@
+"""
+Token-chunk coalescing for streamed model output.
+
+Model streams (e.g. OllamaClient.generate_stream) yield one tiny chunk per
+token. Forwarding each one as its own SSE/WebSocket frame means tens of
+thousands of frames and JSON encodes for a long artifact. StreamCoalescer sits
+between the model stream and the transport and batches chunks into frames,
+flushing when either the buffered text reaches `max_bytes` or `max_interval_ms`
+has passed since the first buffered chunk, whichever comes first. The very first
+chunk is always flushed immediately so time-to-first-token is unchanged.
+
+Per-endpoint limits come from `settings.stream_coalesce_profiles`.
+
+Usage:
+    coalescer = StreamCoalescer("generation")
+    async for frame in coalescer.coalesce_text(ollama_client.generate_stream(...)):
+        await send(frame)
+
+    async for event in StreamCoalescer("chat").coalesce_events(service.chat(...)):
+        yield f"data: {json.dumps(event)}\\n\\n"
+"""
+
+import sys
+import asyncio
+import time
+import logging
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.core.config import settings
+from backend.core.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+# Fallback limits for endpoints without a profile
+DEFAULT_MAX_BYTES = 512
+DEFAULT_MAX_INTERVAL_MS = 50.0
+
+# Chunks read ahead of the consumer; a slow client makes the source wait
+# instead of the whole stream being buffered in memory
+MAX_PENDING_CHUNKS = 256
+
+_END = object()
+
+
+def get_stream_profile(endpoint: str) -> Dict[str, float]:
+    """Get coalescing limits for an endpoint ("generation", "chat", "agent_chat", ...)."""
+    profiles = getattr(settings, "stream_coalesce_profiles", None) or {}
+    profile = profiles.get(endpoint) or profiles.get("default") or {}
+    return {
+        "max_bytes": int(profile.get("max_bytes", DEFAULT_MAX_BYTES)),
+        "max_interval_ms": float(profile.get("max_interval_ms", DEFAULT_MAX_INTERVAL_MS)),
+    }
+
+
+class StreamCoalescer:
+    """
+    Batches streamed text chunks into larger frames.
+
+    One instance per stream. After the stream ends, `chunks_in`, `frames_sent`
+    and `bytes_sent` describe what happened; the same numbers are also added to
+    the `stream_*_total` counters (tagged by endpoint) in the metrics collector.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "default",
+        max_bytes: Optional[int] = None,
+        max_interval_ms: Optional[float] = None,
+    ):
+        profile = get_stream_profile(endpoint)
+        self.endpoint = endpoint
+        self.max_bytes = max_bytes if max_bytes is not None else profile["max_bytes"]
+        self.max_interval = (max_interval_ms if max_interval_ms is not None else profile["max_interval_ms"]) / 1000.0
+        self.chunks_in = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.first_frame_at: Optional[float] = None
+
+    def coalesce_text(
+        self,
+        source: AsyncIterator[str],
+        is_control: Optional[Callable[[str], bool]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Coalesce a stream of text chunks.
+
+        Args:
+            source: Async iterator of text chunks
+            is_control: Optional predicate; matching chunks (e.g. "Error: ...")
+                        are never merged and are yielded as their own frame
+        """
+        return self._coalesce(
+            source,
+            text_of=lambda chunk: None if is_control and is_control(chunk) else chunk,
+            make_frame=lambda first, text: text,
+        )
+
+    def coalesce_events(
+        self,
+        source: AsyncIterator[Dict[str, Any]],
+        text_field: str = "content",
+        chunk_type: str = "chunk",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Coalesce a stream of event dicts.
+
+        Consecutive events with `type == chunk_type` are merged by
+        concatenating `text_field` (other keys are taken from the first event
+        of the frame). Any other event flushes the buffer and passes through.
+        """
+        def text_of(event: Dict[str, Any]) -> Optional[str]:
+            if isinstance(event, dict) and event.get("type") == chunk_type:
+                return event.get(text_field) or ""
+            return None
+
+        return self._coalesce(
+            source,
+            text_of=text_of,
+            make_frame=lambda first, text: {**first, text_field: text},
+        )
+
+    async def _coalesce(
+        self,
+        source: AsyncIterator[Any],
+        text_of: Callable[[Any], Optional[str]],
+        make_frame: Callable[[Any, str], Any],
+    ) -> AsyncIterator[Any]:
+        # Pump the source into a queue so the interval deadline can fire even
+        # while the model is between tokens (cancelling queue.get() is safe,
+        # cancelling the source generator's __anext__ is not). The queue is
+        # bounded, so the pump blocks when the consumer falls behind.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_CHUNKS)
+
+        async def pump():
+            try:
+                async for item in source:
+                    await queue.put(item)
+            except asyncio.CancelledError as e:
+                # Must not block on a full queue here: make room so a waiting
+                # consumer still sees the cancellation
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(e)
+                return
+            except BaseException as e:  # Surface errors to the consumer
+                await queue.put(e)
+                return
+            await queue.put(_END)
+
+        pump_task = asyncio.create_task(pump())
+
+        parts = []
+        buffered = 0
+        first_item = None
+        deadline: Optional[float] = None
+
+        def take_frame():
+            nonlocal parts, buffered, first_item, deadline
+            text = "".join(parts)
+            frame = make_frame(first_item, text)
+            self.frames_sent += 1
+            self.bytes_sent += len(text.encode("utf-8"))
+            if self.first_frame_at is None:
+                self.first_frame_at = time.perf_counter()
+            parts, buffered, first_item, deadline = [], 0, None, None
+            return frame
+
+        try:
+            while True:
+                if deadline is None:
+                    item = await queue.get()
+                else:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=max(timeout, 0))
+                    except asyncio.TimeoutError:
+                        yield take_frame()
+                        continue
+
+                if item is _END:
+                    break
+                if isinstance(item, BaseException):
+                    if parts:
+                        yield take_frame()
+                    raise item
+
+                self.chunks_in += 1
+                text = text_of(item)
+                if text is None:
+                    # Control/non-chunk item: flush pending text first, keep ordering
+                    if parts:
+                        yield take_frame()
+                    self.frames_sent += 1
+                    yield item
+                    continue
+
+                if first_item is None:
+                    first_item = item
+                    deadline = time.monotonic() + self.max_interval
+                parts.append(text)
+                buffered += len(text)
+
+                # First frame goes out immediately to preserve time-to-first-token
+                if self.first_frame_at is None or buffered >= self.max_bytes:
+                    yield take_frame()
+
+            if parts:
+                yield take_frame()
+        finally:
+            if not pump_task.done():
+                pump_task.cancel()
+                try:
+                    await pump_task
+                except BaseException:
+                    pass
+            self._record_metrics()
+
+    def _record_metrics(self):
+        try:
+            metrics = get_metrics_collector()
+            tags = {"endpoint": self.endpoint}
+            metrics.increment("stream_chunks_in_total", self.chunks_in, tags=tags)
+            metrics.increment("stream_frames_sent_total", self.frames_sent, tags=tags)
+            metrics.increment("stream_bytes_sent_total", self.bytes_sent, tags=tags)
+        except Exception as e:
+            logger.debug(f"Failed to record stream metrics: {e}")
+
+
+async def stop_on_disconnect(
+    request: Any,
+    source: AsyncIterator[Any],
+    endpoint: str = "default",
+) -> AsyncIterator[Any]:
+    """
+    Relay `source` until the HTTP client goes away, then close it.
+
+    Starlette only notices a dropped SSE client when a write fails, and leaves the
+    body generator to be garbage collected, so an abandoned model stream can keep
+    generating. This checks `request.is_disconnected()` before every item and
+    always closes `source`, which propagates down to the model request.
+    """
+    try:
+        async for item in source:
+            if await request.is_disconnected():
+                logger.info(f"Client disconnected, cancelling {endpoint} stream")
+                get_metrics_collector().increment("stream_client_disconnects_total", tags={"endpoint": endpoint})
+                break
+            yield item
+    finally:
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -3,7 +3,8 @@ WebSocket manager for real-time communication.
 Handles generation progress, training updates, and streaming events.
 """
 
-from typing import Dict, Set, Optional, Callable, Any
+from typing import Dict, Set, Optional, Callable, Any, Iterable, Tuple
+from collections import deque
 from fastapi import WebSocket, WebSocketDisconnect
 import json
 import logging
@@ -24,10 +25,110 @@ class EventType(str, Enum):
     TRAINING_PROGRESS = "training.progress"
     TRAINING_COMPLETE = "training.complete"
     TRAINING_ERROR = "training.error"
+    REPO_INDEX_PROGRESS = "repo_index.progress"
     JOB_STATUS = "job.status"
     HEARTBEAT = "heartbeat"
 
 
+# Events where only the latest value matters: a pending, unsent message for
+# the same (type, job_id) is replaced instead of queueing another frame, and
+# they are dropped rather than disconnecting when a client's queue is full.
+COALESCABLE_EVENTS = {
+    EventType.GENERATION_PROGRESS.value,
+    EventType.TRAINING_PROGRESS.value,
+    EventType.HEARTBEAT.value,
+}
+
+# WebSocket close code 1013: "Try Again Later" (server overloaded for this client)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def _serialize(message: dict) -> str:
+    """Serialize a message the same way WebSocket.send_json does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _coalesce_key(message: dict) -> Optional[Tuple[str, Any]]:
+    message_type = message.get("type")
+    if message_type not in COALESCABLE_EVENTS:
+        return None
+    data = message.get("data") or {}
+    return message_type, data.get("job_id") if isinstance(data, dict) else None
+
+
+class ConnectionSender:
+    """
+    Bounded outgoing queue plus writer task for one WebSocket connection.
+    
+    Messages are enqueued pre-serialized, so a broadcast encodes JSON once no
+    matter how many sockets receive it, and a slow socket only delays itself.
+    """
+    
+    def __init__(self, websocket: WebSocket, max_queue_size: int, on_failure: Callable[[WebSocket, str], None]):
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self._on_failure = on_failure
+        # Entries are [coalesce_key, text]; lists so a pending entry can be updated in place
+        self._queue: deque = deque()
+        self._pending: Dict[Tuple[str, Any], list] = {}
+        self._wakeup = asyncio.Event()
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.task = asyncio.create_task(self._writer())
+    
+    def enqueue(self, text: str, coalesce_key: Optional[Tuple[str, Any]] = None) -> bool:
+        """
+        Queue a serialized message.
+        
+        Returns:
+            False if the queue overflowed with a message that cannot be dropped
+        """
+        if coalesce_key is not None:
+            entry = self._pending.get(coalesce_key)
+            if entry is not None:
+                entry[1] = text
+                self.coalesced += 1
+                return True
+        
+        if len(self._queue) >= self.max_queue_size:
+            if coalesce_key is not None:
+                self.dropped += 1
+                return True
+            return False
+        
+        entry = [coalesce_key, text]
+        self._queue.append(entry)
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = entry
+        self._wakeup.set()
+        return True
+    
+    async def _writer(self):
+        try:
+            while True:
+                while not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                entry = self._queue.popleft()
+                coalesce_key, text = entry
+                if coalesce_key is not None and self._pending.get(coalesce_key) is entry:
+                    del self._pending[coalesce_key]
+                await self.websocket.send_text(text)
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self._on_failure(self.websocket, f"send failed: {e}")
+    
+    def cancel(self):
+        self.task.cancel()
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+
 class WebSocketManager:
     """
     Manages WebSocket connections and event broadcasting.
@@ -38,14 +139,19 @@ class WebSocketManager:
     - Event broadcasting
     - Heartbeat mechanism
     - Automatic reconnection handling
+    
+    Each connection gets a ConnectionSender (bounded queue + writer task), so
+    broadcasts never wait on a slow client; a client whose queue overflows
+    with non-droppable events is disconnected.
     """
     
-    def __init__(self, heartbeat_interval: int = 30):
+    def __init__(self, heartbeat_interval: int = 30, max_queue_size: int = 256):
         """
         Initialize WebSocket manager.
         
         Args:
             heartbeat_interval: Heartbeat interval in seconds (default: 30)
+            max_queue_size: Max pending outgoing messages per connection (default: 256)
         """
         self.active_connections: Dict[str, Set[WebSocket]] = {}  # room_id -> set of connections
         self.connection_rooms: Dict[WebSocket, Set[str]] = {}  # connection -> set of room_ids
@@ -54,6 +160,9 @@ class WebSocketManager:
         self.heartbeat_tasks: Dict[WebSocket, asyncio.Task] = {}  # connection -> heartbeat task
         self.event_handlers: Dict[EventType, Set[Callable]] = {}  # event_type -> handlers
         self._heartbeat_running = False
+        self.max_queue_size = max_queue_size
+        self.senders: Dict[WebSocket, ConnectionSender] = {}  # connection -> outgoing queue
+        self.slow_consumer_disconnects = 0
     
     async def connect(
         self, 
@@ -71,6 +180,13 @@ class WebSocketManager:
             metadata: Optional connection metadata
             authenticated: Whether connection is authenticated
         """
+        if websocket in self.senders:
+            # Already accepted (e.g. "subscribe" message): just join the room
+            self.active_connections.setdefault(room_id, set()).add(websocket)
+            self.connection_rooms.setdefault(websocket, set()).add(room_id)
+            logger.info(f"📡 [WEBSOCKET] Existing connection joined room '{room_id}'")
+            return
+        
         logger.info(f"📡 [WEBSOCKET] ========== CONNECTION STARTED ==========")
         logger.info(f"📡 [WEBSOCKET] Step 1: Accepting WebSocket connection")
         logger.info(f"📡 [WEBSOCKET] Step 1.1: room_id={room_id}, authenticated={authenticated}, has_metadata={bool(metadata)}")
@@ -101,6 +217,9 @@ class WebSocketManager:
         self.connection_metadata[websocket]["last_heartbeat"] = time.time()
         logger.info(f"📡 [WEBSOCKET] Step 4.1: Metadata stored")
         
+        # Start outgoing queue writer
+        self.senders[websocket] = ConnectionSender(websocket, self.max_queue_size, self._on_send_failure)
+        
         # Start heartbeat task
         logger.info(f"📡 [WEBSOCKET] Step 5: Starting heartbeat task")
         self.heartbeat_tasks[websocket] = asyncio.create_task(
@@ -123,6 +242,11 @@ class WebSocketManager:
             self.heartbeat_tasks[websocket].cancel()
             del self.heartbeat_tasks[websocket]
         
+        # Stop the writer (drops anything still queued)
+        sender = self.senders.pop(websocket, None)
+        if sender:
+            sender.cancel()
+        
         # Remove from all rooms
         if websocket in self.connection_rooms:
             for room_id in self.connection_rooms[websocket]:
@@ -164,6 +288,50 @@ class WebSocketManager:
             logger.error(f"Heartbeat loop error: {e}")
             self.disconnect(websocket)
     
+    def _on_send_failure(self, websocket: WebSocket, reason: str):
+        """Called by a writer task when sending to its socket fails."""
+        logger.warning(f"📡 [WEBSOCKET] Dropping connection: {reason}")
+        self.disconnect(websocket)
+    
+    def _disconnect_slow_consumer(self, websocket: WebSocket):
+        """Disconnect a client whose outgoing queue overflowed."""
+        self.slow_consumer_disconnects += 1
+        logger.warning(
+            f"📡 [WEBSOCKET] Slow consumer disconnected: queue exceeded {self.max_queue_size} messages"
+        )
+        self.disconnect(websocket)
+        
+        async def _close():
+            try:
+                await asyncio.wait_for(
+                    websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Slow consumer"),
+                    timeout=5
+                )
+            except Exception:
+                pass
+        
+        asyncio.create_task(_close())
+    
+    def _fan_out(self, message: dict, connections: Iterable[WebSocket]) -> int:
+        """
+        Serialize once and enqueue on every connection's sender.
+        
+        Returns:
+            Number of connections the message was queued for
+        """
+        text = _serialize(message)
+        coalesce_key = _coalesce_key(message)
+        queued = 0
+        for connection in list(connections):
+            sender = self.senders.get(connection)
+            if sender is None:
+                continue
+            if sender.enqueue(text, coalesce_key):
+                queued += 1
+            else:
+                self._disconnect_slow_consumer(connection)
+        return queued
+    
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """
         Send message to a specific connection.
@@ -172,6 +340,10 @@ class WebSocketManager:
             message: Message dictionary
             websocket: Target WebSocket connection
         """
+        if websocket in self.senders:
+            self._fan_out(message, (websocket,))
+            return
+        
         try:
             await websocket.send_json(message)
         except Exception as e:
@@ -182,34 +354,39 @@ class WebSocketManager:
         """
         Broadcast message to all connections in a room.
         
+        Messages are queued per connection and written by each connection's
+        writer task, so this never waits on a slow client.
+        
         Args:
             message: Message dictionary
             room_id: Room identifier
         """
-        logger.info(f"📡 [WEBSOCKET] Step 4.1.1: Broadcasting to room: {room_id}")
-        if room_id not in self.active_connections:
-            logger.warning(f"📡 [WEBSOCKET] Step 4.1.2: Room '{room_id}' not found, no connections to broadcast to")
+        connections = self.active_connections.get(room_id)
+        if not connections:
+            logger.debug(f"📡 [WEBSOCKET] Room '{room_id}' not found, no connections to broadcast to")
             return
         
-        connections = list(self.active_connections[room_id])
-        logger.info(f"📡 [WEBSOCKET] Step 4.1.2: Broadcasting to {len(connections)} connections in room '{room_id}'")
-        
-        disconnected = []
-        for idx, connection in enumerate(connections):
-            try:
-                await connection.send_json(message)
-                logger.debug(f"📡 [WEBSOCKET] Step 4.1.2.{idx+1}: Message sent to connection {idx+1}/{len(connections)}")
-            except Exception as e:
-                logger.error(f"📡 [WEBSOCKET] Step 4.1.2.{idx+1}.ERROR: Error broadcasting to room '{room_id}': {e}", exc_info=True)
-                disconnected.append(connection)
-        
-        # Clean up disconnected connections
-        if disconnected:
-            logger.warning(f"📡 [WEBSOCKET] Step 4.1.3: Cleaning up {len(disconnected)} disconnected connections")
-            for connection in disconnected:
-                self.disconnect(connection)
-        else:
-            logger.info(f"📡 [WEBSOCKET] Step 4.1.3: All {len(connections)} connections received message successfully")
+        queued = self._fan_out(message, connections)
+        logger.debug(f"📡 [WEBSOCKET] Queued {message.get('type')} for {queued} connections in room '{room_id}'")
+    
+    async def broadcast_to_all(self, message: dict):
+        """Broadcast message once to every connection, regardless of how many rooms it joined."""
+        queued = self._fan_out(message, list(self.senders.keys()))
+        logger.debug(f"📡 [WEBSOCKET] Queued {message.get('type')} for {queued} connections")
+    
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Outgoing queue statistics across all connections."""
+        senders = list(self.senders.values())
+        return {
+            "connections": len(senders),
+            "max_queue_size": self.max_queue_size,
+            "queued": sum(sender.queue_depth for sender in senders),
+            "max_depth": max((sender.queue_depth for sender in senders), default=0),
+            "sent": sum(sender.sent for sender in senders),
+            "coalesced": sum(sender.coalesced for sender in senders),
+            "dropped": sum(sender.dropped for sender in senders),
+            "slow_consumer_disconnects": self.slow_consumer_disconnects,
+        }
     
     async def emit_event(self, event_type: EventType, data: dict, room_id: Optional[str] = None):
         """
@@ -220,41 +397,23 @@ class WebSocketManager:
             data: Event data
             room_id: Optional room identifier (broadcasts to all if None)
         """
-        logger.info(f"📡 [WEBSOCKET] ========== EMIT EVENT ==========")
-        logger.info(f"📡 [WEBSOCKET] Step 1: Event type={event_type.value}, room_id={room_id}, data_keys={list(data.keys())}")
-        
         message = {
             "type": event_type.value,
             "data": data,
             "timestamp": datetime.now().isoformat()
         }
-        logger.info(f"📡 [WEBSOCKET] Step 2: Message built: type={event_type.value}, data_size={len(str(data))}")
         
         # Call registered event handlers
-        logger.info(f"📡 [WEBSOCKET] Step 3: Calling event handlers")
-        if event_type in self.event_handlers:
-            handler_count = len(self.event_handlers[event_type])
-            logger.info(f"📡 [WEBSOCKET] Step 3.1: {handler_count} handlers registered for {event_type.value}")
-            for idx, handler in enumerate(self.event_handlers[event_type]):
-                try:
-                    await handler(event_type, data, room_id)
-                    logger.info(f"📡 [WEBSOCKET] Step 3.{idx+2}: Handler {idx+1} executed successfully")
-                except Exception as e:
-                    logger.error(f"📡 [WEBSOCKET] Step 3.{idx+2}.ERROR: Event handler error: {e}", exc_info=True)
-        else:
-            logger.info(f"📡 [WEBSOCKET] Step 3.1: No handlers registered for {event_type.value}")
+        for handler in list(self.event_handlers.get(event_type, ())):
+            try:
+                await handler(event_type, data, room_id)
+            except Exception as e:
+                logger.error(f"📡 [WEBSOCKET] Event handler error for {event_type.value}: {e}", exc_info=True)
         
-        logger.info(f"📡 [WEBSOCKET] Step 4: Broadcasting message")
         if room_id:
-            logger.info(f"📡 [WEBSOCKET] Step 4.1: Broadcasting to room: {room_id}")
             await self.broadcast_to_room(message, room_id)
         else:
-            # Broadcast to all connections
-            rooms = list(self.active_connections.keys())
-            logger.info(f"📡 [WEBSOCKET] Step 4.1: Broadcasting to all {len(rooms)} rooms")
-            for room in rooms:
-                await self.broadcast_to_room(message, room)
-        logger.info(f"📡 [WEBSOCKET] ========== EMIT EVENT COMPLETE ==========")
+            await self.broadcast_to_all(message)
     
     def register_event_handler(self, event_type: EventType, handler: Callable):
         """
@@ -424,6 +583,17 @@ class WebSocketManager:
             },
             room_id=job_id
         )
+    
+    async def emit_repo_index_progress(self, repo_id: str, progress: float, message: str = ""):
+        """Emit repository indexing progress event (broadcast, one stream per repo_id)."""
+        await self.emit_event(
+            EventType.REPO_INDEX_PROGRESS,
+            {
+                "repo_id": repo_id,
+                "progress": progress,
+                "message": message
+            }
+        )
 
 
 # Global WebSocket manager instance
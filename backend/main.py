@@ -17,7 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.openapi.utils import get_openapi
 import logging
 import sys
@@ -44,11 +44,8 @@ logger.info("✅ Logging configured to stdout")
 from datetime import datetime
 from typing import Dict, Any, Optional
 from backend.core.middleware import (
-    RequestIDMiddleware,
-    TimingMiddleware,
-    StructuredLoggingMiddleware,
     setup_rate_limiting,
-    setup_security_middleware,
+    setup_request_middleware,
     get_ip_ban_stats
 )
 from backend.core.config import settings
@@ -314,6 +311,16 @@ async def lifespan(app: FastAPI):
             logger.info("RAG auto-refresh stopped")
         except Exception as e:
             logger.error(f"Error stopping RAG: {e}")
+    try:
+        from backend.services.meeting_notes_index import get_meeting_notes_index
+        get_meeting_notes_index().stop_watching()
+    except Exception as e:
+        logger.error(f"Error stopping meeting notes watcher: {e}")
+    try:
+        from backend.core.logger import flush_log_summaries
+        flush_log_summaries()
+    except Exception as e:
+        logger.error(f"Error flushing log summaries: {e}")
     logger.info("Backend shutdown complete")
 
 async def run_background_analysis(user_project_dirs):
@@ -523,18 +530,14 @@ def mark_system_ready(message: str) -> None:
     logger.info(f"✅ [SYSTEM_STATUS] System marked as ready: {message}")
 
 
-# Custom middleware (order matters - last added is first executed)
-app.add_middleware(StructuredLoggingMiddleware)
-app.add_middleware(TimingMiddleware)
-app.add_middleware(RequestIDMiddleware)
-
 # Setup rate limiting
 limiter = setup_rate_limiting(app)
 
-# Setup security middleware (IP banning, trusted hosts)
-# This adds protection against vulnerability scanners and ensures
-# requests only come from trusted hosts (localhost, frontend, ngrok)
-ip_ban_manager = setup_security_middleware(app)
+# Request pipeline: IP banning, trusted hosts, request ID, timing/metrics and
+# structured logging as a single pure-ASGI layer (order matters - last added
+# is first executed, so this runs just inside CORS). Pure ASGI keeps streaming
+# endpoints (/api/generation/stream, /api/chat/agent/stream) unbuffered.
+ip_ban_manager = setup_request_middleware(app)
 
 # CORS middleware (OUTERMOST - must be added last in FastAPI/Starlette)
 # Supporting local development, Vercel, and dynamic ngrok tunnels
@@ -580,8 +583,13 @@ async def health_check() -> Dict[str, Any]:
     """Health check endpoint for monitoring."""
     from backend.core.cache import get_cache_manager
     from backend.core.metrics import get_metrics_collector
+    from ai.response_cache import get_response_cache
+    from backend.services.generation_queue import get_generation_queue
     
     cache_stats = get_cache_manager().get_stats()
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        cache_stats["llm_responses"] = response_cache.get_stats()
     metrics_stats = get_metrics_collector().get_stats()
     system_status = _get_system_status()
     
@@ -617,6 +625,7 @@ async def health_check() -> Dict[str, Any]:
         "last_updated": last_updated,
         "phases": formatted_phases,  # Use formatted phases
         "cache": cache_stats,
+        "generation_queue": get_generation_queue().get_stats(),
         "metrics": {
             "counters": len(metrics_stats.get("counters", {})),
             "gauges": len(metrics_stats.get("gauges", {})),
@@ -635,16 +644,19 @@ async def health_check() -> Dict[str, Any]:
     return response
 
 # Metrics endpoint
-@app.get("/metrics")
+@app.get("/metrics", response_class=PlainTextResponse)
 async def metrics_endpoint() -> str:
-    """Prometheus metrics endpoint."""
+    """Prometheus metrics endpoint (text exposition format)."""
     from backend.core.metrics import get_metrics_collector
     
     if not settings.metrics_enabled:
         return "# Metrics disabled"
     
     collector = get_metrics_collector()
-    return collector.export_prometheus()
+    return PlainTextResponse(
+        collector.export_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 # Metrics stats endpoint (JSON)
 @app.get("/api/metrics/stats")
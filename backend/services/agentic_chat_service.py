@@ -33,6 +33,7 @@ logger = get_logger(__name__)
 # Optional imports for Ollama (local models)
 try:
     from ai.ollama_client import OllamaClient
+    from ai.model_scheduler import RequestPriority
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
@@ -240,7 +241,8 @@ class AgenticChatService:
         self.kg_builder = get_kg_builder()
         self.pattern_miner = get_miner()
         self.user_projects = get_user_project_directories()
-        self.ollama_client = OllamaClient() if OLLAMA_AVAILABLE else None
+        # Interactive: chat requests are scheduled ahead of generation and background work
+        self.ollama_client = OllamaClient(default_priority=RequestPriority.INTERACTIVE) if OLLAMA_AVAILABLE else None
         
         logger.info(f"Agentic Chat Service initialized (Ollama: {'available' if self.ollama_client else 'not available'})")
     
@@ -779,10 +781,7 @@ class AgenticChatService:
                 notes_service = get_meeting_notes_service()
                 notes = notes_service.get_notes_by_folder(folder_id)
                 if notes:
-                    notes_context = "\n\n---\n\n".join([
-                        f"**{n.get('title', 'Meeting Note')}**\n{n.get('content', '')}"
-                        for n in notes
-                    ])
+                    notes_context = notes_service.get_folder_context(folder_id, with_headers=True)
                     logger.info(f"🤖 [AGENTIC_CHAT] Step 2.2: Loaded {len(notes)} meeting notes from folder: {folder_id} (total_length={len(notes_context)})")
                 else:
                     logger.warning(f"🤖 [AGENTIC_CHAT] Step 2.2: No notes found in folder {folder_id}")
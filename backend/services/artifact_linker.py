@@ -4,6 +4,11 @@ Artifact Dependency Service
 Manages cross-artifact relationships and dependency tracking.
 Enables detection of outdated downstream artifacts when upstream
 artifacts are modified.
+
+Persistence: data/artifact_links.json is a snapshot of the graph and
+data/artifact_links.journal.jsonl an append-only journal of node and link
+changes since that snapshot. Changes append one journal line; the journal is
+folded into a new snapshot once it reaches JOURNAL_COMPACT_ENTRIES lines.
 """
 
 import logging
@@ -16,6 +21,9 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Journal lines replayed on top of the snapshot before it is rewritten
+JOURNAL_COMPACT_ENTRIES = 500
+
 
 @dataclass
 class ArtifactLink:
@@ -148,39 +156,104 @@ class ArtifactLinker:
         """Initialize with optional persistence path."""
         self.storage_path = storage_path or Path("data/artifact_links.json")
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path = self.storage_path.with_name(f"{self.storage_path.stem}.journal.jsonl")
+        self._journal_entries = 0
         
         # In-memory graph
         self.nodes: Dict[str, ArtifactNode] = {}
         self.links: List[ArtifactLink] = []
         
+        # Adjacency indexes: target -> {source: link} and source -> {target: link}
+        self._upstream: Dict[str, Dict[str, ArtifactLink]] = {}
+        self._downstream: Dict[str, Dict[str, ArtifactLink]] = {}
+        self._ids_by_type: Dict[str, Set[str]] = {}
+        
+        # Staleness cache: reports of stale artifacts, refreshed only for dirty ids
+        self._stale: Dict[str, StalenessReport] = {}
+        self._dirty: Set[str] = set()
+        
         # Load from storage
         self._load()
+        self._dirty = set(self.nodes)
         
         logger.info(f"Artifact Linker initialized with {len(self.nodes)} nodes, {len(self.links)} links")
     
     def _load(self):
-        """Load graph from storage."""
+        """Load graph from the snapshot, then replay the journal."""
         if self.storage_path.exists():
             try:
                 data = json.loads(self.storage_path.read_text())
-                self.nodes = {
-                    k: ArtifactNode(**v) for k, v in data.get("nodes", {}).items()
-                }
-                self.links = [ArtifactLink(**l) for l in data.get("links", [])]
+                for node in data.get("nodes", {}).values():
+                    self._put_node(ArtifactNode(**node))
+                for link in data.get("links", []):
+                    self._put_link(ArtifactLink(**link))
             except Exception as e:
                 logger.warning(f"Failed to load artifact links: {e}")
+        
+        if self.journal_path.exists():
+            try:
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if not line.endswith("\n"):
+                            break  # Torn write at the end of the journal
+                        entry = json.loads(line)
+                        if entry["op"] == "node":
+                            self._put_node(ArtifactNode(**entry["data"]))
+                        elif entry["op"] == "link":
+                            self._put_link(ArtifactLink(**entry["data"]))
+                        self._journal_entries += 1
+            except Exception as e:
+                logger.warning(f"Failed to replay artifact link journal: {e}")
+            if self._journal_entries >= JOURNAL_COMPACT_ENTRIES:
+                self._compact()
+    
+    def _put_node(self, node: ArtifactNode):
+        """Insert or replace a node in the graph and the type index."""
+        previous = self.nodes.get(node.artifact_id)
+        if previous and previous.artifact_type != node.artifact_type:
+            self._ids_by_type.get(previous.artifact_type, set()).discard(node.artifact_id)
+        self.nodes[node.artifact_id] = node
+        self._ids_by_type.setdefault(node.artifact_type, set()).add(node.artifact_id)
+    
+    def _put_link(self, link: ArtifactLink) -> ArtifactLink:
+        """Add a link to the graph and adjacency indexes (existing source/target pairs are kept)."""
+        existing = self._downstream.get(link.source_id, {}).get(link.target_id)
+        if existing:
+            return existing
+        self.links.append(link)
+        self._downstream.setdefault(link.source_id, {})[link.target_id] = link
+        self._upstream.setdefault(link.target_id, {})[link.source_id] = link
+        return link
     
-    def _save(self):
-        """Save graph to storage."""
+    def _append_journal(self, op: str, data: Dict[str, Any]):
+        """Persist one change; compact into a snapshot when the journal is long."""
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"op": op, "data": data}) + "\n")
+            self._journal_entries += 1
+            if self._journal_entries >= JOURNAL_COMPACT_ENTRIES:
+                self._compact()
+        except Exception as e:
+            logger.warning(f"Failed to save artifact links: {e}")
+    
+    def _compact(self):
+        """Write the whole graph as the snapshot and start an empty journal."""
         try:
             data = {
                 "nodes": {k: v.to_dict() for k, v in self.nodes.items()},
                 "links": [l.to_dict() for l in self.links],
                 "updated_at": datetime.now().isoformat()
             }
-            self.storage_path.write_text(json.dumps(data, indent=2))
+            temp_path = self.storage_path.with_suffix(".json.tmp")
+            temp_path.write_text(json.dumps(data, indent=2))
+            temp_path.replace(self.storage_path)
+            # Replaying a journal on top of a snapshot that already has its changes is harmless,
+            # so a crash between these two steps loses nothing
+            self.journal_path.write_text("")
+            self._journal_entries = 0
+            logger.info(f"Compacted artifact links: {len(self.nodes)} nodes, {len(self.links)} links")
         except Exception as e:
-            logger.warning(f"Failed to save artifact links: {e}")
+            logger.warning(f"Failed to compact artifact links: {e}")
     
     def _compute_hash(self, content: str) -> str:
         """Compute content hash for change detection."""
@@ -209,6 +282,10 @@ class ArtifactLinker:
                 node.updated_at = now
                 node.version += 1
                 logger.info(f"Updated artifact {artifact_id} to version {node.version}")
+                self._append_journal("node", node.to_dict())
+                # Its own staleness and that of everything directly depending on it may change
+                self._dirty.add(artifact_id)
+                self._dirty.update(self._downstream.get(artifact_id, {}))
         else:
             # Create new
             node = ArtifactNode(
@@ -220,13 +297,14 @@ class ArtifactLinker:
                 version=1,
                 metadata=metadata or {}
             )
-            self.nodes[artifact_id] = node
+            self._put_node(node)
+            self._append_journal("node", node.to_dict())
+            self._dirty.add(artifact_id)
             logger.info(f"Registered new artifact {artifact_id}")
             
             # Auto-create dependency links based on type
             self._auto_link_artifact(node)
         
-        self._save()
         return node
     
     def _auto_link_artifact(self, node: ArtifactNode):
@@ -237,8 +315,8 @@ class ArtifactLinker:
         for upstream_type, deps in ARTIFACT_DEPENDENCIES.items():
             if artifact_type in deps["downstream"]:
                 # Find existing upstream artifacts
-                for upstream_id, upstream_node in self.nodes.items():
-                    if upstream_node.artifact_type == upstream_type:
+                for upstream_id in sorted(self._ids_by_type.get(upstream_type, ())):
+                    if upstream_id != node.artifact_id:
                         self.add_link(
                             source_id=upstream_id,
                             source_type=upstream_type,
@@ -257,38 +335,30 @@ class ArtifactLinker:
     ) -> ArtifactLink:
         """Add a link between artifacts."""
         # Check if link already exists
-        for link in self.links:
-            if link.source_id == source_id and link.target_id == target_id:
-                return link
+        existing = self._downstream.get(source_id, {}).get(target_id)
+        if existing:
+            return existing
         
-        link = ArtifactLink(
+        link = self._put_link(ArtifactLink(
             source_id=source_id,
             source_type=source_type,
             target_id=target_id,
             target_type=target_type,
             link_type=link_type
-        )
-        self.links.append(link)
-        self._save()
+        ))
+        self._append_journal("link", link.to_dict())
+        self._dirty.add(target_id)
         
         logger.info(f"Added link: {source_id} --[{link_type}]--> {target_id}")
         return link
     
     def get_upstream(self, artifact_id: str) -> List[ArtifactNode]:
         """Get all artifacts that this artifact depends on."""
-        upstream_ids = [
-            link.source_id for link in self.links
-            if link.target_id == artifact_id
-        ]
-        return [self.nodes[id] for id in upstream_ids if id in self.nodes]
+        return [self.nodes[id] for id in self._upstream.get(artifact_id, {}) if id in self.nodes]
     
     def get_downstream(self, artifact_id: str) -> List[ArtifactNode]:
         """Get all artifacts that depend on this artifact."""
-        downstream_ids = [
-            link.target_id for link in self.links
-            if link.source_id == artifact_id
-        ]
-        return [self.nodes[id] for id in downstream_ids if id in self.nodes]
+        return [self.nodes[id] for id in self._downstream.get(artifact_id, {}) if id in self.nodes]
     
     def check_staleness(self, artifact_id: str) -> StalenessReport:
         """
@@ -358,13 +428,21 @@ class ArtifactLinker:
         )
     
     def get_all_stale_artifacts(self) -> List[StalenessReport]:
-        """Get all artifacts that are stale."""
-        stale = []
-        for artifact_id in self.nodes:
+        """
+        Get all artifacts that are stale.
+        
+        Only artifacts whose own hash or an upstream hash changed since the
+        last call (or that gained a link) are re-checked; the rest come from
+        the cached reports.
+        """
+        for artifact_id in self._dirty:
             report = self.check_staleness(artifact_id)
             if report.is_stale:
-                stale.append(report)
-        return stale
+                self._stale[artifact_id] = report
+            else:
+                self._stale.pop(artifact_id, None)
+        self._dirty.clear()
+        return list(self._stale.values())
     
     def get_dependency_tree(self, artifact_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -386,10 +464,9 @@ class ArtifactLinker:
     
     def _find_roots(self) -> List[str]:
         """Find root nodes (no upstream dependencies)."""
-        all_targets = {link.target_id for link in self.links}
         return [
             node_id for node_id in self.nodes
-            if node_id not in all_targets
+            if not self._upstream.get(node_id)
         ]
     
     def _build_subtree(self, artifact_id: str, visited: Set[str]) -> Dict[str, Any]:
@@ -0,0 +1,329 @@
+"""
+Artifact Store - Indexed, queryable copy of artifact versions for listing.
+
+VersionService keeps the full version history in data/versions/*.json and
+writes every change through to this store. Listing artifacts used to rebuild
+the response from scratch on every call (walk every job, every version of
+every artifact, clean every body); the store answers it with one indexed
+query instead:
+
+- one row per artifact version in the `artifact_versions` table of the main
+  database (backend/core/database.py), indexed on folder_id, artifact_type
+  and is_current
+- content is cleaned with ArtifactCleaner once, at write time, and stored
+  next to the raw content
+- list queries return metadata rows (optionally paged); bodies are only read
+  when asked for, or fetched per artifact with get()
+
+The JSON history stays the source of truth: on startup VersionService calls
+sync() to reconcile the table with it.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import (
+    JSON, Boolean, Column, Float, Index, Integer, MetaData, String, Table, Text,
+    and_, delete, exists, func, insert, select, update,
+)
+from sqlalchemy.engine import Engine
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Folder assigned to artifacts saved without a meeting notes folder
+ORPHAN_FOLDER = "Orphaned Artifacts"
+
+metadata = MetaData()
+
+artifact_versions = Table(
+    "artifact_versions",
+    metadata,
+    Column("artifact_id", String, primary_key=True),
+    Column("version", Integer, primary_key=True),
+    Column("artifact_type", String, nullable=False),
+    Column("folder_id", String, nullable=False),
+    Column("is_current", Boolean, nullable=False, default=False),
+    Column("created_at", String, nullable=False),
+    Column("score", Float),
+    Column("model_used", String),
+    Column("attempts", JSON),
+    Column("content_length", Integer, nullable=False, default=0),
+    Column("content", Text, nullable=False, default=""),
+    Column("cleaned_content", Text, nullable=False, default=""),
+    Column("html_content", Text),
+    Index("ix_artifact_versions_folder_id", "folder_id"),
+    Index("ix_artifact_versions_artifact_type", "artifact_type"),
+    Index("ix_artifact_versions_is_current", "is_current"),
+)
+
+_metadata_columns = [
+    artifact_versions.c.artifact_id,
+    artifact_versions.c.version,
+    artifact_versions.c.artifact_type,
+    artifact_versions.c.folder_id,
+    artifact_versions.c.is_current,
+    artifact_versions.c.created_at,
+    artifact_versions.c.score,
+    artifact_versions.c.model_used,
+    artifact_versions.c.attempts,
+    artifact_versions.c.content_length,
+    (artifact_versions.c.html_content.isnot(None)).label("has_html"),
+]
+_content_columns = [artifact_versions.c.cleaned_content, artifact_versions.c.html_content]
+
+
+def _clean(content: str, artifact_type: str) -> str:
+    """Clean artifact content using the centralized ArtifactCleaner service."""
+    from backend.services.artifact_cleaner import get_cleaner
+    try:
+        return get_cleaner().clean_artifact(content, artifact_type)
+    except Exception as e:
+        logger.warning(f"⚠️ [ARTIFACT_STORE] Failed to clean artifact content: {e}")
+        return content
+
+
+def _row_for(version: Dict[str, Any]) -> Dict[str, Any]:
+    """Table row for a VersionService version dict."""
+    version_metadata = version.get("metadata") or {}
+    artifact_type = version.get("artifact_type") or "unknown"
+    content = version.get("content") or ""
+    return {
+        "artifact_id": version["artifact_id"],
+        "version": int(version.get("version", 1)),
+        "artifact_type": artifact_type,
+        "folder_id": version_metadata.get("folder_id") or version.get("folder_id") or ORPHAN_FOLDER,
+        "is_current": bool(version.get("is_current", False)),
+        "created_at": version.get("created_at") or datetime.now().isoformat(),
+        "score": version_metadata.get("validation_score"),
+        "model_used": version_metadata.get("model_used"),
+        "attempts": version_metadata.get("attempts"),
+        "content_length": len(content),
+        "content": content,
+        "cleaned_content": _clean(content, artifact_type),
+        "html_content": version_metadata.get("html_content") or None,
+    }
+
+
+class ArtifactStore:
+    """
+    Artifact versions in an indexed SQL table.
+
+    Usage:
+        store = get_artifact_store()
+        store.put_version(version)                       # from VersionService
+        page = store.list_artifacts(folder_id="sprint-12", limit=20)
+        artifact = store.get("sprint-12::mermaid_erd")   # cleaned content
+    """
+
+    def __init__(self, engine: Optional[Engine] = None):
+        """
+        Args:
+            engine: SQLAlchemy engine (defaults to the application database)
+        """
+        if engine is None:
+            from backend.core.database import engine
+        self.engine = engine
+        if self.engine.url.get_backend_name() == "sqlite" and self.engine.url.database not in (None, "", ":memory:"):
+            Path(self.engine.url.database).parent.mkdir(parents=True, exist_ok=True)
+        metadata.create_all(self.engine, tables=[artifact_versions])
+
+    def put_version(self, version: Dict[str, Any]):
+        """Insert or replace one version; a current version demotes the artifact's others."""
+        row = _row_for(version)
+        table = artifact_versions
+        with self.engine.begin() as conn:
+            if row["is_current"]:
+                conn.execute(
+                    update(table)
+                    .where(and_(table.c.artifact_id == row["artifact_id"], table.c.is_current.is_(True)))
+                    .values(is_current=False)
+                )
+            conn.execute(delete(table).where(and_(
+                table.c.artifact_id == row["artifact_id"], table.c.version == row["version"]
+            )))
+            conn.execute(insert(table), [row])
+
+    def replace_artifact(self, artifact_id: str, versions: List[Dict[str, Any]]):
+        """Replace every stored version of an artifact (after trimming or migration)."""
+        # Keyed by version number: histories written before numbering followed the
+        # latest version can repeat a number, the later entry wins
+        rows = list({
+            row["version"]: row
+            for row in (_row_for({**version, "artifact_id": artifact_id}) for version in versions)
+        }.values())
+        with self.engine.begin() as conn:
+            conn.execute(delete(artifact_versions).where(artifact_versions.c.artifact_id == artifact_id))
+            if rows:
+                conn.execute(insert(artifact_versions), rows)
+
+    def delete_artifact(self, artifact_id: str) -> int:
+        """Remove all versions of an artifact. Returns the number of rows deleted."""
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(artifact_versions).where(artifact_versions.c.artifact_id == artifact_id))
+        return result.rowcount
+
+    def prune_artifact(self, artifact_id: str, oldest_version: int) -> int:
+        """Remove versions older than `oldest_version` (trimmed from the history)."""
+        table = artifact_versions
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(table).where(and_(
+                table.c.artifact_id == artifact_id, table.c.version < oldest_version
+            )))
+        return result.rowcount
+
+    def sync(
+        self,
+        versions: Dict[str, List[Dict[str, Any]]],
+        load: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+    ) -> Dict[str, int]:
+        """
+        Reconcile the table with VersionService's history.
+
+        Only artifacts whose version numbers differ from what is stored are
+        rewritten, so a restart with an up-to-date table cleans nothing.
+
+        Args:
+            versions: artifact_id -> version dicts (only "version" is compared)
+            load: Returns an artifact's versions with content for rewriting
+                  (defaults to the lists in `versions`)
+        """
+        with self.engine.connect() as conn:
+            stored: Dict[str, set] = {}
+            for artifact_id, version in conn.execute(
+                select(artifact_versions.c.artifact_id, artifact_versions.c.version)
+            ):
+                stored.setdefault(artifact_id, set()).add(version)
+
+        rewritten = 0
+        for artifact_id, artifact_versions_list in versions.items():
+            expected = {int(v.get("version", 1)) for v in artifact_versions_list}
+            if stored.get(artifact_id) != expected:
+                self.replace_artifact(artifact_id, load(artifact_id) if load else artifact_versions_list)
+                rewritten += 1
+
+        removed = 0
+        for artifact_id in stored.keys() - versions.keys():
+            self.delete_artifact(artifact_id)
+            removed += 1
+
+        if rewritten or removed:
+            logger.info(f"🗄️ [ARTIFACT_STORE] Synced: {rewritten} artifacts rewritten, {removed} removed")
+        return {"rewritten": rewritten, "removed": removed}
+
+    def _filtered(self, query, folder_id: Optional[str], artifact_type: Optional[str], all_versions: bool):
+        table = artifact_versions
+        if folder_id:
+            query = query.where(table.c.folder_id == folder_id)
+        if artifact_type:
+            query = query.where(table.c.artifact_type == artifact_type)
+        if not all_versions:
+            # Latest current version per (folder, type): no newer current row in the same group
+            newer = table.alias("newer")
+            query = query.where(table.c.is_current.is_(True)).where(~exists().where(and_(
+                newer.c.is_current.is_(True),
+                newer.c.folder_id == table.c.folder_id,
+                newer.c.artifact_type == table.c.artifact_type,
+                newer.c.created_at > table.c.created_at,
+            )))
+        return query
+
+    def list_artifacts(
+        self,
+        folder_id: Optional[str] = None,
+        artifact_type: Optional[str] = None,
+        all_versions: bool = False,
+        include_content: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        List artifacts, newest first.
+
+        Args:
+            folder_id: Only artifacts of this meeting notes folder
+            artifact_type: Only artifacts of this type
+            all_versions: Every version instead of the latest artifact per folder and type
+            include_content: Add cleaned content and HTML to each entry
+            limit: Page size (None for everything)
+            offset: Entries to skip
+
+        Returns:
+            Artifact dicts in the /artifacts response format
+        """
+        columns = _metadata_columns + (_content_columns if include_content else [])
+        query = self._filtered(select(*columns), folder_id, artifact_type, all_versions)
+        query = query.order_by(artifact_versions.c.created_at.desc(), artifact_versions.c.artifact_id)
+        if limit is not None:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).mappings().all()
+        return [self._to_artifact(row, all_versions) for row in rows]
+
+    def count(self, folder_id: Optional[str] = None, artifact_type: Optional[str] = None,
+              all_versions: bool = False) -> int:
+        """Number of entries list_artifacts() would return without paging."""
+        query = self._filtered(select(func.count()).select_from(artifact_versions),
+                               folder_id, artifact_type, all_versions)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar_one()
+
+    def get(self, artifact_id: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """An artifact with its cleaned content (current version unless `version` is given)."""
+        table = artifact_versions
+        query = select(*_metadata_columns, *_content_columns).where(table.c.artifact_id == artifact_id)
+        if version is not None:
+            query = query.where(table.c.version == version)
+        else:
+            query = query.order_by(table.c.is_current.desc(), table.c.version.desc()).limit(1)
+
+        with self.engine.connect() as conn:
+            row = conn.execute(query).mappings().first()
+        return self._to_artifact(row, version is not None) if row else None
+
+    @staticmethod
+    def _to_artifact(row, with_version: bool) -> Dict[str, Any]:
+        artifact = {
+            "id": row["artifact_id"],
+            "type": row["artifact_type"],
+            "created_at": row["created_at"],
+            "updated_at": row["created_at"],
+            "folder_id": row["folder_id"],
+            "content_length": row["content_length"],
+            "has_html": bool(row["has_html"]),
+        }
+        if "cleaned_content" in row:
+            artifact["content"] = row["cleaned_content"]
+            if row["html_content"]:
+                artifact["html_content"] = row["html_content"]
+        if with_version:
+            artifact["version"] = row["version"]
+            artifact["is_current"] = bool(row["is_current"])
+        if row["score"] is not None:
+            artifact["score"] = row["score"]
+        if row["model_used"] is not None:
+            artifact["model_used"] = row["model_used"]
+        if row["attempts"] is not None:
+            artifact["attempts"] = row["attempts"]
+        return artifact
+
+
+# Global instance
+_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get or create the global Artifact Store instance."""
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
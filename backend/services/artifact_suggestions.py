@@ -415,7 +415,7 @@ class SuggestionEngine:
             "mermaid_sequence": ["mermaid_erd", "mermaid_architecture"],
             "api_docs": ["mermaid_erd"],
             "code_prototype": ["mermaid_erd", "api_docs"],
-            "dev_visual_prototype": ["api_docs"],
+            "dev_visual_prototype": ["api_docs", "code_prototype"],
             "mermaid_class": ["mermaid_erd"],
             "mermaid_state": ["mermaid_erd"],
             "jira": ["mermaid_architecture"],
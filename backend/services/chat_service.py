@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Optional, AsyncGenerator
 import logging
 from datetime import datetime
 import asyncio
+import json
+import time
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -21,6 +23,7 @@ from backend.core.config import settings
 from backend.core.logger import get_logger
 from backend.core.metrics import get_metrics_collector, timed
 from backend.core.cache import cached
+from backend.core.prompt_layout import PromptLayout, Stability, is_prefix_stable
 from config.artifact_model_mapping import get_artifact_mapper, ArtifactType
 
 logger = get_logger(__name__)
@@ -29,6 +32,7 @@ metrics = get_metrics_collector()
 # Optional imports for Ollama
 try:
     from ai.ollama_client import OllamaClient
+    from ai.model_scheduler import RequestPriority
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
@@ -60,7 +64,8 @@ class ProjectAwareChatService:
         self.rag_retriever = get_retriever()
         self.kg_builder = get_kg_builder()
         self.pattern_miner = get_miner()
-        self.ollama_client = OllamaClient() if OLLAMA_AVAILABLE else None
+        # Interactive: chat requests are scheduled ahead of generation and background work
+        self.ollama_client = OllamaClient(default_priority=RequestPriority.INTERACTIVE) if OLLAMA_AVAILABLE else None
         self.artifact_mapper = get_artifact_mapper()
         
         # Enhanced context settings (from centralized config)
@@ -98,6 +103,7 @@ class ProjectAwareChatService:
             Dictionary with response chunks or final response
         """
         metrics.increment("chat_requests_total")
+        request_start = time.perf_counter()
         logger.info(f"💬 [CHAT] ========== CHAT REQUEST STARTED ==========")
         logger.info(f"💬 [CHAT] Step 1: Initializing chat request")
         logger.info(f"💬 [CHAT] Step 1.1: Message length={len(message)}, has_history={bool(conversation_history)}, include_project_context={include_project_context}")
@@ -113,6 +119,10 @@ class ProjectAwareChatService:
         # Build comprehensive project context
         project_context = ""
         meeting_notes_context = ""
+        # Prefix-stable layout: overview and notes are passed to _build_prompt separately
+        prefix_stable = is_prefix_stable()
+        project_overview = ""
+        session_notes = ""
         logger.info(f"💬 [CHAT] Step 2: Building project context")
         
         # Include meeting notes if provided (either directly or by folder_id)
@@ -128,10 +138,7 @@ class ProjectAwareChatService:
                 notes_service = get_meeting_notes_service()
                 notes = notes_service.get_notes_by_folder(folder_id)
                 if notes:
-                    meeting_notes_context = "\n\n---\n\n".join([
-                        f"**{n.get('title', 'Meeting Note')}**\n{n.get('content', '')}"
-                        for n in notes
-                    ])
+                    meeting_notes_context = notes_service.get_folder_context(folder_id, with_headers=True)
                     logger.info(f"💬 [CHAT] Step 2.1.3: Loaded {len(notes)} meeting notes from folder: {folder_id} (total_length={len(meeting_notes_context)})")
                 else:
                     logger.warning(f"💬 [CHAT] Step 2.1.3: No notes found in folder {folder_id}")
@@ -249,8 +256,12 @@ class ProjectAwareChatService:
                 
                 # Include meeting notes context (most important for user's specific project)
                 if meeting_notes_context:
-                    # Put meeting notes FIRST as it's the most relevant context
-                    project_context_parts.insert(0, f"## Meeting Notes (Your Project Requirements):\n{meeting_notes_context}\n")
+                    notes_block = f"## Meeting Notes (Your Project Requirements):\n{meeting_notes_context}\n"
+                    if prefix_stable:
+                        session_notes = notes_block
+                    else:
+                        # Put meeting notes FIRST as it's the most relevant context
+                        project_context_parts.insert(0, notes_block)
                 
                 # Add PROJECT OVERVIEW from Universal Context (Wikipedia-like knowledge)
                 if universal_ctx:
@@ -282,9 +293,12 @@ class ProjectAwareChatService:
                         for kf in project_map.get("key_files", [])[:10]:
                             overview_parts.append(f"  - `{Path(kf).name}`")
                     
-                    # Insert at position 1 (after meeting notes if present, or first)
-                    insert_pos = 1 if meeting_notes_context else 0
-                    project_context_parts.insert(insert_pos, "\n".join(overview_parts) + "\n")
+                    if prefix_stable:
+                        project_overview = "\n".join(overview_parts) + "\n"
+                    else:
+                        # Insert at position 1 (after meeting notes if present, or first)
+                        insert_pos = 1 if meeting_notes_context else 0
+                        project_context_parts.insert(insert_pos, "\n".join(overview_parts) + "\n")
                 
                 project_context = "\n".join(project_context_parts)
                 logger.info(f"💬 [CHAT] Step 2.3: Project context built: {len(project_context)} chars, {len(rag_results) if rag_results else 0} RAG snippets, has_meeting_notes={bool(meeting_notes_context)}, has_universal={bool(universal_ctx)}")
@@ -299,7 +313,11 @@ class ProjectAwareChatService:
         logger.info(f"💬 [CHAT] Step 3.1: System message built: length={len(system_message)}")
         
         # Build prompt with conversation history AND session context
-        prompt = self._build_prompt(message, conversation_history, project_context, session_id)
+        prompt = self._build_prompt(
+            message, conversation_history, project_context, session_id,
+            project_overview=project_overview,
+            session_notes=session_notes
+        )
         logger.info(f"💬 [CHAT] Step 3.2: Prompt built: length={len(prompt)}")
         
         # Calculate and log context sizes for debugging
@@ -347,6 +365,23 @@ class ProjectAwareChatService:
                     await self.ollama_client.ensure_model_available(model_base_name)
                     logger.info(f"💬 [CHAT] Step 5.{model_idx + 1}.2: Model {model_base_name} is available")
                     
+                    if stream:
+                        # Real token streaming: chunks are relayed as Ollama produces them.
+                        # _relay_stream raises (so we fall through to the next model) only
+                        # if nothing has been sent yet.
+                        logger.info(f"💬 [CHAT] Step 5.{model_idx + 1}.3: Streaming with {model_base_name} (temperature=0.7, num_ctx={settings.local_model_context_window})")
+                        async for event in self._relay_stream(
+                            self._ollama_text_stream(model_base_name, prompt, system_message),
+                            provider="ollama",
+                            model=model_base_name,
+                            request_start=request_start,
+                            min_chars=20,
+                            first_output_timeout=settings.generation_timeout
+                        ):
+                            yield event
+                        logger.info(f"💬 [CHAT] Step 5.{model_idx + 1}.4: Chat stream finished with {model_base_name}")
+                        return  # Critical: return immediately after streaming complete
+                    
                     # Try Ollama generation with context window from config
                     logger.info(f"💬 [CHAT] Step 5.{model_idx + 1}.3: Generating with {model_base_name} (temperature=0.7, num_ctx={settings.local_model_context_window})")
                     response = await asyncio.wait_for(
@@ -363,34 +398,13 @@ class ProjectAwareChatService:
                     
                     if response.success and response.content and len(response.content.strip()) > 20:
                         logger.info(f"💬 [CHAT] Step 5.{model_idx + 1}.5: Chat successful with {model_base_name}, returning response")
-                        if stream:
-                            # Stream character by character for effect
-                            content = response.content
-                            chunk_size = max(10, len(content) // 50)  # Dynamic chunk size
-                            for i in range(0, len(content), chunk_size):
-                                yield {
-                                    "type": "chunk",
-                                    "content": content[i:i+chunk_size],
-                                    "model": model_base_name,
-                                    "provider": "ollama"
-                                }
-                                await asyncio.sleep(0.02)  # Faster streaming
-                            # Send complete signal
-                            yield {
-                                "type": "complete",
-                                "content": content,
-                                "model": model_base_name,
-                                "provider": "ollama"
-                            }
-                            return  # Critical: return immediately after streaming complete
-                        else:
-                            yield {
-                                "type": "complete",
-                                "content": response.content,
-                                "model": model_base_name,
-                                "provider": "ollama"
-                            }
-                            return  # Critical: return immediately after non-streaming complete
+                        yield {
+                            "type": "complete",
+                            "content": response.content,
+                            "model": model_base_name,
+                            "provider": "ollama"
+                        }
+                        return  # Critical: return immediately after non-streaming complete
                     else:
                         logger.warning(f"💬 [CHAT] Step 5.{model_idx + 1}.5: Model {model_base_name} returned empty/short response, trying next...")
                 except asyncio.TimeoutError:
@@ -406,7 +420,8 @@ class ProjectAwareChatService:
                 message=message,
                 system_message=system_message,
                 prompt=prompt,
-                stream=stream
+                stream=stream,
+                request_start=request_start
             )
             logger.info(f"💬 [CHAT] Step 6.2: Cloud chat response received")
             
@@ -730,7 +745,9 @@ When answering:
         message: str,
         conversation_history: Optional[List[Any]],
         project_context: str,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        project_overview: str = "",
+        session_notes: str = ""
     ) -> str:
         """
         Build chat prompt with COMPREHENSIVE history and context.
@@ -739,26 +756,36 @@ When answering:
         1. Include more conversation history (15 messages, not 5)
         2. Summarize older conversation if too long
         3. Retain semantic memory from past interactions
+        
+        With the prefix-stable layout (settings.prompt_layout) the project
+        overview and meeting notes are passed separately and the prompt is
+        ordered overview -> notes -> conversation -> retrieved context ->
+        question, so each turn shares the previous turn's prefix up to the new
+        messages. Otherwise project_context (which then contains the overview
+        and notes) comes first, as before.
         """
-        parts = []
+        layout = PromptLayout()
+        # Retrieved snippets change with every question: after the conversation
+        # in the prefix-stable layout, first otherwise
+        context_stability = Stability.REQUEST if is_prefix_stable() else Stability.PROJECT
+        
+        layout.add(Stability.PROJECT, project_overview)
         
         # Add project context first (most important)
         if project_context:
-            parts.append("## Project Context (Your Codebase):")
-            parts.append(project_context)
-            parts.append("")
+            layout.add(context_stability, f"## Project Context (Your Codebase):\n{project_context}\n")
+        
+        layout.add(Stability.SESSION, session_notes)
         
         # Add semantic memory from previous conversations if available
         if session_id and session_id in self._conversation_summaries:
             summary = self._conversation_summaries[session_id]
             if summary:
-                parts.append("## Earlier Conversation Summary:")
-                parts.append(summary)
-                parts.append("")
+                layout.add(Stability.SESSION, f"## Earlier Conversation Summary:\n{summary}\n")
         
         # Build conversation history with intelligent handling
         if conversation_history:
-            parts.append("## Recent Conversation History:")
+            parts = ["## Recent Conversation History:"]
             
             # If conversation is long, summarize older parts and store for future
             if len(conversation_history) > self.max_conversation_messages:
@@ -781,12 +808,13 @@ When answering:
                     content = content[:1500] + "...[truncated]"
                 parts.append(f"{role.capitalize()}: {content}")
             parts.append("")
+            layout.add(Stability.SESSION, "\n".join(parts))
         
-        parts.append(f"## Current Question:\n{message}")
-        parts.append("\n## Your Response:")
-        parts.append("(Remember: Reference files by their actual names. Never mention 'snippets' or internal labels. Be specific and natural.)")
+        layout.add(Stability.REQUEST, f"## Current Question:\n{message}")
+        layout.add(Stability.REQUEST, "\n## Your Response:")
+        layout.add(Stability.REQUEST, "(Remember: Reference files by their actual names. Never mention 'snippets' or internal labels. Be specific and natural.)")
         
-        return "\n".join(parts)
+        return layout.build()
     
     def _summarize_older_messages(self, older_messages: List[Any], session_id: Optional[str]) -> str:
         """
@@ -858,35 +886,213 @@ When answering:
             return msg.get("role", "user"), msg.get("content", "")
         return "user", str(msg)
     
+    async def _ollama_text_stream(
+        self,
+        model_name: str,
+        prompt: str,
+        system_message: str
+    ) -> AsyncGenerator[str, None]:
+        """Stream text from Ollama, turning its in-band "Error: ..." chunks into exceptions."""
+        token_stream = self.ollama_client.generate_stream(
+            model_name=model_name,
+            prompt=prompt,
+            system_message=system_message,
+            temperature=0.7,
+            num_ctx=settings.local_model_context_window
+        )
+        try:
+            async for token in token_stream:
+                if token.startswith("Error:"):
+                    raise RuntimeError(token)
+                yield token
+        finally:
+            await token_stream.aclose()
+    
+    async def _relay_stream(
+        self,
+        text_stream: AsyncGenerator[str, None],
+        provider: str,
+        model: str,
+        request_start: float,
+        min_chars: int = 0,
+        first_output_timeout: Optional[float] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Relay a model's text stream as chat "chunk" events followed by "complete".
+        
+        Until something has been sent, failures (errors, timeout, or fewer than
+        `min_chars` of content) are raised so the caller can fall back to the next
+        model. Once output has been sent, a failure ends the stream with an
+        "error" event instead. Closing this generator (client disconnect) closes
+        `text_stream`, which aborts the upstream request.
+        """
+        parts: List[str] = []
+        held = ""
+        sent = False
+        deadline = time.monotonic() + first_output_timeout if first_output_timeout else None
+        try:
+            while True:
+                try:
+                    if deadline is not None and not sent:
+                        text = await asyncio.wait_for(
+                            text_stream.__anext__(),
+                            timeout=max(deadline - time.monotonic(), 0)
+                        )
+                    else:
+                        text = await text_stream.__anext__()
+                except StopAsyncIteration:
+                    break
+                if not text:
+                    continue
+                parts.append(text)
+                
+                if not sent:
+                    # Hold back the first few characters so an empty/short answer
+                    # can still fall back to another model
+                    held += text
+                    if len(held.strip()) <= min_chars:
+                        continue
+                    text, held, sent = held, "", True
+                    self._record_ttft(request_start, provider, model)
+                
+                yield {
+                    "type": "chunk",
+                    "content": text,
+                    "model": model,
+                    "provider": provider
+                }
+        except Exception as e:
+            if not sent:
+                raise
+            logger.warning(f"💬 [CHAT] {provider}/{model} stream failed mid-response: {e}")
+            yield {
+                "type": "error",
+                "content": f"Error encountered: {str(e)}",
+                "error": str(e)
+            }
+            return
+        finally:
+            await text_stream.aclose()
+        
+        if not sent:
+            raise RuntimeError(f"{provider}/{model} returned an empty or too short response")
+        
+        yield {
+            "type": "complete",
+            "content": "".join(parts),
+            "model": model,
+            "provider": provider
+        }
+    
+    def _record_ttft(self, request_start: float, provider: str, model: str):
+        """Record time from chat request start to the first streamed chunk."""
+        ttft = time.perf_counter() - request_start
+        metrics.record("chat_time_to_first_token", ttft, tags={"provider": provider, "model": model})
+        logger.info(f"💬 [CHAT] First token from {provider}/{model} after {ttft:.2f}s")
+    
+    async def _openai_compatible_stream(
+        self,
+        client: Any,
+        url: str,
+        api_key: str,
+        payload: Dict[str, Any]
+    ) -> AsyncGenerator[str, None]:
+        """Stream content deltas from an OpenAI-compatible chat completions endpoint (SSE)."""
+        async with client.stream(
+            "POST",
+            url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            json={**payload, "stream": True}
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+    
+    async def _gemini_stream(
+        self,
+        client: Any,
+        model_name: str,
+        api_key: str,
+        payload: Dict[str, Any]
+    ) -> AsyncGenerator[str, None]:
+        """Stream text from Gemini's streamGenerateContent endpoint (SSE)."""
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:streamGenerateContent?alt=sse&key={api_key}"
+        async with client.stream("POST", url, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                for candidate in json.loads(line[5:]).get("candidates") or []:
+                    for part in candidate.get("content", {}).get("parts") or []:
+                        if part.get("text"):
+                            yield part["text"]
+    
     async def _call_cloud_chat(
         self,
         message: str,
         system_message: str,
         prompt: str,
-        stream: bool = False
+        stream: bool = False,
+        request_start: Optional[float] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Call cloud API for chat with multiple provider fallbacks."""
+        """
+        Call cloud API for chat with multiple provider fallbacks.
+        
+        With stream=True each provider's native streaming API is used; a provider
+        that fails before producing output falls through to the next one.
+        """
         import httpx
         
+        if request_start is None:
+            request_start = time.perf_counter()
+        
         # Try Groq first (fastest for chat)
         if settings.groq_api_key:
             try:
                 async with httpx.AsyncClient(timeout=60.0) as client:
+                    groq_payload = {
+                        "model": "llama-3.3-70b-versatile",  # Groq Llama 3.3
+                        "messages": [
+                            {"role": "system", "content": system_message},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "temperature": 0.7,
+                        "max_tokens": settings.cloud_api_max_tokens
+                    }
+                    if stream:
+                        async for event in self._relay_stream(
+                            self._openai_compatible_stream(
+                                client,
+                                "https://api.groq.com/openai/v1/chat/completions",
+                                settings.groq_api_key,
+                                groq_payload
+                            ),
+                            provider="groq",
+                            model="llama-3.3-70b-versatile",
+                            request_start=request_start
+                        ):
+                            yield event
+                        return
+                    
                     response = await client.post(
                         "https://api.groq.com/openai/v1/chat/completions",
                         headers={
                             "Authorization": f"Bearer {settings.groq_api_key}",
                             "Content-Type": "application/json"
                         },
-                        json={
-                            "model": "llama-3.3-70b-versatile",  # Groq Llama 3.3
-                            "messages": [
-                                {"role": "system", "content": system_message},
-                                {"role": "user", "content": prompt}
-                            ],
-                            "temperature": 0.7,
-                            "max_tokens": settings.cloud_api_max_tokens
-                        }
+                        json=groq_payload
                     )
                     response.raise_for_status()
                     data = response.json()
@@ -929,6 +1135,16 @@ When answering:
                         }
                     }
                     
+                    if stream:
+                        async for event in self._relay_stream(
+                            self._gemini_stream(client, model_name, api_key, payload),
+                            provider="gemini",
+                            model=model_name,
+                            request_start=request_start
+                        ):
+                            yield event
+                        return
+                    
                     response = await client.post(url, json=payload)
                     response.raise_for_status()
                     
@@ -950,21 +1166,37 @@ When answering:
         if settings.openai_api_key:
             try:
                 async with httpx.AsyncClient(timeout=60.0) as client:
+                    openai_payload = {
+                        "model": "gpt-4o",  # Updated Jan 2026 - Use GPT-4o
+                        "messages": [
+                            {"role": "system", "content": system_message},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "temperature": 0.7,
+                        "max_tokens": settings.cloud_api_max_tokens
+                    }
+                    if stream:
+                        async for event in self._relay_stream(
+                            self._openai_compatible_stream(
+                                client,
+                                "https://api.openai.com/v1/chat/completions",
+                                settings.openai_api_key,
+                                openai_payload
+                            ),
+                            provider="openai",
+                            model="gpt-4o",
+                            request_start=request_start
+                        ):
+                            yield event
+                        return
+                    
                     response = await client.post(
                         "https://api.openai.com/v1/chat/completions",
                         headers={
                             "Authorization": f"Bearer {settings.openai_api_key}",
                             "Content-Type": "application/json"
                         },
-                        json={
-                            "model": "gpt-4o",  # Updated Jan 2026 - Use GPT-4o
-                            "messages": [
-                                {"role": "system", "content": system_message},
-                                {"role": "user", "content": prompt}
-                            ],
-                            "temperature": 0.7,
-                            "max_tokens": settings.cloud_api_max_tokens
-                        }
+                        json=openai_payload
                     )
                     response.raise_for_status()
                     data = response.json()
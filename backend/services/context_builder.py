@@ -5,10 +5,11 @@ Builds comprehensive context for artifact generation.
 
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Hashable
 import logging
 from datetime import datetime
 import asyncio
+import time
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -29,6 +30,76 @@ logger = get_logger(__name__)
 metrics = get_metrics_collector()
 
 
+class ContextSession:
+    """
+    Artifact-independent context parts shared across one batch of generations.
+    
+    Bulk generation and sprint packages build a context per artifact, usually
+    from the same meeting notes. Only the artifact-targeted RAG retrieval and
+    the budget assembly differ between them; the universal context, Knowledge
+    Graph, pattern and ML feature parts are the same. Passing one session to
+    every build_context call of the batch builds each of those parts once.
+    
+    Parts are keyed by what they depend on (the KG part by meeting notes and
+    depth, the others by name only), so items with different notes still share
+    what they can. Concurrent builds of the same part wait for the first one.
+    
+    Usage:
+        session = ContextSession()
+        for artifact_type in artifact_types:
+            await builder.build_context(notes, artifact_type=artifact_type, session=session)
+        session.get_stats()["time_saved_seconds"]
+    """
+    
+    def __init__(self):
+        self._parts: Dict[Hashable, asyncio.Future] = {}
+        self._seconds: Dict[Hashable, float] = {}
+        self.built = 0
+        self.reused = 0
+        self.time_saved_seconds = 0.0
+    
+    async def get(self, key: Hashable, build: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the part for `key`, building it with `build()` the first time."""
+        future = self._parts.get(key)
+        if future is not None:
+            result = await asyncio.shield(future)
+            self.reused += 1
+            self.time_saved_seconds += self._seconds.get(key, 0.0)
+            metrics.increment("context_session_reused_total", tags={"part": self._part_name(key)})
+            return result
+        
+        future = self._parts[key] = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        try:
+            result = await build()
+        except BaseException as e:
+            # Let a later caller retry; callers already waiting see the same error
+            del self._parts[key]
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody is waiting
+            else:
+                future.cancel()
+            raise
+        self._seconds[key] = time.perf_counter() - start
+        self.built += 1
+        future.set_result(result)
+        return result
+    
+    @staticmethod
+    def _part_name(key: Hashable) -> str:
+        return key[0] if isinstance(key, tuple) else str(key)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Parts built and reused, and the build time the reuse saved."""
+        return {
+            "parts_built": self.built,
+            "parts_reused": self.reused,
+            "shared_build_seconds": round(sum(self._seconds.values()), 3),
+            "time_saved_seconds": round(self.time_saved_seconds, 3),
+        }
+
+
 class ContextBuilder:
     """
     Context Builder service that combines multiple analysis sources.
@@ -85,7 +156,8 @@ class ContextBuilder:
         max_rag_chunks: int = 18,
         kg_depth: int = 2,
         artifact_type: Optional[str] = None,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        session: Optional[ContextSession] = None
     ) -> Dict[str, Any]:
         """
         Build comprehensive context from multiple sources.
@@ -101,10 +173,15 @@ class ContextBuilder:
             kg_depth: Knowledge Graph traversal depth
             artifact_type: Optional artifact type for targeted retrieval
             force_refresh: If True, bypass cache and always retrieve fresh context
+            session: Optional batch session; artifact-independent parts (universal
+                context, KG, patterns, ML features) are built once per session
         
         Returns:
             Dictionary with assembled context
         """
+        async def shared(key: Hashable, build: Callable[[], Awaitable[Any]]) -> Any:
+            return await session.get(key, build) if session is not None else await build()
+        
         logger.info(f"🏗️ [CONTEXT] ========== CONTEXT BUILD STARTED ==========")
         logger.info(f"🏗️ [CONTEXT] Step 1: Initializing context build")
         logger.info(f"🏗️ [CONTEXT] Step 1.1: meeting_notes_length={len(meeting_notes)}, artifact_type={artifact_type}")
@@ -116,7 +193,7 @@ class ContextBuilder:
         
         try:
             logger.info(f"🏗️ [CONTEXT] Step 2.1: Calling universal context service")
-            universal_ctx = await self.universal_context_service.get_universal_context()
+            universal_ctx = await shared("universal", self.universal_context_service.get_universal_context)
             if not universal_ctx:
                 raise ValueError("Universal context service returned None")
             logger.info(f"🏗️ [CONTEXT] Step 2.2: Universal context retrieved successfully")
@@ -201,17 +278,17 @@ class ContextBuilder:
         
         if include_kg:
             logger.info(f"🏗️ [CONTEXT] Step 5.2: Adding Knowledge Graph context task")
-            tasks.append(self._build_kg_context(meeting_notes, kg_depth))
+            tasks.append(shared(("kg", meeting_notes, kg_depth), lambda: self._build_kg_context(meeting_notes, kg_depth)))
             task_names.append("kg")
         
         if include_patterns:
             logger.info(f"🏗️ [CONTEXT] Step 5.3: Adding Pattern Mining context task")
-            tasks.append(self._build_pattern_context(meeting_notes))
+            tasks.append(shared("patterns", lambda: self._build_pattern_context(meeting_notes)))
             task_names.append("patterns")
         
         if include_ml_features:
             logger.info(f"🏗️ [CONTEXT] Step 5.4: Adding ML Features context task")
-            tasks.append(self._build_ml_features_context(meeting_notes))
+            tasks.append(shared("ml_features", lambda: self._build_ml_features_context(meeting_notes)))
             task_names.append("ml_features")
         
         logger.info(f"🏗️ [CONTEXT] Step 6: Executing {len(tasks)} context building tasks in parallel")
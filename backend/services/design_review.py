@@ -9,17 +9,31 @@ Capabilities:
 - Design pattern verification
 - SOLID principles validation
 - Code quality assessment
+
+A full review runs its reviewers concurrently, each under its own timeout
+(settings.design_review_timeouts), over a SourceSnapshot that reads and
+summarizes the files once for all of them. full_review_stream yields each
+reviewer's result as soon as it finishes.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import time
+from typing import Dict, List, Any, Optional, Tuple, AsyncGenerator, Awaitable
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 
+from backend.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Files a full review hands to the reviewers (source files are capped for prompt size and speed)
+MAX_REVIEW_SOURCE_FILES = 50
+MAX_SECURITY_SCAN_FILES = 30
+MAX_SUMMARY_FILES = 20
+
 
 class ReviewSeverity(str, Enum):
     """Severity level for review findings."""
@@ -63,6 +77,54 @@ class DesignReviewResult:
         return result
 
 
+class SourceSnapshot:
+    """
+    Source files read once and shared by the reviewers of one review.
+    
+    Reviewers used to read (and stat) the same files independently. A
+    snapshot loads every file a review needs in one pass, off the event loop,
+    and builds the code structure summary used in AI prompts only once.
+    """
+    
+    def __init__(self, paths: List[str]):
+        self.paths = list(dict.fromkeys(paths))
+        self._contents: Dict[str, Optional[str]] = {}
+        self._summaries: Dict[Tuple[str, ...], str] = {}
+    
+    def load(self) -> "SourceSnapshot":
+        """Read every file (blocking; run in a thread)."""
+        for file_path in self.paths:
+            self.read(file_path)
+        return self
+    
+    def read(self, file_path: str) -> Optional[str]:
+        """File content, or None if it does not exist or cannot be read."""
+        if file_path not in self._contents:
+            path = Path(file_path)
+            try:
+                self._contents[file_path] = path.read_text(encoding="utf-8", errors="ignore") if path.exists() else None
+            except OSError as e:
+                logger.warning(f"Failed to read {file_path}: {e}")
+                self._contents[file_path] = None
+        return self._contents[file_path]
+    
+    def exists(self, file_path: str) -> bool:
+        return self.read(file_path) is not None
+    
+    def summary(self, file_paths: List[str]) -> str:
+        """Code structure summary of `file_paths` (cached per file list)."""
+        key = tuple(file_paths[:MAX_SUMMARY_FILES])
+        if key not in self._summaries:
+            summary_parts = []
+            for file_path in key:
+                content = self.read(file_path)
+                if content is not None:
+                    path = Path(file_path)
+                    summary_parts.append(f"- {path.name}: {path.suffix} ({content.count(chr(10)) + 1} lines)")
+            self._summaries[key] = "\n".join(summary_parts) if summary_parts else "No files found"
+        return self._summaries[key]
+
+
 # Common anti-patterns to detect
 ANTI_PATTERNS = {
     "god_class": {
@@ -157,7 +219,8 @@ class DesignReviewService:
         self,
         code_files: List[str],
         architecture_diagram: str,
-        meeting_notes: Optional[str] = None
+        meeting_notes: Optional[str] = None,
+        snapshot: Optional[SourceSnapshot] = None
     ) -> DesignReviewResult:
         """
         Review code files against an architecture diagram.
@@ -171,7 +234,7 @@ class DesignReviewService:
         components = self._extract_components_from_diagram(architecture_diagram)
         
         # Analyze code files
-        code_summary = self._summarize_code_files(code_files)
+        code_summary = self._summarize_code_files(code_files, snapshot)
         
         # Use AI to compare architecture vs implementation
         prompt = f"""Compare this architecture diagram with the actual implementation.
@@ -244,7 +307,8 @@ Output as JSON array of findings."""
     async def review_test_coverage(
         self,
         source_files: List[str],
-        test_files: List[str]
+        test_files: List[str],
+        snapshot: Optional[SourceSnapshot] = None
     ) -> DesignReviewResult:
         """
         Review test coverage for source files.
@@ -274,7 +338,7 @@ Output as JSON array of findings."""
         
         # Analyze test quality
         for test_file in test_files:
-            quality_findings = self._analyze_test_quality(test_file)
+            quality_findings = self._analyze_test_quality(test_file, snapshot)
             findings.extend(quality_findings)
         
         score = self._calculate_score(findings)
@@ -292,7 +356,8 @@ Output as JSON array of findings."""
     async def review_security(
         self,
         file_paths: Optional[List[str]] = None,
-        directory: Optional[str] = None
+        directory: Optional[str] = None,
+        snapshot: Optional[SourceSnapshot] = None
     ) -> DesignReviewResult:
         """
         Perform security review of code files.
@@ -306,15 +371,15 @@ Output as JSON array of findings."""
             file_paths = []
             for ext in {'.py', '.ts', '.tsx', '.js', '.jsx'}:
                 file_paths.extend([str(f) for f in path.glob(f"**/*{ext}")])
-            file_paths = file_paths[:30] # Limit
+            file_paths = file_paths[:MAX_SECURITY_SCAN_FILES] # Limit
         
+        snapshot = snapshot or SourceSnapshot(file_paths)
         for file_path in file_paths:
-            path = Path(file_path)
-            if not path.exists():
+            content = snapshot.read(file_path)
+            if content is None:
                 continue
             
             try:
-                content = path.read_text(encoding="utf-8", errors="ignore")
                 
                 # Check for hardcoded secrets
                 secret_findings = self._check_hardcoded_secrets(content, file_path)
@@ -358,7 +423,7 @@ Output as JSON array of findings."""
         
         # Use pattern mining service
         try:
-            patterns = self.pattern_mining.analyze_directory(path)
+            patterns = await asyncio.to_thread(self.pattern_mining.analyze_directory, path)
             
             # Convert pattern findings to review findings
             for pattern in patterns.get("anti_patterns", []):
@@ -413,7 +478,8 @@ Output as JSON array of findings."""
     async def review_code_quality(
         self,
         directory: Optional[str] = None,
-        files: Optional[List[str]] = None
+        files: Optional[List[str]] = None,
+        snapshot: Optional[SourceSnapshot] = None
     ) -> DesignReviewResult:
         """
         Review code quality using AI without a diagram.
@@ -434,9 +500,9 @@ Output as JSON array of findings."""
             files = []
             for ext in {'.py', '.ts', '.tsx', '.js', '.jsx'}:
                 files.extend([str(f) for f in path.glob(f"**/*{ext}")])
-            files = files[:50]
+            files = files[:MAX_REVIEW_SOURCE_FILES]
             
-        code_summary = self._summarize_code_files(files)
+        code_summary = self._summarize_code_files(files, snapshot)
         
         prompt = f"""Review the following code structure and file list for general code quality.
         
@@ -510,13 +576,135 @@ Output as JSON array of findings."""
         - Test coverage
         - Security
         - Patterns
+        
+        The reviewers run concurrently; see full_review_stream.
+        """
+        result = None
+        async for event in self.full_review_stream(directory, architecture_diagram, meeting_notes):
+            if event["type"] == "result":
+                result = event["result"]
+        return result
+    
+    async def full_review_stream(
+        self,
+        directory: Optional[str] = None,
+        architecture_diagram: Optional[str] = None,
+        meeting_notes: Optional[str] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Run a full review, yielding each reviewer's result as it finishes.
+        
+        Yields:
+            {"type": "partial", "reviewer": name, "result": {...}, "completed": n, "total": m}
+            for every reviewer, then {"type": "result", "result": DesignReviewResult}.
+            A reviewer that fails or exceeds its timeout contributes an info
+            finding instead of failing the review.
         """
         review_id = f"rev_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        all_findings: List[ReviewFinding] = []
         
         path = self._resolve_directory(directory)
+        all_files, source_files, test_files = await asyncio.to_thread(self._collect_files, path)
+        
+        # Read and summarize the files once for every reviewer
+        review_sources = source_files[:MAX_REVIEW_SOURCE_FILES]
+        snapshot = await asyncio.to_thread(SourceSnapshot(review_sources + test_files).load)
+        
+        reviewers: Dict[str, Awaitable[DesignReviewResult]] = {}
+        if architecture_diagram:
+            reviewers["architecture"] = self.review_against_architecture(
+                review_sources, architecture_diagram, meeting_notes, snapshot=snapshot
+            )
+        else:
+            # Fallback: General AI Code Quality Review
+            reviewers["code_quality"] = self.review_code_quality(directory, review_sources, snapshot=snapshot)
+        reviewers["tests"] = self.review_test_coverage(review_sources, test_files, snapshot=snapshot)
+        reviewers["security"] = self.review_security(source_files[:MAX_SECURITY_SCAN_FILES], snapshot=snapshot)
+        reviewers["patterns"] = self.review_patterns(directory)
+        
+        tasks = [
+            asyncio.create_task(self._run_reviewer(name, reviewer))
+            for name, reviewer in reviewers.items()
+        ]
+        results: Dict[str, DesignReviewResult] = {}
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), 1):
+                name, result = await next_done
+                results[name] = result
+                yield {
+                    "type": "partial",
+                    "reviewer": name,
+                    "result": result.to_dict(),
+                    "completed": completed,
+                    "total": len(tasks)
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        # Combine in a fixed reviewer order so the report does not depend on timing
+        all_findings: List[ReviewFinding] = []
+        for name in reviewers:
+            all_findings.extend(results[name].findings)
+        
+        # Deduplicate findings
+        all_findings = self._deduplicate_findings(all_findings)
         
-        # Get all source and test files
+        score = self._calculate_score(all_findings)
+        
+        yield {
+            "type": "result",
+            "result": DesignReviewResult(
+                review_id=review_id,
+                review_type="full",
+                files_reviewed=len(all_files),
+                findings=all_findings,
+                summary=self._generate_summary(all_findings),
+                score=score,
+                created_at=datetime.now().isoformat()
+            )
+        }
+    
+    async def _run_reviewer(
+        self,
+        name: str,
+        reviewer: Awaitable[DesignReviewResult]
+    ) -> Tuple[str, DesignReviewResult]:
+        """Await one reviewer under its timeout, turning failures into a finding."""
+        timeout = settings.design_review_timeouts.get(name, 120.0)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(reviewer, timeout=timeout)
+            logger.info(f"Design reviewer {name} finished in {time.perf_counter() - start:.1f}s")
+            return name, result
+        except asyncio.TimeoutError:
+            logger.warning(f"Design reviewer {name} timed out after {timeout}s")
+            title = f"{name.replace('_', ' ').title()} review timed out"
+            description = f"The {name} reviewer did not finish within {timeout:.0f} seconds"
+        except Exception as e:
+            logger.error(f"Design reviewer {name} failed: {e}")
+            title = f"{name.replace('_', ' ').title()} review failed"
+            description = str(e)
+        findings = [ReviewFinding(
+            category=name,
+            severity=ReviewSeverity.INFO,
+            title=title,
+            description=description,
+            file_path=None,
+            line_number=None,
+            recommendation="Re-run this review or review this area manually"
+        )]
+        return name, DesignReviewResult(
+            review_id=f"rev_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            review_type=name,
+            files_reviewed=0,
+            findings=findings,
+            summary=self._generate_summary(findings),
+            score=self._calculate_score(findings),
+            created_at=datetime.now().isoformat()
+        )
+    
+    def _collect_files(self, path: Path) -> Tuple[List[str], List[str], List[str]]:
+        """All, source and test files under `path`."""
         source_extensions = {'.py', '.ts', '.tsx', '.js', '.jsx', '.cs', '.java'}
         test_patterns = ['test_', '_test.', '.test.', '.spec.', 'Test.']
         
@@ -534,42 +722,7 @@ Output as JSON array of findings."""
                 else:
                     source_files.append(file_str)
         
-        # Run all review types
-        if architecture_diagram:
-            arch_result = await self.review_against_architecture(
-                source_files[:50],  # Limit for performance
-                architecture_diagram,
-                meeting_notes
-            )
-            all_findings.extend(arch_result.findings)
-        else:
-            # Fallback: General AI Code Quality Review
-            quality_result = await self.review_code_quality(directory, source_files[:50])
-            all_findings.extend(quality_result.findings)
-        
-        test_result = await self.review_test_coverage(source_files[:50], test_files)
-        all_findings.extend(test_result.findings)
-        
-        security_result = await self.review_security(source_files[:30])
-        all_findings.extend(security_result.findings)
-        
-        pattern_result = await self.review_patterns(directory)
-        all_findings.extend(pattern_result.findings)
-        
-        # Deduplicate findings
-        all_findings = self._deduplicate_findings(all_findings)
-        
-        score = self._calculate_score(all_findings)
-        
-        return DesignReviewResult(
-            review_id=review_id,
-            review_type="full",
-            files_reviewed=len(all_files),
-            findings=all_findings,
-            summary=self._generate_summary(all_findings),
-            score=score,
-            created_at=datetime.now().isoformat()
-        )
+        return all_files, source_files, test_files
     
     def _extract_components_from_diagram(self, diagram: str) -> List[str]:
         """Extract component names from a diagram."""
@@ -590,17 +743,10 @@ Output as JSON array of findings."""
         
         return list(components)
     
-    def _summarize_code_files(self, file_paths: List[str]) -> str:
+    def _summarize_code_files(self, file_paths: List[str], snapshot: Optional[SourceSnapshot] = None) -> str:
         """Create a summary of code file structure."""
-        summary_parts = []
-        
-        for file_path in file_paths[:20]:  # Limit for prompt size
-            path = Path(file_path)
-            if path.exists():
-                # Get file info
-                summary_parts.append(f"- {path.name}: {path.suffix}")
-        
-        return "\n".join(summary_parts) if summary_parts else "No files found"
+        snapshot = snapshot or SourceSnapshot(file_paths[:MAX_SUMMARY_FILES])  # Limit for prompt size
+        return snapshot.summary(file_paths)
     
     def _parse_ai_findings(self, ai_response: str) -> List[ReviewFinding]:
         """Parse AI response into ReviewFindings."""
@@ -664,16 +810,16 @@ Output as JSON array of findings."""
         
         return mapping
     
-    def _analyze_test_quality(self, test_file: str) -> List[ReviewFinding]:
+    def _analyze_test_quality(self, test_file: str, snapshot: Optional[SourceSnapshot] = None) -> List[ReviewFinding]:
         """Analyze quality of a test file."""
         findings = []
         path = Path(test_file)
         
-        if not path.exists():
+        content = (snapshot or SourceSnapshot([test_file])).read(test_file)
+        if content is None:
             return findings
         
         try:
-            content = path.read_text(encoding="utf-8", errors="ignore")
             lines = content.split("\n")
             
             # Check for assertions
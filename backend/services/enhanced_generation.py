@@ -16,10 +16,12 @@ import asyncio
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.services.model_service import get_service as get_model_service
-from backend.services.context_builder import get_builder as get_context_builder
+from backend.services.context_builder import ContextSession, get_builder as get_context_builder
 from backend.services.validation_service import get_service as get_validation_service
 from backend.core.config import settings
 from backend.core.metrics import get_metrics_collector, timed
+from backend.core.streaming import StreamCoalescer
+from backend.core.prompt_layout import PromptLayout, Stability, is_prefix_stable
 from backend.core.logger import get_logger, log_error_to_file, log_token_usage, log_ai_call
 from backend.core.cache import cached
 from backend.models.dto import ArtifactType
@@ -75,7 +77,8 @@ class EnhancedGenerationService:
         meeting_notes: str,
         context_id: Optional[str] = None,
         options: Optional[Dict[str, Any]] = None,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        context_session: Optional[ContextSession] = None
     ) -> Dict[str, Any]:
         """
         Generate artifact using proper pipeline.
@@ -86,6 +89,7 @@ class EnhancedGenerationService:
             context_id: Optional pre-built context
             options: Generation options
             progress_callback: Optional callback for progress updates (progress: float, message: str)
+            context_session: Optional batch ContextSession shared with sibling artifacts
         
         Returns:
             Dictionary with generation result
@@ -148,7 +152,8 @@ class EnhancedGenerationService:
                             include_patterns=True,
                             include_ml_features=True,  # Enable ML features
                             artifact_type=artifact_type_str,  # Pass artifact type for targeted RAG
-                            force_refresh=True  # Always get fresh context for generation
+                            force_refresh=True,  # Always get fresh context for generation
+                            session=context_session
                         )
                         logger.info(f"✅ [ENHANCED_GEN] New context built successfully")
                     else:
@@ -162,7 +167,8 @@ class EnhancedGenerationService:
                         include_patterns=True,
                         include_ml_features=True,  # Enable ML features for structure analysis
                         artifact_type=artifact_type_str,  # Pass artifact type for targeted RAG
-                        force_refresh=True  # Always get fresh context for generation
+                        force_refresh=True,  # Always get fresh context for generation
+                        session=context_session
                     )
                     logger.info(f"✅ [ENHANCED_GEN] Context built successfully")
             except Exception as e:
@@ -368,7 +374,10 @@ class EnhancedGenerationService:
                 await progress_callback(progress, f"Trying model: {model_name}...")
             
             # Build prompt ONCE before retries (efficiency pick)
-            prompt = self._build_prompt(meeting_notes, assembled_context, artifact_type, custom_prompt_template)
+            prompt = self._build_prompt(
+                meeting_notes, assembled_context, artifact_type, custom_prompt_template,
+                project_summary=self._build_project_summary(context)
+            )
             logger.info(f"📝 [ENHANCED_GEN] Step 3.{model_idx + 1}: Prompt built: length={len(prompt)}, custom_template={bool(custom_prompt_template)}")
                 
             # Try this model with retries (max 2 retries = 3 total attempts)
@@ -415,39 +424,39 @@ class EnhancedGenerationService:
                         # Use streaming if callback provided
                         if progress_callback:
                             content_accumulator = []
-                            last_update_time = datetime.now()
-                            token_count = 0
                             
                             start_time = datetime.now().timestamp()
                             
-                            async for chunk in self.ollama_client.generate_stream(
-                                model_name=model_name,
-                                prompt=current_prompt,
-                                system_message=self._get_system_message(artifact_type),
-                                temperature=opts["temperature"],
-                                num_ctx=settings.local_model_context_window
+                            eval_timings: Dict[str, float] = {}
+                            # Coalesce per-token chunks into frames (flush on size or interval)
+                            coalescer = StreamCoalescer("generation")
+                            async for frame in coalescer.coalesce_text(
+                                self.ollama_client.generate_stream(
+                                    model_name=model_name,
+                                    prompt=current_prompt,
+                                    system_message=self._get_system_message(artifact_type),
+                                    temperature=opts["temperature"],
+                                    num_ctx=settings.local_model_context_window,
+                                    eval_stats=eval_timings
+                                ),
+                                is_control=lambda chunk: chunk.startswith("Error:")
                             ):
-                                if chunk.startswith("Error:"):
+                                if frame.startswith("Error:"):
                                     # Handle streaming error
-                                    logger.error(f"❌ [ENHANCED_GEN] Streaming error: {chunk}")
+                                    logger.error(f"❌ [ENHANCED_GEN] Streaming error: {frame}")
                                     break
                                 
-                                content_accumulator.append(chunk)
-                                token_count += 1
-                                
-                                # Send progress update for tokens (every 20 tokens or 100ms)
-                                now = datetime.now()
-                                if token_count % 10 == 0 or (now - last_update_time).total_seconds() > 0.1:
-                                    await progress_callback(
-                                        40.0 + (model_idx / len(local_models)) * 30.0 + min(20.0, token_count / 100),
-                                        f"||CHUNK||{chunk}"  # Send with marker
-                                    )
-                                    last_update_time = now
+                                content_accumulator.append(frame)
+                                await progress_callback(
+                                    40.0 + (model_idx / len(local_models)) * 30.0 + min(20.0, coalescer.chunks_in / 100),
+                                    f"||CHUNK||{frame}"  # Send with marker
+                                )
                             
+                            token_count = coalescer.chunks_in
                             full_content = "".join(content_accumulator)
                             generation_time = datetime.now().timestamp() - start_time
                             
-                            # Create response object
+                            # Create response object (eval timings come from the stream's final chunk)
                             from ai.ollama_client import GenerationResponse as OllamaResponse
                             response = OllamaResponse(
                                 content=full_content,
@@ -455,7 +464,10 @@ class EnhancedGenerationService:
                                 generation_time=generation_time,
                                 tokens_generated=token_count,
                                 success=bool(full_content) and not full_content.startswith("Error:"),
-                                error_message=full_content if full_content.startswith("Error:") else ""
+                                error_message=full_content if full_content.startswith("Error:") else "",
+                                prompt_eval_count=eval_timings.get("prompt_eval_count", 0),
+                                prompt_eval_duration=eval_timings.get("prompt_eval_duration", 0.0),
+                                eval_duration=eval_timings.get("eval_duration", 0.0)
                             )
                         else:
                             # Standard non-streaming generation
@@ -493,6 +505,9 @@ class EnhancedGenerationService:
                     # Log AI call and token usage
                     if response.success:
                         logger.info(f"✅ [ENHANCED_GEN] Step 3.{model_idx + 1}.{retry + 1}.6: Generation completed successfully: content_length={len(response.content) if response.content else 0}")
+                        if response.prompt_eval_duration or response.eval_duration:
+                            logger.info(f"⏱️ [ENHANCED_GEN] {model_name}: prompt_eval={response.prompt_eval_duration:.2f}s "
+                                       f"({response.prompt_eval_count} tokens), eval={response.eval_duration:.2f}s")
                         # (Logging logic skipped for brevity, assumed unchanged)
                     
                     if not response.success or not response.content:
@@ -627,9 +642,12 @@ class EnhancedGenerationService:
                         if progress_callback:
                             await progress_callback(90.0, f"Generation successful! (Score: {score:.1f})")
                         
-                        # Unload non-persistent models to free VRAM (keep persistent models loaded)
+                        # Unload non-persistent models to free VRAM (keep persistent models loaded).
+                        # The scheduler owns residency when enabled: unloading here would evict a
+                        # model it still counts as resident, possibly with another request on it.
                         try:
-                            if model_name not in self.ollama_client.persistent_models:
+                            if (self.ollama_client.scheduler is None
+                                    and model_name not in self.ollama_client.persistent_models):
                                 await self.ollama_client.unload_model(model_name, show_progress=False)
                                 logger.debug(f"Unloaded {model_name} to free VRAM")
                         except Exception as e:
@@ -950,19 +968,22 @@ class EnhancedGenerationService:
             }
     
     def _build_prompt(self, meeting_notes: str, rag_context: str, artifact_type: Union[ArtifactType, str], 
-                       custom_prompt_template: Optional[str] = None) -> str:
+                       custom_prompt_template: Optional[str] = None, project_summary: str = "") -> str:
         """
         Build comprehensive prompt with all context.
         
         FIX: The rag_context (assembled_context) already includes meeting notes,
         so we check if meeting notes are already in rag_context to avoid duplication.
         However, we still include them separately for clarity and emphasis.
+        
+        With settings.prompt_layout == "prefix_stable" the prompt is ordered from
+        most to least stable (project summary, artifact instructions, then the
+        requirements and retrieved context) so Ollama can reuse the evaluated
+        prefix across requests. See backend/core/prompt_layout.py.
         """
         # Import prompt sanitization to prevent injection attacks
         from rag.filters import sanitize_prompt_input
         
-        parts = []
-        
         # Get artifact type as string
         if isinstance(artifact_type, ArtifactType):
             artifact_type_str = artifact_type.value
@@ -979,33 +1000,57 @@ class EnhancedGenerationService:
             prompt = prompt.replace("{context}", safe_context)
             return prompt
         
+        prefix_stable = is_prefix_stable()
+        layout = PromptLayout()
+        
         # Default prompt building for built-in types
         artifact_name = artifact_type_str.replace("_", " ").title()
-        parts.append(f"Generate a {artifact_name} based on the following requirements and project context.")
+        if prefix_stable:
+            if project_summary:
+                layout.add(Stability.PROJECT, f"## Project Overview\n{project_summary}")
+            layout.add(Stability.INSTRUCTIONS, f"Generate a {artifact_name} based on the requirements and project context given after these instructions.")
+            layout.add(Stability.INSTRUCTIONS, self._artifact_instructions(artifact_type_str, context_position="below"))
+        else:
+            layout.add(Stability.INSTRUCTIONS, f"Generate a {artifact_name} based on the following requirements and project context.")
         
         # FIX: Check if meeting notes are already in rag_context to avoid duplication
         # The assembled_context includes meeting notes, but we still want them as a clear section
         # So we include them, but note that they may also appear in the context section
         if meeting_notes and meeting_notes.strip():
-            parts.append("\n## Requirements")
             # Sanitize user-provided meeting notes to prevent prompt injection
             safe_notes = sanitize_prompt_input(meeting_notes, max_length=8000)
-            parts.append(safe_notes)
+            layout.add(Stability.REQUEST, f"\n## Requirements\n{safe_notes}")
         
         if rag_context and rag_context.strip():
-            parts.append("\n## Project Context (from codebase)")
             # Sanitize RAG context - INCREASED LIMIT significantly to preserve architectural details
             # User reported "0 context" - we must provide as much as the model can handle
             # Modern models (Gemini 1.5/2.0, GPT-4o, Claude 3.5) handle 128k+ to 1M+ context
             safe_context = sanitize_prompt_input(rag_context, max_length=100000)
-            parts.append(safe_context)
+            layout.add(Stability.REQUEST, f"\n## Project Context (from codebase)\n{safe_context}")
         elif not rag_context or not rag_context.strip():
             logger.warning(f"⚠️ [ENHANCED_GEN] RAG context is empty! Generating generic output. TIP: Ensure project path is correct and files are indexed.")
-            parts.append("No existing codebase context found. Generate a complete solution from scratch based on requirements.")
+            layout.add(Stability.REQUEST, "No existing codebase context found. Generate a complete solution from scratch based on requirements.")
+        
+        if not prefix_stable:
+            # Legacy order: instructions come last and refer back to the context
+            layout.add(Stability.REQUEST, self._artifact_instructions(artifact_type_str, context_position="above"))
         
+        final_prompt = layout.build()
+        
+        # Log prompt composition for debugging
+        logger.debug(f"📝 [ENHANCED_GEN] Prompt built: total_length={len(final_prompt)}, "
+                    f"stable_prefix_length={layout.prefix_length() if prefix_stable else 0}, "
+                    f"meeting_notes_length={len(meeting_notes) if meeting_notes else 0}, "
+                    f"rag_context_length={len(rag_context) if rag_context else 0}")
+        
+        return final_prompt
+    
+    def _artifact_instructions(self, artifact_type_str: str, context_position: str = "above") -> str:
+        """Generation instructions for an artifact type (identical for every request of that type)."""
+        parts = []
         parts.append("\n## Instructions")
         parts.append("1. **Analyze Requirements**: specific user needs versus generic patterns.")
-        parts.append("2. **Analyze Context**: strict consistency with existing codebase (Project Context above).")
+        parts.append(f"2. **Analyze Context**: strict consistency with existing codebase (Project Context {context_position}).")
         parts.append("3. **Chain of Thought**: First, think step-by-step about the architecture/logic. Then generate the artifact.")
         
         # Artifact-specific instructions to avoid "light/empty" outputs
@@ -1025,14 +1070,42 @@ class EnhancedGenerationService:
         else:
             parts.append("4. Ensure the output is complete, detailed, and production-ready.")
         
-        final_prompt = "\n".join(parts)
+        return "\n".join(parts)
+    
+    def _build_project_summary(self, context: Dict[str, Any]) -> str:
+        """
+        Universal project summary for the stable prompt prefix.
         
-        # Log prompt composition for debugging
-        logger.debug(f"📝 [ENHANCED_GEN] Prompt built: total_length={len(final_prompt)}, "
-                    f"meeting_notes_length={len(meeting_notes) if meeting_notes else 0}, "
-                    f"rag_context_length={len(rag_context) if rag_context else 0}")
+        Built only from the universal context (directories, key entities, key
+        files), which does not depend on the meeting notes or artifact type, so
+        it is byte-identical across requests until the project is re-indexed.
+        """
+        universal = context.get("universal_context") or {}
+        lines = []
+        
+        dirs = universal.get("project_directories") or []
+        if dirs:
+            lines.append(f"**Project(s):** {', '.join(sorted(Path(d).name for d in dirs))}")
+            lines.append(f"**Files Indexed:** {universal.get('total_files', 0)}")
+        
+        key_entities = universal.get("key_entities") or []
+        if key_entities:
+            type_priority = {"class": 0, "function": 1, "module": 2, "file": 3}
+            sorted_entities = sorted(
+                key_entities,
+                key=lambda e: (type_priority.get(str(e.get("type", "")).lower(), 99), str(e.get("name", "")))
+            )
+            lines.append("**Key Entities:**")
+            for entity in sorted_entities[:20]:
+                lines.append(f"  - {entity.get('name', 'unknown')} ({entity.get('type', 'unknown')})")
         
-        return final_prompt
+        key_files = (universal.get("project_map") or {}).get("key_files") or []
+        if key_files:
+            lines.append("**Important Files:**")
+            for key_file in sorted(key_files)[:10]:
+                lines.append(f"  - {Path(key_file).name}")
+        
+        return "\n".join(lines)
     
     def _get_system_message(self, artifact_type: Union[ArtifactType, str]) -> str:
         """Get comprehensive system message for artifact type."""
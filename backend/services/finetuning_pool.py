@@ -3,7 +3,8 @@ Finetuning Pool Service - Collects high-quality examples for automatic finetunin
 
 Features:
 - Collects examples with 85+ validation scores
-- Groups examples by artifact type
+- Groups examples by artifact type (append-only `<artifact_type>_pool.jsonl`)
+- Rejects near-duplicates (MinHash/LSH over content and meeting notes)
 - Auto-triggers finetuning when 50 examples collected
 - Tracks finetuning progress
 - Maps finetuned models to artifact types
@@ -11,10 +12,11 @@ Features:
 
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 from datetime import datetime
 import json
+import os
 import asyncio
 import time
 
@@ -23,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.core.config import settings
 from backend.models.dto import ArtifactType
+from backend.utils import minhash
 
 logger = logging.getLogger(__name__)
 
@@ -44,15 +47,25 @@ class FinetuningPool:
     triggers finetuning when enough examples are collected.
     """
     
-    def __init__(self):
-        """Initialize Finetuning Pool."""
+    def __init__(self, pool_dir: Optional[Path] = None):
+        """
+        Initialize Finetuning Pool.
+        
+        Args:
+            pool_dir: Directory of the pool files (defaults to data/finetuning_pool)
+        """
         # Use absolute path relative to project root
         project_root = Path(__file__).parent.parent.parent
-        self.pool_dir = project_root / "data" / "finetuning_pool"
+        self.pool_dir = Path(pool_dir) if pool_dir else project_root / "data" / "finetuning_pool"
         self.pool_dir.mkdir(parents=True, exist_ok=True)
         
         # Per-artifact-type pools
         self.pools: Dict[str, List[Dict[str, Any]]] = {}
+        # Per-type {"real": n, "synthetic": n}, kept up to date on every add
+        self._source_counts: Dict[str, Dict[str, int]] = {}
+        # Per-type LSH index over content signatures + (content, notes) signatures by pool position;
+        # built on the first add for a type
+        self._dedupe: Dict[str, Tuple[minhash.LSHIndex, List[Tuple[Any, Any]]]] = {}
         
         # Finetuning thresholds
         self.incremental_finetuning_threshold = 10  # Examples for incremental finetuning (reduced from 50)
@@ -87,28 +100,138 @@ class FinetuningPool:
         
         logger.info("Finetuning Pool initialized")
     
+    def _pool_file(self, artifact_type: str) -> Path:
+        return self.pool_dir / f"{artifact_type}_pool.jsonl"
+    
     def _load_pools(self):
-        """Load existing pools from disk."""
-        for artifact_type in ArtifactType:
-            pool_file = self.pool_dir / f"{artifact_type.value}_pool.json"
-            if pool_file.exists():
-                try:
-                    with open(pool_file, 'r', encoding='utf-8') as f:
-                        self.pools[artifact_type.value] = json.load(f)
-                except Exception as e:
-                    logger.error(f"Error loading pool for {artifact_type.value}: {e}")
-                    self.pools[artifact_type.value] = []
-            else:
-                self.pools[artifact_type.value] = []
+        """Load existing pools from disk, converting legacy `_pool.json` files."""
+        artifact_types = {artifact_type.value for artifact_type in ArtifactType}
+        for suffix in ("_pool.jsonl", "_pool.json"):
+            artifact_types.update(p.name[:-len(suffix)] for p in self.pool_dir.glob(f"*{suffix}"))
+        
+        for artifact_type in sorted(artifact_types):
+            self.pools[artifact_type] = self._read_pool(artifact_type)
+            legacy_file = self.pool_dir / f"{artifact_type}_pool.json"
+            if legacy_file.exists():
+                self._merge_legacy_pool(artifact_type, legacy_file)
+            self._count_sources(artifact_type)
     
-    def _save_pool(self, artifact_type: str):
-        """Save pool for an artifact type to disk."""
-        pool_file = self.pool_dir / f"{artifact_type}_pool.json"
+    def _merge_legacy_pool(self, artifact_type: str, legacy_file: Path):
+        """
+        Fold a legacy `_pool.json` into the JSONL pool.
+        
+        Runs on every start while the legacy file exists, so examples appended
+        after a failed conversion are kept alongside it; examples already in
+        the JSONL pool are not added twice.
+        """
         try:
-            with open(pool_file, 'w', encoding='utf-8') as f:
-                json.dump(self.pools.get(artifact_type, []), f, indent=2, default=str)
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading pool for {artifact_type}: {e}")
+            return
+        
+        seen = {json.dumps(example, sort_keys=True, default=str) for example in self.pools[artifact_type]}
+        missing = [example for example in legacy if json.dumps(example, sort_keys=True, default=str) not in seen]
+        self.pools[artifact_type] = missing + self.pools[artifact_type]
+        if self._save_pool(artifact_type):
+            # Kept as a backup; `_pool.json.bak` is not picked up as a pool
+            legacy_file.replace(legacy_file.with_suffix(".json.bak"))
+            logger.info(f"Converted {legacy_file.name} to JSONL ({len(missing)} examples)")
+    
+    def _read_pool(self, artifact_type: str) -> List[Dict[str, Any]]:
+        """Read a JSONL pool; a torn or corrupt line is skipped."""
+        pool_file = self._pool_file(artifact_type)
+        examples = []
+        if not pool_file.exists():
+            return examples
+        try:
+            with open(pool_file, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        examples.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable line {line_number} in {pool_file.name}")
+        except Exception as e:
+            logger.error(f"Error loading pool for {artifact_type}: {e}")
+        return examples
+    
+    def _save_pool(self, artifact_type: str) -> bool:
+        """
+        Rewrite the pool file for an artifact type from memory.
+        
+        Only needed when examples are removed or replaced; add_example appends.
+        
+        Returns:
+            True if the pool file was written
+        """
+        pool_file = self._pool_file(artifact_type)
+        tmp_file = pool_file.with_suffix(".jsonl.tmp")
+        saved = False
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for example in self.pools.get(artifact_type, []):
+                    f.write(json.dumps(example, default=str) + "\n")
+            os.replace(tmp_file, pool_file)
+            saved = True
         except Exception as e:
             logger.error(f"Error saving pool for {artifact_type}: {e}")
+            tmp_file.unlink(missing_ok=True)
+        # The pool may have been replaced wholesale: recount and re-index lazily
+        self._count_sources(artifact_type)
+        self._dedupe.pop(artifact_type, None)
+        self._invalidate_stats_cache()
+        return saved
+    
+    def _append_example(self, artifact_type: str, example: Dict[str, Any]):
+        """Append one example to the pool file."""
+        try:
+            with open(self._pool_file(artifact_type), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(example, default=str) + "\n")
+        except Exception as e:
+            logger.error(f"Error saving pool for {artifact_type}: {e}")
+    
+    @staticmethod
+    def _source_of(example: Dict[str, Any]) -> str:
+        source = (example.get('context') or {}).get('source', 'feedback')
+        return 'synthetic' if source == 'synthetic' else 'real'
+    
+    def _count_sources(self, artifact_type: str):
+        counts = {'real': 0, 'synthetic': 0}
+        for example in self.pools.get(artifact_type, []):
+            counts[self._source_of(example)] += 1
+        self._source_counts[artifact_type] = counts
+    
+    def _dedupe_index(self, artifact_type: str) -> Tuple[minhash.LSHIndex, List[Tuple[Any, Any]]]:
+        """
+        LSH index of an artifact type's pool, built from the pool on first use
+        (and rebuilt if the near-duplicate threshold, which sets its bands, changed).
+        """
+        threshold = settings.finetuning_near_duplicate_threshold
+        cached = self._dedupe.get(artifact_type)
+        if cached is None or cached[0].threshold != threshold:
+            index, signatures = minhash.LSHIndex(threshold), []
+            for position, example in enumerate(self.pools.get(artifact_type, [])):
+                signatures.append((
+                    minhash.signature(example.get("content") or ""),
+                    minhash.signature(example.get("meeting_notes") or ""),
+                ))
+                index.add(position, signatures[-1][0])
+            self._dedupe[artifact_type] = (index, signatures)
+        return self._dedupe[artifact_type]
+    
+    def _find_near_duplicate(self, artifact_type: str, content_signature, notes_signature) -> Optional[int]:
+        """Pool position of an example whose content and meeting notes both match, if any."""
+        threshold = settings.finetuning_near_duplicate_threshold
+        index, signatures = self._dedupe_index(artifact_type)
+        for position in sorted(index.candidates(content_signature)):
+            stored_content, stored_notes = signatures[position]
+            if (minhash.similarity(content_signature, stored_content) >= threshold
+                    and minhash.similarity(notes_signature, stored_notes) >= threshold):
+                return position
+        return None
     
     def add_example(
         self,
@@ -131,7 +254,8 @@ class FinetuningPool:
             context: Optional additional context
         
         Returns:
-            True if example was added, False if score too low
+            True if example was added, False if score too low or a near-duplicate
+            of an example already in the pool
         """
         # Quality gate: only accept 85+ scores
         if validation_score < self.min_score_threshold:
@@ -141,6 +265,15 @@ class FinetuningPool:
         # Initialize pool for artifact type if needed
         if artifact_type not in self.pools:
             self.pools[artifact_type] = []
+            self._source_counts[artifact_type] = {'real': 0, 'synthetic': 0}
+        
+        # Near-duplicate gate: repeated generations for the same notes add no signal
+        content_signature = minhash.signature(content or "")
+        notes_signature = minhash.signature(meeting_notes or "")
+        duplicate_of = self._find_near_duplicate(artifact_type, content_signature, notes_signature)
+        if duplicate_of is not None:
+            logger.info(f"Example rejected: near-duplicate of {artifact_type} pool example #{duplicate_of}")
+            return False
         
         # Create example entry
         example = {
@@ -154,8 +287,12 @@ class FinetuningPool:
         }
         
         # Add to pool
+        index, signatures = self._dedupe_index(artifact_type)
         self.pools[artifact_type].append(example)
-        self._save_pool(artifact_type)
+        signatures.append((content_signature, notes_signature))
+        index.add(len(signatures) - 1, content_signature)
+        self._source_counts[artifact_type][self._source_of(example)] += 1
+        self._append_example(artifact_type, example)
         
         # FIX: Invalidate stats cache when data changes
         self._invalidate_stats_cache()
@@ -339,17 +476,9 @@ class FinetuningPool:
         Returns:
             Dictionary with source breakdown
         """
-        examples = self.pools.get(artifact_type, [])
-        
-        real_count = 0
-        synthetic_count = 0
-        
-        for example in examples:
-            source = example.get('context', {}).get('source', 'feedback')
-            if source == 'synthetic':
-                synthetic_count += 1
-            else:
-                real_count += 1
+        counts = self._source_counts.get(artifact_type) or {'real': 0, 'synthetic': 0}
+        real_count = counts['real']
+        synthetic_count = counts['synthetic']
         
         total = real_count + synthetic_count
         synthetic_pct = (synthetic_count / total * 100) if total > 0 else 0
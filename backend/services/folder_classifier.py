@@ -0,0 +1,272 @@
+"""
+Folder Classifier - Nearest-folder suggestions for meeting notes.
+
+Suggesting a folder used to run a full LLM generation on every paste. The
+classifier answers it locally instead:
+
+- every note under settings.meeting_notes_dir is embedded once (keyed by
+  folder, file name and mtime, so a rescan only embeds changed notes)
+- each folder keeps the sum of its note vectors and a count; saving, moving
+  or deleting a note adjusts those in place, and the centroid is the
+  normalized sum
+- a suggestion embeds the new content and ranks folders by cosine
+  similarity to their centroids
+
+Embeddings come from sentence-transformers (all-MiniLM-L6-v2) when it is
+installed, otherwise from a hashed bag of words, which needs only numpy.
+"""
+
+import re
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.core.config import settings
+from backend.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+NOTE_SUFFIXES = (".md", ".txt")
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+HASH_DIMENSIONS = 1024
+MAX_EMBED_CHARS = 4000  # Topic is settled long before this; keeps embedding cost flat
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9_\-]+")
+_STOPWORDS = frozenset(
+    "the and for that this with from are was were will would should could have has had not but "
+    "you your our they them their there what when where which who how all any can about into "
+    "also just more some than then its it's been being over only out per via we us".split()
+)
+
+
+class HashingEmbedder:
+    """Bag of words hashed into a fixed number of dimensions (no model needed)."""
+
+    name = "hashing"
+
+    def __init__(self, dimensions: int = HASH_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: Dict[int, int] = {}
+            for token in _TOKEN_PATTERN.findall(text.lower()):
+                if token not in _STOPWORDS:
+                    # crc32 rather than hash(): stable across processes
+                    bucket = zlib.crc32(token.encode("utf-8")) % self.dimensions
+                    counts[bucket] = counts.get(bucket, 0) + 1
+            if counts:
+                buckets = np.fromiter(counts.keys(), dtype=np.int64)
+                vectors[row, buckets] = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32))
+        return _normalize(vectors)
+
+
+class SentenceEmbedder:
+    """sentence-transformers model, loaded on first use."""
+
+    name = EMBEDDING_MODEL
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        self.model_name = model_name
+        self._model = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+            logger.info(f"📁 [FOLDER_CLASSIFIER] Loaded embedding model: {self.model_name}")
+        vectors = self._model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def default_embedder():
+    """sentence-transformers when installed, else hashed bag of words."""
+    try:
+        import sentence_transformers  # noqa: F401
+        return SentenceEmbedder()
+    except ImportError:
+        logger.info("📁 [FOLDER_CLASSIFIER] sentence-transformers not available, using hashed word vectors")
+        return HashingEmbedder()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class FolderClassifier:
+    """
+    Per-folder centroids of meeting note embeddings.
+
+    Usage:
+        classifier = get_folder_classifier()
+        classifier.suggest(content, top_k=3)        # [(folder, similarity), ...]
+        classifier.add_note("auth", note_path)      # after saving a note
+        classifier.remove_note("auth", "kickoff.md")
+    """
+
+    def __init__(self, notes_dir: Optional[Path] = None, embedder=None):
+        """
+        Args:
+            notes_dir: Meeting notes root (defaults to settings.meeting_notes_dir)
+            embedder: Object with embed(texts) -> normalized vectors (defaults to default_embedder())
+        """
+        self.notes_dir = Path(notes_dir or settings.meeting_notes_dir)
+        self.embedder = embedder or default_embedder()
+        self._lock = threading.RLock()
+        self._built = False
+        self._notes: Dict[Tuple[str, str], Tuple[float, np.ndarray]] = {}
+        self._sums: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, int] = {}
+        self._matrix: Optional[Tuple[List[str], np.ndarray]] = None
+
+    def refresh(self) -> int:
+        """
+        Bring the index in line with the notes on disk.
+
+        Notes whose mtime is unchanged are not read again. Returns the number
+        of notes embedded.
+        """
+        on_disk: Dict[Tuple[str, str], Tuple[float, Path]] = {}
+        if self.notes_dir.exists():
+            for folder_path in self.notes_dir.iterdir():
+                if not folder_path.is_dir():
+                    continue
+                for note_path in folder_path.iterdir():
+                    if note_path.suffix in NOTE_SUFFIXES and note_path.is_file():
+                        on_disk[(folder_path.name, note_path.name)] = (note_path.stat().st_mtime, note_path)
+
+        with self._lock:
+            for key in self._notes.keys() - on_disk.keys():
+                self._discard(key)
+            changed = [(key, mtime, path) for key, (mtime, path) in on_disk.items()
+                       if key not in self._notes or self._notes[key][0] != mtime]
+
+        texts, entries = [], []
+        for key, mtime, path in changed:
+            try:
+                texts.append(path.read_text(encoding="utf-8")[:MAX_EMBED_CHARS])
+                entries.append((key, mtime))
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"⚠️ [FOLDER_CLASSIFIER] Could not read note {path}: {e}")
+        vectors = self.embedder.embed(texts) if texts else []
+
+        with self._lock:
+            for (key, mtime), vector in zip(entries, vectors):
+                self._store(key, mtime, vector)
+            self._built = True
+        if entries:
+            logger.info(f"📁 [FOLDER_CLASSIFIER] Embedded {len(entries)} notes, "
+                        f"{len(self._counts)} folders indexed")
+        return len(entries)
+
+    def add_note(self, folder_id: str, note_path: Path, content: Optional[str] = None):
+        """Index a saved (new or edited) note. No-op until the index is built."""
+        note_path = Path(note_path)
+        if not self._built or note_path.suffix not in NOTE_SUFFIXES:
+            return
+        if content is None:
+            content = note_path.read_text(encoding="utf-8")
+        try:
+            mtime = note_path.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        vector = self.embedder.embed([content[:MAX_EMBED_CHARS]])[0]
+        with self._lock:
+            self._store((folder_id, note_path.name), mtime, vector)
+
+    def remove_note(self, folder_id: str, note_name: str):
+        """Drop a deleted note from its folder's centroid."""
+        with self._lock:
+            self._discard((folder_id, note_name))
+
+    def move_note(self, from_folder: str, to_folder: str, note_name: str):
+        """Move a note's vector between folders without embedding it again."""
+        with self._lock:
+            entry = self._notes.get((from_folder, note_name))
+            if entry is None:
+                return
+            self._discard((from_folder, note_name))
+            self._store((to_folder, note_name), *entry)
+
+    def remove_folder(self, folder_id: str):
+        """Drop a deleted folder and all of its notes."""
+        with self._lock:
+            for key in [key for key in self._notes if key[0] == folder_id]:
+                self._discard(key)
+
+    def rename_folder(self, old_name: str, new_name: str):
+        """Re-key a renamed folder's notes."""
+        with self._lock:
+            for key in [key for key in self._notes if key[0] == old_name]:
+                entry = self._notes[key]
+                self._discard(key)
+                self._store((new_name, key[1]), *entry)
+
+    def suggest(self, content: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Folders closest to `content`, best first.
+
+        Returns:
+            Up to top_k (folder, cosine similarity) pairs; empty when no
+            folder has notes yet
+        """
+        if not self._built:
+            self.refresh()
+        with self._lock:
+            if self._matrix is None:
+                folders = sorted(self._sums)
+                centroids = np.stack([self._sums[f] for f in folders]) if folders else np.zeros((0, 0))
+                self._matrix = (folders, _normalize(centroids))
+            folders, centroids = self._matrix
+        if not folders:
+            return []
+
+        similarities = centroids @ self.embedder.embed([content[:MAX_EMBED_CHARS]])[0]
+        best = np.argsort(-similarities)[:top_k]
+        return [(folders[i], round(float(similarities[i]), 4)) for i in best]
+
+    def _store(self, key: Tuple[str, str], mtime: float, vector: np.ndarray):
+        self._discard(key)
+        folder_id = key[0]
+        self._notes[key] = (mtime, vector)
+        if folder_id in self._sums:
+            self._sums[folder_id] = self._sums[folder_id] + vector
+            self._counts[folder_id] += 1
+        else:
+            self._sums[folder_id] = vector.astype(np.float32, copy=True)
+            self._counts[folder_id] = 1
+        self._matrix = None
+
+    def _discard(self, key: Tuple[str, str]):
+        entry = self._notes.pop(key, None)
+        if entry is None:
+            return
+        folder_id = key[0]
+        self._counts[folder_id] -= 1
+        if self._counts[folder_id] == 0:
+            del self._counts[folder_id]
+            del self._sums[folder_id]
+        else:
+            self._sums[folder_id] = self._sums[folder_id] - entry[1]
+        self._matrix = None
+
+
+# Global instance
+_folder_classifier: Optional[FolderClassifier] = None
+
+
+def get_folder_classifier() -> FolderClassifier:
+    """Get or create the global Folder Classifier instance."""
+    global _folder_classifier
+    if _folder_classifier is None:
+        _folder_classifier = FolderClassifier()
+    return _folder_classifier
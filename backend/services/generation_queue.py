@@ -0,0 +1,246 @@
+"""
+Generation Job Queue - Admission control and bounded concurrency for artifact generation.
+
+Every background generation job (/generate, regenerate, /bulk) is submitted
+here instead of being started with asyncio.create_task(). Jobs wait in a
+priority queue per resource class and at most `workers[resource]` run at once:
+
+- "local": the pipeline tries local models first, so these jobs share the GPU
+  (default 1 worker)
+- "cloud": jobs pinned to a cloud model (model_preference "gemini:...", etc.)
+  only wait on API latency and can run wider (default 4 workers)
+
+Within a resource class, lower priority values run first (interactive
+requests ahead of bulk items), then first-come-first-served. When more than
+`max_pending` jobs are waiting, submit() raises QueueFullError and the API
+answers 429 with a Retry-After hint.
+"""
+
+import sys
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.core.config import settings
+from backend.core.logger import get_logger
+from backend.core.metrics import get_metrics_collector
+
+logger = get_logger(__name__)
+metrics = get_metrics_collector()
+
+LOCAL = "local"
+CLOUD = "cloud"
+
+CLOUD_PROVIDERS = {"gemini", "groq", "openai", "anthropic"}
+
+
+class JobPriority(IntEnum):
+    """Priority lane (lower value runs first)"""
+    INTERACTIVE = 0   # Single /generate or regenerate request, a user is waiting
+    NORMAL = 1
+    BULK = 2          # Items of a /bulk request
+
+
+class QueueFullError(Exception):
+    """Raised when the queue has no room for more pending jobs."""
+
+    def __init__(self, pending: int, retry_after: int):
+        super().__init__(f"Generation queue is full ({pending} jobs waiting)")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+def resource_class_for(options: Optional[Dict[str, Any]]) -> str:
+    """Resource class of a job from its generation options."""
+    preference = (options or {}).get("model_preference") or ""
+    provider = preference.split(":", 1)[0].lower() if ":" in preference else preference.lower()
+    return CLOUD if provider in CLOUD_PROVIDERS else LOCAL
+
+
+@dataclass(order=True)
+class _QueuedJob:
+    """A pending job (heap-ordered by priority, then arrival)"""
+    priority: int
+    seq: int
+    job_id: str = field(compare=False)
+    resource: str = field(compare=False)
+    run: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class GenerationJobQueue:
+    """
+    Priority queues with a fixed number of worker slots per resource class.
+
+    Usage:
+        future = queue.submit(job_id, lambda: run_job(job_id), resource="local",
+                              priority=JobPriority.INTERACTIVE)
+        queue.position(job_id)   # 1 = next to run, None once started
+        result = await future    # whatever run_job returned
+    """
+
+    def __init__(self, workers: Optional[Dict[str, int]] = None, max_pending: int = 50):
+        """
+        Args:
+            workers: Concurrent jobs per resource class ({"local": 1, "cloud": 4})
+            max_pending: Jobs allowed to wait (across all classes) before rejecting
+        """
+        self.workers = {LOCAL: 1, CLOUD: 4}
+        self.workers.update({k: max(1, v) for k, v in (workers or {}).items()})
+        self.max_pending = max(1, max_pending)
+
+        self.pending: Dict[str, List[_QueuedJob]] = {resource: [] for resource in self.workers}
+        self.running: Dict[str, Dict[str, asyncio.Task]] = {resource: {} for resource in self.workers}
+        self._seq = itertools.count()
+
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self._durations: List[float] = []
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(heap) for heap in self.pending.values())
+
+    def has_capacity(self, count: int = 1) -> bool:
+        return self.pending_count + count <= self.max_pending
+
+    def submit(
+        self,
+        job_id: str,
+        run: Callable[[], Awaitable[Any]],
+        resource: str = LOCAL,
+        priority: int = JobPriority.NORMAL,
+    ) -> asyncio.Future:
+        """
+        Queue a job. Returns a future resolved with run()'s result.
+
+        Raises:
+            QueueFullError: too many jobs are already waiting
+        """
+        if resource not in self.workers:
+            resource = LOCAL
+        if not self.has_capacity():
+            self.rejected += 1
+            metrics.increment("generation_queue_rejected_total", tags={"resource": resource})
+            raise QueueFullError(self.pending_count, self.retry_after(resource))
+
+        job = _QueuedJob(
+            priority=int(priority),
+            seq=next(self._seq),
+            job_id=job_id,
+            resource=resource,
+            run=run,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.perf_counter(),
+        )
+        heapq.heappush(self.pending[resource], job)
+        self.submitted += 1
+        logger.info(f"📥 [GEN_QUEUE] Queued {job_id} ({resource}, priority={JobPriority(job.priority).name.lower()}), "
+                    f"position={self.position(job_id)}")
+        self._dispatch(resource)
+        return job.future
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based place in line within the job's resource class, or None if not waiting."""
+        for heap in self.pending.values():
+            for index, job in enumerate(sorted(heap)):
+                if job.job_id == job_id:
+                    return index + 1
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a job that has not started yet."""
+        for resource, heap in self.pending.items():
+            for job in heap:
+                if job.job_id == job_id:
+                    heap.remove(job)
+                    heapq.heapify(heap)
+                    job.future.cancel()
+                    self._publish(resource)
+                    return True
+        return False
+
+    def retry_after(self, resource: str = LOCAL) -> int:
+        """Rough seconds until a slot frees up, for the Retry-After header."""
+        average = sum(self._durations) / len(self._durations) if self._durations else 60.0
+        waiting = len(self.pending.get(resource, ())) + 1
+        return max(1, int(average * waiting / self.workers.get(resource, 1)))
+
+    def _dispatch(self, resource: str):
+        heap = self.pending[resource]
+        running = self.running[resource]
+        while heap and len(running) < self.workers[resource]:
+            job = heapq.heappop(heap)
+            if job.future.cancelled():
+                continue
+            running[job.job_id] = asyncio.create_task(self._run(job))
+        self._publish(resource)
+
+    async def _run(self, job: _QueuedJob):
+        wait = time.perf_counter() - job.enqueued_at
+        metrics.record(
+            "generation_queue_wait_seconds",
+            wait,
+            tags={"resource": job.resource, "priority": JobPriority(job.priority).name.lower()},
+        )
+        started = time.perf_counter()
+        try:
+            result = await job.run()
+            if not job.future.done():
+                job.future.set_result(result)
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"❌ [GEN_QUEUE] Job {job.job_id} failed: {e}", exc_info=True)
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self._durations = (self._durations + [time.perf_counter() - started])[-20:]
+            self.completed += 1
+            self.running[job.resource].pop(job.job_id, None)
+            self._dispatch(job.resource)
+
+    def _publish(self, resource: str):
+        metrics.gauge("generation_queue_depth", len(self.pending[resource]), tags={"resource": resource})
+        metrics.gauge("generation_queue_running", len(self.running[resource]), tags={"resource": resource})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and running jobs per resource class."""
+        return {
+            "workers": dict(self.workers),
+            "pending": {resource: len(heap) for resource, heap in self.pending.items()},
+            "running": {resource: len(tasks) for resource, tasks in self.running.items()},
+            "max_pending": self.max_pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+# Global instance
+_queue: Optional[GenerationJobQueue] = None
+
+
+def get_generation_queue() -> GenerationJobQueue:
+    """Get the process-wide generation job queue."""
+    global _queue
+    if _queue is None:
+        _queue = GenerationJobQueue(
+            workers={
+                LOCAL: settings.generation_local_workers,
+                CLOUD: settings.generation_cloud_workers,
+            },
+            max_pending=settings.generation_queue_max_pending,
+        )
+    return _queue
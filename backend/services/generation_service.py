@@ -5,22 +5,83 @@ Handles artifact generation with streaming support.
 
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional, AsyncGenerator, Union
+from typing import Dict, List, Any, Optional, AsyncGenerator, Union, Callable, Awaitable, Tuple
 from datetime import datetime
+import hashlib
+import json
+import time
 import uuid
 import asyncio
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from backend.services.context_builder import get_builder as get_context_builder
+from backend.services.context_builder import ContextSession, get_builder as get_context_builder
 from backend.services.enhanced_generation import get_enhanced_service
 from backend.services.quality_predictor import get_quality_predictor
+from backend.services.generation_queue import get_generation_queue, resource_class_for, JobPriority
 from backend.core.config import settings
 from backend.core.logger import get_logger, log_error_to_file, capture_exceptions
+from backend.core.metrics import get_metrics_collector
 from backend.models.dto import ArtifactType, GenerationStatus
 
 logger = get_logger(__name__)
+metrics = get_metrics_collector()
+
+# Generation options applied before request options
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "max_retries": 3,
+    "use_validation": True,
+    "use_multi_agent": False,
+    "temperature": 0.7,
+    "model_preference": None
+}
+
+
+class _Flight:
+    """
+    One in-flight generation shared by every identical request.
+    
+    The leader's pipeline runs in its own task and publishes events here; each
+    attached request replays them from the start, so late joiners still see
+    the "started" event and all progress so far.
+    """
+    
+    def __init__(self, key: str, leader_job_id: str, stream: bool):
+        self.key = key
+        self.leader_job_id = leader_job_id
+        self.stream = stream
+        self.events: List[Dict[str, Any]] = []
+        self.started = False
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+    
+    def publish(self, event: Dict[str, Any]):
+        self.events.append(event)
+        self._wake()
+    
+    def finish(self):
+        self.done = True
+        self._wake()
+    
+    def _wake(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+    
+    async def follow(self) -> AsyncGenerator[Dict[str, Any], None]:
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
 
 # Enhanced Generation Service is the primary generation path
 # It handles: local models → retry → cloud fallback → validation → finetuning pool
@@ -45,6 +106,11 @@ class GenerationService:
         self.enhanced_gen = get_enhanced_service()  # Primary generation service (local → cloud pipeline)
         self.quality_predictor = get_quality_predictor()
         self.active_jobs: Dict[str, Dict[str, Any]] = {}
+        self.job_queue = get_generation_queue()  # Bounded workers for background jobs
+        
+        # Single-flight: identical concurrent requests share one pipeline run
+        self._flights: Dict[str, _Flight] = {}
+        self._recent_results: Dict[str, Tuple[float, Dict[str, Any], Dict[str, Any]]] = {}
         
         # FIX: Memory leak prevention - limit max jobs and add cleanup
         self.max_jobs = 100  # Maximum jobs to keep in memory
@@ -201,6 +267,31 @@ class GenerationService:
         
         return content
     
+    @staticmethod
+    def flight_key(
+        artifact_type: Union[ArtifactType, str],
+        meeting_notes: str,
+        context_id: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        folder_id: Optional[str] = None,
+        stream: bool = False
+    ) -> str:
+        """Canonical hash of everything that determines a generation's output."""
+        artifact_type_str = artifact_type.value if isinstance(artifact_type, ArtifactType) else str(artifact_type)
+        payload = json.dumps(
+            {
+                "artifact_type": artifact_type_str,
+                "meeting_notes": (meeting_notes or "").replace("\r\n", "\n").strip(),
+                "context_id": context_id,
+                "folder_id": folder_id,
+                "options": {**DEFAULT_OPTIONS, **(options or {})},
+                "stream": bool(stream),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
     async def generate_artifact(
         self,
         artifact_type: Union[ArtifactType, str],
@@ -208,11 +299,19 @@ class GenerationService:
         context_id: Optional[str] = None,
         options: Optional[Dict[str, Any]] = None,
         stream: bool = False,
-        folder_id: Optional[str] = None
+        folder_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        context_session: Optional[ContextSession] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generate an artifact with optional streaming.
         
+        Identical requests (same flight_key) that arrive while one is running
+        attach to it instead of starting a second pipeline: they receive the
+        same events under their own job_id and end with the same artifact.
+        With settings.generation_result_cache_seconds > 0, a request repeated
+        shortly after a successful run is answered from that result.
+        
         Args:
             artifact_type: Type of artifact to generate (enum or custom type string)
             meeting_notes: User requirements
@@ -220,11 +319,156 @@ class GenerationService:
             options: Generation options (max_retries, temperature, etc.)
             stream: Whether to stream progress updates
             folder_id: Optional folder ID to associate artifact with meeting notes folder
+            job_id: Job ID assigned by enqueue_job (a new one is created if omitted)
+            context_session: Optional ContextSession shared by the jobs of one batch
         
         Yields:
             Progress updates and final artifact
         """
-        job_id = f"gen_{uuid.uuid4().hex[:8]}"
+        job_id = job_id or self.new_job_id()
+        run_kwargs = dict(
+            artifact_type=artifact_type,
+            meeting_notes=meeting_notes,
+            context_id=context_id,
+            options=options,
+            stream=stream,
+            folder_id=folder_id,
+            job_id=job_id,
+            context_session=context_session
+        )
+        if not settings.generation_dedup_enabled:
+            async for event in self._run_generation(**run_kwargs):
+                yield event
+            return
+        
+        key = self.flight_key(artifact_type, meeting_notes, context_id, options, folder_id, stream)
+        
+        cached = self._cached_result(key)
+        if cached is not None:
+            async for event in self._replay_result(job_id, run_kwargs, *cached):
+                yield event
+            return
+        
+        flight = self._flights.get(key)
+        if flight is None or flight.done:
+            flight = self._flights[key] = _Flight(key, job_id, stream)
+        
+        leader = flight.leader_job_id == job_id
+        if leader:
+            flight.started = True
+            flight.task = asyncio.create_task(self._fly(flight, run_kwargs))
+            metrics.increment("generation_dedup_total", tags={"result": "leader"})
+        else:
+            logger.info(f"🔗 [GEN_SERVICE] Job {job_id} attached to identical in-flight job {flight.leader_job_id}")
+            metrics.increment("generation_dedup_total", tags={"result": "attached"})
+            self._init_attached_job(job_id, flight.leader_job_id, run_kwargs)
+        
+        flight.subscribers += 1
+        try:
+            async for event in flight.follow():
+                if not leader:
+                    event = {**event, "job_id": job_id}
+                yield event
+        finally:
+            flight.subscribers -= 1
+            if not leader:
+                self._mirror_job(job_id, flight.leader_job_id)
+            if flight.subscribers == 0 and not flight.done and flight.task:
+                # Every requester went away (e.g. client disconnect): stop the pipeline
+                flight.task.cancel()
+    
+    async def _fly(self, flight: _Flight, run_kwargs: Dict[str, Any]):
+        """Run the leader's pipeline and publish its events to the flight."""
+        try:
+            async for event in self._run_generation(**run_kwargs):
+                flight.publish(event)
+        except Exception as e:
+            flight.error = e
+        else:
+            final = flight.events[-1] if flight.events else None
+            leader_job = self.active_jobs.get(flight.leader_job_id)
+            if (settings.generation_result_cache_seconds > 0 and final and leader_job
+                    and final.get("status") == GenerationStatus.COMPLETED.value):
+                self._recent_results[flight.key] = (time.monotonic(), final, dict(leader_job))
+        finally:
+            flight.finish()
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+    
+    def _cached_result(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        ttl = settings.generation_result_cache_seconds
+        if ttl <= 0:
+            return None
+        now = time.monotonic()
+        for stale in [k for k, (at, _, _) in self._recent_results.items() if now - at > ttl]:
+            del self._recent_results[stale]
+        entry = self._recent_results.get(key)
+        return (entry[1], entry[2]) if entry else None
+    
+    async def _replay_result(
+        self,
+        job_id: str,
+        run_kwargs: Dict[str, Any],
+        final_event: Dict[str, Any],
+        leader_job: Dict[str, Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Answer a repeated request from the short-lived result cache."""
+        logger.info(f"♻️ [GEN_SERVICE] Job {job_id} served from the result of job {leader_job.get('job_id')}")
+        metrics.increment("generation_dedup_total", tags={"result": "cached"})
+        self._init_attached_job(job_id, leader_job.get("job_id"), run_kwargs)
+        yield {
+            "type": "started",
+            "job_id": job_id,
+            "status": GenerationStatus.IN_PROGRESS.value,
+            "created_at": self.active_jobs[job_id]["created_at"]
+        }
+        self._mirror_job(job_id, leader_job.get("job_id"), leader_job)
+        yield {**final_event, "job_id": job_id}
+    
+    def _init_attached_job(self, job_id: str, leader_job_id: Optional[str], run_kwargs: Dict[str, Any]):
+        artifact_type = run_kwargs["artifact_type"]
+        queued_job = self.active_jobs.get(job_id, {})
+        leader_job = self.active_jobs.get(leader_job_id) or {}
+        # An attached job waits in line exactly as long as the job it is attached to
+        waiting = leader_job.get("status") == GenerationStatus.PENDING.value
+        self.active_jobs[job_id] = {
+            **queued_job,
+            "job_id": job_id,
+            "artifact_type": artifact_type.value if isinstance(artifact_type, ArtifactType) else str(artifact_type),
+            "status": GenerationStatus.PENDING.value if waiting else GenerationStatus.IN_PROGRESS.value,
+            "progress": 0.0,
+            "created_at": queued_job.get("created_at") or datetime.now().isoformat(),
+            "started_at": datetime.now().isoformat(),
+            "meeting_notes": run_kwargs["meeting_notes"],
+            "folder_id": run_kwargs["folder_id"],
+            "is_custom_type": not isinstance(artifact_type, ArtifactType),
+            "attached_to": leader_job_id
+        }
+    
+    def _mirror_job(self, job_id: str, leader_job_id: Optional[str], leader_job: Optional[Dict[str, Any]] = None):
+        """Copy the leader's outcome into an attached job's status entry."""
+        leader_job = leader_job or self.active_jobs.get(leader_job_id) or {}
+        job = self.active_jobs.get(job_id)
+        if job is None or leader_job.get("status") in (None, GenerationStatus.PENDING.value):
+            return
+        job.update({
+            k: v for k, v in leader_job.items()
+            if k not in ("job_id", "created_at", "started_at", "attached_to", "resource_class", "priority")
+        })
+    
+    async def _run_generation(
+        self,
+        artifact_type: Union[ArtifactType, str],
+        meeting_notes: str,
+        context_id: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        folder_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        context_session: Optional[ContextSession] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run the full generation pipeline for one job (see generate_artifact)."""
+        job_id = job_id or self.new_job_id()
         
         # Handle both enum and string artifact types
         if isinstance(artifact_type, ArtifactType):
@@ -240,13 +484,7 @@ class GenerationService:
                    f"context_id={context_id}, folder_id={folder_id}, stream={stream}")
         
         # Default options
-        opts = {
-            "max_retries": 3,
-            "use_validation": True,
-            "use_multi_agent": False,
-            "temperature": 0.7,
-            "model_preference": None
-        }
+        opts = dict(DEFAULT_OPTIONS)
         if options:
             opts.update(options)
         logger.info(f"⚙️ [GEN_SERVICE] Generation options: {opts}")
@@ -254,13 +492,16 @@ class GenerationService:
         # FIX: Cleanup old jobs to prevent memory leak
         self._cleanup_old_jobs()
         
-        # Initialize job
+        # Initialize job (keeping the submission time of a queued job)
+        queued_job = self.active_jobs.get(job_id, {})
         self.active_jobs[job_id] = {
+            **queued_job,
             "job_id": job_id,
             "artifact_type": artifact_type_str,
             "status": GenerationStatus.IN_PROGRESS.value,
             "progress": 0.0,
-            "created_at": datetime.now().isoformat(),
+            "created_at": queued_job.get("created_at") or datetime.now().isoformat(),
+            "started_at": datetime.now().isoformat(),
             "meeting_notes": meeting_notes,
             "folder_id": folder_id,  # Associate artifact with meeting notes folder
             "is_custom_type": is_custom_type  # Track if this is a custom artifact type
@@ -300,7 +541,8 @@ class GenerationService:
                     include_kg=True,
                     include_patterns=True,
                     include_ml_features=True,  # Enable ML features for deeper context
-                    force_refresh=True  # Always get fresh context for generation
+                    force_refresh=True,  # Always get fresh context for generation
+                    session=context_session
                 )
                 logger.info(f"✅ [GEN_SERVICE] Context built successfully: "
                            f"has_rag={bool(context.get('rag'))}, "
@@ -392,7 +634,8 @@ class GenerationService:
                         meeting_notes=meeting_notes,
                         context_id=context_id,
                         options=opts,
-                        progress_callback=progress_callback if stream else None
+                        progress_callback=progress_callback if stream else None,
+                        context_session=context_session
                     )
                     # Put result in queue
                     await queue.put({"type": "result", "data": gen_result})
@@ -700,7 +943,9 @@ class GenerationService:
         artifact_type: ArtifactType,
         meeting_notes: str,
         context_id: Optional[str] = None,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        context_session: Optional[ContextSession] = None
     ) -> Dict[str, Any]:
         """
         Generate artifact synchronously (non-streaming).
@@ -710,6 +955,8 @@ class GenerationService:
             meeting_notes: User requirements
             context_id: Optional pre-built context ID
             options: Generation options
+            job_id: Job ID assigned by enqueue_job (optional)
+            context_session: Optional ContextSession shared by the jobs of one batch
         
         Returns:
             Final generation result
@@ -720,12 +967,101 @@ class GenerationService:
             meeting_notes=meeting_notes,
             context_id=context_id,
             options=options,
-            stream=False
+            stream=False,
+            job_id=job_id,
+            context_session=context_session
         ):
             result = update
         
         return result or {"error": "Generation failed"}
     
+    @staticmethod
+    def new_job_id() -> str:
+        return f"gen_{uuid.uuid4().hex[:8]}"
+    
+    def enqueue_job(
+        self,
+        run: Callable[[str], Awaitable[Any]],
+        artifact_type: Union[ArtifactType, str],
+        meeting_notes: str,
+        options: Optional[Dict[str, Any]] = None,
+        folder_id: Optional[str] = None,
+        priority: int = JobPriority.NORMAL,
+        context_id: Optional[str] = None,
+        stream: bool = False
+    ) -> Tuple[str, asyncio.Future]:
+        """
+        Register a pending job and queue `run(job_id)` on the generation queue.
+        
+        The job is visible through get_job_status (status "pending" with a
+        queue_position) until a worker picks it up; `run` should call
+        generate_artifact(..., job_id=job_id) with the same inputs.
+        
+        A job identical to one already queued or running does not take a
+        queue slot: `run` starts right away and attaches to that job.
+        
+        Returns:
+            (job_id, future resolved with run's result)
+        
+        Raises:
+            QueueFullError: The queue is full (the API answers 429)
+        """
+        job_id = self.new_job_id()
+        artifact_type_str = artifact_type.value if isinstance(artifact_type, ArtifactType) else str(artifact_type)
+        resource = resource_class_for(options)
+        
+        self._cleanup_old_jobs()
+        self.active_jobs[job_id] = {
+            "job_id": job_id,
+            "artifact_type": artifact_type_str,
+            "status": GenerationStatus.PENDING.value,
+            "progress": 0.0,
+            "created_at": datetime.now().isoformat(),
+            "meeting_notes": meeting_notes,
+            "folder_id": folder_id,
+            "is_custom_type": not isinstance(artifact_type, ArtifactType),
+            "resource_class": resource,
+            "priority": JobPriority(priority).name.lower()
+        }
+        if not settings.generation_dedup_enabled:
+            try:
+                future = self.job_queue.submit(job_id, lambda: run(job_id), resource=resource, priority=priority)
+            except Exception:
+                del self.active_jobs[job_id]
+                raise
+            return job_id, future
+        
+        key = self.flight_key(artifact_type, meeting_notes, context_id, options, folder_id, stream)
+        flight = self._flights.get(key)
+        if flight is not None and not flight.done:
+            self.active_jobs[job_id]["attached_to"] = flight.leader_job_id
+            return job_id, asyncio.ensure_future(run(job_id))
+        
+        # Reserve the flight now so identical requests attach while this one waits in line
+        flight = self._flights[key] = _Flight(key, job_id, stream)
+        try:
+            future = self.job_queue.submit(job_id, lambda: run(job_id), resource=resource, priority=priority)
+        except Exception:
+            del self.active_jobs[job_id]
+            del self._flights[key]
+            raise
+        future.add_done_callback(lambda _: self._abandon_flight(flight))
+        return job_id, future
+    
+    def _abandon_flight(self, flight: _Flight):
+        """Release a reserved flight whose leader never started (cancelled or failed in the queue)."""
+        if flight.started or flight.done:
+            return
+        flight.publish({
+            "type": "error",
+            "job_id": flight.leader_job_id,
+            "status": GenerationStatus.CANCELLED.value,
+            "error": "The identical job this request was attached to was cancelled"
+        })
+        flight.finish()
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+    
     def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Get status of a generation job.
@@ -734,9 +1070,19 @@ class GenerationService:
             job_id: Job identifier
         
         Returns:
-            Job status dictionary or None if not found
+            Job status dictionary or None if not found. Queued jobs include
+            their 1-based queue_position.
         """
-        return self.active_jobs.get(job_id)
+        job = self.active_jobs.get(job_id)
+        active = (GenerationStatus.PENDING.value, GenerationStatus.IN_PROGRESS.value)
+        leader = self.active_jobs.get(job.get("attached_to")) if job else None
+        if leader and job["status"] in active and leader.get("status") in active:
+            # Attached jobs report the progress of the job doing the work
+            job = {**job, "status": leader["status"], "progress": leader.get("progress", 0.0)}
+            job_id = leader["job_id"]
+        if job and job.get("status") == GenerationStatus.PENDING.value:
+            return {**job, "queue_position": self.job_queue.position(job_id)}
+        return job
     
     def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -764,6 +1110,10 @@ class GenerationService:
         """
         if job_id in self.active_jobs:
             job = self.active_jobs[job_id]
+            if job["status"] == GenerationStatus.PENDING.value and self.job_queue.cancel(job_id):
+                job["status"] = GenerationStatus.CANCELLED.value
+                job["completed_at"] = datetime.now().isoformat()
+                return True
             if job["status"] == GenerationStatus.IN_PROGRESS.value:
                 job["status"] = GenerationStatus.CANCELLED.value
                 job["completed_at"] = datetime.now().isoformat()
@@ -1,7 +1,12 @@
 """
 Git Service - Provides git diff functionality for artifacts.
+
+Artifact status for the outputs tree comes from one `git status
+--porcelain=v2 -z` and one `git ls-files -z` (instead of two git processes
+per file), cached until the git index, HEAD or the output files change.
 """
 
+import os
 import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
@@ -18,6 +23,9 @@ from backend.utils.target_project import get_target_project_path
 
 logger = get_logger(__name__)
 
+# File types listed by get_all_artifacts_git_status
+ARTIFACT_SUFFIXES = ('.md', '.mermaid', '.mmd', '.html', '.json', '.txt')
+
 
 class GitService:
     """
@@ -34,6 +42,8 @@ class GitService:
         """Initialize Git Service."""
         self.outputs_dir = Path("outputs")
         self.outputs_dir.mkdir(parents=True, exist_ok=True)
+        # (cache key, {repo-relative path: porcelain XY}, {tracked paths})
+        self._status_cache: Optional[Tuple[Tuple, Dict[str, str], set]] = None
         logger.info("Git Service initialized")
     
     def _get_repo_root(self) -> Optional[Path]:
@@ -245,6 +255,136 @@ class GitService:
             "raw": stats_output
         }
     
+    @staticmethod
+    def _git_dir(repo_root: Path) -> Path:
+        """The .git directory (a .git file points elsewhere for worktrees and submodules)."""
+        git_path = repo_root / ".git"
+        if git_path.is_file():
+            content = git_path.read_text(encoding='utf-8').strip()
+            if content.startswith("gitdir:"):
+                return (repo_root / content[len("gitdir:"):].strip()).resolve()
+        return git_path
+    
+    def _head_state(self, git_dir: Path) -> str:
+        """Commit HEAD points at, read from the ref files without running git."""
+        head = (git_dir / "HEAD").read_text(encoding='utf-8').strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head[len("ref: "):]
+        ref_file = git_dir / ref
+        if ref_file.exists():
+            return f"{ref}:{ref_file.read_text(encoding='utf-8').strip()}"
+        packed_refs = git_dir / "packed-refs"
+        if packed_refs.exists():
+            for line in packed_refs.read_text(encoding='utf-8').splitlines():
+                if line.endswith(f" {ref}"):
+                    return f"{ref}:{line.split(' ', 1)[0]}"
+        return head
+    
+    def _status_cache_key(self, repo_root: Path, artifact_files: List[Path]) -> Optional[Tuple]:
+        """
+        Key for the cached status: git index mtime, HEAD commit, and the
+        outputs files' names and mtimes (editing or adding an output changes
+        its status without touching the index).
+        """
+        try:
+            git_dir = self._git_dir(repo_root)
+            index = git_dir / "index"
+            index_mtime = index.stat().st_mtime_ns if index.exists() else 0
+            outputs = tuple(sorted(
+                (str(path), path.stat().st_mtime_ns) for path in artifact_files if path.exists()
+            ))
+            return (str(repo_root), index_mtime, self._head_state(git_dir), outputs)
+        except OSError as e:
+            logger.debug(f"Could not build git status cache key: {e}")
+            return None
+    
+    def _outputs_git_status(self, repo_root: Path, artifact_files: List[Path]) -> Tuple[Dict[str, str], set]:
+        """
+        Porcelain status and tracked paths for the outputs tree.
+        
+        Returns:
+            ({repo-relative path: XY status code}, {tracked repo-relative paths})
+        """
+        key = self._status_cache_key(repo_root, artifact_files)
+        if key is not None and self._status_cache and self._status_cache[0] == key:
+            return self._status_cache[1], self._status_cache[2]
+        
+        try:
+            pathspec = self.outputs_dir.resolve().relative_to(repo_root).as_posix() or "."
+        except ValueError:
+            return {}, set()
+        
+        # --no-optional-locks: status would otherwise refresh the index, changing the cache key
+        statuses: Dict[str, str] = {}
+        success, status_output = self._run_git_command(
+            ['git', '--no-optional-locks', 'status', '--porcelain=v2', '-z', '--untracked-files=all', '--', pathspec],
+            cwd=repo_root
+        )
+        if success:
+            statuses = self._parse_porcelain_v2(status_output)
+        
+        tracked = set()
+        success_tracked, ls_output = self._run_git_command(
+            ['git', 'ls-files', '-z', '--', pathspec],
+            cwd=repo_root
+        )
+        if success_tracked:
+            tracked = {path for path in ls_output.split('\0') if path}
+        
+        if key is not None and success and success_tracked:
+            self._status_cache = (key, statuses, tracked)
+        return statuses, tracked
+    
+    @staticmethod
+    def _parse_porcelain_v2(output: str) -> Dict[str, str]:
+        """
+        Parse `git status --porcelain=v2 -z` into {path: XY}.
+        
+        Entry formats (fields separated by spaces, entries by NUL):
+            1 XY sub mH mI mW hH hI path
+            2 XY sub mH mI mW hH hI Xscore path NUL origPath
+            u XY sub m1 m2 m3 mW h1 h2 h3 path
+            ? path
+        """
+        statuses: Dict[str, str] = {}
+        entries = iter(output.split('\0'))
+        for entry in entries:
+            if not entry:
+                continue
+            kind = entry[0]
+            if kind == '1':
+                parts = entry.split(' ', 8)
+                statuses[parts[8]] = parts[1]
+            elif kind == '2':
+                parts = entry.split(' ', 9)
+                statuses[parts[9]] = parts[1]
+                next(entries, None)  # Original path of the rename/copy
+            elif kind == 'u':
+                parts = entry.split(' ', 10)
+                statuses[parts[10]] = parts[1]
+            elif kind == '?':
+                statuses[entry[2:]] = '??'
+        return statuses
+    
+    @staticmethod
+    def _file_status(rel_path: str, statuses: Dict[str, str], tracked: set) -> str:
+        """Artifact status name from the porcelain XY code and tracked set."""
+        git_status = "untracked"
+        status_code = statuses.get(rel_path, "")
+        if status_code.startswith('??'):
+            git_status = "untracked"
+        elif 'M' in status_code:
+            git_status = "modified"
+        elif 'A' in status_code:
+            git_status = "added"
+        elif 'D' in status_code:
+            git_status = "deleted"
+        
+        if rel_path in tracked and git_status == "untracked":
+            git_status = "tracked"
+        return git_status
+    
     def get_artifact_git_status(self, artifact_id: str) -> Dict[str, Any]:
         """
         Get git status for an artifact.
@@ -263,7 +403,7 @@ class GitService:
             }
         
         # Try to find artifact file in outputs directory
-        artifact_files = list(self.outputs_dir.rglob(f"*{artifact_id}*"))
+        artifact_files = list(self.outputs_dir.resolve().rglob(f"*{artifact_id}*"))
         
         if not artifact_files:
             return {
@@ -272,6 +412,8 @@ class GitService:
                 "files": []
             }
         
+        statuses, tracked = self._outputs_git_status(repo_root, artifact_files)
+        
         results = []
         for artifact_file in artifact_files:
             try:
@@ -284,33 +426,7 @@ class GitService:
                 })
                 continue
             
-            # Check git status
-            success, status_output = self._run_git_command(
-                ['git', 'status', '--porcelain', '--', str(rel_path)],
-                cwd=repo_root
-            )
-            
-            git_status = "untracked"
-            if success and status_output.strip():
-                # Parse status: " M file" = modified, "?? file" = untracked, "A  file" = added
-                status_code = status_output.strip().split()[0] if status_output.strip() else ""
-                if status_code.startswith('??'):
-                    git_status = "untracked"
-                elif 'M' in status_code:
-                    git_status = "modified"
-                elif 'A' in status_code:
-                    git_status = "added"
-                elif 'D' in status_code:
-                    git_status = "deleted"
-            
-            # Check if tracked
-            success_tracked, _ = self._run_git_command(
-                ['git', 'ls-files', '--error-unmatch', str(rel_path)],
-                cwd=repo_root
-            )
-            
-            if success_tracked and git_status == "untracked":
-                git_status = "tracked"
+            git_status = self._file_status(rel_path.as_posix(), statuses, tracked)
             
             results.append({
                 "path": str(rel_path),
@@ -338,10 +454,15 @@ class GitService:
                 "artifacts": []
             }
         
-        # Find all artifact files
+        # Find all artifact files (one walk of the outputs tree)
         artifact_files = []
-        for pattern in ['*.md', '*.mermaid', '*.mmd', '*.html', '*.json', '*.txt']:
-            artifact_files.extend(self.outputs_dir.rglob(pattern))
+        for directory, _, filenames in os.walk(self.outputs_dir.resolve()):
+            artifact_files.extend(
+                Path(directory) / name for name in filenames if name.endswith(ARTIFACT_SUFFIXES)
+            )
+        artifact_files.sort()
+        
+        statuses, tracked = self._outputs_git_status(repo_root, artifact_files)
         
         results = []
         for artifact_file in artifact_files:
@@ -350,30 +471,7 @@ class GitService:
             except ValueError:
                 continue
             
-            # Get git status
-            success, status_output = self._run_git_command(
-                ['git', 'status', '--porcelain', '--', str(rel_path)],
-                cwd=repo_root
-            )
-            
-            git_status = "untracked"
-            if success and status_output.strip():
-                status_code = status_output.strip().split()[0] if status_output.strip() else ""
-                if status_code.startswith('??'):
-                    git_status = "untracked"
-                elif 'M' in status_code:
-                    git_status = "modified"
-                elif 'A' in status_code:
-                    git_status = "added"
-            
-            # Check if tracked
-            success_tracked, _ = self._run_git_command(
-                ['git', 'ls-files', '--error-unmatch', str(rel_path)],
-                cwd=repo_root
-            )
-            
-            if success_tracked and git_status == "untracked":
-                git_status = "tracked"
+            git_status = self._file_status(rel_path.as_posix(), statuses, tracked)
             
             results.append({
                 "file": str(rel_path),
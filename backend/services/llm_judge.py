@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.core.config import settings
 from backend.core.logger import get_logger
+from ai.response_cache import get_response_cache
 
 logger = get_logger(__name__)
 
@@ -120,45 +121,62 @@ class LLMJudge:
         """
 
     async def _call_evaluator_llm(self, prompt: str) -> str:
-        """Call the underlying LLM provider."""
+        """
+        Call the underlying LLM provider.
+        
+        Judging runs at temperature 0 so scores are repeatable; with the response
+        cache enabled, re-judging an unchanged artifact costs no model call.
+        """
         # Check available providers (prioritizing fast/free ones)
+        cache = get_response_cache()
         
         # 1. Google Gemini (Best free fast option)
         if settings.google_api_key:
             try:
-                import google.generativeai as genai
-                genai.configure(api_key=settings.google_api_key)
-                
                 # Use flash model for speed
                 model_name = "gemini-2.5-flash"
+                cache_key = None
+                if cache is not None:
+                    cache_key, cached = await asyncio.to_thread(
+                        cache.lookup, "gemini", model_name, prompt, None, {"temperature": 0.0}
+                    )
+                    if cached is not None:
+                        return cached
+                
+                import google.generativeai as genai
+                genai.configure(api_key=settings.google_api_key)
                 gemini_model = genai.GenerativeModel(model_name)
                 
                 # Run in thread since it's a blocking call in the library
                 response = await asyncio.to_thread(
                     gemini_model.generate_content,
-                    prompt
+                    prompt,
+                    generation_config={"temperature": 0.0}
                 )
                 
                 if response and response.text:
+                    if cache_key:
+                        await asyncio.to_thread(cache.store, cache_key, "gemini", model_name, response.text)
                     return response.text
             except Exception as e:
                 logger.warning(f"Judge failed with Gemini: {e}")
         
-        # 2. Ollama (Free local option)
+        # 2. Ollama (Free local option) - OllamaClient.generate caches temperature-0 calls itself
         try:
             from ai.ollama_client import get_ollama_client as get_client
+            from ai.model_scheduler import RequestPriority
             client = get_client()
             # Try preferred judge models
             for model in settings.llm_judge_preferred_models:
                 if await client.check_model_availability(model):
-                    response = await client.generate(model, prompt)
+                    response = await client.generate(model, prompt, priority=RequestPriority.BACKGROUND)
                     if response.success:
                         return response.content
             
             # Fallback to any available
             models = await client.list_models()
             if models:
-                response = await client.generate(models[0], prompt)
+                response = await client.generate(models[0], prompt, priority=RequestPriority.BACKGROUND)
                 if response.success:
                     return response.content
         except Exception as e:
@@ -167,16 +185,28 @@ class LLMJudge:
         # 3. Groq (Fast)
         if settings.groq_api_key:
             try:
+                # Use llama3-8b-8192 for fast evaluation
+                model_name = "llama3-8b-8192"
+                cache_key = None
+                if cache is not None:
+                    cache_key, cached = await asyncio.to_thread(
+                        cache.lookup, "groq", model_name, prompt, None, {"temperature": 0.0}
+                    )
+                    if cached is not None:
+                        return cached
+                
                 from groq import AsyncGroq
                 client = AsyncGroq(api_key=settings.groq_api_key)
-                # Use llama3-8b-8192 for fast evaluation
                 response = await client.chat.completions.create(
-                    model="llama3-8b-8192",
+                    model=model_name,
                     messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1
+                    temperature=0.0
                 )
                 if response.choices and response.choices[0].message.content:
-                    return response.choices[0].message.content
+                    content = response.choices[0].message.content
+                    if cache_key:
+                        await asyncio.to_thread(cache.store, cache_key, "groq", model_name, content)
+                    return content
             except Exception as e:
                 logger.warning(f"Judge failed with Groq: {e}")
 
@@ -0,0 +1,252 @@
+"""
+Meeting Notes Index - In-memory cache of meeting note folders.
+
+Generation (single, streamed and bulk) and chat with a folder_id used to
+glob the folder and read every note from disk on each request, item and
+message. The index keeps each folder's notes, their metadata and the
+concatenated folder context in memory:
+
+- a note is re-read only when its mtime or size changes
+- with watchdog installed, a recursive observer on settings.meeting_notes_dir
+  marks folders dirty as files change, so reading a clean folder does no
+  I/O at all
+- without a watcher, each read re-validates the folder with one scandir
+  (stat only; unchanged notes are not read again)
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.core.config import settings
+from backend.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+NOTE_SUFFIXES = (".md", ".txt")
+
+
+class MeetingNotesIndex:
+    """
+    Cached folder listings, notes and folder context.
+
+    Usage:
+        index = get_meeting_notes_index()
+        index.get_folders()                           # ["api", "auth", ...]
+        index.get_notes("auth")                       # note dicts, or None for a missing folder
+        index.get_folder_context("auth")              # notes joined for prompts
+    """
+
+    def __init__(self, notes_dir: Optional[Path] = None, watch: bool = True):
+        """
+        Args:
+            notes_dir: Meeting notes root (defaults to settings.meeting_notes_dir)
+            watch: Invalidate through a filesystem watcher when watchdog is available
+        """
+        self.notes_dir = Path(notes_dir or settings.meeting_notes_dir)
+        self.watch = watch
+        self._lock = threading.RLock()
+        # folder -> note file name -> (mtime_ns, size, note dict)
+        self._folders: Dict[str, Dict[str, Tuple[int, int, Dict[str, Any]]]] = {}
+        self._contexts: Dict[Tuple[str, bool], str] = {}
+        self._folder_names: Optional[List[str]] = None
+        self._dirty: Set[str] = set()
+        self._observer = None
+
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    def start_watching(self) -> bool:
+        """Start the filesystem watcher (once). Returns whether it is running."""
+        if self._observer is not None or not self.watch:
+            return self._observer is not None
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            logger.info("📁 [NOTES_INDEX] watchdog not available, validating folders by mtime on each read")
+            self.watch = False
+            return False
+
+        index = self
+
+        class NotesEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                index.invalidate(event.src_path)
+                if getattr(event, "dest_path", None):
+                    index.invalidate(event.dest_path)
+
+        try:
+            self.notes_dir.mkdir(parents=True, exist_ok=True)
+            observer = Observer()
+            observer.schedule(NotesEventHandler(), str(self.notes_dir), recursive=True)
+            observer.start()
+        except Exception as e:
+            logger.warning(f"⚠️ [NOTES_INDEX] Could not watch {self.notes_dir}: {e}")
+            self.watch = False
+            return False
+
+        with self._lock:
+            # Anything cached before the watcher started may already be out of date
+            self._dirty.update(self._folders)
+            self._folder_names = None
+            self._observer = observer
+        logger.info(f"📁 [NOTES_INDEX] Watching {self.notes_dir}")
+        return True
+
+    def stop_watching(self):
+        """Stop the filesystem watcher; reads fall back to mtime validation."""
+        with self._lock:
+            observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join()
+            logger.info("📁 [NOTES_INDEX] Stopped watching meeting notes")
+
+    def invalidate(self, path):
+        """
+        Mark the folder containing `path` for re-validation.
+
+        Called by the watcher and, synchronously, by every endpoint that
+        writes notes: watcher events arrive after the write returns, so a
+        read straight after a write would otherwise be served stale.
+        """
+        try:
+            parts = Path(path).resolve().relative_to(self.notes_dir.resolve()).parts
+        except ValueError:
+            return
+        with self._lock:
+            if len(parts) <= 1:
+                # A folder itself (or the root) was created, removed or renamed
+                self._folder_names = None
+            if parts:
+                self._dirty.add(parts[0])
+            else:
+                self._dirty.update(self._folders)
+
+    def get_folders(self) -> List[str]:
+        """Names of the folders under the notes root."""
+        self.start_watching()
+        with self._lock:
+            if self.watching and self._folder_names is not None:
+                return list(self._folder_names)
+        self.notes_dir.mkdir(parents=True, exist_ok=True)
+        folders = sorted(entry.name for entry in os.scandir(self.notes_dir) if entry.is_dir())
+        with self._lock:
+            self._folder_names = folders
+        return list(folders)
+
+    def get_notes(self, folder_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Notes of a folder, sorted by file name.
+
+        Returns:
+            Note dicts (id, name, content, created_at, updated_at), or None
+            when the folder does not exist
+        """
+        notes = self._validated(folder_id)
+        if notes is None:
+            return None
+        return [dict(note) for _, _, note in notes.values()]
+
+    def get_folder_context(self, folder_id: str, with_headers: bool = False) -> str:
+        """
+        A folder's notes concatenated for a prompt.
+
+        Args:
+            folder_id: Folder name
+            with_headers: Chat layout (a bold header per note, `---` between
+                          notes) instead of the generation layout (blank lines)
+        """
+        notes = self._validated(folder_id)
+        if not notes:
+            return ""
+        key = (folder_id, with_headers)
+        with self._lock:
+            context = self._contexts.get(key)
+        if context is None:
+            contents = [note["content"] for _, _, note in notes.values()]
+            if with_headers:
+                context = "\n\n---\n\n".join(f"**Meeting Note**\n{content}" for content in contents)
+            else:
+                context = "\n\n".join(contents)
+            with self._lock:
+                # Only cache if the folder was not changed while joining
+                if self._folders.get(folder_id) is notes:
+                    self._contexts[key] = context
+        return context
+
+    def _validated(self, folder_id: str) -> Optional[Dict[str, Tuple[int, int, Dict[str, Any]]]]:
+        """A folder's cached notes, re-validated against disk unless the watcher vouches for them."""
+        self.start_watching()
+        with self._lock:
+            cached = self._folders.get(folder_id)
+            if self.watching and cached is not None and folder_id not in self._dirty:
+                return cached
+            # Cleared before scanning: an event during the scan marks it dirty again
+            self._dirty.discard(folder_id)
+
+        folder_path = self.notes_dir / folder_id
+        if not folder_path.is_dir():
+            self._drop(folder_id)
+            return None
+
+        previous = cached or {}
+        notes: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+        changed = False
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if not entry.name.endswith(NOTE_SUFFIXES) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                known = previous.get(entry.name)
+                if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+                    notes[entry.name] = known
+                    continue
+                try:
+                    content = Path(entry.path).read_text(encoding="utf-8")
+                except Exception as e:
+                    logger.error(f"Error reading note {entry.path}: {e}")
+                    continue
+                changed = True
+                notes[entry.name] = (stat.st_mtime_ns, stat.st_size, {
+                    "id": Path(entry.name).stem,
+                    "name": entry.name,
+                    "content": content,
+                    "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                    "updated_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                })
+        notes = dict(sorted(notes.items()))
+
+        with self._lock:
+            if cached is not None and not changed and notes.keys() == cached.keys():
+                return cached
+            self._folders[folder_id] = notes
+            for key in [key for key in self._contexts if key[0] == folder_id]:
+                del self._contexts[key]
+        return notes
+
+    def _drop(self, folder_id: str):
+        with self._lock:
+            self._folders.pop(folder_id, None)
+            for key in [key for key in self._contexts if key[0] == folder_id]:
+                del self._contexts[key]
+
+
+# Global instance
+_meeting_notes_index: Optional[MeetingNotesIndex] = None
+
+
+def get_meeting_notes_index() -> MeetingNotesIndex:
+    """Get or create the global Meeting Notes Index instance."""
+    global _meeting_notes_index
+    if _meeting_notes_index is None:
+        _meeting_notes_index = MeetingNotesIndex(watch=settings.meeting_notes_watch_enabled)
+    return _meeting_notes_index
@@ -2,16 +2,18 @@
 Meeting Notes Service - Handles folder organization and AI suggestions.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import logging
-from datetime import datetime
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.core.config import settings
+from backend.services.folder_classifier import get_folder_classifier
+from backend.services.meeting_notes_index import get_meeting_notes_index
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +31,8 @@ class MeetingNotesService:
     Service for managing meeting notes with AI-powered folder suggestions.
     
     Features:
-    - AI-powered folder suggestions based on content analysis
+    - Folder suggestions from the nearest existing folder (embedding centroids),
+      with an LLM fallback when no folder is close enough
     - Folder organization and management
     - Content analysis for better categorization
     """
@@ -37,11 +40,17 @@ class MeetingNotesService:
     def __init__(self):
         """Initialize Meeting Notes Service."""
         self.agent = UniversalArchitectAgent() if AI_AVAILABLE else None
+        self.folder_classifier = get_folder_classifier()
+        self.notes_index = get_meeting_notes_index()
         logger.info("Meeting Notes Service initialized")
     
     async def suggest_folder(self, content: str) -> Dict[str, Any]:
         """
-        Suggest the best folder for meeting notes content using AI.
+        Suggest the best folder for meeting notes content.
+
+        Existing folders are ranked by embedding similarity first; the LLM is
+        only asked when the best match is below
+        settings.folder_suggestion_min_similarity.
         
         Args:
             content: Meeting notes content to analyze
@@ -56,6 +65,22 @@ class MeetingNotesService:
                 "alternatives": []
             }
         
+        # Nearest existing folder (local embeddings, no generation)
+        try:
+            matches = await asyncio.to_thread(
+                self.folder_classifier.suggest, content, settings.folder_suggestion_top_k
+            )
+        except Exception as e:
+            logger.warning(f"Folder classifier failed: {e}")
+            matches = []
+        alternatives = [{"folder": folder, "score": score} for folder, score in matches]
+        if matches and matches[0][1] >= settings.folder_suggestion_min_similarity:
+            return {
+                "suggested_folder": matches[0][0],
+                "confidence": matches[0][1],
+                "alternatives": alternatives[1:]
+            }
+        
         # Use AI if available for better suggestions
         if self.agent and AI_AVAILABLE:
             try:
@@ -71,10 +96,9 @@ Respond with ONLY a single folder name (lowercase, no spaces, use underscores).
 Folder name:"""
                 
                 # Use a lightweight model for quick suggestions
-                # Try local first, then cloud if needed
                 try:
-                    from ai.ollama_client import OllamaClient
-                    ollama = OllamaClient()
+                    from ai.ollama_client import get_ollama_client
+                    ollama = get_ollama_client()
                     response = await ollama.generate(
                         model_name="llama3:8b-instruct-q4_K_M",
                         prompt=prompt,
@@ -89,7 +113,7 @@ Folder name:"""
                             return {
                                 "suggested_folder": suggested_folder,
                                 "confidence": 0.8,
-                                "alternatives": []
+                                "alternatives": alternatives
                             }
                 except Exception as e:
                     logger.debug(f"Local model suggestion failed: {e}")
@@ -146,54 +170,36 @@ Folder name:"""
     
     def get_existing_folders(self) -> List[str]:
         """Get list of existing folder names."""
-        # Use centralized config to avoid circular import with API layer
-        meeting_notes_dir = settings.meeting_notes_dir
-        meeting_notes_dir.mkdir(parents=True, exist_ok=True)
-        
-        folders = []
-        if meeting_notes_dir.exists():
-            for folder_path in meeting_notes_dir.iterdir():
-                if folder_path.is_dir():
-                    folders.append(folder_path.name)
-        return folders
+        return self.notes_index.get_folders()
     
     def get_notes_by_folder(self, folder_id: str) -> List[Dict[str, Any]]:
         """
         Get all notes from a specific folder.
         
+        Notes are served from the meeting notes index; only notes changed on
+        disk since the last call are read again.
+        
         Args:
             folder_id: The folder name/ID
             
         Returns:
             List of note dictionaries with id, name, content, etc.
         """
-        # Use centralized config to avoid circular import with API layer
-        meeting_notes_dir = settings.meeting_notes_dir
-        meeting_notes_dir.mkdir(parents=True, exist_ok=True)
-        
-        folder_path = meeting_notes_dir / folder_id
-        if not folder_path.exists() or not folder_path.is_dir():
+        notes = self.notes_index.get_notes(folder_id)
+        if notes is None:
             logger.warning(f"Folder not found: {folder_id}")
             return []
-        
-        notes = []
-        # Read all .md and .txt files in the folder
-        for note_file in folder_path.glob("*"):
-            if note_file.suffix in [".md", ".txt"] and note_file.is_file():
-                try:
-                    content = note_file.read_text(encoding="utf-8")
-                    notes.append({
-                        "id": note_file.stem,
-                        "name": note_file.name,
-                        "content": content,
-                        "created_at": datetime.fromtimestamp(note_file.stat().st_ctime).isoformat(),
-                        "updated_at": datetime.fromtimestamp(note_file.stat().st_mtime).isoformat(),
-                    })
-                except Exception as e:
-                    logger.error(f"Error reading note {note_file}: {e}")
-                    continue
-        
         return notes
+    
+    def get_folder_context(self, folder_id: str, with_headers: bool = False) -> str:
+        """
+        All notes of a folder concatenated for a prompt (cached until a note changes).
+        
+        Args:
+            folder_id: The folder name/ID
+            with_headers: Chat layout with a header per note instead of the generation layout
+        """
+        return self.notes_index.get_folder_context(folder_id, with_headers=with_headers)
 
 
 # Global service instance
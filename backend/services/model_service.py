@@ -8,6 +8,7 @@ from typing import Dict, List, Any, Optional, Union
 import logging
 from datetime import datetime, timedelta
 import json
+import time
 import yaml
 import asyncio
 
@@ -27,11 +28,14 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 class ModelListCache:
     """
-    Simple in-memory cache for model list queries.
+    Per-provider freshness tracking for the model list (stale-while-revalidate).
     
-    The /api/models/ endpoint was taking 4-7 seconds because it polls
-    Ollama, cloud providers, and HuggingFace on every request.
-    This cache reduces that to ~0ms for cached responses.
+    The /api/models/ endpoint used to take 4-7 seconds because it polled
+    Ollama, cloud providers, and HuggingFace one after another whenever the
+    cache expired. Each provider ("ollama", "huggingface", "cloud") now has its
+    own refresh time; an expired provider keeps serving its last known models
+    while a background task refreshes it. Only a provider that has never been
+    refreshed (or was invalidated) is waited for, and then only up to its timeout.
     """
     
     def __init__(self, ttl_seconds: int = 60):
@@ -39,37 +43,60 @@ class ModelListCache:
         Initialize cache with TTL.
         
         Args:
-            ttl_seconds: Cache time-to-live (default: 60 seconds)
+            ttl_seconds: Per-provider time-to-live (default: 60 seconds)
         """
         self.ttl_seconds = ttl_seconds
-        self._cache: Optional[List[ModelInfoDTO]] = None
-        self._cache_time: Optional[datetime] = None
-        self._lock = asyncio.Lock()
+        self._refreshed_at: Dict[str, datetime] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.last_duration: Dict[str, float] = {}
+        self.last_error: Dict[str, Optional[str]] = {}
     
-    def is_valid(self) -> bool:
-        """Check if cache is still valid."""
-        if self._cache is None or self._cache_time is None:
+    def has_data(self, provider: str) -> bool:
+        """Whether the provider has been refreshed at least once since the last invalidation."""
+        return provider in self._refreshed_at
+    
+    def is_valid(self, provider: str) -> bool:
+        """Check if a provider's model list is still fresh."""
+        refreshed_at = self._refreshed_at.get(provider)
+        if refreshed_at is None:
             return False
-        return datetime.now() - self._cache_time < timedelta(seconds=self.ttl_seconds)
+        return datetime.now() - refreshed_at < timedelta(seconds=self.ttl_seconds)
     
-    def get(self) -> Optional[List[ModelInfoDTO]]:
-        """Get cached model list if valid."""
-        if self.is_valid():
-            logger.debug(f"📦 [CACHE] Model list cache HIT (age: {(datetime.now() - self._cache_time).seconds}s)")
-            return self._cache
-        return None
+    def mark_refreshed(self, provider: str, duration: float, error: Optional[str] = None) -> None:
+        """Record a finished refresh (failed ones too, so a down provider isn't retried per request)."""
+        self._refreshed_at[provider] = datetime.now()
+        self.last_duration[provider] = duration
+        self.last_error[provider] = error
+        logger.debug(f"📦 [CACHE] {provider} model list refreshed in {duration:.2f}s")
     
-    def set(self, models: List[ModelInfoDTO]) -> None:
-        """Set cache with model list."""
-        self._cache = models
-        self._cache_time = datetime.now()
-        logger.debug(f"📦 [CACHE] Model list cached ({len(models)} models)")
+    def get_task(self, provider: str) -> Optional[asyncio.Task]:
+        """In-flight refresh task for a provider on the current event loop, if any."""
+        task = self._tasks.get(provider)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        return task
     
-    def invalidate(self) -> None:
-        """Invalidate the cache."""
-        self._cache = None
-        self._cache_time = None
-        logger.debug("📦 [CACHE] Model list cache invalidated")
+    def set_task(self, provider: str, task: asyncio.Task) -> None:
+        self._tasks[provider] = task
+    
+    def invalidate(self, provider: Optional[str] = None) -> None:
+        """Invalidate one provider (or all); the next list_models call waits for a fresh list."""
+        if provider is None:
+            self._refreshed_at.clear()
+        else:
+            self._refreshed_at.pop(provider, None)
+        logger.debug(f"📦 [CACHE] Model list cache invalidated ({provider or 'all providers'})")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            provider: {
+                "age_seconds": round((datetime.now() - refreshed_at).total_seconds(), 1),
+                "fresh": self.is_valid(provider),
+                "last_duration_seconds": round(self.last_duration.get(provider, 0.0), 3),
+                "last_error": self.last_error.get(provider),
+            }
+            for provider, refreshed_at in self._refreshed_at.items()
+        }
 
 
 # Global cache instance
@@ -453,53 +480,75 @@ class ModelService:
     
     async def list_models(self, force_refresh: bool = False) -> List[ModelInfoDTO]:
         """
-        List all registered models with caching.
+        List all registered models with per-provider caching.
         
-        Performance optimization: Model list is cached for 60 seconds to avoid
-        polling Ollama, cloud providers, and HuggingFace on every request.
-        The /api/models/ endpoint was taking 4-7 seconds without caching.
+        Providers are refreshed concurrently, each bounded by its timeout in
+        settings.model_refresh_timeouts. A provider whose list is older than the
+        60s TTL is served stale while it refreshes in the background; only
+        providers with no list yet (first call, invalidated) are waited for.
         
         Args:
-            force_refresh: If True, bypass cache and refresh from all providers
+            force_refresh: If True, wait for a fresh list from every provider
         
         Returns:
             List of model information
         """
-        # Check cache first (unless force_refresh)
-        if not force_refresh:
-            cached = _model_list_cache.get()
-            if cached is not None:
-                return cached
-        
-        logger.info("🔄 [MODEL_SERVICE] Refreshing model list from all providers...")
-        start_time = datetime.now()
-        
-        # Load fine-tuned models from registry first
-        self._load_finetuned_models_from_registry()
-        
-        # Refresh Ollama models if available
+        waiting = []
+        for provider in self._provider_refreshers():
+            if force_refresh or not _model_list_cache.has_data(provider):
+                waiting.append(self._start_refresh(provider))
+            elif not _model_list_cache.is_valid(provider):
+                self._start_refresh(provider)  # stale-while-revalidate
+        
+        if waiting:
+            start_time = datetime.now()
+            # Shield: a cancelled request must not cancel a refresh other requests share
+            await asyncio.gather(*(asyncio.shield(task) for task in waiting))
+            duration = (datetime.now() - start_time).total_seconds()
+            logger.info(f"✅ [MODEL_SERVICE] Model list refreshed: {len(self.models)} models in {duration:.2f}s")
+        
+        return list(self.models.values())
+    
+    def _provider_refreshers(self) -> Dict[str, Any]:
+        """Refresh coroutine function per independently cached provider."""
+        refreshers = {
+            "huggingface": self._refresh_huggingface_models,
+            "cloud": self._refresh_cloud_models,
+        }
         if OLLAMA_AVAILABLE:
-            await self._refresh_ollama_models()
-        
-        # Refresh HuggingFace models
-        await self._refresh_huggingface_models()
-        
-        # Register cloud models if API keys are available
-        await self._refresh_cloud_models()
-        
-        models = list(self.models.values())
-        
-        # Update cache
-        _model_list_cache.set(models)
-        
-        duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"✅ [MODEL_SERVICE] Model list refreshed: {len(models)} models in {duration:.2f}s")
-        
-        return models
+            refreshers["ollama"] = self._refresh_ollama_models
+        return refreshers
+    
+    def _start_refresh(self, provider: str) -> asyncio.Task:
+        """Start (or join) the background refresh for one provider."""
+        task = _model_list_cache.get_task(provider)
+        if task is None:
+            task = asyncio.create_task(self._refresh_provider(provider))
+            _model_list_cache.set_task(provider, task)
+        return task
+    
+    async def _refresh_provider(self, provider: str) -> None:
+        """Refresh one provider within its timeout and record the outcome."""
+        refresher = self._provider_refreshers()[provider]
+        timeout = settings.model_refresh_timeouts.get(provider, 5.0)
+        start = time.perf_counter()
+        error = None
+        if provider == "ollama":
+            # Fine-tuned models come from the local registry file even if Ollama is down
+            self._load_finetuned_models_from_registry()
+        try:
+            await asyncio.wait_for(refresher(), timeout=timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {timeout}s"
+            logger.warning(f"⏱️ [MODEL_SERVICE] {provider} model refresh {error}; serving last known models")
+        except Exception as e:
+            error = str(e)
+            logger.warning(f"Could not refresh {provider} models: {e}")
+        _model_list_cache.mark_refreshed(provider, time.perf_counter() - start, error)
     
-    def invalidate_model_cache(self) -> None:
+    def invalidate_model_cache(self, provider: Optional[str] = None) -> None:
         """Invalidate the model list cache (call after model changes)."""
-        _model_list_cache.invalidate()
+        _model_list_cache.invalidate(provider)
     
     async def _refresh_cloud_models(self):
         """Register cloud models based on available API keys."""
@@ -679,7 +728,8 @@ class ModelService:
         """Refresh HuggingFace models from the HuggingFace service registry."""
         try:
             from backend.services.huggingface_service import get_service as get_hf_service
-            hf_service = get_hf_service()
+            # First construction scans the local model cache; keep it off the event loop
+            hf_service = await asyncio.to_thread(get_hf_service)
             
             # Get all downloaded models from HuggingFace service
             downloaded_models = await hf_service.list_downloaded_models()
@@ -1100,7 +1150,7 @@ class ModelService:
                             await self._refresh_ollama_models()
                             
                             # Invalidate cache so next list_models() picks up the new model
-                            self.invalidate_model_cache()
+                            self.invalidate_model_cache("ollama")
                             
                             return True
                         else:
@@ -1130,7 +1180,8 @@ class ModelService:
                 for provider in ["ollama", "huggingface", "openai", "anthropic"]
             },
             "routing_configs": len(self.routing),
-            "enabled_routings": sum(1 for r in self.routing.values() if r.enabled)
+            "enabled_routings": sum(1 for r in self.routing.values() if r.enabled),
+            "provider_refresh": _model_list_cache.get_stats()
         }
 
 
@@ -9,13 +9,20 @@ Features:
 - Technology stack detection and mapping
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional, Set
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
 import json
 
+from backend.core.config import settings
+from backend.services.repo_facts import EXCLUDED_DIRS, RepoFactsIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +38,7 @@ class RepositoryConfig:
     indexed: bool = False
     last_indexed: Optional[str] = None
     file_count: int = 0
+    fingerprint: Optional[str] = None  # Hash of source file paths, sizes and mtimes at the last scan
     
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -86,6 +94,13 @@ class MultiRepoService:
         
         self.repositories: Dict[str, RepositoryConfig] = {}
         self.cross_repo_links: List[CrossRepoLink] = []
+        # Extracted HTTP calls and routes per repo, refreshed on index_repository
+        self.facts = RepoFactsIndex(self.config_path.parent / "multi_repo_facts")
+        # Shared by all repository scans, so indexing several repos at once stays bounded
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.multi_repo_index_workers, thread_name_prefix="repo-index"
+        )
+        self._context_cache: Optional[Tuple[tuple, MultiRepoContext]] = None
         
         self._load_config()
         logger.info(f"Multi-Repo Service initialized with {len(self.repositories)} repositories")
@@ -146,6 +161,7 @@ class MultiRepoService:
         
         # Auto-detect language and framework if not provided
         detected_lang, detected_framework = self._detect_repo_type(repo_path)
+        file_count, fingerprint = self._scan_repository(repo_path)
         
         config = RepositoryConfig(
             repo_id=repo_id,
@@ -155,7 +171,8 @@ class MultiRepoService:
             language=language if language != "unknown" else detected_lang,
             framework=framework or detected_framework,
             indexed=False,
-            file_count=self._count_files(repo_path)
+            file_count=file_count,
+            fingerprint=fingerprint
         )
         
         self.repositories[repo_id] = config
@@ -217,13 +234,35 @@ class MultiRepoService:
     
     def _count_files(self, repo_path: Path) -> int:
         """Count source files in repository."""
+        return self._scan_repository(repo_path)[0]
+    
+    def _scan_repository(self, repo_path: Path) -> Tuple[int, str]:
+        """
+        Count source files and fingerprint them in one walk.
+        
+        Dependency and build directories are skipped. The fingerprint hashes
+        every source file's path, size and mtime, so it changes whenever a
+        file is added, removed or edited.
+        """
         extensions = {'.ts', '.tsx', '.js', '.jsx', '.py', '.cs', '.java', '.go', '.rs'}
+        digest = hashlib.sha1()
         count = 0
         
-        for ext in extensions:
-            count += len(list(repo_path.glob(f"**/*{ext}")))
-        
-        return count
+        for root, dirs, names in os.walk(repo_path):
+            dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+            for name in sorted(names):
+                if os.path.splitext(name)[1].lower() not in extensions:
+                    continue
+                full_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                rel_path = os.path.relpath(full_path, repo_path)
+                digest.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8", "surrogateescape"))
+                count += 1
+        
+        return count, digest.hexdigest()
     
     def unregister_repository(self, repo_id: str) -> bool:
         """Remove a repository from tracking."""
@@ -234,6 +273,8 @@ class MultiRepoService:
                 l for l in self.cross_repo_links
                 if l.source_repo != repo_id and l.target_repo != repo_id
             ]
+            self.facts.remove(repo_id)
+            self._context_cache = None
             self._save_config()
             return True
         return False
@@ -242,17 +283,38 @@ class MultiRepoService:
         """Get all registered repositories."""
         return list(self.repositories.values())
     
-    async def index_repository(self, repo_id: str) -> Dict[str, Any]:
+    async def index_repository(
+        self,
+        repo_id: str,
+        progress_callback: Optional[Callable[[str, float, str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
         """
         Index a repository for RAG retrieval.
         
         Uses the existing RAG ingester but with repo-specific collection.
+        File scanning runs on the service's shared worker pool.
+        
+        Args:
+            repo_id: Repository to index
+            progress_callback: Async callback(repo_id, progress, message); defaults
+                               to repo_index.progress WebSocket events
         """
         if repo_id not in self.repositories:
             raise ValueError(f"Unknown repository: {repo_id}")
         
         config = self.repositories[repo_id]
         repo_path = Path(config.path)
+        loop = asyncio.get_running_loop()
+        
+        await self._emit_progress(progress_callback, repo_id, 0.0, "Scanning files")
+        config.file_count, config.fingerprint = await loop.run_in_executor(
+            self._executor, self._scan_repository, repo_path
+        )
+        
+        # Calls and routes for cross-repo linking (only changed files are re-parsed)
+        await self._emit_progress(progress_callback, repo_id, 20.0, "Extracting API calls and routes")
+        facts_stats = await loop.run_in_executor(self._executor, self.facts.refresh, repo_id, repo_path)
+        self._save_config()
         
         try:
             # Use RAG ingester with custom collection
@@ -265,36 +327,91 @@ class MultiRepoService:
             ingester = RAGIngester(str(index_path))
             
             # Index the repository
+            await self._emit_progress(progress_callback, repo_id, 40.0, "Indexing files for RAG")
             stats = await ingester.index_directory(repo_path, recursive=True)
             
             # Update config
             config.indexed = True
             config.last_indexed = datetime.now().isoformat()
             self._save_config()
+            await self._emit_progress(progress_callback, repo_id, 100.0, "Indexed")
             
             return {
                 "repo_id": repo_id,
                 "indexed": True,
                 "files_indexed": stats.get("files_indexed", 0),
-                "chunks_created": stats.get("chunks_created", 0)
+                "chunks_created": stats.get("chunks_created", 0),
+                "facts": facts_stats,
+                "fingerprint": config.fingerprint
             }
             
         except Exception as e:
             logger.error(f"Failed to index repository {repo_id}: {e}")
+            await self._emit_progress(progress_callback, repo_id, 100.0, f"Failed: {e}")
             return {
                 "repo_id": repo_id,
                 "indexed": False,
-                "error": str(e)
+                "error": str(e),
+                "facts": facts_stats,
+                "fingerprint": config.fingerprint
             }
     
+    async def index_repositories(
+        self,
+        repo_ids: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[str, float, str], Awaitable[None]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Index several repositories concurrently.
+        
+        At most settings.multi_repo_index_workers repositories are in flight;
+        their file scans share the service's worker pool.
+        
+        Args:
+            repo_ids: Repositories to index (None = all registered)
+            progress_callback: Per-repo progress callback, see index_repository
+            
+        Returns:
+            repo_id -> index_repository result
+        """
+        target_repos = repo_ids or list(self.repositories.keys())
+        unknown = [repo_id for repo_id in target_repos if repo_id not in self.repositories]
+        if unknown:
+            raise ValueError(f"Unknown repository: {', '.join(unknown)}")
+        
+        semaphore = asyncio.Semaphore(max(1, settings.multi_repo_index_workers))
+        
+        async def index_one(repo_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.index_repository(repo_id, progress_callback)
+        
+        results = await asyncio.gather(*(index_one(repo_id) for repo_id in target_repos))
+        return dict(zip(target_repos, results))
+    
+    async def _emit_progress(
+        self,
+        progress_callback: Optional[Callable[[str, float, str], Awaitable[None]]],
+        repo_id: str,
+        progress: float,
+        message: str
+    ):
+        """Report indexing progress; failures never interrupt indexing."""
+        try:
+            if progress_callback:
+                await progress_callback(repo_id, progress, message)
+            else:
+                from backend.core.websocket import websocket_manager
+                await websocket_manager.emit_repo_index_progress(repo_id, progress, message)
+        except Exception as e:
+            logger.debug(f"Failed to report indexing progress for {repo_id}: {e}")
+    
     def detect_cross_repo_links(self) -> List[CrossRepoLink]:
         """
         Detect dependencies between repositories.
         
-        Looks for:
-        - API calls from frontend to backend
-        - Shared types/interfaces
-        - Import references
+        Frontend HTTP calls are joined on their normalized path against the
+        route tables of all backends, using the facts extracted when each
+        repository was indexed (repos without facts are scanned once here).
         """
         links = []
         
@@ -302,58 +419,43 @@ class MultiRepoService:
         frontends = [r for r in self.repositories.values() if r.repo_type == "frontend"]
         backends = [r for r in self.repositories.values() if r.repo_type == "backend"]
         
+        for repo in frontends + backends:
+            if not self.facts.has(repo.repo_id):
+                self.facts.refresh(repo.repo_id, Path(repo.path))
+        
+        # Build side: route key -> (backend, file, route) across all backends
+        routes: Dict[str, List[tuple]] = {}
+        for backend in backends:
+            for key, entries in self.facts.route_table(backend.repo_id).items():
+                routes.setdefault(key, []).extend((backend, file, route) for file, route in entries)
+        
+        # Probe side: each frontend call looks up its key once
         for frontend in frontends:
-            for backend in backends:
-                # Detect API consumption patterns
-                api_links = self._detect_api_consumption(frontend, backend)
-                links.extend(api_links)
+            for file, call in self.facts.calls(frontend.repo_id):
+                for backend, route_file, route in routes.get(call["key"], ()):
+                    if call["method"] and route["method"] and call["method"] != route["method"]:
+                        continue
+                    links.append(CrossRepoLink(
+                        source_repo=frontend.repo_id,
+                        source_component=file,
+                        source_type="api_call",
+                        target_repo=backend.repo_id,
+                        target_component=call["url"],
+                        link_type="consumes",
+                        metadata={
+                            "endpoint": call["url"],
+                            "method": call["method"] or route["method"],
+                            "route": route["path"],
+                            "route_file": route_file,
+                        }
+                    ))
         
         self.cross_repo_links = links
+        self._context_cache = None
         self._save_config()
         
         return links
     
-    def _detect_api_consumption(
-        self,
-        frontend: RepositoryConfig,
-        backend: RepositoryConfig
-    ) -> List[CrossRepoLink]:
-        """Detect API calls from frontend to backend."""
-        links = []
-        frontend_path = Path(frontend.path)
-        
-        # Look for HTTP calls in frontend code
-        api_patterns = [
-            r"fetch\s*\(\s*['\"`]([^'\"`]+)['\"`]",
-            r"axios\.[a-z]+\s*\(\s*['\"`]([^'\"`]+)['\"`]",
-            r"http\.(?:get|post|put|delete)\s*\(\s*['\"`]([^'\"`]+)['\"`]",
-            r"this\.http\.(?:get|post|put|delete)\s*<[^>]+>\s*\(\s*['\"`]([^'\"`]+)['\"`]",
-        ]
-        
-        import re
-        
-        for ts_file in frontend_path.glob("**/*.ts"):
-            try:
-                content = ts_file.read_text(encoding="utf-8", errors="ignore")
-                
-                for pattern in api_patterns:
-                    matches = re.findall(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        if match.startswith("/api") or match.startswith("http"):
-                            links.append(CrossRepoLink(
-                                source_repo=frontend.repo_id,
-                                source_component=str(ts_file.relative_to(frontend_path)),
-                                source_type="api_call",
-                                target_repo=backend.repo_id,
-                                target_component=match,
-                                link_type="consumes",
-                                metadata={"endpoint": match}
-                            ))
-            except Exception as e:
-                logger.debug(f"Failed to parse {ts_file}: {e}")
-        
-        return links
-    
     def build_combined_context(self) -> MultiRepoContext:
         """
         Build a combined context from all registered repositories.
@@ -363,7 +465,23 @@ class MultiRepoService:
         - All APIs
         - Technology stack
         - Architecture summary
+        
+        The result is memoized until a repository's recorded fingerprint or
+        configuration changes, or cross-repo links are detected again.
         """
+        key = tuple(sorted(
+            (r.repo_id, r.fingerprint, r.repo_type, r.language, r.framework, r.indexed)
+            for r in self.repositories.values()
+        ))
+        if self._context_cache is not None and self._context_cache[0] == key:
+            return self._context_cache[1]
+        
+        context = self._build_combined_context()
+        self._context_cache = (key, context)
+        return context
+    
+    def _build_combined_context(self) -> MultiRepoContext:
+        """Extract entities, APIs and the technology stack from every repository."""
         combined_entities = []
         combined_apis = []
         tech_stack: Dict[str, List[str]] = {}
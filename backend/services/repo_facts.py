@@ -0,0 +1,267 @@
+"""
+Repository Facts - Per-repository index of HTTP calls and exposed routes.
+
+Cross-repo link detection used to re-read every frontend file and run every
+API regex over it once per backend. The facts index extracts what linking
+needs once per file content instead:
+
+- outbound HTTP calls (fetch, axios, Angular HttpClient) with their method
+- exposed routes (FastAPI/Flask decorators, Express routers, ASP.NET
+  attributes, Spring mappings), including router/controller prefixes
+- both stored per file under the file's SHA-1; a refresh only hashes files
+  whose mtime or size changed and only re-parses files whose hash changed
+
+Paths are normalized to a join key (no host or query, lowercase, every
+parameter segment as `{}`), so linking is a dictionary lookup of call keys
+in the backends' route tables.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+SOURCE_SUFFIXES = {".ts", ".tsx", ".js", ".jsx", ".py", ".cs", ".java"}
+EXCLUDED_DIRS = {
+    "__pycache__", ".git", "node_modules", ".venv", "venv", "env", ".pytest_cache", ".mypy_cache",
+    "dist", "build", ".next", ".nuxt", "bin", "obj", "target",
+}
+
+# Outbound calls: `url` is the literal, `method` the HTTP verb when the call names it
+CALL_PATTERNS = [
+    re.compile(r"fetch\s*\(\s*['\"`](?P<url>[^'\"`]+)['\"`]", re.IGNORECASE),
+    re.compile(r"axios\.(?P<method>[a-z]+)\s*\(\s*['\"`](?P<url>[^'\"`]+)['\"`]", re.IGNORECASE),
+    re.compile(r"http\.(?P<method>get|post|put|patch|delete)\s*(?:<[^>]+>\s*)?\(\s*['\"`](?P<url>[^'\"`]+)['\"`]",
+               re.IGNORECASE),
+]
+
+_PY_ROUTE = re.compile(
+    r"@(?P<owner>\w+)\.(?P<method>get|post|put|patch|delete|route|api_route)\(\s*['\"](?P<path>[^'\"]*)['\"]"
+)
+_PY_PREFIX = re.compile(r"(?:APIRouter|Blueprint)\([^)]*?(?:url_)?prefix\s*=\s*['\"](?P<prefix>[^'\"]+)['\"]", re.DOTALL)
+_JS_ROUTE = re.compile(
+    r"\b(?:router|app|server)\.(?P<method>get|post|put|patch|delete|all)\s*\(\s*['\"`](?P<path>/[^'\"`]*)['\"`]"
+)
+_CS_CLASS = re.compile(r"\bclass\s+(?P<name>\w+?)(?:Controller)?\b")
+_CS_ROUTE = re.compile(r"\[Route\(\s*\"(?P<path>[^\"]*)\"\s*\)\]")
+_CS_VERB = re.compile(r"\[Http(?P<method>Get|Post|Put|Patch|Delete)(?:\(\s*\"(?P<path>[^\"]*)\"[^)]*\))?\]")
+_JAVA_MAPPING = re.compile(
+    r"@(?P<method>Get|Post|Put|Patch|Delete|Request)Mapping\s*(?:\(\s*(?:(?:value|path)\s*=\s*)?\{?\s*\"(?P<path>[^\"]*)\")?"
+)
+
+
+def route_key(path: str) -> str:
+    """Join key for a call URL or route path: no host/query, lowercase, parameters as `{}`."""
+    path = re.sub(r"^[a-z][a-z0-9+.-]*://[^/]+", "", path.strip(), flags=re.IGNORECASE)
+    path = re.split(r"[?#]", path, maxsplit=1)[0]
+    segments = []
+    for segment in path.split("/"):
+        if not segment:
+            continue
+        if "${" in segment or segment[0] in ":{<" or segment == "*":
+            segments.append("{}")
+        else:
+            segments.append(segment.lower())
+    return "/" + "/".join(segments)
+
+
+def _join(prefix: str, path: str) -> str:
+    if not prefix:
+        return path
+    if not path.strip("/"):
+        return prefix
+    return prefix.rstrip("/") + "/" + path.lstrip("/")
+
+
+def extract_calls(content: str) -> List[Dict[str, Any]]:
+    """Outbound HTTP calls to /api paths or absolute URLs."""
+    calls, seen = [], set()
+    for pattern in CALL_PATTERNS:
+        for match in pattern.finditer(content):
+            url = match.group("url")
+            if not (url.startswith("/api") or url.startswith("http")):
+                continue
+            method = (match.groupdict().get("method") or "").upper() or None
+            if (method, url) not in seen:
+                seen.add((method, url))
+                calls.append({"method": method, "url": url, "key": route_key(url)})
+    return calls
+
+
+def extract_routes(content: str, suffix: str) -> List[Dict[str, Any]]:
+    """Routes a backend file exposes, with router or controller prefixes applied."""
+    found = []
+    if suffix == ".py":
+        prefix_match = _PY_PREFIX.search(content)
+        prefix = prefix_match.group("prefix") if prefix_match else ""
+        for match in _PY_ROUTE.finditer(content):
+            method = match.group("method").upper()
+            owner_prefix = "" if match.group("owner") == "app" else prefix
+            found.append((None if method in ("ROUTE", "API_ROUTE") else method,
+                          _join(owner_prefix, match.group("path"))))
+    elif suffix in (".js", ".ts"):
+        for match in _JS_ROUTE.finditer(content):
+            method = match.group("method").upper()
+            found.append((None if method == "ALL" else method, match.group("path")))
+    elif suffix == ".cs":
+        class_match = _CS_CLASS.search(content)
+        controller = class_match.group("name").lower() if class_match else ""
+        prefix_match = _CS_ROUTE.search(content, 0, class_match.start() if class_match else len(content))
+        prefix = prefix_match.group("path").replace("[controller]", controller) if prefix_match else ""
+        for match in _CS_VERB.finditer(content):
+            path = match.group("path") or ""
+            if path.startswith("~/") or path.startswith("/"):
+                path = path.lstrip("~")
+            else:
+                path = _join(prefix, path) if path else prefix
+            found.append((match.group("method").upper(), path))
+    elif suffix == ".java":
+        class_index = content.find("class ")
+        prefix = ""
+        for match in _JAVA_MAPPING.finditer(content):
+            method, path = match.group("method").upper(), match.group("path") or ""
+            if match.start() < class_index and method == "REQUEST":
+                prefix = path
+                continue
+            found.append((None if method == "REQUEST" else method, _join(prefix, path)))
+
+    routes, seen = [], set()
+    for method, path in found:
+        path = "/" + path.lstrip("/")
+        if (method, path) not in seen:
+            seen.add((method, path))
+            routes.append({"method": method, "path": path, "key": route_key(path)})
+    return routes
+
+
+class RepoFactsIndex:
+    """
+    Extracted calls and routes per repository, cached by file content hash.
+
+    Usage:
+        facts = RepoFactsIndex(Path("data/multi_repo_facts"))
+        facts.refresh("web", Path("../web"))          # on index_repository
+        facts.calls("web")                            # [(file, call), ...]
+        facts.route_table("api")                      # key -> [(file, route), ...]
+    """
+
+    def __init__(self, facts_dir: Path):
+        self.facts_dir = Path(facts_dir)
+        self._lock = threading.Lock()
+        self._repos: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._route_tables: Dict[str, Dict[str, List[tuple]]] = {}
+
+    def _path(self, repo_id: str) -> Path:
+        return self.facts_dir / f"{repo_id}.json"
+
+    def _files(self, repo_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            if repo_id not in self._repos:
+                path = self._path(repo_id)
+                if not path.exists():
+                    return None
+                try:
+                    self._repos[repo_id] = json.loads(path.read_text(encoding="utf-8"))["files"]
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"⚠️ [REPO_FACTS] Ignoring unreadable facts for {repo_id}: {e}")
+                    return None
+            return self._repos[repo_id]
+
+    def has(self, repo_id: str) -> bool:
+        """Whether facts have been extracted for the repository."""
+        return self._files(repo_id) is not None
+
+    def refresh(self, repo_id: str, repo_path: Path) -> Dict[str, int]:
+        """
+        Bring a repository's facts up to date with its files.
+
+        Returns:
+            Counts of files seen, re-parsed and removed
+        """
+        repo_path = Path(repo_path)
+        previous = self._files(repo_id) or {}
+        files: Dict[str, Dict[str, Any]] = {}
+        parsed = 0
+
+        for root, dirs, names in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+            for name in names:
+                suffix = os.path.splitext(name)[1].lower()
+                if suffix not in SOURCE_SUFFIXES:
+                    continue
+                full_path = os.path.join(root, name)
+                rel_path = Path(os.path.relpath(full_path, repo_path)).as_posix()
+                try:
+                    stat = os.stat(full_path)
+                    known = previous.get(rel_path)
+                    if known and known["mtime_ns"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+                        files[rel_path] = known
+                        continue
+                    with open(full_path, "rb") as f:
+                        data = f.read()
+                except OSError as e:
+                    logger.debug(f"Failed to read {full_path}: {e}")
+                    continue
+
+                digest = hashlib.sha1(data).hexdigest()
+                if known and known["hash"] == digest:
+                    files[rel_path] = {**known, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                    continue
+                content = data.decode("utf-8", errors="ignore")
+                files[rel_path] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "hash": digest,
+                    "calls": extract_calls(content),
+                    "routes": extract_routes(content, suffix),
+                }
+                parsed += 1
+
+        removed = len(previous.keys() - files.keys())
+        with self._lock:
+            self._repos[repo_id] = files
+            if parsed or removed:
+                self._route_tables.pop(repo_id, None)
+        self.facts_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path(repo_id).with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps({"repo_id": repo_id, "files": files}), encoding="utf-8")
+        os.replace(tmp_path, self._path(repo_id))
+
+        logger.info(f"🔗 [REPO_FACTS] {repo_id}: {len(files)} files, {parsed} re-parsed, {removed} removed")
+        return {"files": len(files), "parsed": parsed, "removed": removed}
+
+    def remove(self, repo_id: str):
+        """Forget a repository's facts."""
+        with self._lock:
+            self._repos.pop(repo_id, None)
+            self._route_tables.pop(repo_id, None)
+        self._path(repo_id).unlink(missing_ok=True)
+
+    def calls(self, repo_id: str) -> List[tuple]:
+        """(file, call) pairs for every outbound HTTP call in the repository."""
+        files = self._files(repo_id) or {}
+        return [(rel_path, call) for rel_path, facts in sorted(files.items()) for call in facts["calls"]]
+
+    def route_table(self, repo_id: str) -> Dict[str, List[tuple]]:
+        """Route key -> (file, route) pairs for every route the repository exposes."""
+        files = self._files(repo_id) or {}
+        with self._lock:
+            table = self._route_tables.get(repo_id)
+            if table is None:
+                table = {}
+                for rel_path, facts in sorted(files.items()):
+                    for route in facts["routes"]:
+                        table.setdefault(route["key"], []).append((rel_path, route))
+                self._route_tables[repo_id] = table
+            return table
@@ -6,7 +6,11 @@ Generates complete artifact suites from meeting notes including:
 ERD, Architecture, Sequence diagrams, API docs, Code prototypes,
 Visual prototypes, and JIRA stories.
 
-Artifacts are generated in dependency order and automatically linked.
+The package is generated as a dependency DAG (SuggestionEngine's artifact
+dependencies): independent artifacts run in parallel, up to
+settings.sprint_package_max_concurrency at once, and an artifact starts as
+soon as the artifacts it builds on are finished. Artifacts are automatically
+linked.
 """
 
 import logging
@@ -16,7 +20,10 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
 
+from backend.core.config import settings
 from backend.models.dto import ArtifactType
+from backend.services.artifact_suggestions import get_suggestion_engine
+from backend.services.context_builder import ContextSession
 
 logger = logging.getLogger(__name__)
 
@@ -146,6 +153,7 @@ class SprintPackageResult:
     success_rate: float
     failed_artifacts: List[str]
     created_at: str
+    context_time_saved_seconds: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         result = asdict(self)
@@ -161,7 +169,7 @@ class SprintPackageGenerator:
     - Pre-defined package presets (Full, Backend, Frontend, etc.)
     - Custom artifact selection
     - Progress streaming
-    - Dependency-ordered generation
+    - Parallel, dependency-ordered generation
     - Artifact linking
     """
     
@@ -226,7 +234,8 @@ class SprintPackageGenerator:
         meeting_notes: str,
         preset: PackagePreset = PackagePreset.FULL,
         custom_artifacts: Optional[List[ArtifactType]] = None,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        max_concurrency: Optional[int] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generate a complete sprint package.
@@ -236,6 +245,7 @@ class SprintPackageGenerator:
             preset: Which preset to use (ignored if custom_artifacts provided)
             custom_artifacts: Custom list of artifacts (overrides preset)
             progress_callback: Optional callback for progress updates
+            max_concurrency: Artifacts generated at once (default: settings.sprint_package_max_concurrency)
             
         Yields:
             Progress updates and final result
@@ -252,8 +262,10 @@ class SprintPackageGenerator:
             artifacts_to_generate = config["artifacts"]
             preset_name = preset.value
         
+        artifacts_to_generate = list(dict.fromkeys(artifacts_to_generate))
+        dependencies = self._dependency_graph(artifacts_to_generate)
         total = len(artifacts_to_generate)
-        generated_artifacts: List[GeneratedArtifact] = []
+        generated: Dict[ArtifactType, GeneratedArtifact] = {}
         failed_artifacts: List[str] = []
         
         logger.info(f"Starting sprint package generation: {total} artifacts, preset={preset_name}")
@@ -273,67 +285,72 @@ class SprintPackageGenerator:
             ).to_dict()
         }
         
-        # Generate each artifact
-        for idx, artifact_type in enumerate(artifacts_to_generate):
-            artifact_start = datetime.now()
-            current_name = self._format_artifact_type(artifact_type)
-            
-            # Yield progress
-            elapsed = (datetime.now() - start_time).total_seconds()
-            yield {
-                "type": "progress",
-                "data": PackageProgress(
-                    total_artifacts=total,
-                    completed_artifacts=idx,
-                    current_artifact=current_name,
-                    current_artifact_type=artifact_type.value,
-                    status="generating",
-                    progress_percent=(idx / total) * 100,
-                    message=f"Generating {current_name} ({idx + 1}/{total})...",
-                    elapsed_seconds=elapsed
-                ).to_dict()
-            }
-            
+        # Generate the DAG: each artifact waits for its dependencies, then for a free slot
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.sprint_package_max_concurrency))
+        finished = {artifact_type: asyncio.Event() for artifact_type in artifacts_to_generate}
+        updates: asyncio.Queue = asyncio.Queue()
+        running: List[str] = []
+        context_session = ContextSession()  # Artifact-independent context built once for the package
+        
+        async def generate_node(artifact_type: ArtifactType):
             try:
-                # Build context from previously generated artifacts
-                context_additions = self._build_context_from_generated(generated_artifacts)
-                enhanced_notes = f"{meeting_notes}\n\n{context_additions}" if context_additions else meeting_notes
-                
-                # Generate the artifact
-                result = await self.generation_service.generate_with_pipeline(
-                    artifact_type=artifact_type,
-                    meeting_notes=enhanced_notes,
-                    options={"temperature": 0.3, "max_retries": 2}
-                )
-                
-                if result.get("content"):
-                    gen_time = (datetime.now() - artifact_start).total_seconds()
-                    artifact = GeneratedArtifact(
-                        artifact_type=artifact_type.value,
-                        content=result["content"],
-                        generated_at=datetime.now().isoformat(),
-                        generation_time_seconds=gen_time,
-                        model_used=result.get("model_used", "unknown"),
-                        validation_score=result.get("validation_score")
-                    )
-                    generated_artifacts.append(artifact)
-                    
-                    # Register with artifact linker
-                    self.artifact_linker.register_artifact(
-                        artifact_id=f"{package_id}_{artifact_type.value}",
-                        artifact_type=artifact_type.value,
-                        content=result["content"],
-                        metadata={"package_id": package_id}
-                    )
-                    
-                    logger.info(f"Generated {artifact_type.value} in {gen_time:.1f}s")
+                for dependency in dependencies[artifact_type]:
+                    await finished[dependency].wait()
+                async with semaphore:
+                    running.append(artifact_type.value)
+                    await updates.put(artifact_type)
+                    try:
+                        artifact = await self._generate_artifact(
+                            package_id,
+                            artifact_type,
+                            meeting_notes,
+                            [generated[d] for d in dependencies[artifact_type] if d in generated],
+                            context_session
+                        )
+                    finally:
+                        running.remove(artifact_type.value)
+                if artifact:
+                    generated[artifact_type] = artifact
                 else:
                     failed_artifacts.append(artifact_type.value)
-                    logger.warning(f"Failed to generate {artifact_type.value}: empty content")
-                    
-            except Exception as e:
-                failed_artifacts.append(artifact_type.value)
-                logger.error(f"Failed to generate {artifact_type.value}: {e}")
+            finally:
+                # Dependents run even if this artifact failed, just without its context
+                finished[artifact_type].set()
+                await updates.put(None)
+        
+        tasks = [asyncio.create_task(generate_node(a)) for a in artifacts_to_generate]
+        try:
+            pending = len(tasks)
+            while pending:
+                started = await updates.get()
+                if started is None:
+                    pending -= 1
+                    continue
+                
+                # Yield progress when an artifact starts
+                completed = total - pending
+                current_name = self._format_artifact_type(started)
+                elapsed = (datetime.now() - start_time).total_seconds()
+                yield {
+                    "type": "progress",
+                    "data": PackageProgress(
+                        total_artifacts=total,
+                        completed_artifacts=completed,
+                        current_artifact=current_name,
+                        current_artifact_type=started.value,
+                        status="generating",
+                        progress_percent=(completed / total) * 100,
+                        message=f"Generating {current_name} ({completed}/{total} done, {len(running)} running)...",
+                        elapsed_seconds=elapsed
+                    ).to_dict()
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Keep the preset order in the result
+        generated_artifacts = [generated[a] for a in artifacts_to_generate if a in generated]
         
         # Calculate final stats
         total_time = (datetime.now() - start_time).total_seconds()
@@ -350,7 +367,8 @@ class SprintPackageGenerator:
             total_time_seconds=total_time,
             success_rate=success_rate,
             failed_artifacts=failed_artifacts,
-            created_at=start_time.isoformat()
+            created_at=start_time.isoformat(),
+            context_time_saved_seconds=context_session.get_stats()["time_saved_seconds"]
         )
         
         # Yield final result
@@ -375,8 +393,90 @@ class SprintPackageGenerator:
         
         logger.info(f"Sprint package complete: {len(generated_artifacts)}/{total} artifacts in {total_time:.1f}s")
     
+    async def _generate_artifact(
+        self,
+        package_id: str,
+        artifact_type: ArtifactType,
+        meeting_notes: str,
+        dependency_artifacts: List[GeneratedArtifact],
+        context_session: Optional[ContextSession] = None
+    ) -> Optional[GeneratedArtifact]:
+        """Generate one artifact with its dependencies as context (None on failure)."""
+        artifact_start = datetime.now()
+        try:
+            # Build context from the artifacts this one depends on
+            context_additions = self._build_context_from_generated(dependency_artifacts)
+            enhanced_notes = f"{meeting_notes}\n\n{context_additions}" if context_additions else meeting_notes
+            
+            # Generate the artifact
+            result = await self.generation_service.generate_with_pipeline(
+                artifact_type=artifact_type,
+                meeting_notes=enhanced_notes,
+                options={"temperature": 0.3, "max_retries": 2},
+                context_session=context_session
+            )
+            
+            if not result.get("content"):
+                logger.warning(f"Failed to generate {artifact_type.value}: empty content")
+                return None
+            
+            gen_time = (datetime.now() - artifact_start).total_seconds()
+            artifact = GeneratedArtifact(
+                artifact_type=artifact_type.value,
+                content=result["content"],
+                generated_at=datetime.now().isoformat(),
+                generation_time_seconds=gen_time,
+                model_used=result.get("model_used", "unknown"),
+                validation_score=result.get("validation_score")
+            )
+            
+            # Register with artifact linker
+            self.artifact_linker.register_artifact(
+                artifact_id=f"{package_id}_{artifact_type.value}",
+                artifact_type=artifact_type.value,
+                content=result["content"],
+                metadata={"package_id": package_id}
+            )
+            
+            logger.info(f"Generated {artifact_type.value} in {gen_time:.1f}s")
+            return artifact
+        
+        except Exception as e:
+            logger.error(f"Failed to generate {artifact_type.value}: {e}")
+            return None
+    
+    def _dependency_graph(self, artifacts: List[ArtifactType]) -> Dict[ArtifactType, List[ArtifactType]]:
+        """
+        Dependencies of each artifact within the package.
+        
+        Dependencies outside the package are ignored. Artifacts caught in a
+        cycle have their dependencies dropped so the package cannot deadlock.
+        """
+        engine = get_suggestion_engine()
+        by_value = {a.value: a for a in artifacts}
+        graph = {
+            a: [by_value[d] for d in engine._get_dependencies(a.value) if d in by_value and d != a.value]
+            for a in artifacts
+        }
+        
+        # Kahn's algorithm: whatever cannot be ordered is part of a cycle
+        remaining = {a: len(deps) for a, deps in graph.items()}
+        ready = [a for a, count in remaining.items() if count == 0]
+        while ready:
+            done = ready.pop()
+            del remaining[done]
+            for a, deps in graph.items():
+                if done in deps and a in remaining:
+                    remaining[a] -= 1
+                    if remaining[a] == 0:
+                        ready.append(a)
+        for a in remaining:
+            logger.warning(f"Circular dependency for {a.value} in sprint package, generating it without dependencies")
+            graph[a] = []
+        return graph
+    
     def _build_context_from_generated(self, generated: List[GeneratedArtifact]) -> str:
-        """Build context string from previously generated artifacts."""
+        """Build context string from the generated artifacts an artifact depends on."""
         if not generated:
             return ""
         
@@ -1,14 +1,30 @@
 """
 Artifact Version Service - Tracks and manages artifact versions.
+
+Storage: one append-only log per artifact (data/versions/<artifact_id>.jsonl).
+Each line is one version: its metadata plus the content, stored either as a
+compressed full snapshot or as a compressed line diff against the previous
+version. Every `version_snapshot_interval` versions (or whenever a diff would
+not be smaller) a full snapshot is written, so rebuilding any version applies
+at most interval - 1 diffs.
+
+- creating a version appends one line instead of rewriting the whole history
+- only metadata is kept in memory (`versions`); content is rebuilt on demand
+  by get_version()/get_versions() and the most recent results are cached
+- once trimmed versions make up half the log it is compacted (rewritten with
+  only the kept versions, the oldest as a full snapshot)
+- legacy per-artifact .json files are converted on load
 """
 
 import sys
+import base64
+import difflib
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import logging
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import json
-import shutil
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -18,6 +34,47 @@ from backend.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+MAX_VERSIONS = 50  # Versions kept per artifact
+CONTENT_CACHE_SIZE = 64  # Rebuilt version contents kept in memory
+
+
+def _pack(text: str) -> str:
+    """Compress text into an ASCII string for the JSON log."""
+    return base64.b64encode(zlib.compress(text.encode("utf-8"))).decode("ascii")
+
+
+def _unpack(data: str) -> str:
+    return zlib.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+def _line_delta(base: str, content: str) -> List[Any]:
+    """
+    Line diff turning `base` into `content`.
+
+    Ops are [start, end] (copy base lines start:end) or a string (new text).
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = content.splitlines(keepends=True)
+    ops: List[Any] = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(lines[j1:j2]))
+    return ops
+
+
+def _apply_delta(base: str, ops: List[Any]) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, list):
+            parts.extend(base_lines[op[0]:op[1]])
+        else:
+            parts.append(op)
+    return "".join(parts)
+
 
 class VersionService:
     """
@@ -37,15 +94,24 @@ class VersionService:
         self.versions_dir = base_path / "data" / "versions"
         self.versions_dir.mkdir(parents=True, exist_ok=True)
         
-        # In-memory version store
+        # In-memory version store (metadata only, see get_version() for content)
         self.versions: Dict[str, List[Dict[str, Any]]] = {}  # artifact_id -> versions
         
+        # Stored content per version: {"kind": "full"|"delta", "base", "depth", "data"}
+        self._payloads: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._log_lines: Dict[str, int] = {}  # artifact_id -> lines in its log
+        self._log_offsets: Dict[str, int] = {}  # log file name -> bytes already loaded
+        self._contents: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        
         # Load existing versions
         self._load_versions()
         
         # Auto-migrate legacy timestamped artifacts on startup
         self._auto_migrate_legacy()
         
+        # Bring the indexed artifact store (used for listing) in line with the history
+        self._sync_store()
+        
         logger.info("Version Service initialized")
     
     def _auto_migrate_legacy(self):
@@ -56,30 +122,228 @@ class VersionService:
             result = self.migrate_legacy_versions()
             logger.info(f"✅ Auto-migration complete: {result.get('migrated_versions', 0)} versions consolidated")
     
+    def _log_path(self, artifact_id: str) -> Path:
+        # Sanitize filename for Windows (replace : with _)
+        safe_id = artifact_id.replace(":", "_")
+        return self.versions_dir / f"{safe_id}.jsonl"
+    
     def _load_versions(self):
-        """Load version history from disk."""
+        """
+        Load version history from disk.
+        
+        Logs are append-only, so a repeated call only reads lines added since
+        the last one (a log that shrank was compacted and is read again).
+        """
         logger.info(f"Loading versions from {self.versions_dir}")
+        for legacy_file in self.versions_dir.glob("*.json"):
+            try:
+                self._convert_legacy_file(legacy_file)
+            except Exception as e:
+                logger.error(f"Error converting legacy versions file {legacy_file}: {e}")
+        
         count = 0
-        for artifact_file in self.versions_dir.glob("*.json"):
+        for log_file in self.versions_dir.glob("*.jsonl"):
             try:
-                artifact_id = artifact_file.stem
-                with open(artifact_file, 'r', encoding='utf-8') as f:
-                    self.versions[artifact_id] = json.load(f)
-                    count += 1
+                count += self._read_log(log_file)
             except Exception as e:
-                logger.error(f"Error loading versions for {artifact_file}: {e}")
-        logger.info(f"Loaded versions for {count} artifacts")
+                logger.error(f"Error loading versions for {log_file}: {e}")
+        logger.info(f"Loaded {count} new versions ({len(self.versions)} artifacts)")
     
-    def _save_versions(self, artifact_id: str):
-        """Save version history to disk."""
-        # Sanitize filename for Windows (replace : with _)
-        safe_id = artifact_id.replace(":", "_")
-        version_file = self.versions_dir / f"{safe_id}.json"
+    def _read_log(self, log_file: Path) -> int:
+        offset = self._log_offsets.get(log_file.name, 0)
+        size = log_file.stat().st_size
+        if size == offset:
+            return 0
+        if size < offset:
+            offset = 0
+        
+        with open(log_file, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        # A line without its newline is still being written, pick it up next time
+        complete = data[:data.rfind(b"\n") + 1]
+        
+        count = 0
+        for line in complete.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if offset == 0 and count == 0:
+                self._forget(record["artifact_id"])
+            self._apply_record(record)
+            count += 1
+        self._log_offsets[log_file.name] = offset + len(complete)
+        return count
+    
+    def _apply_record(self, record: Dict[str, Any]):
+        """Add one log line to the in-memory state."""
+        artifact_id = record["artifact_id"]
+        storage = record.pop("storage")
+        self._payloads.setdefault(artifact_id, {})[record["version"]] = storage
+        self._log_lines[artifact_id] = self._log_lines.get(artifact_id, 0) + 1
+        
+        versions = self.versions.setdefault(artifact_id, [])
+        if record.get("is_current", False):
+            for v in versions:
+                v["is_current"] = False
+        versions.append(record)
+        del versions[:-MAX_VERSIONS]
+    
+    def _forget(self, artifact_id: str):
+        """Drop all in-memory state of an artifact."""
+        self.versions.pop(artifact_id, None)
+        self._payloads.pop(artifact_id, None)
+        self._log_lines.pop(artifact_id, None)
+        self._log_offsets.pop(self._log_path(artifact_id).name, None)
+        for key in [key for key in self._contents if key[0] == artifact_id]:
+            del self._contents[key]
+    
+    def _convert_legacy_file(self, legacy_file: Path):
+        """Rewrite a legacy full-copy .json history as a compressed log."""
+        with open(legacy_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        if entries:
+            artifact_id = entries[0].get("artifact_id") or legacy_file.stem
+            # Old files can repeat version numbers (numbering used to follow the count)
+            last = 0
+            for entry in entries:
+                entry["artifact_id"] = artifact_id
+                if not isinstance(entry.get("version"), int) or entry["version"] <= last:
+                    entry["version"] = last + 1
+                last = entry["version"]
+            self._forget(artifact_id)
+            self._rewrite(artifact_id, entries)
+            logger.info(f"Converted {legacy_file.name} ({len(entries)} versions) to a compressed log")
+        legacy_file.unlink()
+    
+    def _remember(self, artifact_id: str, version_number: int, content: str):
+        self._contents[(artifact_id, version_number)] = content
+        self._contents.move_to_end((artifact_id, version_number))
+        while len(self._contents) > CONTENT_CACHE_SIZE:
+            self._contents.popitem(last=False)
+    
+    def _content(self, artifact_id: str, version_number: int) -> Optional[str]:
+        """Rebuild a version's content from its snapshot and the diffs after it."""
+        payloads = self._payloads.get(artifact_id, {})
+        chain = []
+        number = version_number
+        content = None
+        while True:
+            cached = self._contents.get((artifact_id, number))
+            if cached is not None:
+                content = cached
+                break
+            storage = payloads.get(number)
+            if storage is None:
+                return None
+            if storage["kind"] == "full":
+                content = _unpack(storage["data"])
+                self._remember(artifact_id, number, content)
+                break
+            chain.append((number, storage))
+            number = storage["base"]
+        
+        for number, storage in reversed(chain):
+            content = _apply_delta(content, json.loads(_unpack(storage["data"])))
+            self._remember(artifact_id, number, content)
+        return content
+    
+    def _encode(
+        self,
+        payloads: Dict[int, Dict[str, Any]],
+        content: str,
+        previous: Optional[int],
+        previous_content: Optional[str],
+    ) -> Dict[str, Any]:
+        """Storage for a new version: a diff against `previous` or a full snapshot."""
+        snapshot = _pack(content)
+        interval = max(1, settings.version_snapshot_interval)
+        if previous is not None and previous_content is not None:
+            depth = payloads[previous]["depth"] + 1
+            if depth < interval:
+                delta = _pack(json.dumps(_line_delta(previous_content, content), ensure_ascii=False))
+                if len(delta) < len(snapshot):
+                    return {"kind": "delta", "base": previous, "depth": depth, "data": delta}
+        return {"kind": "full", "depth": 0, "data": snapshot}
+    
+    def _append(self, artifact_id: str, lines: List[Dict[str, Any]]):
+        log_file = self._log_path(artifact_id)
+        with open(log_file, 'a', encoding='utf-8') as f:
+            for line in lines:
+                f.write(json.dumps(line, default=str, ensure_ascii=False) + "\n")
+        self._log_offsets[log_file.name] = log_file.stat().st_size
+    
+    def _rewrite(self, artifact_id: str, entries: Optional[List[Dict[str, Any]]] = None):
+        """
+        Replace an artifact's log with `entries` (version dicts with content).
+        
+        Defaults to the kept versions, which compacts away trimmed ones.
+        """
+        if entries is None:
+            entries = self.get_versions(artifact_id)
+        entries = entries[-MAX_VERSIONS:]
+        log_file = self._log_path(artifact_id)
+        if not entries:
+            self._forget(artifact_id)
+            log_file.unlink(missing_ok=True)
+            return
+        
+        payloads: Dict[int, Dict[str, Any]] = {}
+        records = []
+        lines = []
+        previous = previous_content = None
+        for entry in entries:
+            content = entry.get("content") or ""
+            number = entry["version"]
+            storage = self._encode(payloads, content, previous, previous_content)
+            payloads[number] = storage
+            record = {k: v for k, v in entry.items() if k != "content"}
+            record["artifact_id"] = artifact_id
+            record["content_length"] = len(content)
+            records.append(record)
+            lines.append({**record, "storage": storage})
+            self._remember(artifact_id, number, content)
+            previous, previous_content = number, content
+        
+        self.versions[artifact_id] = records
+        self._payloads[artifact_id] = payloads
+        self._log_lines[artifact_id] = len(lines)
+        
+        temp_file = log_file.with_suffix(".jsonl.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(json.dumps(line, default=str, ensure_ascii=False) + "\n")
+        temp_file.replace(log_file)
+        self._log_offsets[log_file.name] = log_file.stat().st_size
+    
+    def _sync_store(self):
+        """Reconcile the artifact store with the loaded version history."""
         try:
-            with open(version_file, 'w', encoding='utf-8') as f:
-                json.dump(self.versions.get(artifact_id, []), f, indent=2, default=str)
+            from backend.services.artifact_store import get_artifact_store
+            get_artifact_store().sync(self.versions, load=self.get_versions)
         except Exception as e:
-            logger.error(f"Error saving versions for {artifact_id}: {e}")
+            logger.error(f"Error syncing artifact store: {e}")
+    
+    def _write_through(self, artifact_id: str, version: Optional[Dict[str, Any]] = None):
+        """
+        Mirror a change into the artifact store.
+        
+        With `version`, that version is upserted and versions trimmed from the
+        history are dropped; otherwise the artifact's whole history is replaced
+        (or removed once it has no versions left).
+        """
+        try:
+            from backend.services.artifact_store import get_artifact_store
+            store = get_artifact_store()
+            if version is not None:
+                store.put_version(version)
+                store.prune_artifact(artifact_id, self.versions[artifact_id][0]["version"])
+            elif self.versions.get(artifact_id):
+                store.replace_artifact(artifact_id, self.get_versions(artifact_id))
+            else:
+                store.delete_artifact(artifact_id)
+        except Exception as e:
+            logger.error(f"Error updating artifact store for {artifact_id}: {e}")
     
     def create_version(
         self,
@@ -113,7 +377,8 @@ class VersionService:
         else:
             logger.info(f"📦 [VERSION] Step 2: Existing artifact entry: {artifact_id} ({len(self.versions[artifact_id])} existing versions)")
         
-        version_number = len(self.versions[artifact_id]) + 1
+        # Follow the latest number (not the count) so numbers stay unique after trimming
+        version_number = max((v.get("version", 0) for v in self.versions[artifact_id]), default=0) + 1
         logger.info(f"📦 [VERSION] Step 3: Creating version {version_number}")
         version = {
             "version": version_number,
@@ -126,6 +391,16 @@ class VersionService:
             "is_current": True
         }
         
+        # Encode against the latest stored version before it is demoted
+        previous = self.versions[artifact_id][-1]["version"] if self.versions[artifact_id] else None
+        payloads = self._payloads.setdefault(artifact_id, {})
+        storage = self._encode(
+            payloads, content, previous,
+            self._content(artifact_id, previous) if previous is not None else None,
+        )
+        record = {k: v for k, v in version.items() if k != "content"}
+        record["content_length"] = len(content)
+        
         # Mark previous versions as not current
         logger.info(f"📦 [VERSION] Step 4: Marking previous versions as not current")
         previous_count = 0
@@ -137,44 +412,57 @@ class VersionService:
         
         # Add new version
         logger.info(f"📦 [VERSION] Step 5: Adding new version to store")
-        self.versions[artifact_id].append(version)
+        self.versions[artifact_id].append(record)
+        payloads[version_number] = storage
+        self._remember(artifact_id, version_number, content)
         logger.info(f"📦 [VERSION] Step 5.1: Version added: total versions={len(self.versions[artifact_id])}")
         
-        # Keep only last 50 versions per artifact
-        if len(self.versions[artifact_id]) > 50:
-            removed = len(self.versions[artifact_id]) - 50
-            self.versions[artifact_id] = self.versions[artifact_id][-50:]
-            logger.info(f"📦 [VERSION] Step 6: Trimmed versions: removed {removed} old versions, kept 50")
+        # Keep only last MAX_VERSIONS versions per artifact
+        if len(self.versions[artifact_id]) > MAX_VERSIONS:
+            removed = len(self.versions[artifact_id]) - MAX_VERSIONS
+            self.versions[artifact_id] = self.versions[artifact_id][-MAX_VERSIONS:]
+            logger.info(f"📦 [VERSION] Step 6: Trimmed versions: removed {removed} old versions, kept {MAX_VERSIONS}")
         else:
-            logger.info(f"📦 [VERSION] Step 6: Version count within limit: {len(self.versions[artifact_id])}/50")
+            logger.info(f"📦 [VERSION] Step 6: Version count within limit: {len(self.versions[artifact_id])}/{MAX_VERSIONS}")
         
-        # Save to disk
-        logger.info(f"📦 [VERSION] Step 7: Saving versions to disk")
-        self._save_versions(artifact_id)
-        logger.info(f"📦 [VERSION] Step 7.1: Versions saved to disk")
+        # Save to disk: append one line, compact once trimmed versions fill half the log
+        logger.info(f"📦 [VERSION] Step 7: Appending version to log ({storage['kind']}, {len(storage['data'])} bytes)")
+        try:
+            self._append(artifact_id, [{**record, "storage": storage}])
+            self._log_lines[artifact_id] = self._log_lines.get(artifact_id, 0) + 1
+            if self._log_lines[artifact_id] >= 2 * MAX_VERSIONS:
+                self._rewrite(artifact_id)
+                logger.info(f"📦 [VERSION] Step 7.1: Compacted log for {artifact_id}")
+        except Exception as e:
+            logger.error(f"Error saving versions for {artifact_id}: {e}")
+        self._write_through(artifact_id, version)
+        logger.info(f"📦 [VERSION] Step 7.2: Versions saved to disk")
         
         logger.info(f"📦 [VERSION] ========== CREATE VERSION COMPLETE ==========")
         logger.info(f"📦 [VERSION] Created version {version_number} for artifact {artifact_id}")
         return version
     
+    def _materialize(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a version record with its content rebuilt."""
+        return {**record, "content": self._content(record["artifact_id"], record["version"]) or ""}
+    
     def get_versions(self, artifact_id: str) -> List[Dict[str, Any]]:
         """Get all versions for an artifact."""
-        return self.versions.get(artifact_id, [])
+        return [self._materialize(v) for v in self.versions.get(artifact_id, [])]
     
     def get_current_version(self, artifact_id: str) -> Optional[Dict[str, Any]]:
         """Get the current version of an artifact."""
-        versions = self.get_versions(artifact_id)
+        versions = self.versions.get(artifact_id, [])
         for version in reversed(versions):
             if version.get("is_current", False):
-                return version
-        return versions[-1] if versions else None
+                return self._materialize(version)
+        return self._materialize(versions[-1]) if versions else None
     
     def get_version(self, artifact_id: str, version_number: int) -> Optional[Dict[str, Any]]:
         """Get a specific version of an artifact."""
-        versions = self.get_versions(artifact_id)
-        for version in versions:
+        for version in self.versions.get(artifact_id, []):
             if version.get("version") == version_number:
-                return version
+                return self._materialize(version)
         return None
     
     def compare_versions(
@@ -187,7 +475,7 @@ class VersionService:
         Compare two versions of an artifact.
         
         Returns:
-            Dictionary with differences and statistics
+            Dictionary with differences, a unified diff and statistics
         """
         v1 = self.get_version(artifact_id, version1)
         v2 = self.get_version(artifact_id, version2)
@@ -198,10 +486,17 @@ class VersionService:
         content1 = v1.get("content", "")
         content2 = v2.get("content", "")
         
-        # Simple diff (could be enhanced with proper diff algorithm)
         lines1 = content1.split('\n')
         lines2 = content2.split('\n')
         
+        # Line diff: ratio() is 2 * matched lines / total lines (1.0 = identical)
+        matcher = difflib.SequenceMatcher(None, lines1, lines2, autojunk=False)
+        lines_added = lines_removed = 0
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != "equal":
+                lines_removed += i2 - i1
+                lines_added += j2 - j1
+        
         return {
             "version1": {
                 "version": version1,
@@ -218,25 +513,15 @@ class VersionService:
             "differences": {
                 "size_diff": len(content2) - len(content1),
                 "lines_diff": len(lines2) - len(lines1),
-                "similarity": self._calculate_similarity(content1, content2)
+                "lines_added": lines_added,
+                "lines_removed": lines_removed,
+                "similarity": round(matcher.ratio(), 4),
+                "unified_diff": "\n".join(difflib.unified_diff(
+                    lines1, lines2, fromfile=f"v{version1}", tofile=f"v{version2}", lineterm=""
+                ))
             }
         }
     
-    def _calculate_similarity(self, content1: str, content2: str) -> float:
-        """Calculate similarity between two content strings (0-1)."""
-        if not content1 and not content2:
-            return 1.0
-        if not content1 or not content2:
-            return 0.0
-        
-        # Simple character-based similarity
-        set1 = set(content1)
-        set2 = set(content2)
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
-        
-        return intersection / union if union > 0 else 0.0
-    
     def restore_version(self, artifact_id: str, version_number: int) -> Dict[str, Any]:
         """
         Restore a previous version (creates a new version with old content).
@@ -311,7 +596,7 @@ class VersionService:
             # Collect all versions from legacy artifacts
             all_legacy_versions = []
             for legacy_id in legacy_ids:
-                versions = self.versions.get(legacy_id, [])
+                versions = self.get_versions(legacy_id)
                 for v in versions:
                     # Add original artifact_id to metadata for reference
                     v["metadata"] = v.get("metadata", {})
@@ -327,12 +612,11 @@ class VersionService:
             # Check if we already have a stable artifact with this base_type
             if base_type in self.versions:
                 # Append to existing stable artifact
-                existing_versions = self.versions[base_type]
-                start_version = len(existing_versions) + 1
+                existing_versions = self.get_versions(base_type)
+                start_version = max((v["version"] for v in existing_versions), default=0) + 1
             else:
                 # Create new stable artifact
-                self.versions[base_type] = []
-                existing_versions = self.versions[base_type]
+                existing_versions = []
                 start_version = 1
             
             # Mark all existing versions as not current
@@ -349,17 +633,18 @@ class VersionService:
                 migrated_count += 1
             
             # Save the consolidated stable artifact
-            self._save_versions(base_type)
+            self._rewrite(base_type, existing_versions)
+            self._write_through(base_type)
             
             # Delete legacy artifact files
             for legacy_id in legacy_ids:
-                legacy_file = self.versions_dir / f"{legacy_id}.json"
+                legacy_file = self._log_path(legacy_id)
                 if legacy_file.exists():
                     legacy_file.unlink()
                     logger.info(f"Deleted legacy version file: {legacy_file}")
                 # Remove from in-memory store
-                if legacy_id in self.versions:
-                    del self.versions[legacy_id]
+                self._forget(legacy_id)
+                self._write_through(legacy_id)
             
             artifacts_consolidated += len(legacy_ids)
             logger.info(f"Migrated {len(legacy_ids)} legacy artifacts to {base_type} with {len(all_legacy_versions)} total versions")
@@ -441,12 +726,13 @@ class VersionService:
         
         # Remove from memory
         logger.info(f"📦 [VERSION] Step 2: Removing from memory")
-        del self.versions[artifact_id]
+        self._forget(artifact_id)
+        self._write_through(artifact_id)
         logger.info(f"📦 [VERSION] Step 2.1: Removed from memory")
         
         # Remove from disk
         logger.info(f"📦 [VERSION] Step 3: Removing from disk")
-        version_file = self.versions_dir / f"{artifact_id}.json"
+        version_file = self._log_path(artifact_id)
         if version_file.exists():
             logger.info(f"📦 [VERSION] Step 3.1: Deleting version file: {version_file}")
             version_file.unlink()
@@ -0,0 +1,110 @@
+"""
+MinHash signatures and LSH banding for near-duplicate text detection.
+
+A signature is the minimum of NUM_PERMUTATIONS hash functions over a text's
+word shingles; the fraction of equal positions in two signatures estimates
+the Jaccard similarity of their shingle sets. LSHIndex buckets signatures by
+bands so a lookup only compares against likely matches instead of every
+stored text. The band layout is derived from the similarity threshold: a pair
+with Jaccard similarity s shares a bucket with probability 1 - (1 - s^rows)^bands,
+and the layout with the fewest bands that still keeps that at LSH_MIN_RECALL
+for s = threshold is used.
+"""
+
+import re
+import zlib
+from typing import Dict, Hashable, List, Set, Tuple
+
+import numpy as np
+
+NUM_PERMUTATIONS = 128
+LSH_MIN_RECALL = 0.99  # Minimum chance that a pair at the threshold becomes a candidate
+SHINGLE_SIZE = 3
+
+_WORD_PATTERN = re.compile(r"\w+")
+_rng = np.random.default_rng(20240601)  # Fixed seed: signatures must be comparable across restarts
+_MULTIPLIERS = _rng.integers(1, 2**63, size=NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2**63, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_EMPTY_SIGNATURE = np.full(NUM_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Lowercased word n-grams (the single words for texts shorter than n)."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERMUTATIONS uint32 values) of a text's shingles."""
+    items = shingles(text)
+    if not items:
+        return _EMPTY_SIGNATURE.copy()
+    values = np.fromiter((zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64, count=len(items))
+    # Multiply-shift hashing; uint64 arithmetic wraps modulo 2**64 by design
+    with np.errstate(over="ignore"):
+        hashed = (values[:, None] * _MULTIPLIERS[None, :] + _OFFSETS[None, :]) >> np.uint64(32)
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(first == second)) / NUM_PERMUTATIONS
+
+
+def candidate_probability(jaccard: float, bands: int, rows: int) -> float:
+    """Chance that a pair with this Jaccard similarity shares at least one band."""
+    return 1.0 - (1.0 - jaccard ** rows) ** bands
+
+
+def band_layout(threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) for a similarity threshold.
+
+    The most rows per band (fewest false candidates) whose candidate
+    probability at `threshold` is at least LSH_MIN_RECALL, e.g. 32 x 4 for
+    0.7-0.8 and 64 x 2 for 0.5. Falls back to 128 x 1 (any shared value).
+    """
+    rows = NUM_PERMUTATIONS
+    while rows > 1:
+        bands = NUM_PERMUTATIONS // rows
+        if candidate_probability(threshold, bands, rows) >= LSH_MIN_RECALL:
+            return bands, rows
+        rows //= 2
+    return NUM_PERMUTATIONS, 1
+
+
+class LSHIndex:
+    """
+    Banded signatures for candidate lookup.
+
+    Usage:
+        index = LSHIndex(threshold=0.8)
+        index.add(key, sig)
+        for key in index.candidates(other_sig): ...
+    """
+
+    def __init__(self, threshold: float):
+        """
+        Args:
+            threshold: Jaccard similarity candidates will be tested against;
+                       sets the band layout (see band_layout)
+        """
+        self.threshold = threshold
+        self.bands, self.rows = band_layout(threshold)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+
+    def _band_keys(self, sig: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, sig[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def add(self, key: Hashable, sig: np.ndarray):
+        for band, band_key in self._band_keys(sig):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def candidates(self, sig: np.ndarray) -> Set[Hashable]:
+        """Keys sharing at least one band with `sig`."""
+        found: Set[Hashable] = set()
+        for band, band_key in self._band_keys(sig):
+            found.update(self._buckets[band].get(band_key, ()))
+        return found
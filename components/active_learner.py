@@ -7,6 +7,12 @@ Selection criteria:
 2. Diversity - Cover different scenarios/artifacts
 3. Quality - High reward examples (learn from successes)
 
+Selection is greedy max-min: each pick is the candidate with the best
+combined score, where diversity is 1 - its highest similarity to anything
+already picked. Example features are precomputed once and a running
+max-similarity vector is updated with NumPy after every pick, so choosing
+hundreds of examples from tens of thousands of events takes seconds.
+
 Reduces training data requirements by ~30% for same performance.
 """
 
@@ -30,6 +36,61 @@ class FeedbackEvent:
     context: Dict
 
 
+def _ratio(values: np.ndarray, value: float) -> np.ndarray:
+    """min/max of `value` against each entry (1.0 where both are zero)."""
+    high = np.maximum(values, value)
+    return np.divide(np.minimum(values, value), high, out=np.ones_like(high), where=high > 0)
+
+
+class _SimilarityIndex:
+    """
+    Features behind ActiveLearner._calculate_diversity, computed once per event.
+
+    similarity_row(i) returns the similarity of every event to event i in one
+    vectorized pass. Token overlap is exact Jaccard: an inverted index from
+    token id to the events containing it gives the intersection sizes.
+    """
+
+    def __init__(self, events: List[FeedbackEvent]):
+        count = len(events)
+        artifact_codes: Dict[str, int] = {}
+        vocabulary: Dict[str, int] = {}
+        self.artifacts = np.fromiter(
+            (artifact_codes.setdefault(e.artifact_type, len(artifact_codes)) for e in events), dtype=np.int64, count=count
+        )
+        self.input_lengths = np.fromiter((len(e.input_data) for e in events), dtype=np.float64, count=count)
+        self.context_lengths = np.fromiter((len(str(e.context)) for e in events), dtype=np.float64, count=count)
+        self.tokens = [
+            np.fromiter({vocabulary.setdefault(t, len(vocabulary)) for t in e.input_data.lower().split()}, dtype=np.int64)
+            for e in events
+        ]
+        self.token_counts = np.fromiter((len(t) for t in self.tokens), dtype=np.int64, count=count)
+
+        token_ids = np.concatenate(self.tokens) if count else np.empty(0, dtype=np.int64)
+        order = np.argsort(token_ids, kind="stable")
+        self._postings = np.repeat(np.arange(count), self.token_counts)[order]
+        self._offsets = np.searchsorted(token_ids[order], np.arange(len(vocabulary) + 1))
+
+    def similarity_row(self, index: int) -> np.ndarray:
+        count = len(self.artifacts)
+        tokens = self.tokens[index]
+        if len(tokens):
+            hits = np.concatenate([self._postings[start:end] for start, end in
+                                   zip(self._offsets[tokens], self._offsets[tokens + 1])])
+            intersection = np.bincount(hits, minlength=count)
+        else:
+            intersection = np.zeros(count, dtype=np.int64)
+        union = (self.token_counts + self.token_counts[index] - intersection).astype(np.float64)
+        token_sim = np.divide(intersection, union, out=np.ones_like(union), where=union > 0)
+
+        return (
+            (self.artifacts == self.artifacts[index]) * 0.3 +
+            _ratio(self.input_lengths, self.input_lengths[index]) * 0.2 +
+            _ratio(self.context_lengths, self.context_lengths[index]) * 0.2 +
+            token_sim * 0.3
+        )
+
+
 class ActiveLearner:
     """
     Select most informative examples for training.
@@ -76,7 +137,8 @@ class ActiveLearner:
         
         Returns:
             Tuple of:
-            - Selected examples (sorted by informativeness, best first)
+            - Selected examples in pick order (each the most informative
+              given the ones picked before it)
             - Selection metadata (scores, reasoning)
         """
         if not candidates:
@@ -87,40 +149,43 @@ class ActiveLearner:
             return candidates, [{'reason': 'insufficient_candidates'} for _ in candidates]
         
         already_selected = already_selected or []
+        count = len(candidates)
+        features = _SimilarityIndex(list(candidates) + list(already_selected))
         
-        # Score each candidate
-        scored_candidates = []
+        # Per-example scores don't change between picks
+        uncertainty = np.fromiter((self._calculate_uncertainty(c) for c in candidates), dtype=np.float64, count=count)
+        quality = np.fromiter((self._calculate_quality(c) for c in candidates), dtype=np.float64, count=count)
+        base_score = uncertainty * self.uncertainty_weight + quality * self.quality_weight
         
-        for candidate in candidates:
-            # Calculate individual scores
-            uncertainty = self._calculate_uncertainty(candidate)
-            diversity = self._calculate_diversity(candidate, already_selected + [c for _, c, _ in scored_candidates])
-            quality = self._calculate_quality(candidate)
-            
-            # Combined informativeness score
-            informativeness = (
-                uncertainty * self.uncertainty_weight +
-                diversity * self.diversity_weight +
-                quality * self.quality_weight
-            )
+        # Highest similarity of each candidate to anything selected so far
+        max_similarity = np.zeros(count)
+        for index in range(count, count + len(already_selected)):
+            np.maximum(max_similarity, features.similarity_row(index)[:count], out=max_similarity)
+        has_reference = bool(already_selected)
+        available = np.ones(count, dtype=bool)
+        
+        selected = []
+        metadata = []
+        for _ in range(budget):
+            # First example is always diverse
+            diversity = np.clip(1.0 - max_similarity, 0.0, 1.0) if has_reference else np.ones(count)
+            informativeness = np.where(available, base_score + diversity * self.diversity_weight, -np.inf)
+            best = int(np.argmax(informativeness))
             
-            metadata = {
-                'uncertainty': uncertainty,
-                'diversity': diversity,
-                'quality': quality,
-                'informativeness': informativeness,
+            candidate = candidates[best]
+            selected.append(candidate)
+            metadata.append({
+                'uncertainty': float(uncertainty[best]),
+                'diversity': float(diversity[best]),
+                'quality': float(quality[best]),
+                'informativeness': float(informativeness[best]),
                 'artifact_type': candidate.artifact_type,
                 'validation_score': candidate.validation_score
-            }
+            })
             
-            scored_candidates.append((informativeness, candidate, metadata))
-        
-        # Sort by informativeness (descending)
-        scored_candidates.sort(reverse=True, key=lambda x: x[0])
-        
-        # Select top-k
-        selected = [candidate for _, candidate, _ in scored_candidates[:budget]]
-        metadata = [meta for _, _, meta in scored_candidates[:budget]]
+            available[best] = False
+            np.maximum(max_similarity, features.similarity_row(best)[:count], out=max_similarity)
+            has_reference = True
         
         # Log selection summary
         self._log_selection_summary(selected, metadata)
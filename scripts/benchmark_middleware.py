@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Middleware benchmark - the old BaseHTTPMiddleware stack vs RequestPipelineMiddleware.
+
+Drives a bare app, a five-layer BaseHTTPMiddleware stack doing the same work
+as the pipeline (the "before"), and the pipeline (the "after") in-process over
+raw ASGI (no network, no HTTP client) and reports:
+- requests/sec for a small JSON endpoint (sequential and concurrent)
+- time-to-first-byte and total time for a streaming endpoint
+
+Usage:
+    python scripts/benchmark_middleware.py [--requests 2000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from backend.core.middleware import RequestPipelineMiddleware, ip_ban_manager, is_host_allowed
+
+ALLOWED_HOSTS = ["testserver"]
+STREAM_CHUNKS = 200
+STREAM_CHUNK_DELAY = 0.001
+
+
+async def ping(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def stream(request):
+    async def body():
+        for i in range(STREAM_CHUNKS):
+            await asyncio.sleep(STREAM_CHUNK_DELAY)
+            yield f"data: chunk {i}\n\n"
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+
+ROUTES = [Route("/api/ping", ping), Route("/api/generation/stream", stream)]
+
+
+# --- "Before": one BaseHTTPMiddleware per concern, as main.py used to install ---
+
+class LegacyIPBan(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        client_ip = request.client.host if request.client else "unknown"
+        if ip_ban_manager.is_banned(client_ip):
+            return JSONResponse({"error": "Forbidden"}, status_code=403)
+        response = await call_next(request)
+        if response.status_code == 404:
+            ip_ban_manager.record_404(client_ip, request.url.path)
+        return response
+
+
+class LegacyTrustedHost(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        if not is_host_allowed(request.headers.get("host", ""), ALLOWED_HOSTS):
+            return JSONResponse({"error": "Forbidden"}, status_code=403)
+        return await call_next(request)
+
+
+class LegacyRequestID(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request.state.request_id = str(uuid.uuid4())
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request.state.request_id
+        return response
+
+
+class LegacyTiming(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(round(time.time() - start_time, 4))
+        return response
+
+
+class LegacyLogging(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        logging.getLogger(__name__).info("Request received", extra={"path": request.url.path})
+        response = await call_next(request)
+        logging.getLogger(__name__).info("Request completed", extra={"status_code": response.status_code})
+        return response
+
+
+def build_bare_app() -> Starlette:
+    return Starlette(routes=ROUTES)
+
+
+def build_legacy_app() -> Starlette:
+    # Same order as the old main.py: outermost first
+    return Starlette(routes=ROUTES, middleware=[
+        Middleware(LegacyIPBan),
+        Middleware(LegacyTrustedHost),
+        Middleware(LegacyRequestID),
+        Middleware(LegacyTiming),
+        Middleware(LegacyLogging),
+    ])
+
+
+def build_pipeline_app() -> Starlette:
+    return Starlette(routes=ROUTES, middleware=[
+        Middleware(RequestPipelineMiddleware, allowed_hosts=ALLOWED_HOSTS),
+    ])
+
+
+async def call(app, path: str):
+    """Issue one GET over ASGI. Returns (status, ttfb_seconds, total_seconds)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"user-agent", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    status = 0
+    first_byte = None
+    start = time.perf_counter()
+    request_sent = False
+    disconnect = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, first_byte
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            if first_byte is None and message.get("body"):
+                first_byte = time.perf_counter() - start
+
+    await app(scope, receive, send)
+    disconnect.set()
+    total = time.perf_counter() - start
+    return status, first_byte if first_byte is not None else total, total
+
+
+async def bench_rps(app, requests: int, concurrency: int) -> dict:
+    # Warm up routing/middleware stack construction
+    for _ in range(20):
+        await call(app, "/api/ping")
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, "/api/ping")
+    sequential = requests / (time.perf_counter() - start)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await call(app, "/api/ping")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    concurrent = requests / (time.perf_counter() - start)
+    return {"sequential_rps": sequential, "concurrent_rps": concurrent}
+
+
+async def bench_stream(app, runs: int = 20) -> dict:
+    ttfbs, totals = [], []
+    for _ in range(runs):
+        _, ttfb, total = await call(app, "/api/generation/stream")
+        ttfbs.append(ttfb * 1000)
+        totals.append(total * 1000)
+    return {
+        "ttfb_ms_p50": statistics.median(ttfbs),
+        "ttfb_ms_max": max(ttfbs),
+        "total_ms_p50": statistics.median(totals),
+    }
+
+
+async def main(requests: int, concurrency: int):
+    # Keep per-request log lines out of the measurement
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    for name, builder in (("bare (no middleware)", build_bare_app),
+                          ("before (BaseHTTPMiddleware x5)", build_legacy_app),
+                          ("after (pure ASGI pipeline)", build_pipeline_app)):
+        app = builder()
+        results[name] = {**await bench_rps(app, requests, concurrency), **await bench_stream(app)}
+
+    print(f"\n{'=' * 72}")
+    print(f"  Middleware benchmark ({requests} requests, concurrency {concurrency}, "
+          f"{STREAM_CHUNKS} stream chunks)")
+    print('=' * 72)
+    header = f"{'stack':<34}{'seq rps':>9}{'conc rps':>10}{'ttfb p50':>10}{'ttfb max':>10}"
+    print(header)
+    for name, r in results.items():
+        print(f"{name:<34}{r['sequential_rps']:>9.0f}{r['concurrent_rps']:>10.0f}"
+              f"{r['ttfb_ms_p50']:>8.2f}ms{r['ttfb_ms_max']:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
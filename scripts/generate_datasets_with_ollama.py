@@ -21,6 +21,7 @@ import time
 
 from config.artifact_model_mapping import get_artifact_mapper, ArtifactType
 from ai.ollama_client import OllamaClient
+from ai.model_scheduler import RequestPriority
 from ai.model_router import get_router
 
 
@@ -115,7 +116,7 @@ async def run_synthesis(artifact: str, count: int, concurrency: int, out_path: P
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Initialize Ollama + router
-    ollama = OllamaClient()
+    ollama = OllamaClient(default_priority=RequestPriority.BACKGROUND)
     assert await ollama.check_server_health(), "Ollama server is not running. Start with 'ollama serve'."
     router = get_router({}, ollama)
     router.set_force_local_only(True)  # ensure local-only for dataset gen
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for journaled persistence and incremental staleness in ArtifactLinker (backend/services/artifact_linker.py)
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import artifact_linker as artifact_linker_module
+from backend.services.artifact_linker import ArtifactLinker
+
+
+class TestArtifactLinkerJournal(unittest.TestCase):
+    """Test suite for the artifact dependency graph storage"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.storage_path = self.directory / "artifact_links.json"
+        self.linker = ArtifactLinker(storage_path=self.storage_path)
+        self.timestamps = iter(f"2026-01-01T00:00:{second:02d}" for second in range(60))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def register(self, linker, artifact_id, artifact_type, content):
+        with patch.object(artifact_linker_module, "datetime") as fake_datetime:
+            fake_datetime.now.return_value.isoformat.return_value = next(self.timestamps)
+            return linker.register_artifact(artifact_id, artifact_type, content)
+
+    def journal_lines(self):
+        return self.linker.journal_path.read_text().splitlines()
+
+    def test_changes_are_appended_to_journal(self):
+        """Registering appends lines instead of rewriting a snapshot"""
+        self.register(self.linker, "erd", "mermaid_erd", "erDiagram")
+        self.register(self.linker, "api", "api_docs", "openapi")
+        self.register(self.linker, "api", "api_docs", "openapi")
+
+        ops = [json.loads(line)["op"] for line in self.journal_lines()]
+        self.assertEqual(ops, ["node", "node", "link"])
+        self.assertFalse(self.storage_path.exists())
+
+    def test_graph_is_restored_from_snapshot_and_journal(self):
+        """A new linker sees the same nodes, links and adjacency"""
+        self.register(self.linker, "erd", "mermaid_erd", "erDiagram")
+        self.register(self.linker, "api", "api_docs", "openapi")
+        self.linker._compact()
+        self.register(self.linker, "code", "code_prototype", "def main(): pass")
+        self.register(self.linker, "erd", "mermaid_erd", "erDiagram v2")
+
+        restored = ArtifactLinker(storage_path=self.storage_path)
+        self.assertEqual(restored.nodes["erd"].version, 2)
+        self.assertEqual(len(restored.links), 3)
+        self.assertEqual({n.artifact_id for n in restored.get_downstream("erd")}, {"api", "code"})
+        self.assertEqual({n.artifact_id for n in restored.get_upstream("code")}, {"erd", "api"})
+        self.assertEqual(restored._find_roots(), ["erd"])
+
+    def test_journal_is_compacted(self):
+        """The journal is folded into the snapshot once it is long enough"""
+        with patch.object(artifact_linker_module, "JOURNAL_COMPACT_ENTRIES", 3):
+            self.register(self.linker, "erd", "mermaid_erd", "erDiagram")
+            self.register(self.linker, "api", "api_docs", "openapi")
+            self.register(self.linker, "jira", "jira", "PROJ-1")
+
+        [entry] = [json.loads(line) for line in self.journal_lines()]
+        self.assertEqual(entry["data"]["artifact_id"], "jira")
+        snapshot = json.loads(self.storage_path.read_text())
+        self.assertEqual(set(snapshot["nodes"]), {"erd", "api"})
+
+    def test_torn_journal_line_is_ignored(self):
+        """A half-written last line does not break loading"""
+        self.register(self.linker, "erd", "mermaid_erd", "erDiagram")
+        with open(self.linker.journal_path, "a") as f:
+            f.write('{"op": "node", "data": {"artifact_id"')
+
+        restored = ArtifactLinker(storage_path=self.storage_path)
+        self.assertEqual(list(restored.nodes), ["erd"])
+
+    def test_staleness_is_rechecked_only_downstream_of_changes(self):
+        """Only the changed artifact and its dependents are re-evaluated"""
+        self.register(self.linker, "erd", "mermaid_erd", "erDiagram")
+        self.register(self.linker, "jira", "jira", "PROJ-1")
+        self.register(self.linker, "api", "api_docs", "openapi")
+        self.register(self.linker, "estimate", "estimations", "3 days")
+        self.assertEqual(self.linker.get_all_stale_artifacts(), [])
+
+        checked = []
+        original = self.linker.check_staleness
+
+        def counting_check(artifact_id):
+            checked.append(artifact_id)
+            return original(artifact_id)
+
+        with patch.object(self.linker, "check_staleness", counting_check):
+            self.register(self.linker, "erd", "mermaid_erd", "erDiagram v2")
+            stale = self.linker.get_all_stale_artifacts()
+            self.assertEqual(sorted(checked), ["api", "erd"])
+            self.assertEqual([report.artifact_id for report in stale], ["api"])
+
+            checked.clear()
+            self.register(self.linker, "api", "api_docs", "openapi v2")
+            self.assertEqual(self.linker.get_all_stale_artifacts(), [])
+            self.assertEqual(checked, ["api"])
+
+
+if __name__ == "__main__":
+    unittest.main()
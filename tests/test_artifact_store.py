@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for ArtifactStore (backend/services/artifact_store.py)
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import artifact_store as artifact_store_module
+from backend.services.artifact_store import ArtifactStore, ORPHAN_FOLDER
+
+
+def make_version(artifact_id, version, artifact_type="mermaid_erd", folder_id=None, created_at=None,
+                 is_current=True, content="erDiagram", **metadata):
+    return {
+        "version": version,
+        "artifact_id": artifact_id,
+        "artifact_type": artifact_type,
+        "content": content,
+        "metadata": metadata,
+        "folder_id": folder_id,
+        "created_at": created_at or f"2026-01-01T00:00:{version:02d}",
+        "is_current": is_current,
+    }
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Test suite for the indexed artifact store"""
+
+    def setUp(self):
+        self.cleaned = []
+
+        def fake_clean(content, artifact_type):
+            self.cleaned.append(content)
+            return content.strip("` ")
+
+        self.clean_patch = patch.object(artifact_store_module, "_clean", fake_clean)
+        self.clean_patch.start()
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        self.store = ArtifactStore(engine=engine)
+
+    def tearDown(self):
+        self.clean_patch.stop()
+
+    def test_content_is_cleaned_once_at_write_time(self):
+        """Listing and fetching serve the stored cleaned content"""
+        self.store.put_version(make_version("sprint::mermaid_erd", 1, folder_id="sprint", content="```erDiagram```"))
+        self.store.list_artifacts(include_content=True)
+        artifact = self.store.get("sprint::mermaid_erd")
+
+        self.assertEqual(self.cleaned, ["```erDiagram```"])
+        self.assertEqual(artifact["content"], "erDiagram")
+        self.assertEqual(artifact["folder_id"], "sprint")
+
+    def test_listing_without_content_returns_metadata(self):
+        """Bodies are left out unless asked for"""
+        self.store.put_version(make_version("api_docs", 1, "api_docs", html_content="<p/>", validation_score=88.0))
+        [artifact] = self.store.list_artifacts()
+
+        self.assertNotIn("content", artifact)
+        self.assertEqual(artifact["content_length"], len("erDiagram"))
+        self.assertTrue(artifact["has_html"])
+        self.assertEqual(artifact["score"], 88.0)
+        self.assertEqual(artifact["folder_id"], ORPHAN_FOLDER)
+
+    def test_latest_current_version_per_folder_and_type(self):
+        """Default listing keeps the newest current artifact per folder and type"""
+        self.store.put_version(make_version("a::mermaid_erd", 1, folder_id="a"))
+        self.store.put_version(make_version("a::mermaid_erd", 2, folder_id="a"))
+        self.store.put_version(make_version("mermaid_erd", 3, folder_id="a"))
+        self.store.put_version(make_version("b::mermaid_erd", 4, folder_id="b"))
+
+        latest = self.store.list_artifacts()
+        self.assertEqual([(a["id"], a["folder_id"]) for a in latest], [("b::mermaid_erd", "b"), ("mermaid_erd", "a")])
+        self.assertEqual(len(self.store.list_artifacts(all_versions=True, folder_id="a")), 3)
+        self.assertEqual(self.store.count(all_versions=True), 4)
+        self.assertEqual(self.store.get("a::mermaid_erd")["created_at"], "2026-01-01T00:00:02")
+
+    def test_paging(self):
+        """limit/offset page through newest-first results"""
+        for index, artifact_type in enumerate(["mermaid_erd", "api_docs", "jira"], start=1):
+            self.store.put_version(make_version(artifact_type, index, artifact_type))
+        page = self.store.list_artifacts(limit=2, offset=1)
+        self.assertEqual([a["type"] for a in page], ["api_docs", "mermaid_erd"])
+
+    def test_sync_rewrites_only_changed_artifacts(self):
+        """Startup sync cleans only artifacts whose history differs"""
+        history = {
+            "mermaid_erd": [make_version("mermaid_erd", 1, is_current=False), make_version("mermaid_erd", 2)],
+            "jira": [make_version("jira", 1, "jira")],
+        }
+        self.store.put_version(make_version("stale", 1))
+        self.store.replace_artifact("mermaid_erd", history["mermaid_erd"])
+        self.cleaned.clear()
+
+        result = self.store.sync(history)
+        self.assertEqual(result, {"rewritten": 1, "removed": 1})
+        self.assertEqual(len(self.cleaned), 1)
+        self.assertIsNone(self.store.get("stale"))
+        self.assertEqual(self.store.sync(history), {"rewritten": 0, "removed": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for token streaming in ProjectAwareChatService (backend/services/chat_service.py)
+"""
+
+import sys
+import time
+import asyncio
+import unittest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import chat_service as chat_module
+from backend.services.chat_service import ProjectAwareChatService
+
+
+class FakeTextStream:
+    """Async generator stand-in that records whether it was closed"""
+
+    def __init__(self, chunks, fail_after=None, delay=0.0):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.delay = delay
+        self.closed = False
+        self._gen = self._run()
+
+    async def _run(self):
+        try:
+            for i, chunk in enumerate(self.chunks):
+                if self.fail_after is not None and i == self.fail_after:
+                    raise RuntimeError("connection reset")
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                yield chunk
+        finally:
+            self.closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._gen.__anext__()
+
+    async def aclose(self):
+        await self._gen.aclose()
+
+
+class TestChatStreaming(unittest.IsolatedAsyncioTestCase):
+    """Test suite for ProjectAwareChatService._relay_stream"""
+
+    def setUp(self):
+        # Skip __init__: the relay does not touch RAG/KG/Ollama state
+        self.service = ProjectAwareChatService.__new__(ProjectAwareChatService)
+        chat_module.metrics.reset()
+
+    async def collect(self, text_stream, **kwargs):
+        return [event async for event in self.service._relay_stream(
+            text_stream, provider="ollama", model="llama3", request_start=time.perf_counter(), **kwargs
+        )]
+
+    async def test_chunks_then_complete(self):
+        """Chunks are relayed as produced and followed by the full content"""
+        stream = FakeTextStream(["Hello", " there,", " this is", " a streamed", " answer."])
+        events = await self.collect(stream)
+
+        self.assertEqual(events[0]["type"], "chunk")
+        self.assertEqual(events[-1], {
+            "type": "complete",
+            "content": "Hello there, this is a streamed answer.",
+            "model": "llama3",
+            "provider": "ollama",
+        })
+        streamed = "".join(e["content"] for e in events if e["type"] == "chunk")
+        self.assertEqual(streamed, events[-1]["content"])
+        self.assertTrue(stream.closed)
+
+    async def test_ttft_recorded(self):
+        """Time to first token is recorded once per stream"""
+        await self.collect(FakeTextStream(["a", "b", "c"]))
+        histograms = chat_module.metrics.get_stats()["histograms"]
+        self.assertEqual(histograms["chat_time_to_first_token[model=llama3,provider=ollama]"]["count"], 1)
+
+    async def test_short_response_raises_for_fallback(self):
+        """Nothing is sent for a too-short answer so the caller can try another model"""
+        with self.assertRaises(RuntimeError):
+            await self.collect(FakeTextStream(["ok", "."]), min_chars=20)
+
+    async def test_error_before_output_raises(self):
+        """A failure before any chunk was sent is raised for fallback"""
+        with self.assertRaises(RuntimeError):
+            await self.collect(FakeTextStream(["a", "b"], fail_after=0))
+
+    async def test_error_after_output_yields_error_event(self):
+        """A failure mid-response ends the stream with an error event"""
+        events = await self.collect(FakeTextStream(["partial ", "answer", "x"], fail_after=2))
+        self.assertEqual([e["type"] for e in events[-2:]], ["chunk", "error"])
+
+    async def test_first_output_timeout(self):
+        """A model that produces nothing within the timeout is abandoned"""
+        stream = FakeTextStream(["late"], delay=1.0)
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.collect(stream, first_output_timeout=0.05)
+        self.assertTrue(stream.closed)
+
+    async def test_consumer_close_closes_source(self):
+        """Closing the relay (client disconnect) closes the model stream"""
+        stream = FakeTextStream([f"t{i} " for i in range(100)])
+        relay = self.service._relay_stream(
+            stream, provider="ollama", model="llama3", request_start=time.perf_counter()
+        )
+        await relay.__anext__()
+        await relay.aclose()
+        self.assertTrue(stream.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for ContextSession (backend/services/context_builder.py)
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.context_builder import ContextBuilder, ContextSession
+
+
+class FakeUniversalContext:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_universal_context(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"total_files": 3, "key_entities": [{"name": "Order"}]}
+
+
+def make_builder(calls):
+    """ContextBuilder whose sources only count how often they are built"""
+    builder = ContextBuilder.__new__(ContextBuilder)
+    builder.universal_context_service = FakeUniversalContext()
+    builder.rag_cache = MagicMock()
+    builder._context_store = {}
+    builder._max_context_store_size = 50
+
+    def source(name):
+        async def build(*args):
+            calls[name] = calls.get(name, 0) + 1
+            await asyncio.sleep(0.01)
+            return {"source": name, "args": args}
+        return build
+
+    builder._build_smart_rag_context = source("rag")
+    builder._build_kg_context = source("kg")
+    builder._build_pattern_context = source("patterns")
+    builder._build_ml_features_context = source("ml_features")
+    builder._assemble_context = lambda context, max_tokens=None: {"content": "ctx", "truncation_info": {}}
+    return builder
+
+
+class TestContextSession(unittest.IsolatedAsyncioTestCase):
+    """Test suite for batch-shared context parts"""
+
+    async def build_batch(self, builder, artifact_types, session, notes="Users place orders"):
+        return await asyncio.gather(*(
+            builder.build_context(notes, include_ml_features=True, artifact_type=artifact_type,
+                                  force_refresh=True, session=session)
+            for artifact_type in artifact_types
+        ))
+
+    async def test_shared_parts_built_once(self):
+        """Only targeted RAG runs per artifact when a session is shared"""
+        calls = {}
+        builder = make_builder(calls)
+        session = ContextSession()
+        contexts = await self.build_batch(builder, ["mermaid_erd", "api_docs", "jira"], session)
+
+        self.assertEqual(calls, {"rag": 3, "kg": 1, "patterns": 1, "ml_features": 1})
+        self.assertEqual(builder.universal_context_service.calls, 1)
+        self.assertEqual([c["sources"]["rag"]["args"][2] for c in contexts], ["mermaid_erd", "api_docs", "jira"])
+        stats = session.get_stats()
+        self.assertEqual(stats["parts_built"], 4)
+        self.assertEqual(stats["parts_reused"], 8)
+        self.assertGreater(stats["time_saved_seconds"], 0)
+
+    async def test_without_session_everything_is_rebuilt(self):
+        """The default path is unchanged"""
+        calls = {}
+        builder = make_builder(calls)
+        await self.build_batch(builder, ["mermaid_erd", "api_docs"], None)
+        self.assertEqual(calls, {"rag": 2, "kg": 2, "patterns": 2, "ml_features": 2})
+
+    async def test_kg_is_keyed_by_meeting_notes(self):
+        """Different notes get their own KG part but share the rest"""
+        calls = {}
+        builder = make_builder(calls)
+        session = ContextSession()
+        await self.build_batch(builder, ["mermaid_erd"], session, notes="Users place orders")
+        await self.build_batch(builder, ["mermaid_erd"], session, notes="Admins refund orders")
+        self.assertEqual(calls["kg"], 2)
+        self.assertEqual(calls["patterns"], 1)
+
+    async def test_failed_part_is_retried(self):
+        """A part whose build raised is built again by the next caller"""
+        session = ContextSession()
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("index not ready")
+            return "ok"
+
+        with self.assertRaises(RuntimeError):
+            await session.get("universal", flaky)
+        self.assertEqual(await session.get("universal", flaky), "ok")
+        self.assertEqual(len(attempts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
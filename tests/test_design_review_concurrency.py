@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for concurrent reviewers in DesignReviewService.full_review (backend/services/design_review.py)
+"""
+
+import sys
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import design_review as design_review_module
+from backend.services.design_review import DesignReviewService, SourceSnapshot
+
+
+class FakeGenerationService:
+    """LLM stand-in that takes `delay` seconds and records the prompts it saw"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.prompts = []
+
+    async def generate_with_pipeline(self, artifact_type, meeting_notes, options=None):
+        self.prompts.append(meeting_notes)
+        await asyncio.sleep(self.delay)
+        return {"content": '[{"severity": "warning", "title": "God class", "category": "patterns"}]'}
+
+
+class SlowPatternMining:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def analyze_directory(self, path):
+        time.sleep(self.delay)
+        return {"anti_patterns": [], "design_patterns": [{"name": "Repository"}], "files_analyzed": 2}
+
+
+class TestDesignReviewConcurrency(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the concurrent full review"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        (self.directory / "orders.py").write_text('api_key = "abcdefghijklmnopqrstuvwxyz123456"\n')
+        (self.directory / "users.py").write_text("class User:\n    pass\n")
+        (self.directory / "test_orders.py").write_text("def test_total():\n    assert True\n")
+        self.service = DesignReviewService()
+        self.service._generation_service = FakeGenerationService(delay=0.2)
+        self.service._pattern_mining = SlowPatternMining(delay=0.2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    async def test_reviewers_run_concurrently(self):
+        """The slow AI and pattern reviewers overlap instead of adding up"""
+        start = time.perf_counter()
+        result = await self.service.full_review(directory=str(self.directory))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.35)
+        titles = [finding.title for finding in result.findings]
+        self.assertIn("God class", titles)
+        self.assertIn("Good pattern: Repository", titles)
+        self.assertIn("No tests for users.py", titles)
+        self.assertTrue(any("API key" in title or "secret" in title.lower() for title in titles))
+        self.assertEqual(result.files_reviewed, 3)
+
+    async def test_partial_results_stream_as_reviewers_finish(self):
+        """Fast reviewers are reported before the slow ones, then the combined result"""
+        events = [event async for event in self.service.full_review_stream(directory=str(self.directory))]
+
+        partials = [event for event in events if event["type"] == "partial"]
+        self.assertEqual(len(partials), 4)
+        self.assertEqual({event["reviewer"] for event in partials[:2]}, {"tests", "security"})
+        self.assertEqual([event["completed"] for event in partials], [1, 2, 3, 4])
+        self.assertEqual(events[-1]["type"], "result")
+
+    async def test_reviewer_timeout_becomes_a_finding(self):
+        """A reviewer over its timeout is reported, not fatal"""
+        timeouts = {"code_quality": 0.05, "tests": 5, "security": 5, "patterns": 5}
+        with patch.object(design_review_module.settings, "design_review_timeouts", timeouts):
+            result = await self.service.full_review(directory=str(self.directory))
+
+        titles = [finding.title for finding in result.findings]
+        self.assertIn("Code Quality review timed out", titles)
+        self.assertIn("Good pattern: Repository", titles)
+
+    async def test_files_are_read_once(self):
+        """Reviewers share one snapshot instead of reading the files themselves"""
+        reads = []
+        original = Path.read_text
+
+        def counting_read_text(path, *args, **kwargs):
+            reads.append(str(path))
+            return original(path, *args, **kwargs)
+
+        with patch.object(Path, "read_text", counting_read_text):
+            await self.service.full_review(directory=str(self.directory))
+
+        self.assertEqual(len(reads), len(set(reads)))
+        self.assertEqual(len(reads), 3)
+
+    def test_snapshot_summary_is_cached(self):
+        """The code summary is built once per file list"""
+        snapshot = SourceSnapshot([str(self.directory / "users.py"), str(self.directory / "missing.py")])
+        first = snapshot.summary(snapshot.paths)
+        self.assertIn("users.py: .py (3 lines)", first)
+        self.assertNotIn("missing.py", first)
+        self.assertIs(first, snapshot.summary(snapshot.paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for JSONL storage and near-duplicate rejection in FinetuningPool (backend/services/finetuning_pool.py)
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core.config import settings
+from backend.services.finetuning_pool import FinetuningPool
+from backend.utils import minhash
+
+NOTES = ("Kickoff for the checkout service. Customers place orders with line items, "
+         "payments are captured through the gateway and invoices are emailed after shipment.")
+ERD = """erDiagram
+    CUSTOMER ||--o{ ORDER : places
+    ORDER ||--|{ LINE_ITEM : contains
+    ORDER ||--o| PAYMENT : "paid by"
+    ORDER ||--o{ INVOICE : "billed as"
+    CUSTOMER { string id string email string name }
+    ORDER { string id date placed_at string status }
+    LINE_ITEM { string sku int quantity decimal price }
+    PAYMENT { string id decimal amount string gateway_ref }
+    INVOICE { string id date sent_at }
+"""
+
+
+class TestFinetuningPoolDedup(unittest.TestCase):
+    """Test suite for the append-only, deduplicated finetuning pool"""
+
+    def setUp(self):
+        self.pool_dir = Path(tempfile.mkdtemp())
+        self.pool = self.new_pool()
+
+    def tearDown(self):
+        shutil.rmtree(self.pool_dir, ignore_errors=True)
+
+    def new_pool(self):
+        pool = FinetuningPool(pool_dir=self.pool_dir)
+        pool.incremental_finetuning_threshold = 1000
+        return pool
+
+    def add(self, content, notes=NOTES, source=None, pool=None):
+        return (pool or self.pool).add_example("mermaid_erd", content, notes, 92.0, "llama3",
+                                               context={"source": source} if source else None)
+
+    def lines(self):
+        return (self.pool_dir / "mermaid_erd_pool.jsonl").read_text(encoding="utf-8").splitlines()
+
+    def test_examples_are_appended_as_jsonl(self):
+        """Each accepted example is one appended line"""
+        self.assertTrue(self.add(ERD))
+        self.assertTrue(self.add("erDiagram\n    USER ||--o{ SESSION : opens\n", notes="Login and sessions"))
+        lines = self.lines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])["meeting_notes"], "Login and sessions")
+
+    def test_near_duplicates_are_rejected(self):
+        """A regenerated artifact for the same notes is not added again"""
+        self.assertTrue(self.add(ERD))
+        regenerated = ERD.replace("date sent_at", "date sent_at string pdf_url")
+        self.assertGreater(minhash.similarity(minhash.signature(ERD), minhash.signature(regenerated)), 0.8)
+        self.assertFalse(self.add(regenerated))
+        self.assertFalse(self.add(ERD))
+        self.assertEqual(len(self.lines()), 1)
+
+        # The same diagram for different meeting notes is a different example
+        self.assertTrue(self.add(ERD, notes="Warehouse sync: stock levels are mirrored to the ERP nightly."))
+
+    def test_lsh_bands_follow_the_threshold(self):
+        """Pairs at the configured threshold almost always become candidates"""
+        for threshold in (0.5, 0.7, 0.8, 0.9):
+            bands, rows = minhash.band_layout(threshold)
+            self.assertEqual(bands * rows, minhash.NUM_PERMUTATIONS)
+            self.assertGreaterEqual(minhash.candidate_probability(threshold, bands, rows), minhash.LSH_MIN_RECALL)
+
+        self.assertTrue(self.add(ERD))
+        with patch.object(settings, "finetuning_near_duplicate_threshold", 0.5):
+            self.assertEqual(self.pool._dedupe_index("mermaid_erd")[0].rows, 2)
+            self.assertFalse(self.add(ERD.replace("CUSTOMER", "CLIENT")))
+
+    def test_source_counters_are_incremental(self):
+        """Breakdown counts follow adds, removals and restarts"""
+        self.add(ERD)
+        self.add("erDiagram\n    USER ||--o{ SESSION : opens\n", notes="Login and sessions", source="synthetic")
+        self.add("erDiagram\n    TEAM ||--|{ MEMBER : has\n", notes="Teams and members", source="synthetic")
+        breakdown = self.pool.get_source_breakdown("mermaid_erd")
+        self.assertEqual((breakdown["real_examples"], breakdown["synthetic_examples"]), (1, 2))
+
+        self.assertEqual(self.pool.remove_synthetic("mermaid_erd"), 2)
+        restarted = self.new_pool()
+        self.assertEqual(restarted.get_source_breakdown("mermaid_erd")["total_examples"], 1)
+        self.assertFalse(self.add(ERD, pool=restarted))
+
+    def test_legacy_json_pool_is_converted(self):
+        """An indented JSON pool becomes JSONL on load"""
+        shutil.rmtree(self.pool_dir)
+        self.pool_dir.mkdir()
+        legacy = [{"artifact_type": "api_docs", "content": "GET /users", "meeting_notes": "users api",
+                   "validation_score": 90.0, "model_used": "m", "context": {}, "added_at": "2026-01-01"}]
+        (self.pool_dir / "api_docs_pool.json").write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+
+        pool = self.new_pool()
+        self.assertEqual(pool.get_examples("api_docs"), legacy)
+        self.assertFalse((self.pool_dir / "api_docs_pool.json").exists())
+        self.assertTrue((self.pool_dir / "api_docs_pool.json.bak").exists())
+        self.assertEqual(len((self.pool_dir / "api_docs_pool.jsonl").read_text().splitlines()), 1)
+        self.assertEqual(self.new_pool().get_examples("api_docs"), legacy)
+
+    def test_legacy_json_pool_is_kept_when_conversion_fails(self):
+        """A failed JSONL write leaves the legacy pool in place for the next start"""
+        legacy = [{"artifact_type": "api_docs", "content": "GET /users", "meeting_notes": "users api",
+                   "validation_score": 90.0, "model_used": "m", "context": {}, "added_at": "2026-01-01"}]
+        legacy_file = self.pool_dir / "api_docs_pool.json"
+        legacy_file.write_text(json.dumps(legacy), encoding="utf-8")
+
+        with patch("backend.services.finetuning_pool.os.replace", side_effect=OSError("No space left on device")):
+            pool = self.new_pool()
+        self.assertEqual(pool.get_examples("api_docs"), legacy)
+        self.assertEqual(json.loads(legacy_file.read_text(encoding="utf-8")), legacy)
+        self.assertFalse((self.pool_dir / "api_docs_pool.jsonl").exists())
+        self.assertFalse((self.pool_dir / "api_docs_pool.jsonl.tmp").exists())
+
+        # An example appended before the next start creates the JSONL pool; both survive the restart
+        pool.add_example("api_docs", "POST /orders", "orders api", 95.0, "m")
+        restarted = self.new_pool()
+        self.assertEqual([e["content"] for e in restarted.get_examples("api_docs")], ["GET /users", "POST /orders"])
+        self.assertFalse(legacy_file.exists())
+        self.assertEqual(len(self.new_pool().get_examples("api_docs")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
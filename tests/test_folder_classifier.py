@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for FolderClassifier (backend/services/folder_classifier.py)
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.folder_classifier import FolderClassifier, HashingEmbedder
+
+NOTES = {
+    "authentication": {
+        "kickoff.md": "Login flow review: password reset, session tokens, OAuth provider and JWT expiry.",
+        "sso.md": "Single sign-on: OAuth callback, session cookie, token refresh and password policy.",
+    },
+    "database": {
+        "schema.md": "Schema migration plan: orders table, index on customer id, query performance in SQL.",
+    },
+}
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        return super().embed(texts)
+
+
+class TestFolderClassifier(unittest.TestCase):
+    """Test suite for nearest-folder suggestions"""
+
+    def setUp(self):
+        self.notes_dir = Path(tempfile.mkdtemp())
+        for folder, notes in NOTES.items():
+            (self.notes_dir / folder).mkdir()
+            for name, text in notes.items():
+                (self.notes_dir / folder / name).write_text(text)
+        self.embedder = CountingEmbedder()
+        self.classifier = FolderClassifier(notes_dir=self.notes_dir, embedder=self.embedder)
+
+    def tearDown(self):
+        shutil.rmtree(self.notes_dir, ignore_errors=True)
+
+    def test_suggest_ranks_folders_by_similarity(self):
+        """The closest centroid comes first, with a cosine score"""
+        matches = self.classifier.suggest("Users keep losing their session after password reset and token refresh")
+        self.assertEqual([folder for folder, _ in matches], ["authentication", "database"])
+        self.assertGreater(matches[0][1], matches[1][1])
+        self.assertLessEqual(matches[0][1], 1.0)
+
+    def test_refresh_embeds_only_changed_notes(self):
+        """Unchanged notes are not read or embedded again"""
+        self.classifier.suggest("schema")
+        self.embedder.embedded.clear()
+
+        self.assertEqual(self.classifier.refresh(), 0)
+        (self.notes_dir / "database" / "backup.txt").write_text("Nightly database backup and restore drill.")
+        (self.notes_dir / "authentication" / "sso.md").unlink()
+        self.assertEqual(self.classifier.refresh(), 1)
+        self.assertEqual(self.classifier._counts, {"authentication": 1, "database": 2})
+
+    def test_centroids_follow_incremental_updates(self):
+        """Saving, moving and deleting notes adjust the folder sums in place"""
+        self.classifier.suggest("schema")
+        note = self.notes_dir / "database" / "indexes.md"
+        note.write_text("Index tuning for slow SQL query plans.")
+        self.classifier.add_note("database", note)
+        (self.notes_dir / "authentication" / "sso.md").rename(self.notes_dir / "database" / "sso.md")
+        self.classifier.move_note("authentication", "database", "sso.md")
+        (self.notes_dir / "database" / "schema.md").unlink()
+        self.classifier.remove_note("database", "schema.md")
+
+        rebuilt = FolderClassifier(notes_dir=self.notes_dir, embedder=HashingEmbedder())
+        rebuilt.refresh()
+        self.assertEqual(self.classifier._counts, rebuilt._counts)
+        for folder in rebuilt._sums:
+            np.testing.assert_allclose(self.classifier._sums[folder], rebuilt._sums[folder], atol=1e-5)
+
+    def test_folder_rename_and_delete(self):
+        """Folder operations re-key or drop their notes"""
+        self.classifier.suggest("schema")
+        self.classifier.rename_folder("authentication", "auth")
+        self.classifier.remove_folder("database")
+        self.assertEqual([folder for folder, _ in self.classifier.suggest("login session")], ["auth"])
+
+    def test_no_notes_gives_no_matches(self):
+        """An empty notes directory leaves the decision to the fallbacks"""
+        empty = FolderClassifier(notes_dir=self.notes_dir / "missing", embedder=HashingEmbedder())
+        self.assertEqual(empty.suggest("anything at all"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for request coalescing in GenerationService (backend/services/generation_service.py)
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.models.dto import ArtifactType, GenerationStatus
+from backend.services import generation_service as generation_service_module
+from backend.services.generation_queue import GenerationJobQueue, LOCAL, CLOUD
+from backend.services.generation_service import GenerationService
+
+
+class FakePipeline:
+    """Stands in for _run_generation: counts runs and waits until released"""
+
+    def __init__(self, service):
+        self.service = service
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, artifact_type, meeting_notes, context_id=None, options=None,
+                       stream=False, folder_id=None, job_id=None, context_session=None):
+        self.runs += 1
+        self.service.active_jobs[job_id] = {"job_id": job_id, "status": GenerationStatus.IN_PROGRESS.value,
+                                            "progress": 0.0}
+        yield {"type": "started", "job_id": job_id, "status": GenerationStatus.IN_PROGRESS.value}
+        await self.release.wait()
+        yield {"type": "progress", "job_id": job_id, "progress": 50.0}
+        self.service.active_jobs[job_id].update(status=GenerationStatus.COMPLETED.value, progress=100.0,
+                                                artifact={"content": "erDiagram"})
+        yield {"type": "complete", "job_id": job_id, "status": GenerationStatus.COMPLETED.value,
+               "artifact": {"content": "erDiagram"}}
+
+
+async def collect(agen):
+    return [event async for event in agen]
+
+
+class TestGenerationDedup(unittest.IsolatedAsyncioTestCase):
+    """Test suite for single-flight generation"""
+
+    async def asyncSetUp(self):
+        self.service = GenerationService.__new__(GenerationService)
+        self.service.active_jobs = {}
+        self.service.job_queue = GenerationJobQueue(workers={LOCAL: 1, CLOUD: 1}, max_pending=10)
+        self.service._flights = {}
+        self.service._recent_results = {}
+        self.service._cleanup_old_jobs = lambda: None
+        self.pipeline = FakePipeline(self.service)
+        self.service._run_generation = self.pipeline
+        self.settings = patch.multiple(
+            generation_service_module.settings,
+            generation_dedup_enabled=True,
+            generation_result_cache_seconds=0,
+        )
+        self.settings.start()
+
+    async def asyncTearDown(self):
+        self.settings.stop()
+
+    def generate(self, job_id, notes="Users have orders", **kwargs):
+        return self.service.generate_artifact(ArtifactType.MERMAID_ERD, notes, job_id=job_id, **kwargs)
+
+    async def test_identical_requests_share_one_run(self):
+        """A concurrent identical request attaches and gets the same events under its own job_id"""
+        first = asyncio.create_task(collect(self.generate("job-a")))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(collect(self.generate("job-b", notes="Users have orders\r\n")))
+        await asyncio.sleep(0)
+        self.pipeline.release.set()
+        events_a, events_b = await asyncio.gather(first, second)
+
+        self.assertEqual(self.pipeline.runs, 1)
+        self.assertEqual([e["type"] for e in events_a], [e["type"] for e in events_b])
+        self.assertTrue(all(e["job_id"] == "job-b" for e in events_b))
+        self.assertEqual(self.service.active_jobs["job-b"]["status"], GenerationStatus.COMPLETED.value)
+        self.assertEqual(self.service.active_jobs["job-b"]["attached_to"], "job-a")
+        self.assertEqual(self.service._flights, {})
+
+    async def test_different_inputs_run_separately(self):
+        """Requests with different options get their own pipeline"""
+        self.pipeline.release.set()
+        await asyncio.gather(
+            collect(self.generate("job-a", options={"temperature": 0.2})),
+            collect(self.generate("job-b", options={"temperature": 0.9})),
+        )
+        self.assertEqual(self.pipeline.runs, 2)
+
+    async def test_default_options_are_canonical(self):
+        """Omitted options and explicit defaults hash to the same key"""
+        self.assertEqual(
+            GenerationService.flight_key(ArtifactType.MERMAID_ERD, "notes"),
+            GenerationService.flight_key(ArtifactType.MERMAID_ERD, " notes ", options={"max_retries": 3}),
+        )
+
+    async def test_queued_duplicate_skips_the_queue(self):
+        """An identical enqueued job attaches instead of taking a queue slot"""
+        def run(job_id):
+            return collect(self.generate(job_id))
+
+        leader_id, leader = self.service.enqueue_job(run, ArtifactType.MERMAID_ERD, "Users have orders")
+        follower_id, follower = self.service.enqueue_job(run, ArtifactType.MERMAID_ERD, "Users have orders")
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.service.job_queue.submitted, 1)
+        self.assertEqual(self.service.active_jobs[follower_id]["attached_to"], leader_id)
+        self.pipeline.release.set()
+        leader_events, follower_events = await asyncio.gather(leader, follower)
+        self.assertEqual(self.pipeline.runs, 1)
+        self.assertEqual(follower_events[-1]["type"], "complete")
+
+    async def test_recent_result_cache(self):
+        """With the result cache on, an immediate repeat is answered without a new run"""
+        self.pipeline.release.set()
+        with patch.object(generation_service_module.settings, "generation_result_cache_seconds", 30):
+            await collect(self.generate("job-a"))
+            repeat = await collect(self.generate("job-b"))
+
+        self.assertEqual(self.pipeline.runs, 1)
+        self.assertEqual(repeat[-1]["job_id"], "job-b")
+        self.assertEqual(repeat[-1]["artifact"], {"content": "erDiagram"})
+
+    async def test_abandoned_run_is_cancelled(self):
+        """The shared pipeline stops once every attached request has gone away"""
+        stream = self.generate("job-a")
+        await stream.__anext__()
+        flight = next(iter(self.service._flights.values()))
+        await stream.aclose()
+        await asyncio.sleep(0)
+        self.assertTrue(flight.task.cancelled() or flight.task.done())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for GenerationJobQueue (backend/services/generation_queue.py)
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.generation_queue import (
+    GenerationJobQueue,
+    JobPriority,
+    QueueFullError,
+    resource_class_for,
+    LOCAL,
+    CLOUD,
+)
+
+
+class Job:
+    """Records how many jobs run at once; each waits until released"""
+
+    def __init__(self, tracker, name):
+        self.tracker = tracker
+        self.name = name
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.tracker["running"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["running"])
+        self.tracker["order"].append(self.name)
+        await self.release.wait()
+        self.tracker["running"] -= 1
+        return self.name
+
+
+class TestGenerationJobQueue(unittest.IsolatedAsyncioTestCase):
+    """Test suite for GenerationJobQueue"""
+
+    async def asyncSetUp(self):
+        self.queue = GenerationJobQueue(workers={LOCAL: 1, CLOUD: 2}, max_pending=3)
+        self.tracker = {"running": 0, "peak": 0, "order": []}
+
+    def job(self, name):
+        return Job(self.tracker, name)
+
+    async def test_local_jobs_run_one_at_a_time(self):
+        """Only `workers` jobs run; the rest wait and report their position"""
+        jobs = [self.job(f"j{i}") for i in range(3)]
+        futures = [self.queue.submit(f"j{i}", job, resource=LOCAL) for i, job in enumerate(jobs)]
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.tracker["running"], 1)
+        self.assertIsNone(self.queue.position("j0"))
+        self.assertEqual(self.queue.position("j1"), 1)
+        self.assertEqual(self.queue.position("j2"), 2)
+
+        for job in jobs:
+            job.release.set()
+        self.assertEqual(await asyncio.gather(*futures), ["j0", "j1", "j2"])
+        self.assertEqual(self.tracker["peak"], 1)
+
+    async def test_priority_lanes(self):
+        """Interactive jobs overtake queued bulk jobs"""
+        first = self.job("first")
+        self.queue.submit("first", first, resource=LOCAL)
+        bulk = self.job("bulk")
+        interactive = self.job("interactive")
+        self.queue.submit("bulk", bulk, resource=LOCAL, priority=JobPriority.BULK)
+        self.queue.submit("interactive", interactive, resource=LOCAL, priority=JobPriority.INTERACTIVE)
+
+        self.assertEqual(self.queue.position("interactive"), 1)
+        for job in (first, bulk, interactive):
+            job.release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.tracker["order"], ["first", "interactive", "bulk"])
+
+    async def test_full_queue_rejects(self):
+        """Submitting beyond max_pending raises QueueFullError with a retry hint"""
+        jobs = [self.job(f"j{i}") for i in range(5)]
+        for i in range(4):  # one running + three waiting
+            self.queue.submit(f"j{i}", jobs[i], resource=LOCAL)
+        with self.assertRaises(QueueFullError) as ctx:
+            self.queue.submit("j4", jobs[4], resource=LOCAL)
+        self.assertGreater(ctx.exception.retry_after, 0)
+        self.assertEqual(self.queue.get_stats()["rejected"], 1)
+        for job in jobs:
+            job.release.set()
+        await asyncio.sleep(0.01)
+
+    async def test_cancel_pending_job(self):
+        """A waiting job can be removed; it never runs"""
+        running, waiting = self.job("running"), self.job("waiting")
+        self.queue.submit("running", running, resource=LOCAL)
+        future = self.queue.submit("waiting", waiting, resource=LOCAL)
+
+        self.assertTrue(self.queue.cancel("waiting"))
+        self.assertTrue(future.cancelled())
+        running.release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.tracker["order"], ["running"])
+
+    async def test_resource_classes_are_independent(self):
+        """Cloud jobs do not wait behind a busy GPU"""
+        gpu = self.job("gpu")
+        cloud = self.job("cloud")
+        self.queue.submit("gpu", gpu, resource=LOCAL)
+        self.queue.submit("cloud", cloud, resource=CLOUD)
+        await asyncio.sleep(0)
+        self.assertEqual(self.tracker["running"], 2)
+        gpu.release.set()
+        cloud.release.set()
+        await asyncio.sleep(0.01)
+
+    def test_resource_class_for(self):
+        self.assertEqual(resource_class_for(None), LOCAL)
+        self.assertEqual(resource_class_for({"model_preference": "llama3:8b"}), LOCAL)
+        self.assertEqual(resource_class_for({"model_preference": "gemini:gemini-2.0-flash"}), CLOUD)
+        self.assertEqual(resource_class_for({"model_preference": "groq"}), CLOUD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for batched artifact git status in GitService (backend/services/git_service.py)
+"""
+
+import sys
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.git_service import GitService
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestGitStatusBatch(unittest.TestCase):
+    """Test suite for get_all_artifacts_git_status"""
+
+    def setUp(self):
+        self.repo = Path(tempfile.mkdtemp()).resolve()
+        git(self.repo, "init", "-q")
+        git(self.repo, "config", "user.email", "dev@example.com")
+        git(self.repo, "config", "user.name", "dev")
+        outputs = self.repo / "outputs"
+        (outputs / "sprint").mkdir(parents=True)
+        (outputs / "erd.mmd").write_text("erDiagram\n")
+        (outputs / "sprint" / "api docs.md").write_text("# API\n")
+        (outputs / "old.md").write_text("old\n")
+        git(self.repo, "add", ".")
+        git(self.repo, "commit", "-q", "-m", "initial")
+
+        (outputs / "erd.mmd").write_text("erDiagram\n  USER ||--o{ ORDER : places\n")
+        (outputs / "sprint" / "new.html").write_text("<html></html>\n")
+        (outputs / "staged.json").write_text("{}\n")
+        git(self.repo, "add", "outputs/staged.json")
+        git(self.repo, "mv", "outputs/old.md", "outputs/renamed.md")
+        (outputs / "notes.py").write_text("ignored suffix\n")
+
+        self.service = GitService.__new__(GitService)
+        self.service.outputs_dir = outputs
+        self.service._status_cache = None
+        self.repo_patch = patch.object(GitService, "_get_repo_root", return_value=self.repo)
+        self.repo_patch.start()
+
+    def tearDown(self):
+        self.repo_patch.stop()
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def statuses(self):
+        result = self.service.get_all_artifacts_git_status()
+        return {artifact["file"]: artifact["status"] for artifact in result["artifacts"]}
+
+    def test_statuses_for_whole_tree(self):
+        """Every artifact file gets the status the per-file commands used to give"""
+        self.assertEqual(self.statuses(), {
+            "outputs/erd.mmd": "modified",
+            "outputs/renamed.md": "tracked",
+            "outputs/sprint/api docs.md": "tracked",
+            "outputs/sprint/new.html": "untracked",
+            "outputs/staged.json": "added",
+        })
+
+    def test_two_git_processes_per_uncached_call(self):
+        """The tree costs one status and one ls-files, and a repeat call none"""
+        with patch.object(GitService, "_run_git_command", wraps=self.service._run_git_command) as run:
+            self.statuses()
+            self.statuses()
+        commands = [call.args[0] for call in run.call_args_list]
+        self.assertEqual(len(commands), 2)
+        self.assertIn("status", commands[0])
+        self.assertIn("ls-files", commands[1])
+
+    def test_cache_follows_index_and_outputs(self):
+        """Staging or editing an output invalidates the cached status"""
+        self.statuses()
+        git(self.repo, "add", "outputs/sprint/new.html")
+        self.assertEqual(self.statuses()["outputs/sprint/new.html"], "added")
+
+        (self.repo / "outputs" / "sprint" / "api docs.md").write_text("# API v2\n")
+        self.assertEqual(self.statuses()["outputs/sprint/api docs.md"], "modified")
+
+    def test_single_artifact_uses_batched_status(self):
+        """get_artifact_git_status reads from the same status map"""
+        result = self.service.get_artifact_git_status("erd")
+        self.assertEqual([f["status"] for f in result["files"]], ["modified"])
+
+    def test_parse_porcelain_v2(self):
+        """Renames consume the original path entry"""
+        output = ("1 .M N... 100644 100644 100644 abc abc a b.md\0"
+                  "2 R. N... 100644 100644 100644 abc abc R100 new.md\0old.md\0"
+                  "? x.txt\0")
+        self.assertEqual(GitService._parse_porcelain_v2(output),
+                         {"a b.md": ".M", "new.md": "R.", "x.txt": "??"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the incremental token-usage / error summaries in backend/core/logger.py
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core.logger import TokenUsageAggregate, ErrorAggregate, _JsonlAggregate, _write_jsonl
+
+
+def _token_entry(model: str, tokens: int, cost: float = 0.0, timestamp: str = "2026-01-15T10:42:07Z"):
+    return {
+        "timestamp": timestamp,
+        "type": "token_usage",
+        "model": model,
+        "total_tokens": tokens,
+        "cost_usd": cost,
+    }
+
+
+class TestTokenUsageAggregate(unittest.TestCase):
+    """Test suite for TokenUsageAggregate"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.source = self.tmp / "tokens.jsonl"
+        self.checkpoint = self.tmp / "tokens.summary.json"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _aggregate(self):
+        return TokenUsageAggregate(self.source, self.checkpoint)
+
+    def _append(self, aggregate, entry):
+        offsets = _write_jsonl(self.source, entry)
+        aggregate.record(entry, *offsets)
+
+    def test_record_updates_counters(self):
+        """Records folded on write show up in the summary"""
+        aggregate = self._aggregate()
+        self._append(aggregate, _token_entry("gpt-4o", 100, 0.5))
+        self._append(aggregate, _token_entry("gpt-4o", 50, 0.25))
+        self._append(aggregate, _token_entry("llama3", 10))
+
+        summary = aggregate.get_summary()
+        self.assertEqual(summary["total_tokens"], 160)
+        self.assertAlmostEqual(summary["total_cost_usd"], 0.75)
+        self.assertEqual(summary["by_model"]["gpt-4o"]["calls"], 2)
+        self.assertEqual(summary["hourly"]["2026-01-15T10"]["tokens"], 160)
+        self.assertEqual(summary["daily"]["2026-01-15"]["calls"], 3)
+
+    def test_restart_reads_only_tail(self):
+        """A new aggregate resumes from the checkpoint offset"""
+        aggregate = self._aggregate()
+        for _ in range(3):
+            self._append(aggregate, _token_entry("gpt-4o", 10))
+        aggregate.flush()
+
+        saved = json.loads(self.checkpoint.read_text(encoding="utf-8"))
+        self.assertEqual(saved["offset"], self.source.stat().st_size)
+
+        # Another process appends after the checkpoint
+        _write_jsonl(self.source, _token_entry("mistral", 5))
+
+        restarted = self._aggregate()
+        summary = restarted.get_summary()
+        self.assertEqual(summary["total_tokens"], 35)
+        self.assertEqual(restarted.offset, self.source.stat().st_size)
+
+    def test_truncated_file_rebuilds(self):
+        """A checkpoint past the end of the file is discarded"""
+        aggregate = self._aggregate()
+        self._append(aggregate, _token_entry("gpt-4o", 10))
+        aggregate.flush()
+
+        self.source.write_text("", encoding="utf-8")
+        self.assertEqual(self._aggregate().get_summary()["total_tokens"], 0)
+
+    def test_partial_line_is_deferred(self):
+        """An unterminated trailing line is not consumed"""
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(json.dumps(_token_entry("gpt-4o", 10)) + "\n")
+            f.write('{"type": "token_usage", "model"')
+
+        aggregate = self._aggregate()
+        self.assertEqual(aggregate.get_summary()["total_tokens"], 10)
+        self.assertLess(aggregate.offset, self.source.stat().st_size)
+
+
+class TestErrorAggregate(unittest.TestCase):
+    """Test suite for ErrorAggregate"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.source = self.tmp / "errors.jsonl"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_recent_is_bounded(self):
+        """Only the last 10 errors are kept"""
+        aggregate = ErrorAggregate(self.source, self.tmp / "errors.summary.json")
+        for i in range(15):
+            entry = {"type": "exception", "error_class": "ValueError", "error_message": str(i)}
+            aggregate.record(entry, *_write_jsonl(self.source, entry))
+
+        summary = aggregate.get_summary()
+        self.assertEqual(summary["total_errors"], 15)
+        self.assertEqual(summary["by_type"], {"ValueError": 15})
+        self.assertEqual(len(summary["recent"]), 10)
+        self.assertEqual(summary["recent"][-1]["message"], "14")
+
+
+class TestJsonlAggregateHooks(unittest.TestCase):
+    """Test suite for the aggregate base class"""
+
+    def test_missing_hook_fails_at_construction(self):
+        """A subclass without every hook cannot be instantiated"""
+        class NoSummary(_JsonlAggregate):
+            def _reset(self): pass
+            def _fold(self, entry): pass
+            def _state(self): return {}
+            def _load_state(self, state): pass
+
+        with self.assertRaises(TypeError):
+            NoSummary(Path("tokens.jsonl"), Path("tokens.summary.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
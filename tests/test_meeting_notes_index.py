@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for MeetingNotesIndex (backend/services/meeting_notes_index.py)
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.meeting_notes_index import MeetingNotesIndex
+
+
+class TestMeetingNotesIndex(unittest.TestCase):
+    """Test suite for the cached meeting notes folders"""
+
+    def setUp(self):
+        self.notes_dir = Path(tempfile.mkdtemp())
+        (self.notes_dir / "auth").mkdir()
+        (self.notes_dir / "auth" / "b_sso.md").write_text("SSO callback")
+        (self.notes_dir / "auth" / "a_kickoff.txt").write_text("Login kickoff")
+        (self.notes_dir / "auth" / "diagram.png").write_bytes(b"\x89PNG")
+        (self.notes_dir / "api").mkdir()
+        self.index = MeetingNotesIndex(notes_dir=self.notes_dir, watch=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.notes_dir, ignore_errors=True)
+
+    def touch(self, path: Path, text: str):
+        """Rewrite a note with a distinct mtime (coarse filesystem clocks)."""
+        stat = path.stat()
+        path.write_text(text)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_notes_and_context(self):
+        """Notes come sorted by name; both prompt layouts are served"""
+        notes = self.index.get_notes("auth")
+        self.assertEqual([n["name"] for n in notes], ["a_kickoff.txt", "b_sso.md"])
+        self.assertEqual(notes[0]["id"], "a_kickoff")
+        self.assertEqual(self.index.get_folder_context("auth"), "Login kickoff\n\nSSO callback")
+        self.assertEqual(self.index.get_folder_context("auth", with_headers=True),
+                         "**Meeting Note**\nLogin kickoff\n\n---\n\n**Meeting Note**\nSSO callback")
+        self.assertEqual(self.index.get_notes("api"), [])
+        self.assertIsNone(self.index.get_notes("missing"))
+        self.assertEqual(self.index.get_folders(), ["api", "auth"])
+
+    def test_unchanged_notes_are_not_read_again(self):
+        """Without a watcher only changed notes are re-read"""
+        self.index.get_folder_context("auth")
+        with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read:
+            context = self.index.get_folder_context("auth")
+            self.assertEqual(read.call_count, 0)
+            self.touch(self.notes_dir / "auth" / "b_sso.md", "SSO callback v2")
+            context = self.index.get_folder_context("auth")
+        self.assertEqual([call.args[0].name for call in read.call_args_list], ["b_sso.md"])
+        self.assertEqual(context, "Login kickoff\n\nSSO callback v2")
+
+    def test_watched_folders_are_served_from_memory(self):
+        """With a watcher, a clean folder costs no I/O until an event arrives"""
+        self.index.get_notes("auth")
+        self.index.get_folders()
+        self.index._observer = object()  # stands in for a running watcher
+
+        new_note = self.notes_dir / "auth" / "c_roles.md"
+        new_note.write_text("Role matrix")
+        (self.notes_dir / "deploy").mkdir()
+        with patch("backend.services.meeting_notes_index.os.scandir") as scandir:
+            self.assertEqual(len(self.index.get_notes("auth")), 2)
+            self.assertEqual(self.index.get_folders(), ["api", "auth"])
+        scandir.assert_not_called()
+
+        self.index.invalidate(new_note)
+        self.index.invalidate(self.notes_dir / "deploy")
+        self.assertEqual(len(self.index.get_notes("auth")), 3)
+        self.assertEqual(self.index.get_folders(), ["api", "auth", "deploy"])
+
+    def test_reads_straight_after_a_write_are_fresh(self):
+        """The write endpoints invalidate synchronously, before the watcher's event arrives"""
+        self.index.get_folders()
+        self.index.get_folder_context("auth")
+        self.index._observer = object()  # stands in for a running watcher whose events lag behind
+
+        auth = self.notes_dir / "auth"
+        (auth / "b_sso.md").write_text("SSO callback v2")             # update_note
+        self.index.invalidate(auth)
+        self.assertEqual(self.index.get_folder_context("auth"), "Login kickoff\n\nSSO callback v2")
+
+        (auth / "a_kickoff.txt").rename(self.notes_dir / "api" / "a_kickoff.txt")  # move_note
+        self.index.invalidate(auth)
+        self.index.invalidate(self.notes_dir / "api")
+        self.assertEqual([n["name"] for n in self.index.get_notes("api")], ["a_kickoff.txt"])
+        self.assertEqual(self.index.get_folder_context("auth"), "SSO callback v2")
+
+        (self.notes_dir / "deploy").mkdir()                            # upload into a new folder
+        (self.notes_dir / "deploy" / "k8s.md").write_text("Helm charts")
+        self.index.invalidate(self.notes_dir / "deploy")
+        self.assertEqual(self.index.get_folders(), ["api", "auth", "deploy"])
+        self.assertEqual(self.index.get_folder_context("deploy"), "Helm charts")
+
+        (self.notes_dir / "auth").rename(self.notes_dir / "identity")  # rename_folder
+        self.index.invalidate(self.notes_dir / "auth")
+        self.index.invalidate(self.notes_dir / "identity")
+        self.assertIsNone(self.index.get_notes("auth"))
+        self.assertEqual(self.index.get_folders(), ["api", "deploy", "identity"])
+
+        shutil.rmtree(self.notes_dir / "deploy")                       # delete_folder
+        self.index.invalidate(self.notes_dir / "deploy")
+        self.assertEqual(self.index.get_folder_context("deploy"), "")
+        self.assertEqual(self.index.get_folders(), ["api", "identity"])
+
+    def test_deleted_folder_is_dropped(self):
+        """A folder removed from disk stops being served"""
+        self.index.get_folder_context("auth")
+        shutil.rmtree(self.notes_dir / "auth")
+        self.assertEqual(self.index.get_folder_context("auth"), "")
+        self.assertIsNone(self.index.get_notes("auth"))
+
+
+if __name__ == "__main__":
+    unittest.main()
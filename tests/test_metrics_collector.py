@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for backend/core/metrics.py (sharded collector, sketch histograms)
+"""
+
+import sys
+import random
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core import metrics as metrics_module
+from backend.core.metrics import MetricsCollector, Histogram, DEFAULT_BUCKETS
+
+
+class TestHistogram(unittest.TestCase):
+    """Test suite for Histogram"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Sketch quantiles stay within ~1% of the exact values"""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.observe(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            self.assertAlmostEqual(histogram.quantile(q) / exact, 1.0, delta=0.025)
+
+    def test_memory_is_bounded(self):
+        """The sketch size depends on value range, not sample count"""
+        histogram = Histogram()
+        for i in range(100000):
+            histogram.observe(0.001 + (i % 1000) / 100.0)
+        self.assertLess(len(histogram.sketch), 500)
+        self.assertEqual(histogram.count, 100000)
+        self.assertEqual(len(histogram.bucket_counts), len(DEFAULT_BUCKETS) + 1)
+
+
+class TestMetricsCollector(unittest.TestCase):
+    """Test suite for MetricsCollector"""
+
+    def setUp(self):
+        self.collector = MetricsCollector()
+
+    def test_counters_across_threads(self):
+        """Per-thread shards are merged on read"""
+        def worker():
+            for _ in range(1000):
+                self.collector.increment("jobs", tags={"kind": "a"})
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.collector.get_stats()["counters"]["jobs[kind=a]"], 8000)
+
+    def test_stats_shape(self):
+        """get_stats keeps the histogram/timer summary keys"""
+        for v in (0.1, 0.2, 0.3):
+            self.collector.record("latency", v)
+        with self.collector.timer("work"):
+            pass
+
+        stats = self.collector.get_stats()
+        latency = stats["histograms"]["latency"]
+        self.assertEqual(latency["count"], 3)
+        self.assertAlmostEqual(latency["mean"], 0.2)
+        self.assertEqual(latency["min"], 0.1)
+        self.assertEqual(latency["max"], 0.3)
+        self.assertIn("total", stats["timers"]["work"])
+
+    def test_prometheus_histogram_export(self):
+        """Histograms are exported with cumulative buckets, _sum and _count"""
+        self.collector.record("http_request_duration", 0.02, tags={"method": "GET", "path": "/x"})
+        self.collector.record("http_request_duration", 3.0, tags={"method": "GET", "path": "/x"})
+        self.collector.increment("http_requests_total", tags={"method": "GET"})
+
+        output = self.collector.export_prometheus()
+        self.assertIn("# TYPE http_request_duration histogram", output)
+        self.assertIn('http_request_duration_bucket{method="GET",path="/x",le="0.025"} 1', output)
+        self.assertIn('http_request_duration_bucket{method="GET",path="/x",le="5.0"} 2', output)
+        self.assertIn('http_request_duration_bucket{method="GET",path="/x",le="+Inf"} 2', output)
+        self.assertIn('http_request_duration_count{method="GET",path="/x"} 2', output)
+        self.assertIn('http_requests_total{method="GET"} 1', output)
+
+    def test_custom_buckets(self):
+        """register_histogram overrides the bucket bounds"""
+        self.collector.register_histogram("tokens", (10, 100, 1000))
+        self.collector.record("tokens", 50)
+        output = self.collector.export_prometheus()
+        self.assertIn('tokens_bucket{le="100.0"} 1', output)
+
+    def test_reset(self):
+        """reset clears every shard"""
+        self.collector.increment("x")
+        self.collector.record("y", 1.0)
+        self.collector.reset()
+        stats = self.collector.get_stats()
+        self.assertEqual(stats["counters"], {})
+        self.assertEqual(stats["histograms"], {})
+
+    def test_shard_count_is_fixed(self):
+        """Short-lived threads reuse the fixed shards instead of adding their own"""
+        for _ in range(100):
+            thread = threading.Thread(target=self.collector.increment, args=("jobs",))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(self.collector._shards), metrics_module.METRIC_SHARDS)
+        self.assertEqual(self.collector.get_stats()["counters"]["jobs"], 100)
+
+    def test_series_are_capped(self):
+        """High-cardinality labels evict the least recently used series"""
+        with patch.object(metrics_module.settings, "metrics_max_series", 100):
+            self.collector.increment("requests", tags={"path": "/hot"})
+            for i in range(500):
+                self.collector.increment("requests", tags={"path": f"/user/{i}"})
+                self.collector.record("latency", 0.1, tags={"path": f"/user/{i}"})
+                self.collector.increment("requests", tags={"path": "/hot"})
+
+        self.assertLessEqual(len(self.collector._series), 100)
+        counters = self.collector.get_stats()["counters"]
+        self.assertEqual(counters["requests[path=/hot]"], 501)
+        self.assertIn("requests[path=/user/499]", counters)
+        self.assertNotIn("requests[path=/user/0]", counters)
+        self.assertLessEqual(len(counters) + len(self.collector.get_stats()["histograms"]), 100)
+
+    def test_idle_series_are_evicted_first(self):
+        """Series not recorded within the TTL go before recently used ones"""
+        with patch.object(metrics_module.settings, "metrics_max_series", 10), \
+                patch.object(metrics_module.settings, "metrics_series_ttl_seconds", 60):
+            for i in range(10):
+                self.collector.increment("jobs", tags={"id": str(i)})
+            for key in ("jobs[id=0]", "jobs[id=1]"):
+                self.collector._series_seen[key] -= 120
+            self.collector.increment("jobs", tags={"id": "10"})
+
+        counters = self.collector.get_stats()["counters"]
+        self.assertEqual(len(counters), 9)
+        self.assertNotIn("jobs[id=0]", counters)
+        self.assertNotIn("jobs[id=1]", counters)
+
+    def test_series_registry_across_threads(self):
+        """Concurrent first records of new series all get registered"""
+        def worker(n):
+            for i in range(200):
+                self.collector.increment("calls", tags={"worker": str(n), "i": str(i)})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.collector._series), 1600)
+        self.assertEqual(self.collector.export_prometheus().count("calls{"), 1600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for concurrent, stale-while-revalidate model list refresh
+(ModelService.list_models in backend/services/model_service.py)
+"""
+
+import sys
+import time
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import model_service as model_service_module
+from backend.services.model_service import ModelListCache, ModelService
+
+
+class FakeProviders:
+    """Records refresh calls; each provider sleeps for its configured delay"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = {name: 0 for name in delays}
+
+    def refresher(self, name):
+        async def refresh():
+            self.calls[name] += 1
+            await asyncio.sleep(self.delays[name])
+        return refresh
+
+
+class TestModelListRefresh(unittest.IsolatedAsyncioTestCase):
+    """Test suite for ModelService.list_models"""
+
+    async def asyncSetUp(self):
+        self.cache = ModelListCache(ttl_seconds=60)
+        self.providers = FakeProviders({"ollama": 0.05, "huggingface": 0.05, "cloud": 0.05})
+        self.service = ModelService.__new__(ModelService)
+        self.service.models = {}
+        self.service._load_finetuned_models_from_registry = lambda: None
+        self.service._provider_refreshers = lambda: {
+            name: self.providers.refresher(name) for name in self.providers.delays
+        }
+        self.patches = [
+            patch.object(model_service_module, "_model_list_cache", self.cache),
+            patch.object(model_service_module.settings, "model_refresh_timeouts",
+                         {"ollama": 0.5, "huggingface": 0.5, "cloud": 0.5}),
+        ]
+        for p in self.patches:
+            p.start()
+
+    async def asyncTearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    async def test_providers_refresh_concurrently(self):
+        """Cold refresh takes about as long as the slowest provider, not the sum"""
+        start = time.perf_counter()
+        await self.service.list_models()
+        self.assertLess(time.perf_counter() - start, 0.13)
+        self.assertEqual(self.providers.calls, {"ollama": 1, "huggingface": 1, "cloud": 1})
+
+    async def test_slow_provider_times_out(self):
+        """A hung provider is cut off at its timeout and recorded as an error"""
+        self.providers.delays["huggingface"] = 10
+        start = time.perf_counter()
+        await self.service.list_models()
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertIn("timed out", self.cache.last_error["huggingface"])
+        self.assertIsNone(self.cache.last_error["ollama"])
+
+    async def test_stale_list_served_while_revalidating(self):
+        """An expired provider returns immediately and refreshes in the background"""
+        await self.service.list_models()
+        self.cache._refreshed_at["ollama"] -= model_service_module.timedelta(seconds=120)
+        self.providers.delays["ollama"] = 0.2
+
+        start = time.perf_counter()
+        await self.service.list_models()
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+        await asyncio.sleep(0.3)
+        self.assertEqual(self.providers.calls["ollama"], 2)
+        self.assertTrue(self.cache.is_valid("ollama"))
+
+    async def test_concurrent_callers_share_one_refresh(self):
+        """Simultaneous cold requests trigger a single refresh per provider"""
+        await asyncio.gather(*(self.service.list_models() for _ in range(5)))
+        self.assertEqual(self.providers.calls, {"ollama": 1, "huggingface": 1, "cloud": 1})
+
+    async def test_invalidate_forces_wait_for_one_provider(self):
+        """Invalidating a provider refreshes only that provider on the next call"""
+        await self.service.list_models()
+        self.service.invalidate_model_cache("ollama")
+        await self.service.list_models()
+        self.assertEqual(self.providers.calls, {"ollama": 2, "huggingface": 1, "cloud": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
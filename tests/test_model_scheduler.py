@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for ai/model_scheduler.py (model-affinity request scheduling)
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai.model_scheduler import ModelScheduler, RequestPriority
+from ai.ollama_client import OllamaClient
+
+
+class TestModelScheduler(unittest.IsolatedAsyncioTestCase):
+    """Test suite for ModelScheduler"""
+
+    async def run_requests(self, scheduler, requests, hold=0.01):
+        """Submit (model, priority) requests in order; return the order they ran in."""
+        order = []
+
+        async def request(model, priority):
+            async with scheduler.slot(model, priority):
+                order.append(model)
+                await asyncio.sleep(hold)
+
+        tasks = []
+        for model, priority in requests:
+            tasks.append(asyncio.create_task(request(model, priority)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+
+    async def test_batches_resident_model_before_swapping(self):
+        """Interleaved requests are regrouped by model to avoid swaps"""
+        scheduler = ModelScheduler(max_concurrent=1, max_resident=1, max_batch=10)
+        requests = [(model, RequestPriority.NORMAL) for model in ["a", "b", "a", "b", "a", "b"]]
+        order = await self.run_requests(scheduler, requests)
+
+        self.assertEqual(order, ["a", "a", "a", "b", "b", "b"])
+        self.assertEqual(scheduler.swaps, 1)
+
+    async def test_interactive_requests_go_first(self):
+        """A chat request jumps ahead of queued background work"""
+        scheduler = ModelScheduler(max_concurrent=1, max_resident=2)
+        requests = [("judge", RequestPriority.BACKGROUND)] * 3 + [("chat", RequestPriority.INTERACTIVE)]
+        order = await self.run_requests(scheduler, requests)
+
+        # The first judge request was already running; chat is next
+        self.assertEqual(order[:2], ["judge", "chat"])
+
+    async def test_max_batch_prevents_starvation(self):
+        """A waiting model gets its turn after max_batch resident grants"""
+        scheduler = ModelScheduler(max_concurrent=1, max_resident=1, max_batch=2)
+        requests = [("a", RequestPriority.NORMAL)] * 2 + [("b", RequestPriority.NORMAL)] + [("a", RequestPriority.NORMAL)] * 4
+        order = await self.run_requests(scheduler, requests)
+
+        self.assertLess(order.index("b"), 4)
+
+    async def test_swap_waits_for_in_flight_requests(self):
+        """A model is not evicted while requests on it are still running"""
+        scheduler = ModelScheduler(max_concurrent=2, max_resident=1)
+        release = asyncio.Event()
+        running = []
+
+        async def long_request():
+            async with scheduler.slot("a"):
+                running.append("a")
+                await release.wait()
+
+        async def other_request():
+            async with scheduler.slot("b"):
+                running.append("b")
+
+        first = asyncio.create_task(long_request())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(other_request())
+        await asyncio.sleep(0.01)
+        self.assertEqual(running, ["a"])
+        self.assertEqual(scheduler.get_stats()["queue_depth"], {"b": 1})
+
+        release.set()
+        await asyncio.gather(first, second)
+        self.assertEqual(running, ["a", "b"])
+
+    async def test_cancelled_waiter_is_removed(self):
+        """Cancelling a queued request frees its place without leaking a slot"""
+        scheduler = ModelScheduler(max_concurrent=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot("a"):
+                await release.wait()
+
+        async def waiter():
+            async with scheduler.slot("a"):
+                pass
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await holding
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["queue_depth"], {})
+        self.assertEqual(stats["in_flight"], {})
+
+    async def test_model_in_flight_is_not_evicted(self):
+        """evicting() refuses a busy model and holds back grants while unloading an idle one"""
+        scheduler = ModelScheduler(max_concurrent=2, max_resident=2)
+        async with scheduler.slot("a"):
+            async with scheduler.evicting("a") as evictable:
+                self.assertFalse(evictable)
+            self.assertIn("a", scheduler.resident)
+
+        granted = asyncio.Event()
+
+        async def request():
+            async with scheduler.slot("a"):
+                granted.set()
+
+        async with scheduler.evicting("a") as evictable:
+            self.assertTrue(evictable)
+            self.assertNotIn("a", scheduler.resident)
+            task = asyncio.create_task(request())
+            await asyncio.sleep(0.01)
+            self.assertFalse(granted.is_set())
+        await task
+        self.assertTrue(granted.is_set())
+
+    async def test_client_loads_and_unloads_through_the_scheduler(self):
+        """ensure_model_available takes a slot; unload_model skips a model with a request in flight"""
+        scheduler = ModelScheduler(max_concurrent=2, max_resident=1)
+        client = OllamaClient(scheduler=scheduler)
+        loads = []
+
+        async def load_model(model_name, show_progress=True):
+            loads.append(dict(scheduler.in_flight))
+            return True
+
+        with patch.object(client, "load_model", side_effect=load_model), \
+             patch.object(client, "_unload", AsyncMock()) as unload:
+            self.assertTrue(await client.ensure_model_available("a", show_progress=False))
+            self.assertEqual(loads, [{"a": 1}])
+            self.assertEqual(list(scheduler.resident), ["a"])
+
+            async with scheduler.slot("a"):
+                await client.unload_model("a", show_progress=False)
+            unload.assert_not_called()
+            await client.unload_model("a", show_progress=False)
+            unload.assert_awaited_once()
+        self.assertEqual(list(scheduler.resident), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
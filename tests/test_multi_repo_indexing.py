@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for concurrent repository indexing in MultiRepoService (backend/services/multi_repo.py)
+"""
+
+import os
+import sys
+import types
+import asyncio
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import multi_repo as multi_repo_module
+from backend.services.multi_repo import MultiRepoService
+
+
+class FakeIngester:
+    """Stands in for RAGIngester; records how many repos are indexed at once."""
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+
+    async def index_directory(self, directory, recursive=True):
+        FakeIngester.in_flight += 1
+        FakeIngester.max_in_flight = max(FakeIngester.max_in_flight, FakeIngester.in_flight)
+        await asyncio.sleep(0.05)
+        FakeIngester.in_flight -= 1
+        return {"files_indexed": 1, "chunks_created": 2}
+
+
+class TestMultiRepoIndexing(unittest.IsolatedAsyncioTestCase):
+    """Test suite for parallel indexing, fingerprints and the memoized context"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)  # index_repository creates rag/index/<repo_id> relative to cwd
+        FakeIngester.in_flight = FakeIngester.max_in_flight = 0
+        self.patches = [
+            patch.object(multi_repo_module.settings, "multi_repo_index_workers", 2),
+            patch.dict(sys.modules, {
+                "backend.services.rag_ingester": types.SimpleNamespace(RAGIngester=FakeIngester),
+            }),
+        ]
+        for p in self.patches:
+            p.start()
+        self.service = MultiRepoService(config_path=self.directory / "data" / "multi_repo_config.json")
+        for name in ("web", "api", "worker"):
+            repo = self.directory / name
+            (repo / "src").mkdir(parents=True)
+            (repo / "src" / "main.py").write_text("print('hi')\n")
+            (repo / "node_modules" / "dep").mkdir(parents=True)
+            (repo / "node_modules" / "dep" / "index.js").write_text("module.exports = {}\n")
+            self.service.register_repository(str(repo), repo_type="backend")
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.service._executor.shutdown(wait=True)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    async def test_repositories_are_indexed_concurrently(self):
+        """Up to multi_repo_index_workers repos run at once, each reporting its own progress"""
+        events = {}
+
+        async def on_progress(repo_id, progress, message):
+            events.setdefault(repo_id, []).append(progress)
+
+        results = await self.service.index_repositories(progress_callback=on_progress)
+
+        self.assertEqual(FakeIngester.max_in_flight, 2)
+        self.assertEqual(set(results), {"web", "api", "worker"})
+        self.assertTrue(all(result["indexed"] for result in results.values()))
+        for progress in events.values():
+            self.assertEqual(progress, sorted(progress))
+            self.assertEqual(progress[-1], 100.0)
+
+    async def test_unknown_repository_is_rejected(self):
+        """Nothing is indexed when a requested repo is not registered"""
+        with self.assertRaises(ValueError):
+            await self.service.index_repositories(["web", "missing"])
+        self.assertEqual(FakeIngester.max_in_flight, 0)
+
+    async def test_fingerprint_follows_source_files(self):
+        """Dependency folders are skipped; editing a source file changes the fingerprint"""
+        config = self.service.repositories["web"]
+        self.assertEqual(config.file_count, 1)
+        before = config.fingerprint
+
+        main = self.directory / "web" / "src" / "main.py"
+        main.write_text("print('hello')\n")
+        await self.service.index_repository("web", progress_callback=self.ignore)
+        self.assertNotEqual(config.fingerprint, before)
+
+        reloaded = MultiRepoService(config_path=self.service.config_path)
+        self.assertEqual(reloaded.repositories["web"].fingerprint, config.fingerprint)
+        reloaded._executor.shutdown(wait=True)
+
+    async def test_combined_context_is_memoized_until_a_fingerprint_changes(self):
+        """Repeated context calls reuse the last build"""
+        with patch.object(MultiRepoService, "_build_combined_context",
+                          wraps=self.service._build_combined_context) as build:
+            first = self.service.build_combined_context()
+            self.assertIs(self.service.build_combined_context(), first)
+            self.assertEqual(build.call_count, 1)
+
+            await self.service.index_repository("api", progress_callback=self.ignore)
+            self.service.build_combined_context()  # indexed flag changed
+            self.assertEqual(build.call_count, 2)
+            await self.service.index_repository("api", progress_callback=self.ignore)
+            self.service.build_combined_context()  # nothing changed on disk
+            self.assertEqual(build.call_count, 2)
+
+            (self.directory / "api" / "src" / "routes.py").write_text("routes = []\n")
+            await self.service.index_repository("api", progress_callback=self.ignore)
+            self.service.build_combined_context()
+            self.assertEqual(build.call_count, 3)
+
+    @staticmethod
+    async def ignore(repo_id, progress, message):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
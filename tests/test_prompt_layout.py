@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for prefix-stable prompt assembly (backend/core/prompt_layout.py)
+and Ollama prompt-eval reporting (ai/ollama_client.py)
+"""
+
+import sys
+import json
+import asyncio
+import unittest
+from pathlib import Path
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core import prompt_layout
+from backend.core.prompt_layout import PromptLayout, Stability, is_prefix_stable
+from ai.ollama_client import OllamaClient, ModelInfo, ModelStatus
+
+
+class TestPromptLayout(unittest.TestCase):
+    """Test suite for PromptLayout"""
+
+    def test_segments_ordered_by_stability(self):
+        """Segments are emitted most stable first, insertion order within a tier"""
+        layout = PromptLayout()
+        layout.add(Stability.REQUEST, "question")
+        layout.add(Stability.SESSION, "history")
+        layout.add(Stability.PROJECT, "overview")
+        layout.add(Stability.INSTRUCTIONS, "rules-1")
+        layout.add(Stability.INSTRUCTIONS, "rules-2")
+        self.assertEqual(layout.build(), "overview\nrules-1\nrules-2\nhistory\nquestion")
+
+    def test_empty_segments_dropped(self):
+        layout = PromptLayout()
+        layout.add(Stability.PROJECT, "")
+        layout.add(Stability.SESSION, "   ")
+        layout.add(Stability.REQUEST, "question")
+        self.assertEqual(layout.build(), "question")
+
+    def test_requests_share_prefix(self):
+        """Two requests that differ only in request text share the whole stable prefix"""
+        def build(notes):
+            layout = PromptLayout()
+            layout.add(Stability.REQUEST, notes)
+            layout.add(Stability.PROJECT, "project summary " * 50)
+            layout.add(Stability.INSTRUCTIONS, "instructions " * 20)
+            return layout
+
+        first, second = build("notes A"), build("notes B")
+        prefix = first.prefix_length()
+        self.assertGreater(prefix, 0)
+        self.assertEqual(first.build()[:prefix], second.build()[:prefix])
+        self.assertNotEqual(first.build(), second.build())
+
+    def test_layout_setting(self):
+        with patch.object(prompt_layout.settings, "prompt_layout", "legacy"):
+            self.assertFalse(is_prefix_stable())
+        with patch.object(prompt_layout.settings, "prompt_layout", "prefix_stable"):
+            self.assertTrue(is_prefix_stable())
+
+
+class TestOllamaEvalTimings(unittest.IsolatedAsyncioTestCase):
+    """Test suite for keep_alive and prompt-eval reporting in OllamaClient"""
+
+    async def test_keep_alive_sent_and_timings_reported(self):
+        client = OllamaClient(keep_alive="45m")
+        client.scheduler = None
+        client.models["llama3"] = ModelInfo(name="llama3", status=ModelStatus.READY)
+
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "response": "hello world",
+            "prompt_eval_count": 12,
+            "prompt_eval_duration": 250_000_000,
+            "eval_count": 3,
+            "eval_duration": 1_500_000_000,
+        }
+        http = MagicMock()
+        http.post = AsyncMock(return_value=response)
+
+        with patch.object(client, "_get_http_client", return_value=http), \
+             patch("ai.ollama_client.get_response_cache", return_value=None):
+            result = await client.generate("llama3", "prompt", temperature=0.7)
+
+        payload = http.post.call_args.kwargs["json"]
+        self.assertEqual(payload["keep_alive"], "45m")
+        self.assertEqual(result.prompt_eval_count, 12)
+        self.assertAlmostEqual(result.prompt_eval_duration, 0.25)
+        self.assertAlmostEqual(result.eval_duration, 1.5)
+        self.assertEqual(result.tokens_generated, 3)
+        self.assertEqual(client.get_vram_usage()["eval_timings"]["llama3"]["prompt_eval_count"], 12)
+
+    async def test_concurrent_streams_get_their_own_timings(self):
+        """Two streams on the same model each report the timings of their own request"""
+        client = OllamaClient()
+        client.scheduler = None
+        client.models["llama3"] = ModelInfo(name="llama3", status=ModelStatus.READY)
+        first_started, second_done = asyncio.Event(), asyncio.Event()
+
+        @asynccontextmanager
+        async def stream(method, url, json=None):
+            prompt_eval_count = len(json["prompt"])
+
+            async def lines():
+                yield _json_line({"response": "hi"})
+                if json["prompt"] == "first":
+                    # Finish only after the second request has recorded its timings
+                    first_started.set()
+                    await second_done.wait()
+                yield _json_line({"done": True, "prompt_eval_count": prompt_eval_count,
+                                  "prompt_eval_duration": 1_000_000_000, "eval_duration": 0})
+
+            yield MagicMock(status_code=200, aiter_lines=lines)
+
+        async def consume(prompt, eval_stats):
+            async for _ in client.generate_stream("llama3", prompt, eval_stats=eval_stats):
+                pass
+
+        async def second(eval_stats):
+            await first_started.wait()
+            await consume("second prompt", eval_stats)
+            second_done.set()
+
+        first_stats, second_stats = {}, {}
+        with patch.object(client, "_get_http_client", return_value=MagicMock(stream=stream)), \
+             patch.object(client, "load_model", AsyncMock(return_value=True)):  # model is IN_USE by the first stream
+            await asyncio.gather(consume("first", first_stats), second(second_stats))
+
+        self.assertEqual(first_stats["prompt_eval_count"], len("first"))
+        self.assertEqual(second_stats["prompt_eval_count"], len("second prompt"))
+
+
+def _json_line(data):
+    return json.dumps(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
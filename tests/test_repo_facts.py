@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the repository facts index and cross-repo linking (backend/services/repo_facts.py)
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import repo_facts as repo_facts_module
+from backend.services.multi_repo import MultiRepoService
+from backend.services.repo_facts import extract_calls, extract_routes, route_key
+
+USER_SERVICE_TS = """
+export class UserService {
+  list() { return this.http.get<User[]>('/api/users'); }
+  one(id: string) { return fetch(`/api/users/${id}?expand=roles`); }
+  order() { return axios.post("http://localhost:8000/api/orders/", {}); }
+  remove() { return axios.delete('/api/orders'); }
+  health() { return fetch('/health'); }
+}
+"""
+
+USERS_PY = """
+from fastapi import APIRouter
+router = APIRouter(prefix="/api/users", tags=["users"])
+
+@router.get("")
+async def list_users(): ...
+
+@router.get("/{user_id}")
+async def get_user(user_id: str): ...
+"""
+
+ORDERS_PY = """
+@app.post("/api/orders")
+async def create_order(): ...
+"""
+
+
+def write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+class TestRepoFacts(unittest.TestCase):
+    """Test suite for extracted calls, routes and the hash join"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.web = self.directory / "web"
+        self.api = self.directory / "api"
+        write(self.web / "src" / "user.service.ts", USER_SERVICE_TS)
+        write(self.web / "node_modules" / "lib" / "index.ts", "fetch('/api/users')")
+        write(self.api / "app" / "users.py", USERS_PY)
+        write(self.api / "app" / "orders.py", ORDERS_PY)
+        self.service = MultiRepoService(config_path=self.directory / "data" / "multi_repo_config.json")
+        self.service.register_repository(str(self.web), repo_type="frontend")
+        self.service.register_repository(str(self.api), repo_type="backend")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_route_key(self):
+        """Hosts, queries and parameter syntaxes normalize to the same key"""
+        self.assertEqual(route_key("https://example.com/API/Users/${id}?x=1"), "/api/users/{}")
+        self.assertEqual(route_key("/api/users/{user_id}/"), "/api/users/{}")
+        self.assertEqual(route_key("/api/users/:id"), "/api/users/{}")
+
+    def test_extractors(self):
+        """Calls keep their method; routes get their router and controller prefixes"""
+        calls = {(c["method"], c["key"]) for c in extract_calls(USER_SERVICE_TS)}
+        self.assertEqual(calls, {("GET", "/api/users"), (None, "/api/users/{}"),
+                                 ("POST", "/api/orders"), ("DELETE", "/api/orders")})
+        self.assertEqual([(r["method"], r["path"]) for r in extract_routes(USERS_PY, ".py")],
+                         [("GET", "/api/users"), ("GET", "/api/users/{user_id}")])
+        controller = '[Route("api/[controller]")]\npublic class OrdersController {\n[HttpGet("{id}")]\n}'
+        self.assertEqual([r["path"] for r in extract_routes(controller, ".cs")], ["/api/orders/{id}"])
+
+    def test_calls_are_joined_against_backend_routes(self):
+        """Only calls that hit an exposed route (and method) become links"""
+        links = self.service.detect_cross_repo_links()
+        found = sorted((l.target_component, l.metadata["method"], l.metadata["route_file"]) for l in links)
+        self.assertEqual(found, [
+            ("/api/users", "GET", "app/users.py"),
+            ("/api/users/${id}?expand=roles", "GET", "app/users.py"),
+            ("http://localhost:8000/api/orders/", "POST", "app/orders.py"),
+        ])
+        self.assertTrue(all(l.source_component == "src/user.service.ts" for l in links))
+
+    def test_refresh_parses_only_changed_files(self):
+        """Unchanged files are skipped by stat, touched-but-identical files by hash"""
+        self.service.detect_cross_repo_links()
+        self.assertEqual(self.service.facts.refresh("api", self.api)["parsed"], 0)
+
+        orders = self.api / "app" / "orders.py"
+        stat = orders.stat()
+        os.utime(orders, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        with patch.object(repo_facts_module, "extract_routes", wraps=extract_routes) as extract:
+            self.assertEqual(self.service.facts.refresh("api", self.api)["parsed"], 0)
+            write(orders, ORDERS_PY.replace("/api/orders", "/api/orders/{order_id}"))
+            self.assertEqual(self.service.facts.refresh("api", self.api)["parsed"], 1)
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(len(self.service.detect_cross_repo_links()), 2)
+
+    def test_facts_persist_and_are_removed_with_the_repo(self):
+        """Facts are reloaded from disk and dropped on unregister"""
+        self.service.detect_cross_repo_links()
+        reloaded = MultiRepoService(config_path=self.service.config_path)
+        self.assertTrue(reloaded.facts.has("web"))
+        self.assertEqual(len(reloaded.facts.calls("web")), 4)
+
+        reloaded.unregister_repository("web")
+        self.assertFalse((self.directory / "data" / "multi_repo_facts" / "web.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
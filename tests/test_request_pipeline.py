@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for RequestPipelineMiddleware (backend/core/middleware.py)
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from backend.core.logger import request_id_var
+from backend.core.middleware import IPBanManager, RequestPipelineMiddleware
+
+
+async def echo_context(request):
+    return JSONResponse({
+        "state_request_id": request.state.request_id,
+        "context_request_id": request_id_var.get(),
+    })
+
+
+async def stream(request):
+    async def body():
+        for i in range(3):
+            yield f"data: {i}\n\n"
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+
+class TestRequestPipelineMiddleware(unittest.TestCase):
+    """Test suite for RequestPipelineMiddleware"""
+
+    def setUp(self):
+        self.ban_manager = IPBanManager(ban_threshold=2)
+        app = Starlette(
+            routes=[Route("/api/context", echo_context), Route("/api/stream", stream)],
+            middleware=[Middleware(
+                RequestPipelineMiddleware,
+                allowed_hosts=["testserver"],
+                ban_manager=self.ban_manager,
+            )],
+        )
+        self.client = TestClient(app)
+
+    def test_request_id_and_timing_headers(self):
+        """Request ID is exposed via headers, request.state and the context var"""
+        response = self.client.get("/api/context")
+        self.assertEqual(response.status_code, 200)
+        request_id = response.headers["X-Request-ID"]
+        self.assertEqual(response.json()["state_request_id"], request_id)
+        self.assertEqual(response.json()["context_request_id"], request_id)
+        self.assertGreaterEqual(float(response.headers["X-Process-Time"]), 0)
+        # Context is cleared after the request
+        self.assertIsNone(request_id_var.get())
+
+    def test_streaming_passthrough(self):
+        """Streaming bodies are forwarded unchanged"""
+        response = self.client.get("/api/stream")
+        self.assertEqual(response.text, "data: 0\n\ndata: 1\n\ndata: 2\n\n")
+        self.assertIn("X-Request-ID", response.headers)
+
+    def test_untrusted_host_rejected(self):
+        """Hosts outside the allow list get a 403"""
+        response = self.client.get("/api/context", headers={"host": "evil.example.com"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["type"], "invalid_host")
+
+    def test_ngrok_host_allowed(self):
+        """ngrok tunnel hosts are always trusted"""
+        response = self.client.get("/api/context", headers={"host": "abc.ngrok-free.app"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_repeated_404s_ban_ip(self):
+        """404s are counted and lead to an IP ban"""
+        self.client.get("/missing")
+        self.client.get("/missing")
+        response = self.client.get("/api/context")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["type"], "ip_banned")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for ai/response_cache.py (persistent temperature-0 response cache)
+"""
+
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai.ollama_client import OllamaClient, GenerationResponse
+from ai.response_cache import LLMResponseCache
+
+GREEDY = {"temperature": 0.0}
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test suite for LLMResponseCache"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "responses.db"
+        self.cache = LLMResponseCache(self.path, max_mb=1)
+
+    def tearDown(self):
+        self.cache._conn.close()
+        self.tmpdir.cleanup()
+
+    def test_miss_then_hit(self):
+        """A stored response is returned for the identical request"""
+        key, cached = self.cache.lookup("ollama", "sha256:abc", "prompt", "system", GREEDY)
+        self.assertIsNone(cached)
+        self.cache.store(key, "ollama", "llama3", "answer")
+
+        _, cached = self.cache.lookup("ollama", "sha256:abc", "prompt", "system", GREEDY)
+        self.assertEqual(cached, "answer")
+        self.assertEqual(self.cache.get_stats()["hit_rate"], 0.5)
+
+    def test_key_covers_every_input(self):
+        """Changing digest, prompt, system or params misses the cache"""
+        key, _ = self.cache.lookup("ollama", "sha256:abc", "prompt", "system", GREEDY)
+        self.cache.store(key, "ollama", "llama3", "answer")
+
+        variants = [
+            ("gemini", "sha256:abc", "prompt", "system", GREEDY),
+            ("ollama", "sha256:new", "prompt", "system", GREEDY),
+            ("ollama", "sha256:abc", "prompt!", "system", GREEDY),
+            ("ollama", "sha256:abc", "prompt", "other", GREEDY),
+            ("ollama", "sha256:abc", "prompt", "system", {"temperature": 0.0, "num_ctx": 4096}),
+        ]
+        for variant in variants:
+            self.assertIsNone(self.cache.lookup(*variant)[1], variant)
+
+    def test_non_zero_temperature_bypasses(self):
+        """Sampling requests (or unknown temperature/digest) never touch the cache"""
+        for params, digest in (({"temperature": 0.7}, "d"), ({}, "d"), (GREEDY, None)):
+            key, cached = self.cache.lookup("ollama", digest, "prompt", None, params)
+            self.assertIsNone(key)
+            self.assertIsNone(cached)
+        self.assertEqual(self.cache.get_stats()["bypasses"], 3)
+
+    def test_lru_eviction_by_size(self):
+        """Least recently used responses are evicted above the size bound"""
+        big = "x" * (400 * 1024)
+        keys = []
+        for i in range(3):
+            key, _ = self.cache.lookup("ollama", "d", f"prompt {i}", None, GREEDY)
+            self.cache.store(key, "ollama", "llama3", big)
+            keys.append(key)
+            if i == 1:
+                # Touch the first entry so the second becomes least recently used
+                self.cache.lookup("ollama", "d", "prompt 0", None, GREEDY)
+
+        self.assertIsNotNone(self.cache.lookup("ollama", "d", "prompt 0", None, GREEDY)[1])
+        self.assertIsNone(self.cache.lookup("ollama", "d", "prompt 1", None, GREEDY)[1])
+        self.assertIsNotNone(self.cache.lookup("ollama", "d", "prompt 2", None, GREEDY)[1])
+        self.assertLessEqual(self.cache.total_bytes, self.cache.max_bytes)
+
+    def test_persistent_across_instances(self):
+        """Responses survive a restart"""
+        key, _ = self.cache.lookup("ollama", "d", "prompt", None, GREEDY)
+        self.cache.store(key, "ollama", "llama3", "answer")
+
+        reopened = LLMResponseCache(self.path, max_mb=1)
+        try:
+            self.assertEqual(reopened.lookup("ollama", "d", "prompt", None, GREEDY)[1], "answer")
+            self.assertEqual(reopened.entries, 1)
+        finally:
+            reopened._conn.close()
+
+
+class TestOllamaClientCaching(unittest.IsolatedAsyncioTestCase):
+    """OllamaClient.generate serves temperature-0 repeats from the cache"""
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = LLMResponseCache(Path(self.tmpdir.name) / "responses.db")
+        self.client = OllamaClient()
+        self.client.scheduler = None
+        self.client.get_model_digest = AsyncMock(return_value="sha256:abc")
+        self.client._generate = AsyncMock(return_value=GenerationResponse(
+            content="erDiagram", model_used="llama3", generation_time=1.0
+        ))
+
+    async def asyncTearDown(self):
+        self.cache._conn.close()
+        self.tmpdir.cleanup()
+
+    async def test_repeat_greedy_request_hits_cache(self):
+        with patch("ai.ollama_client.get_response_cache", return_value=self.cache):
+            first = await self.client.generate("llama3", "repair this", temperature=0.0)
+            second = await self.client.generate("llama3", "repair this", temperature=0.0)
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(self.client._generate.await_count, 1)
+
+    async def test_sampling_request_is_not_cached(self):
+        with patch("ai.ollama_client.get_response_cache", return_value=self.cache):
+            await self.client.generate("llama3", "write a poem", temperature=0.7)
+            await self.client.generate("llama3", "write a poem", temperature=0.7)
+
+        self.assertEqual(self.client._generate.await_count, 2)
+        self.client.get_model_digest.assert_not_awaited()
+
+    async def test_sqlite_io_runs_off_the_event_loop(self):
+        """lookup and store run in a worker thread, not on the loop"""
+        loop_thread = threading.get_ident()
+        seen = []
+        lookup, store = self.cache.lookup, self.cache.store
+
+        def spy(method):
+            def wrapper(*args):
+                seen.append(threading.get_ident())
+                return method(*args)
+            return wrapper
+
+        self.cache.lookup, self.cache.store = spy(lookup), spy(store)
+        with patch("ai.ollama_client.get_response_cache", return_value=self.cache):
+            await self.client.generate("llama3", "repair this", temperature=0.0)
+
+        self.assertEqual(len(seen), 2)
+        self.assertNotIn(loop_thread, seen)
+
+
+class TestModelDigest(unittest.IsolatedAsyncioTestCase):
+    """OllamaClient.get_model_digest caches the model listing for its TTL"""
+
+    async def test_failed_listing_is_cached_for_the_ttl(self):
+        client = OllamaClient()
+        client.list_models = AsyncMock(return_value=[])
+
+        self.assertIsNone(await client.get_model_digest("llama3"))
+        self.assertIsNone(await client.get_model_digest("llama3"))
+
+        self.assertEqual(client.list_models.await_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for parallel DAG generation in SprintPackageGenerator (backend/services/sprint_package.py)
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.models.dto import ArtifactType
+from backend.services.sprint_package import SprintPackageGenerator, PackagePreset
+
+
+class FakeGenerationService:
+    """Records start/finish order and peak concurrency of generate_with_pipeline"""
+
+    def __init__(self, delay: float = 0.02, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.running = 0
+        self.peak = 0
+        self.log = []
+        self.notes = {}
+
+    async def generate_with_pipeline(self, artifact_type, meeting_notes, options=None, context_session=None):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.log.append(("start", artifact_type.value))
+        self.notes[artifact_type.value] = meeting_notes
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        self.log.append(("end", artifact_type.value))
+        if artifact_type.value in self.fail:
+            return {}
+        return {"content": f"<{artifact_type.value}>", "model_used": "fake"}
+
+    def index(self, event, artifact_type):
+        return self.log.index((event, artifact_type))
+
+
+async def run_package(generator, **kwargs):
+    events = [event async for event in generator.generate_package("Users place orders", **kwargs)]
+    return events[-1]["data"], events
+
+
+class TestSprintPackageDag(unittest.IsolatedAsyncioTestCase):
+    """Test suite for dependency-aware package generation"""
+
+    def make_generator(self, **kwargs):
+        generator = SprintPackageGenerator()
+        generator._generation_service = FakeGenerationService(**kwargs)
+        generator._artifact_linker = MagicMock()
+        return generator
+
+    async def test_independent_artifacts_run_in_parallel(self):
+        """ERD and architecture have no dependency on each other and overlap"""
+        generator = self.make_generator()
+        result, _ = await run_package(generator, preset=PackagePreset.QUICK, max_concurrency=3)
+        service = generator.generation_service
+
+        self.assertEqual(service.peak, 2)
+        self.assertLess(service.index("start", "mermaid_architecture"), service.index("end", "mermaid_erd"))
+        self.assertEqual([a["artifact_type"] for a in result["artifacts"]],
+                         ["mermaid_erd", "mermaid_architecture", "api_docs"])
+
+    async def test_dependents_wait_for_their_inputs(self):
+        """A dependent starts after its dependencies and receives them as context"""
+        generator = self.make_generator()
+        await run_package(generator, preset=PackagePreset.FULL, max_concurrency=4)
+        service = generator.generation_service
+
+        self.assertGreater(service.index("start", "mermaid_sequence"), service.index("end", "mermaid_erd"))
+        self.assertGreater(service.index("start", "mermaid_sequence"), service.index("end", "mermaid_architecture"))
+        self.assertGreater(service.index("start", "code_prototype"), service.index("end", "api_docs"))
+        self.assertIn("<mermaid_erd>", service.notes["api_docs"])
+        self.assertNotIn("<mermaid_architecture>", service.notes["api_docs"])
+        self.assertEqual(service.notes["mermaid_erd"], "Users place orders")
+
+    async def test_concurrency_is_bounded(self):
+        """No more than max_concurrency artifacts generate at once"""
+        generator = self.make_generator()
+        result, _ = await run_package(generator, preset=PackagePreset.DOCUMENTATION, max_concurrency=2)
+        self.assertEqual(generator.generation_service.peak, 2)
+        self.assertEqual(result["success_rate"], 1.0)
+
+    async def test_failed_dependency_does_not_block_dependents(self):
+        """Dependents of a failed artifact still run, without its context"""
+        generator = self.make_generator(fail={"mermaid_erd"})
+        result, _ = await run_package(generator, preset=PackagePreset.BACKEND, max_concurrency=2)
+
+        self.assertEqual(result["failed_artifacts"], ["mermaid_erd"])
+        self.assertEqual(len(result["artifacts"]), 3)
+        self.assertEqual(generator.generation_service.notes["api_docs"], "Users place orders")
+
+    def test_dependency_graph_is_limited_to_package(self):
+        """Dependencies outside the package are ignored"""
+        generator = SprintPackageGenerator()
+        graph = generator._dependency_graph([ArtifactType.API_DOCS, ArtifactType.CODE_PROTOTYPE])
+        self.assertEqual(graph[ArtifactType.API_DOCS], [])
+        self.assertEqual(graph[ArtifactType.CODE_PROTOTYPE], [ArtifactType.API_DOCS])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for StreamCoalescer (backend/core/streaming.py)
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core import streaming
+from backend.core.streaming import StreamCoalescer, get_stream_profile, stop_on_disconnect
+
+
+async def token_stream(tokens, delay: float = 0.0):
+    for token in tokens:
+        if delay:
+            await asyncio.sleep(delay)
+        yield token
+
+
+async def collect(agen):
+    return [item async for item in agen]
+
+
+class TestStreamCoalescer(unittest.IsolatedAsyncioTestCase):
+    """Test suite for StreamCoalescer"""
+
+    async def test_text_is_preserved_and_batched(self):
+        """All text arrives in order, in far fewer frames than chunks"""
+        tokens = [f"t{i} " for i in range(1000)]
+        coalescer = StreamCoalescer("test", max_bytes=256, max_interval_ms=1000)
+        frames = await collect(coalescer.coalesce_text(token_stream(tokens)))
+
+        self.assertEqual("".join(frames), "".join(tokens))
+        self.assertLess(len(frames), 50)
+        self.assertEqual(coalescer.chunks_in, 1000)
+        self.assertEqual(coalescer.frames_sent, len(frames))
+
+    async def test_first_chunk_is_sent_immediately(self):
+        """The first frame is a single chunk so time-to-first-token is unchanged"""
+        coalescer = StreamCoalescer("test", max_bytes=10_000, max_interval_ms=10_000)
+        frames = await collect(coalescer.coalesce_text(token_stream(["a", "b", "c"])))
+        self.assertEqual(frames, ["a", "bc"])
+
+    async def test_interval_flush(self):
+        """Buffered text is flushed once the interval passes, even mid-stream"""
+        coalescer = StreamCoalescer("test", max_bytes=10_000, max_interval_ms=20)
+        frames = []
+        async for frame in coalescer.coalesce_text(token_stream(["x"] * 20, delay=0.005)):
+            frames.append(frame)
+        self.assertEqual("".join(frames), "x" * 20)
+        self.assertGreater(len(frames), 2)
+
+    async def test_control_chunks_pass_through(self):
+        """Control chunks are never merged and keep their position"""
+        coalescer = StreamCoalescer("test", max_bytes=10_000, max_interval_ms=10_000)
+        frames = await collect(coalescer.coalesce_text(
+            token_stream(["a", "b", "c", "Error: boom", "d"]),
+            is_control=lambda chunk: chunk.startswith("Error:"),
+        ))
+        self.assertEqual(frames, ["a", "bc", "Error: boom", "d"])
+
+    async def test_events_are_merged(self):
+        """Consecutive chunk events merge; other events flush and pass through"""
+        async def events():
+            yield {"type": "start"}
+            for word in ("hello", " ", "world"):
+                yield {"type": "chunk", "content": word}
+            yield {"type": "done", "content": ""}
+
+        coalescer = StreamCoalescer("test", max_bytes=10_000, max_interval_ms=10_000)
+        frames = await collect(coalescer.coalesce_events(events()))
+        self.assertEqual(frames, [
+            {"type": "start"},
+            {"type": "chunk", "content": "hello"},
+            {"type": "chunk", "content": " world"},
+            {"type": "done", "content": ""},
+        ])
+
+    async def test_source_error_flushes_then_raises(self):
+        """Pending text is delivered before a source error propagates"""
+        async def failing():
+            yield "a"
+            yield "b"
+            raise RuntimeError("model died")
+
+        coalescer = StreamCoalescer("test", max_bytes=10_000, max_interval_ms=10_000)
+        frames = []
+        with self.assertRaises(RuntimeError):
+            async for frame in coalescer.coalesce_text(failing()):
+                frames.append(frame)
+        self.assertEqual("".join(frames), "ab")
+
+    async def test_slow_consumer_applies_backpressure(self):
+        """A fast source is read at most MAX_PENDING_CHUNKS ahead of a slow consumer"""
+        produced = 0
+
+        async def fast_source():
+            nonlocal produced
+            for _ in range(streaming.MAX_PENDING_CHUNKS * 4):
+                produced += 1
+                yield "x"
+
+        coalescer = StreamCoalescer("test", max_bytes=1, max_interval_ms=10_000)
+        received = 0
+        lead = 0
+        async for frame in coalescer.coalesce_text(fast_source()):
+            received += len(frame)
+            await asyncio.sleep(0)  # Let the pump run as far as it can
+            await asyncio.sleep(0)
+            lead = max(lead, produced - received)
+
+        self.assertEqual(received, streaming.MAX_PENDING_CHUNKS * 4)
+        self.assertLessEqual(lead, streaming.MAX_PENDING_CHUNKS + 2)
+
+    def test_profiles(self):
+        """Endpoint profiles come from settings with a default fallback"""
+        generation = get_stream_profile("generation")
+        unknown = get_stream_profile("no-such-endpoint")
+        self.assertGreater(generation["max_bytes"], 0)
+        self.assertEqual(unknown, get_stream_profile("default"))
+
+
+class FakeRequest:
+    """Request stand-in whose client drops after `connected_for` checks"""
+
+    def __init__(self, connected_for: int):
+        self.checks = 0
+        self.connected_for = connected_for
+
+    async def is_disconnected(self) -> bool:
+        self.checks += 1
+        return self.checks > self.connected_for
+
+
+class TestStopOnDisconnect(unittest.IsolatedAsyncioTestCase):
+    """Test suite for stop_on_disconnect"""
+
+    async def test_source_closed_on_disconnect(self):
+        """The source stream is closed as soon as the client goes away"""
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield "token"
+                    await asyncio.sleep(0)
+            finally:
+                closed.set()
+
+        items = await collect(stop_on_disconnect(FakeRequest(connected_for=3), endless()))
+        self.assertEqual(items, ["token"] * 3)
+        self.assertTrue(closed.is_set())
+
+    async def test_closes_coalesced_model_stream(self):
+        """Closing a coalesced stream cancels the model generator behind it"""
+        cancelled = asyncio.Event()
+
+        async def model():
+            try:
+                while True:
+                    yield "x"
+                    await asyncio.sleep(0.001)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        coalesced = StreamCoalescer("test", max_bytes=4, max_interval_ms=1000).coalesce_text(model())
+        await collect(stop_on_disconnect(FakeRequest(connected_for=2), coalesced))
+        self.assertTrue(cancelled.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
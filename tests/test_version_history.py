@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for delta-compressed version history in VersionService (backend/services/version_service.py)
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import artifact_store as artifact_store_module
+from backend.services import version_service as version_service_module
+from backend.services.artifact_store import ArtifactStore
+from backend.services.version_service import VersionService, MAX_VERSIONS
+
+
+def html_page(index: int) -> str:
+    rows = "".join(f"<tr><td>row {row}</td><td>{'x' * 40}</td></tr>\n" for row in range(200))
+    return f"<html>\n<h1>Prototype revision {index}</h1>\n<table>\n{rows}</table>\n</html>\n"
+
+
+class TestVersionHistory(unittest.TestCase):
+    """Test suite for the append-only compressed version log"""
+
+    def setUp(self):
+        self.base_path = Path(tempfile.mkdtemp())
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        self.patches = [
+            patch.object(version_service_module.settings, "base_path", str(self.base_path)),
+            patch.object(version_service_module.settings, "version_snapshot_interval", 5),
+            patch.object(artifact_store_module, "_artifact_store", ArtifactStore(engine=engine)),
+            patch.object(artifact_store_module, "_clean", lambda content, artifact_type: content),
+        ]
+        for p in self.patches:
+            p.start()
+        self.service = VersionService()
+        self.log_file = self.base_path / "data" / "versions" / "sprint__html_prototype.jsonl"
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        shutil.rmtree(self.base_path, ignore_errors=True)
+
+    def create(self, index: int):
+        return self.service.create_version("sprint::html_prototype", "html_prototype", html_page(index),
+                                           folder_id="sprint")
+
+    def log_lines(self):
+        return [json.loads(line) for line in self.log_file.read_text(encoding="utf-8").splitlines()]
+
+    def test_versions_are_appended_as_snapshots_and_diffs(self):
+        """Each save appends one line; diffs fill the gaps between snapshots"""
+        for index in range(1, 8):
+            self.create(index)
+
+        lines = self.log_lines()
+        self.assertEqual(len(lines), 7)
+        self.assertEqual([line["storage"]["kind"] for line in lines],
+                         ["full", "delta", "delta", "delta", "delta", "full", "delta"])
+        self.assertLess(len(lines[1]["storage"]["data"]), len(lines[0]["storage"]["data"]) / 4)
+        self.assertNotIn("content", self.service.versions["sprint::html_prototype"][0])
+
+    def test_versions_are_rebuilt_lazily(self):
+        """Any version is rebuilt exactly, also after a restart"""
+        for index in range(1, 8):
+            self.create(index)
+
+        reloaded = VersionService()
+        self.assertEqual(reloaded.get_version("sprint::html_prototype", 4)["content"], html_page(4))
+        self.assertEqual(reloaded.get_current_version("sprint::html_prototype")["version"], 7)
+        self.assertEqual([v["content"] for v in reloaded.get_versions("sprint::html_prototype")],
+                         [html_page(index) for index in range(1, 8)])
+
+    def test_reload_reads_only_new_lines(self):
+        """A second load picks up lines appended by another writer"""
+        self.create(1)
+        other = VersionService()
+        other.create_version("sprint::html_prototype", "html_prototype", html_page(2), folder_id="sprint")
+
+        self.service._load_versions()
+        versions = self.service.versions["sprint::html_prototype"]
+        self.assertEqual([v["version"] for v in versions], [1, 2])
+        self.assertEqual([v["is_current"] for v in versions], [False, True])
+        self.assertEqual(self.service.get_version("sprint::html_prototype", 2)["content"], html_page(2))
+
+    def test_trimmed_log_is_compacted(self):
+        """Versions beyond the limit are dropped and the log is rewritten once half of it is trimmed"""
+        for index in range(1, 2 * MAX_VERSIONS + 1):
+            self.create(index)
+
+        versions = self.service.get_versions("sprint::html_prototype")
+        self.assertEqual(len(versions), MAX_VERSIONS)
+        self.assertEqual(versions[0]["version"], MAX_VERSIONS + 1)
+        self.assertEqual(versions[0]["content"], html_page(MAX_VERSIONS + 1))
+        lines = self.log_lines()
+        self.assertEqual(len(lines), MAX_VERSIONS)
+        self.assertEqual(lines[0]["storage"]["kind"], "full")
+        self.assertEqual(artifact_store_module._artifact_store.count(all_versions=True), MAX_VERSIONS)
+
+    def test_legacy_json_is_converted(self):
+        """Old full-copy files become a log, repeated version numbers are renumbered"""
+        versions_dir = self.base_path / "data" / "versions"
+        legacy = [
+            {"version": 1, "artifact_id": "mermaid_erd", "artifact_type": "mermaid_erd", "content": "erDiagram\n",
+             "metadata": {}, "created_at": "2026-01-01T00:00:01", "is_current": False},
+            {"version": 1, "artifact_id": "mermaid_erd", "artifact_type": "mermaid_erd",
+             "content": "erDiagram\n  USER ||--o{ ORDER : places\n", "metadata": {},
+             "created_at": "2026-01-01T00:00:02", "is_current": True},
+        ]
+        (versions_dir / "mermaid_erd.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        service = VersionService()
+        self.assertFalse((versions_dir / "mermaid_erd.json").exists())
+        self.assertEqual([v["version"] for v in service.versions["mermaid_erd"]], [1, 2])
+        self.assertEqual(service.get_current_version("mermaid_erd")["content"], legacy[1]["content"])
+
+    def test_compare_versions_uses_line_diff(self):
+        """Similarity is a difflib ratio over lines, with a unified diff"""
+        self.service.create_version("mermaid_erd", "mermaid_erd", "erDiagram\nA\nB\nC\n")
+        self.service.create_version("mermaid_erd", "mermaid_erd", "erDiagram\nA\nB2\nC\n")
+
+        comparison = self.service.compare_versions("mermaid_erd", 1, 2)
+        differences = comparison["differences"]
+        self.assertEqual(differences["lines_added"], 1)
+        self.assertEqual(differences["lines_removed"], 1)
+        self.assertAlmostEqual(differences["similarity"], 0.8)
+        self.assertIn("+B2", differences["unified_diff"])
+
+
+if __name__ == "__main__":
+    unittest.main()
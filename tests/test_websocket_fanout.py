@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for per-connection send queues in backend/core/websocket.py
+"""
+
+import sys
+import json
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core import websocket as ws_module
+from backend.core.websocket import WebSocketManager, EventType
+
+
+class FakeWebSocket:
+    """Minimal stand-in for fastapi.WebSocket"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed_code = None
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.release.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def send_json(self, message: dict):
+        await self.send_text(json.dumps(message))
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_code = code
+
+
+class TestWebSocketFanOut(unittest.IsolatedAsyncioTestCase):
+    """Test suite for WebSocketManager fan-out"""
+
+    async def asyncSetUp(self):
+        self.manager = WebSocketManager(heartbeat_interval=3600, max_queue_size=5)
+
+    async def asyncTearDown(self):
+        for connection in list(self.manager.senders):
+            self.manager.disconnect(connection)
+
+    async def test_slow_client_does_not_block_others(self):
+        """A blocked socket does not delay delivery to the rest of the room"""
+        fast, slow = FakeWebSocket(), FakeWebSocket()
+        slow.release.clear()
+        await self.manager.connect(fast, room_id="main")
+        await self.manager.connect(slow, room_id="main")
+
+        await self.manager.emit_generation_chunk("job-1", "hello", 0.5)
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(fast.sent[-1]["data"]["chunk"], "hello")
+        self.assertEqual(slow.sent, [])
+
+    async def test_serialized_once_per_broadcast(self):
+        """JSON is encoded once no matter how many sockets receive it"""
+        for _ in range(4):
+            await self.manager.connect(FakeWebSocket(), room_id="main")
+
+        with patch.object(ws_module, "_serialize", wraps=ws_module._serialize) as serialize:
+            await self.manager.emit_generation_chunk("job-1", "x", 0.1)
+        self.assertEqual(serialize.call_count, 1)
+
+    async def test_progress_events_are_coalesced(self):
+        """Pending progress for the same job is replaced by the latest value"""
+        client = FakeWebSocket()
+        client.release.clear()
+        await self.manager.connect(client, room_id="main")
+        await asyncio.sleep(0)
+
+        for progress in (10, 20, 30, 40):
+            await self.manager.emit_generation_progress("job-1", progress, "working")
+        client.release.set()
+        await asyncio.sleep(0.01)
+
+        progress_events = [m for m in client.sent if m["type"] == EventType.GENERATION_PROGRESS.value]
+        self.assertEqual(progress_events[-1]["data"]["progress"], 40)
+        self.assertLess(len(progress_events), 4)
+
+    async def test_overflow_disconnects_slow_consumer(self):
+        """Overflowing with non-droppable events disconnects the client"""
+        client = FakeWebSocket()
+        client.release.clear()
+        await self.manager.connect(client, room_id="main")
+
+        for i in range(10):
+            await self.manager.emit_generation_chunk("job-1", str(i), i / 10)
+        await asyncio.sleep(0.01)
+
+        self.assertNotIn(client, self.manager.senders)
+        self.assertEqual(client.closed_code, ws_module.SLOW_CONSUMER_CLOSE_CODE)
+        self.assertEqual(self.manager.get_queue_stats()["slow_consumer_disconnects"], 1)
+
+    async def test_broadcast_to_all_deduplicates_rooms(self):
+        """A connection in several rooms gets a global event once"""
+        client = FakeWebSocket()
+        await self.manager.connect(client, room_id="main")
+        await self.manager.connect(client, room_id="job-1")
+
+        await self.manager.emit_generation_error("job-1", "boom")
+        await asyncio.sleep(0.01)
+
+        errors = [m for m in client.sent if m["type"] == EventType.GENERATION_ERROR.value]
+        self.assertEqual(len(errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()